@@ -0,0 +1,117 @@
+// Neighbour sweeps over an n^3 grid stored row-major (ContiguousND<double, 3>)
+// and as Z-ordered bricks (MortonArray<double, 3>):
+//
+//   7-point, k inner  - 7-point stencil, last index fastest
+//   axis 0, i inner   - second difference along axis 0, first index fastest,
+//                       the access pattern of a z-direction line sweep
+//   7-point, bricks   - 7-point stencil visiting one brick at a time
+//                       (MortonArray only)
+//
+//   bench_layouts [n=256] [repeats=5]
+//
+// Reports the best time of `repeats` sweeps and million cell updates per
+// second. Both layouts must produce the same checksum for each sweep.
+#include <cnda/fixed_rank.hpp>
+#include <cnda/morton.hpp>
+#include <algorithm>
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <functional>
+
+namespace {
+
+const double c0 = 0.4;
+const double c1 = 0.1;
+
+template <class In, class Out>
+inline void update(const In& in, Out& out, std::size_t i, std::size_t j, std::size_t k) {
+    out(i, j, k) = c0 * in(i, j, k) +
+                   c1 * (in(i - 1, j, k) + in(i + 1, j, k) +
+                         in(i, j - 1, k) + in(i, j + 1, k) +
+                         in(i, j, k - 1) + in(i, j, k + 1));
+}
+
+template <class In, class Out>
+void sweep_k_inner(const In& in, Out& out, std::size_t n) {
+    for (std::size_t i = 1; i + 1 < n; ++i)
+        for (std::size_t j = 1; j + 1 < n; ++j)
+            for (std::size_t k = 1; k + 1 < n; ++k) update(in, out, i, j, k);
+}
+
+template <class In, class Out>
+void sweep_axis0(const In& in, Out& out, std::size_t n) {
+    for (std::size_t k = 1; k + 1 < n; ++k)
+        for (std::size_t j = 1; j + 1 < n; ++j)
+            for (std::size_t i = 1; i + 1 < n; ++i)
+                out(i, j, k) = in(i - 1, j, k) - 2.0 * in(i, j, k) + in(i + 1, j, k);
+}
+
+template <class In, class Out>
+void sweep_bricks(const In& in, Out& out, std::size_t n) {
+    const std::size_t b = In::brick_side;
+    for (std::size_t i0 = 0; i0 < n; i0 += b)
+        for (std::size_t j0 = 0; j0 < n; j0 += b)
+            for (std::size_t k0 = 0; k0 < n; k0 += b)
+                for (std::size_t i = std::max<std::size_t>(i0, 1); i < std::min(i0 + b, n - 1); ++i)
+                    for (std::size_t j = std::max<std::size_t>(j0, 1); j < std::min(j0 + b, n - 1); ++j)
+                        for (std::size_t k = std::max<std::size_t>(k0, 1); k < std::min(k0 + b, n - 1); ++k)
+                            update(in, out, i, j, k);
+}
+
+template <class A>
+void init(A& a, std::size_t n) {
+    for (std::size_t i = 0; i < n; ++i)
+        for (std::size_t j = 0; j < n; ++j)
+            for (std::size_t k = 0; k < n; ++k) a(i, j, k) = static_cast<double>((i * 7 + j * 3 + k) % 11);
+}
+
+template <class A>
+double checksum(const A& a, std::size_t n) {
+    double s = 0.0;
+    for (std::size_t i = 0; i < n; ++i)
+        for (std::size_t j = 0; j < n; ++j)
+            for (std::size_t k = 0; k < n; ++k) s += a(i, j, k);
+    return s;
+}
+
+template <class A>
+void report(const char* name, int repeats, std::size_t cells, const A& out, std::size_t n,
+            const std::function<void()>& run) {
+    run();
+    const double sum = checksum(out, n);
+    double best = 1e300;
+    for (int r = 0; r < repeats; ++r) {
+        const auto t0 = std::chrono::steady_clock::now();
+        run();
+        const auto t1 = std::chrono::steady_clock::now();
+        best = std::min(best, std::chrono::duration<double>(t1 - t0).count());
+    }
+    std::printf("%-30s %9.3f ms %9.1f Mcell/s   checksum %.6e\n",
+                name, best * 1e3, cells / best * 1e-6, sum);
+}
+
+} // namespace
+
+int main(int argc, char** argv) {
+    const std::size_t n = argc > 1 ? static_cast<std::size_t>(std::atol(argv[1])) : 256;
+    const int repeats = argc > 2 ? std::atoi(argv[2]) : 5;
+    const std::size_t cells = (n - 2) * (n - 2) * (n - 2);
+    std::printf("Neighbour sweeps, %zu^3 grid, best of %d\n", n, repeats);
+
+    {
+        cnda::ContiguousND<double, 3> in({n, n, n}), out({n, n, n});
+        init(in, n);
+        report("row-major  7-point, k inner", repeats, cells, out, n, [&] { sweep_k_inner(in, out, n); });
+        report("row-major  axis 0, i inner", repeats, cells, out, n, [&] { sweep_axis0(in, out, n); });
+    }
+
+    {
+        cnda::MortonArray<double, 3> in({n, n, n}), out({n, n, n});
+        init(in, n);
+        report("Morton     7-point, k inner", repeats, cells, out, n, [&] { sweep_k_inner(in, out, n); });
+        report("Morton     axis 0, i inner", repeats, cells, out, n, [&] { sweep_axis0(in, out, n); });
+        report("Morton     7-point, bricks", repeats, cells, out, n, [&] { sweep_bricks(in, out, n); });
+    }
+    return 0;
+}
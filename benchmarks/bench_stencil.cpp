@@ -0,0 +1,127 @@
+// 7-point Jacobi stencil over an n^3 grid, timed for a raw-pointer loop,
+// ContiguousND<double> (dynamic rank) and ContiguousND<double, 3> (fixed
+// rank), on owning arrays and on strided interior views.
+//
+//   bench_stencil [n=128] [repeats=10]
+//
+// Reports the best time of `repeats` sweeps and million cell updates per
+// second. All variants must produce the same checksum.
+#include <cnda/fixed_rank.hpp>
+#include <algorithm>
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <functional>
+#include <vector>
+
+namespace {
+
+const double c0 = 0.4;
+const double c1 = 0.1;
+
+template <class In, class Out>
+void sweep(const In& in, Out& out, std::size_t n0, std::size_t n1, std::size_t n2) {
+    for (std::size_t i = 1; i + 1 < n0; ++i)
+        for (std::size_t j = 1; j + 1 < n1; ++j)
+            for (std::size_t k = 1; k + 1 < n2; ++k)
+                out(i, j, k) = c0 * in(i, j, k) +
+                               c1 * (in(i - 1, j, k) + in(i + 1, j, k) +
+                                     in(i, j - 1, k) + in(i, j + 1, k) +
+                                     in(i, j, k - 1) + in(i, j, k + 1));
+}
+
+void sweep_raw(const double* in, double* out, std::size_t n0, std::size_t n1, std::size_t n2) {
+    const std::size_t s0 = n1 * n2, s1 = n2;
+    for (std::size_t i = 1; i + 1 < n0; ++i)
+        for (std::size_t j = 1; j + 1 < n1; ++j)
+            for (std::size_t k = 1; k + 1 < n2; ++k) {
+                const std::size_t c = i * s0 + j * s1 + k;
+                out[c] = c0 * in[c] +
+                         c1 * (in[c - s0] + in[c + s0] + in[c - s1] + in[c + s1] + in[c - 1] + in[c + 1]);
+            }
+}
+
+template <class A>
+void init(A& a, std::size_t n0, std::size_t n1, std::size_t n2) {
+    for (std::size_t i = 0; i < n0; ++i)
+        for (std::size_t j = 0; j < n1; ++j)
+            for (std::size_t k = 0; k < n2; ++k) a(i, j, k) = static_cast<double>((i * 7 + j * 3 + k) % 11);
+}
+
+template <class A>
+double checksum(const A& a, std::size_t n0, std::size_t n1, std::size_t n2) {
+    double s = 0.0;
+    for (std::size_t i = 0; i < n0; ++i)
+        for (std::size_t j = 0; j < n1; ++j)
+            for (std::size_t k = 0; k < n2; ++k) s += a(i, j, k);
+    return s;
+}
+
+void report(const char* name, int repeats, std::size_t cells, double sum, const std::function<void()>& run) {
+    double best = 1e300;
+    for (int r = 0; r < repeats; ++r) {
+        const auto t0 = std::chrono::steady_clock::now();
+        run();
+        const auto t1 = std::chrono::steady_clock::now();
+        best = std::min(best, std::chrono::duration<double>(t1 - t0).count());
+    }
+    std::printf("%-22s %9.3f ms %9.1f Mcell/s   checksum %.6e\n",
+                name, best * 1e3, cells / best * 1e-6, sum);
+}
+
+} // namespace
+
+int main(int argc, char** argv) {
+    const std::size_t n = argc > 1 ? static_cast<std::size_t>(std::atol(argv[1])) : 128;
+    const int repeats = argc > 2 ? std::atoi(argv[2]) : 10;
+    const std::size_t cells = (n - 2) * (n - 2) * (n - 2);
+    std::printf("7-point stencil, %zu^3 grid, best of %d\n", n, repeats);
+
+    {
+        std::vector<double> in(n * n * n), out(n * n * n, 0.0);
+        for (std::size_t c = 0; c < in.size(); ++c) {
+            const std::size_t i = c / (n * n), j = c / n % n, k = c % n;
+            in[c] = static_cast<double>((i * 7 + j * 3 + k) % 11);
+        }
+        sweep_raw(in.data(), out.data(), n, n, n);
+        double s = 0.0;
+        for (double x : out) s += x;
+        report("raw pointer", repeats, cells, s, [&] { sweep_raw(in.data(), out.data(), n, n, n); });
+    }
+
+    {
+        cnda::ContiguousND<double> in({n, n, n}), out({n, n, n});
+        init(in, n, n, n);
+        sweep(in, out, n, n, n);
+        report("ContiguousND<T>", repeats, cells, checksum(out, n, n, n), [&] { sweep(in, out, n, n, n); });
+    }
+
+    {
+        cnda::ContiguousND<double, 3> in({n, n, n}), out({n, n, n});
+        init(in, n, n, n);
+        sweep(in, out, n, n, n);
+        report("ContiguousND<T, 3>", repeats, cells, checksum(out, n, n, n), [&] { sweep(in, out, n, n, n); });
+    }
+
+    // The same grid as the interior of a padded buffer: strided views
+    const std::size_t p = n + 2;
+    const std::vector<cnda::Range> interior(3, cnda::Range{1, n + 1, 1});
+    {
+        cnda::ContiguousND<double> bin({p, p, p}), bout({p, p, p});
+        auto in = bin.slice(interior);
+        auto out = bout.slice(interior);
+        init(in, n, n, n);
+        sweep(in, out, n, n, n);
+        report("ContiguousND<T> view", repeats, cells, checksum(out, n, n, n), [&] { sweep(in, out, n, n, n); });
+    }
+
+    {
+        cnda::ContiguousND<double, 3> bin({p, p, p}), bout({p, p, p});
+        auto in = bin.slice(interior);
+        auto out = bout.slice(interior);
+        init(in, n, n, n);
+        sweep(in, out, n, n, n);
+        report("ContiguousND<T, 3> view", repeats, cells, checksum(out, n, n, n), [&] { sweep(in, out, n, n, n); });
+    }
+    return 0;
+}
@@ -0,0 +1,91 @@
+// Cost of creating short-lived tile views of a 2D/3D array: slice() (shares
+// the owner), borrow() (no owner reference) and the fixed-rank versions.
+//
+//   bench_views [views=2000000]
+//
+// Reports nanoseconds and heap allocations per view; operator new is
+// replaced here to count the latter.
+#include <cnda/fixed_rank.hpp>
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <functional>
+#include <new>
+
+namespace {
+std::size_t g_allocations = 0;
+}
+
+void* operator new(std::size_t bytes) {
+    ++g_allocations;
+    if (void* p = std::malloc(bytes ? bytes : 1)) return p;
+    throw std::bad_alloc();
+}
+void operator delete(void* p) noexcept { std::free(p); }
+void operator delete(void* p, std::size_t) noexcept { std::free(p); }
+
+namespace {
+
+const std::size_t tile = 16;
+
+void report(const char* name, std::size_t views, const std::function<double()>& run) {
+    const std::size_t allocs = g_allocations;
+    const auto t0 = std::chrono::steady_clock::now();
+    const double sum = run();
+    const auto t1 = std::chrono::steady_clock::now();
+    const double ns = std::chrono::duration<double, std::nano>(t1 - t0).count() / views;
+    std::printf("%-28s %7.1f ns/view %6.2f allocs/view   (checksum %.0f)\n",
+                name, ns, static_cast<double>(g_allocations - allocs) / views, sum);
+}
+
+// Visit `views` tiles round-robin, reading one element of each
+template <class A, class MakeView>
+double tiles(A& a, std::size_t views, MakeView make_view) {
+    const std::size_t nt = a.shape()[0] / tile;
+    double sum = 0.0;
+    for (std::size_t v = 0; v < views; ++v) {
+        const std::size_t i = (v % nt) * tile, j = (v / nt % nt) * tile;
+        auto t = make_view(a, i, j);
+        sum += t(1, 1);
+    }
+    return sum;
+}
+
+} // namespace
+
+int main(int argc, char** argv) {
+    const std::size_t views = argc > 1 ? static_cast<std::size_t>(std::atol(argv[1])) : 2000000;
+    const std::size_t n = 512;
+    std::printf("%zu views of %zux%zu tiles of a %zux%zu array\n", views, tile, tile, n, n);
+
+    cnda::ContiguousND<double> a({n, n});
+    cnda::ContiguousND<double, 2> f({n, n});
+    for (std::size_t i = 0; i < a.size(); ++i) a.data()[i] = f.data()[i] = static_cast<double>(i % 7);
+
+    report("slice(std::vector<Range>)", views, [&] {
+        return tiles(a, views, [](cnda::ContiguousND<double>& x, std::size_t i, std::size_t j) {
+            return x.slice(std::vector<cnda::Range>{{i, i + tile, 1}, {j, j + tile, 1}});
+        });
+    });
+    report("slice({...})", views, [&] {
+        return tiles(a, views, [](cnda::ContiguousND<double>& x, std::size_t i, std::size_t j) {
+            return x.slice({{i, i + tile, 1}, {j, j + tile, 1}});
+        });
+    });
+    report("borrow({...})", views, [&] {
+        return tiles(a, views, [](cnda::ContiguousND<double>& x, std::size_t i, std::size_t j) {
+            return x.borrow({{i, i + tile, 1}, {j, j + tile, 1}});
+        });
+    });
+    report("ContiguousND<T, 2>::slice", views, [&] {
+        return tiles(f, views, [](cnda::ContiguousND<double, 2>& x, std::size_t i, std::size_t j) {
+            return x.slice({{i, i + tile, 1}, {j, j + tile, 1}});
+        });
+    });
+    report("ContiguousND<T, 2>::borrow", views, [&] {
+        return tiles(f, views, [](cnda::ContiguousND<double, 2>& x, std::size_t i, std::size_t j) {
+            return x.borrow({{i, i + tile, 1}, {j, j + tile, 1}});
+        });
+    });
+    return 0;
+}
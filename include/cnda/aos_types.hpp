@@ -1,6 +1,7 @@
 #pragma once
 #include <cstdint>
 #include <cstddef>
+#include <cstring>
 #include <type_traits>
 
 namespace cnda {
@@ -101,5 +102,128 @@ static_assert(is_aos_compatible<Cell3D>::value,       "Cell3D must be AoS-compat
 static_assert(is_aos_compatible<Particle>::value,     "Particle must be AoS-compatible");
 static_assert(is_aos_compatible<MaterialPoint>::value,"MaterialPoint must be AoS-compatible");
 
+// -------- Field tables --------
+// Per-struct description of every field, in declaration order. Used by the
+// SoA container and by NumPy dtype checks on the Python side. The tables are
+// constant-initialized, so reading them never runs code.
+
+/**
+ * @brief Run-time description of one struct field
+ *
+ * `kind` follows NumPy's dtype.kind: 'f' floating point, 'i' signed integer.
+ */
+struct FieldInfo {
+    const char* name;
+    std::size_t offset;  // bytes from the start of the struct
+    std::size_t size;    // bytes
+    char        kind;
+};
+
+// NumPy kind character for a field type
+template <typename F>
+constexpr char field_kind() {
+    return std::is_floating_point<F>::value ? 'f'
+         : std::is_signed<F>::value         ? 'i'
+                                            : 'u';
+}
+
+#define CNDA_AOS_FIELD(S, m) \
+    FieldInfo{ #m, offsetof(S, m), sizeof(decltype(S::m)), field_kind<decltype(S::m)>() }
+
+// Primary template is left undefined: only described structs have fields.
+// count is an enumerator, not a static data member, so it can be bound to a
+// reference (e.g. inside REQUIRE) without an out-of-line definition.
+template <typename T>
+struct struct_fields;
+
+template <> struct struct_fields<Vec2f> {
+    enum : std::size_t { count = 2 };
+    static const FieldInfo* get() {
+        static constexpr FieldInfo f[count] = { CNDA_AOS_FIELD(Vec2f, x), CNDA_AOS_FIELD(Vec2f, y) };
+        return f;
+    }
+};
+
+template <> struct struct_fields<Vec3f> {
+    enum : std::size_t { count = 3 };
+    static const FieldInfo* get() {
+        static constexpr FieldInfo f[count] = {
+            CNDA_AOS_FIELD(Vec3f, x), CNDA_AOS_FIELD(Vec3f, y), CNDA_AOS_FIELD(Vec3f, z) };
+        return f;
+    }
+};
+
+template <> struct struct_fields<Cell2D> {
+    enum : std::size_t { count = 3 };
+    static const FieldInfo* get() {
+        static constexpr FieldInfo f[count] = {
+            CNDA_AOS_FIELD(Cell2D, u), CNDA_AOS_FIELD(Cell2D, v), CNDA_AOS_FIELD(Cell2D, flag) };
+        return f;
+    }
+};
+
+template <> struct struct_fields<Cell3D> {
+    enum : std::size_t { count = 4 };
+    static const FieldInfo* get() {
+        static constexpr FieldInfo f[count] = {
+            CNDA_AOS_FIELD(Cell3D, u), CNDA_AOS_FIELD(Cell3D, v),
+            CNDA_AOS_FIELD(Cell3D, w), CNDA_AOS_FIELD(Cell3D, flag) };
+        return f;
+    }
+};
+
+template <> struct struct_fields<Particle> {
+    enum : std::size_t { count = 7 };
+    static const FieldInfo* get() {
+        static constexpr FieldInfo f[count] = {
+            CNDA_AOS_FIELD(Particle, x),  CNDA_AOS_FIELD(Particle, y),  CNDA_AOS_FIELD(Particle, z),
+            CNDA_AOS_FIELD(Particle, vx), CNDA_AOS_FIELD(Particle, vy), CNDA_AOS_FIELD(Particle, vz),
+            CNDA_AOS_FIELD(Particle, mass) };
+        return f;
+    }
+};
+
+template <> struct struct_fields<MaterialPoint> {
+    enum : std::size_t { count = 4 };
+    static const FieldInfo* get() {
+        static constexpr FieldInfo f[count] = {
+            CNDA_AOS_FIELD(MaterialPoint, density),  CNDA_AOS_FIELD(MaterialPoint, temperature),
+            CNDA_AOS_FIELD(MaterialPoint, pressure), CNDA_AOS_FIELD(MaterialPoint, id) };
+        return f;
+    }
+};
+
+#undef CNDA_AOS_FIELD
+
+// -------- Layout matching --------
+
+// Field `name` of a table of `count` fields, or nullptr
+inline const FieldInfo* find_field(const FieldInfo* fields, std::size_t count, const char* name) {
+    for (std::size_t i = 0; i < count; ++i) {
+        if (std::strcmp(fields[i].name, name) == 0) return fields + i;
+    }
+    return nullptr;
+}
+
+/**
+ * @brief Check whether records described by `fields` can be read as S
+ *
+ * True when the record is sizeof(S) bytes and has exactly the fields of S,
+ * each at the same offset with the same kind and size. The order of the
+ * fields in the table and how the record was padded to get there do not
+ * matter, so e.g. NumPy dtypes built with align=True and packed ones both
+ * match when their offsets agree with the struct.
+ */
+template <typename S>
+bool layout_matches(const FieldInfo* fields, std::size_t count, std::size_t itemsize) {
+    if (itemsize != sizeof(S) || count != struct_fields<S>::count) return false;
+    const FieldInfo* f = struct_fields<S>::get();
+    for (std::size_t i = 0; i < count; ++i) {
+        const FieldInfo* g = find_field(fields, count, f[i].name);
+        if (!g || g->offset != f[i].offset || g->size != f[i].size || g->kind != f[i].kind) return false;
+    }
+    return true;
+}
+
 } // namespace aos
 } // namespace cnda
@@ -0,0 +1,396 @@
+#pragma once
+#include <cnda/compact.hpp>
+#include <cnda/contiguous_nd.hpp>
+#include <cnda/parallel.hpp>
+#include <algorithm>
+#include <array>
+#include <cmath>
+#include <cstddef>
+#include <cstdint>
+#include <queue>
+#include <stdexcept>
+#include <utility>
+#include <vector>
+
+namespace cnda {
+
+/**
+ * @brief Uniform-grid cell list over particle positions
+ *
+ * Bins the particles of a ContiguousND<T> (any T with double-convertible
+ * x, y, z members, e.g. aos::Particle) into cubic cells covering their
+ * bounding box, for radius and k-nearest-neighbour queries that look at a
+ * few cells instead of every particle. Particles are identified by their
+ * row-major position in the array, as in take()/put().
+ *
+ * build() is a parallel counting sort by cell id: per-task histograms, a
+ * prefix sum over (cell, task), then every task scatters its particles, so
+ * each cell lists its particles in increasing order. Fewer tasks sort when
+ * there are more cells than particles, keeping the histograms to about 2n
+ * counts. The list keeps its own copy of the positions in cell order, which
+ * is what queries read.
+ *
+ * update() is for the next time step. When particles move less than a cell,
+ * only a few of them change cell; those are moved between the cells' ranges
+ * in place and everything else stays. It falls back to build() when a
+ * particle leaves the grid or the moves would cost more than a rebuild.
+ *
+ * cell_size is a lower bound: when it would give more than about four cells
+ * per particle, the cells are made larger. Queries are correct for any size.
+ */
+class CellList {
+public:
+  typedef std::array<std::size_t, 3> shape_type;
+
+  explicit CellList(double cell_size) : m_requested(cell_size), m_h(cell_size) {
+      if (!(cell_size > 0) || !std::isfinite(cell_size)) {
+          throw std::invalid_argument("CellList: cell_size must be positive");
+      }
+  }
+
+  std::size_t size() const noexcept { return m_cell.size(); }
+  double cell_size() const noexcept { return m_h; }
+  const shape_type& shape() const noexcept { return m_dims; }
+  std::size_t num_cells() const noexcept { return m_start.empty() ? 0 : m_start.size() - 1; }
+
+  // Cell id (row-major in shape()) of particle i
+  std::size_t cell_of(std::size_t i) const { return m_cell.at(i); }
+
+  // Particles of cell c: items()[cell_start(c)] to items()[cell_start(c + 1) - 1]
+  std::size_t cell_start(std::size_t c) const { return m_start.at(c); }
+  const std::vector<std::int64_t>& items() const noexcept { return m_items; }
+
+  // Bins every particle from scratch
+  template <class T>
+  void build(const ContiguousND<T>& particles) {
+      const std::size_t n = particles.size();
+      std::vector<double> xyz;
+      read_positions(particles, xyz);
+      bounding_grid(xyz, n);
+
+      m_cell.assign(n, 0);
+      const std::size_t tasks = std::max<std::size_t>(1, std::min(n, parallel_task_count(n)));
+      parallel_tasks(tasks, [&](std::size_t t) {
+          for (std::size_t i = n * t / tasks; i < n * (t + 1) / tasks; ++i) m_cell[i] = cell_id(&xyz[3 * i]);
+      });
+
+      // Counting sort over one flat histogram with a row of cells per sort
+      // task. Fewer tasks sort than bin when cells outnumber particles, so the
+      // histogram holds at most about 2n counts however small the cells are.
+      const std::size_t cells = num_cells();
+      const std::size_t sorters = std::max<std::size_t>(1, std::min(tasks, 2 * n / cells));
+      std::vector<std::size_t> offset(sorters * cells, 0);
+      parallel_tasks(sorters, [&](std::size_t t) {
+          std::size_t* count = &offset[t * cells];
+          for (std::size_t i = n * t / sorters; i < n * (t + 1) / sorters; ++i) ++count[m_cell[i]];
+      });
+      for (std::size_t t = 0; t < sorters; ++t)
+          for (std::size_t c = 0; c < cells; ++c) m_start[c + 1] += offset[t * cells + c];
+      for (std::size_t c = 0; c < cells; ++c) m_start[c + 1] += m_start[c];
+
+      // Row t now becomes the first slot of each cell for task t: particles
+      // in cells < c, plus those of cell c in tasks < t
+      std::vector<std::size_t> first(m_start.begin(), m_start.end() - 1);
+      for (std::size_t t = 0; t < sorters; ++t) {
+          std::size_t* row = &offset[t * cells];
+          for (std::size_t c = 0; c < cells; ++c) {
+              const std::size_t count = row[c];
+              row[c] = first[c];
+              first[c] += count;
+          }
+      }
+
+      m_items.assign(n, 0);
+      m_slot.assign(n, 0);
+      m_pos.assign(3 * n, 0.0);
+      parallel_tasks(sorters, [&](std::size_t t) {
+          std::size_t* next = &offset[t * cells];
+          for (std::size_t i = n * t / sorters; i < n * (t + 1) / sorters; ++i) {
+              const std::size_t s = next[m_cell[i]]++;
+              m_items[s] = static_cast<std::int64_t>(i);
+              m_slot[i] = s;
+              std::copy(&xyz[3 * i], &xyz[3 * i] + 3, &m_pos[3 * s]);
+          }
+      });
+  }
+
+  /**
+   * Re-bins the particles after they moved. Returns true if the list was
+   * patched in place and false if it was rebuilt (first call, a different
+   * particle count, a particle outside the grid, or too many moves).
+   */
+  template <class T>
+  bool update(const ContiguousND<T>& particles) {
+      const std::size_t n = particles.size();
+      if (m_start.empty() || n != m_cell.size()) {
+          build(particles);
+          return false;
+      }
+      std::vector<double> xyz;
+      read_positions(particles, xyz);
+
+      // New cell of every particle; a particle outside the grid forces a rebuild
+      const std::size_t tasks = std::max<std::size_t>(1, std::min(n, parallel_task_count(n)));
+      std::vector<std::vector<std::pair<std::size_t, std::size_t>>> moved(tasks);
+      std::vector<char> outside(tasks, 0);
+      std::vector<std::size_t> cost(tasks, 0);
+      parallel_tasks(tasks, [&](std::size_t t) {
+          for (std::size_t i = n * t / tasks; i < n * (t + 1) / tasks; ++i) {
+              if (!inside(&xyz[3 * i])) {
+                  outside[t] = 1;
+                  return;
+              }
+              const std::size_t c = cell_id(&xyz[3 * i]);
+              if (c != m_cell[i]) {
+                  moved[t].push_back(std::make_pair(i, c));
+                  cost[t] += c > m_cell[i] ? c - m_cell[i] : m_cell[i] - c;
+              }
+          }
+      });
+      std::size_t total_cost = 0;
+      for (std::size_t t = 0; t < tasks; ++t) {
+          if (outside[t]) {
+              build(particles);
+              return false;
+          }
+          total_cost += cost[t];
+      }
+      // Moving a particle from cell a to cell b shifts one particle in each
+      // cell in between; a counting sort touches every particle and cell
+      if (total_cost > n + num_cells()) {
+          build(particles);
+          return false;
+      }
+      for (std::size_t t = 0; t < tasks; ++t) {
+          for (std::size_t m = 0; m < moved[t].size(); ++m) move(moved[t][m].first, moved[t][m].second);
+      }
+      parallel_tasks(tasks, [&](std::size_t t) {
+          for (std::size_t i = n * t / tasks; i < n * (t + 1) / tasks; ++i) {
+              std::copy(&xyz[3 * i], &xyz[3 * i] + 3, &m_pos[3 * m_slot[i]]);
+          }
+      });
+      return true;
+  }
+
+  /**
+   * Permutes the particles into cell order, so the particles of a cell are
+   * next to each other in memory, and renumbers the list to match. Returns
+   * the permutation: new particle i is old particle order[i].
+   */
+  template <class T>
+  std::vector<std::int64_t> reorder(ContiguousND<T>& particles) {
+      if (particles.size() != m_cell.size() || m_start.empty()) {
+          throw std::invalid_argument("CellList::reorder(): particles do not match the list");
+      }
+      const std::size_t n = particles.size();
+      std::vector<T> sorted(n);
+      detail::for_each_listed(particles, m_items.data(), n, [&](std::size_t s, const T& p) { sorted[s] = p; });
+
+      std::vector<std::int64_t> order(n);
+      order.swap(m_items);
+      std::vector<std::size_t> cell(n);
+      for (std::size_t s = 0; s < n; ++s) {
+          cell[s] = m_cell[static_cast<std::size_t>(order[s])];
+          m_items[s] = static_cast<std::int64_t>(s);
+          m_slot[s] = s;
+      }
+      m_cell.swap(cell);
+      detail::for_each_listed(particles, m_items.data(), n, [&](std::size_t s, T& p) { p = sorted[s]; });
+      return order;
+  }
+
+  // Appends to out the particles within distance r of p, in increasing order
+  void query_radius(const double* p, double r, std::vector<std::int64_t>& out) const {
+      const std::size_t first = out.size();
+      std::array<std::size_t, 3> lo, hi;
+      if (m_start.empty() || !(r >= 0) || !cell_range(p, r, lo, hi)) return;
+      const double r2 = r * r;
+      for (std::size_t i = lo[0]; i <= hi[0]; ++i)
+          for (std::size_t j = lo[1]; j <= hi[1]; ++j) {
+              // Cells along the last axis are consecutive, so are their particles
+              const std::size_t row = (i * m_dims[1] + j) * m_dims[2];
+              for (std::size_t s = m_start[row + lo[2]]; s < m_start[row + hi[2] + 1]; ++s) {
+                  if (distance2(p, &m_pos[3 * s]) <= r2) out.push_back(m_items[s]);
+              }
+          }
+      std::sort(out.begin() + static_cast<std::ptrdiff_t>(first), out.end());
+  }
+
+  /**
+   * Appends to out the k particles nearest to p, nearest first (ties by
+   * index). Searches rings of cells around p's cell until no unvisited cell
+   * can hold a closer particle.
+   */
+  void query_nearest(const double* p, std::size_t k, std::vector<std::int64_t>& out) const {
+      if (k > size()) throw std::invalid_argument("CellList::query_nearest(): k exceeds the particle count");
+      if (!std::isfinite(p[0]) || !std::isfinite(p[1]) || !std::isfinite(p[2])) {
+          throw std::invalid_argument("CellList::query_nearest(): point must be finite");
+      }
+      if (k == 0) return;
+      typedef std::pair<double, std::int64_t> candidate;
+      std::priority_queue<candidate> best;   // the k closest so far, farthest on top
+      std::array<std::size_t, 3> c;
+      for (std::size_t d = 0; d < 3; ++d) c[d] = axis_cell(p[d], d);
+      const std::size_t rings = std::max(m_dims[0], std::max(m_dims[1], m_dims[2]));
+      for (std::size_t s = 0; s < rings; ++s) {
+          std::array<std::size_t, 3> lo, hi;
+          for (std::size_t d = 0; d < 3; ++d) {
+              lo[d] = c[d] >= s ? c[d] - s : 0;
+              hi[d] = std::min(c[d] + s, m_dims[d] - 1);
+          }
+          for (std::size_t i = lo[0]; i <= hi[0]; ++i)
+              for (std::size_t j = lo[1]; j <= hi[1]; ++j)
+                  for (std::size_t l = lo[2]; l <= hi[2]; ++l) {
+                      const std::size_t ring = std::max(gap(i, c[0]), std::max(gap(j, c[1]), gap(l, c[2])));
+                      if (ring != s) continue;
+                      const std::size_t cell = (i * m_dims[1] + j) * m_dims[2] + l;
+                      for (std::size_t q = m_start[cell]; q < m_start[cell + 1]; ++q) {
+                          const candidate cand(distance2(p, &m_pos[3 * q]), m_items[q]);
+                          if (best.size() < k) {
+                              best.push(cand);
+                          } else if (cand < best.top()) {
+                              best.pop();
+                              best.push(cand);
+                          }
+                      }
+                  }
+          // Cells of ring s + 1 are at least s cells away from p
+          const double bound = static_cast<double>(s) * m_h;
+          if (best.size() == k && best.top().first <= bound * bound) break;
+      }
+      const std::size_t first = out.size();
+      out.resize(first + k);
+      for (std::size_t m = k; m-- > 0; best.pop()) out[first + m] = best.top().second;
+  }
+
+private:
+  double m_requested;                     // cell_size as given
+  double m_h;                             // cell size in use
+  std::array<double, 3> m_lo = {{0.0, 0.0, 0.0}};
+  shape_type m_dims = {{0, 0, 0}};
+  std::vector<std::size_t> m_start;       // m_start[c]: first slot of cell c; num_cells() + 1 entries
+  std::vector<std::int64_t> m_items;      // particle in each slot
+  std::vector<double> m_pos;              // x, y, z of the particle in each slot
+  std::vector<std::size_t> m_cell;        // cell of each particle
+  std::vector<std::size_t> m_slot;        // slot of each particle
+
+  // xyz[3 * i + d] = coordinate d of the particle at row-major position i
+  template <class T>
+  static void read_positions(const ContiguousND<T>& particles, std::vector<double>& xyz) {
+      const std::size_t n = particles.size();
+      xyz.resize(3 * n);
+      const std::size_t tasks = std::max<std::size_t>(1, std::min(n, parallel_task_count(n)));
+      std::vector<char> finite(tasks, 1);
+      parallel_tasks(tasks, [&](std::size_t t) {
+          detail::for_each_flat(particles, n * t / tasks, n * (t + 1) / tasks, [&](std::size_t i, const T& p) {
+              double* q = &xyz[3 * i];
+              q[0] = static_cast<double>(p.x);
+              q[1] = static_cast<double>(p.y);
+              q[2] = static_cast<double>(p.z);
+              if (!std::isfinite(q[0]) || !std::isfinite(q[1]) || !std::isfinite(q[2])) finite[t] = 0;
+          });
+      });
+      if (std::find(finite.begin(), finite.end(), 0) != finite.end()) {
+          throw std::invalid_argument("CellList: particle positions must be finite");
+      }
+  }
+
+  // Grid over the bounding box of the positions, with cells of m_requested
+  // or larger
+  void bounding_grid(const std::vector<double>& xyz, std::size_t n) {
+      std::array<double, 3> lo, hi;
+      for (std::size_t d = 0; d < 3; ++d) {
+          lo[d] = n ? xyz[d] : 0.0;
+          hi[d] = lo[d];
+      }
+      for (std::size_t i = 1; i < n; ++i)
+          for (std::size_t d = 0; d < 3; ++d) {
+              lo[d] = std::min(lo[d], xyz[3 * i + d]);
+              hi[d] = std::max(hi[d], xyz[3 * i + d]);
+          }
+      const double limit = 4.0 * static_cast<double>(n) + 64.0;
+      m_h = m_requested;
+      for (;;) {
+          double cells = 1.0;
+          for (std::size_t d = 0; d < 3; ++d) cells *= std::floor((hi[d] - lo[d]) / m_h) + 1.0;
+          if (cells <= limit) break;
+          m_h *= 2.0;
+      }
+      for (std::size_t d = 0; d < 3; ++d) {
+          m_lo[d] = lo[d];
+          m_dims[d] = static_cast<std::size_t>(std::floor((hi[d] - lo[d]) / m_h)) + 1;
+      }
+      m_start.assign(m_dims[0] * m_dims[1] * m_dims[2] + 1, 0);
+  }
+
+  // Cell index of coordinate x along axis d, clamped to the grid
+  std::size_t axis_cell(double x, std::size_t d) const {
+      const double f = std::floor((x - m_lo[d]) / m_h);
+      if (!(f > 0)) return 0;
+      if (f >= static_cast<double>(m_dims[d] - 1)) return m_dims[d] - 1;
+      return static_cast<std::size_t>(f);
+  }
+
+  std::size_t cell_id(const double* x) const {
+      return (axis_cell(x[0], 0) * m_dims[1] + axis_cell(x[1], 1)) * m_dims[2] + axis_cell(x[2], 2);
+  }
+
+  bool inside(const double* x) const {
+      for (std::size_t d = 0; d < 3; ++d) {
+          const double f = (x[d] - m_lo[d]) / m_h;
+          if (!(f >= 0) || f >= static_cast<double>(m_dims[d])) return false;
+      }
+      return true;
+  }
+
+  // Cells overlapping the box [p - r, p + r]; false if it misses the grid
+  bool cell_range(const double* p, double r, std::array<std::size_t, 3>& lo, std::array<std::size_t, 3>& hi) const {
+      for (std::size_t d = 0; d < 3; ++d) {
+          const double a = std::floor((p[d] - r - m_lo[d]) / m_h);
+          const double b = std::floor((p[d] + r - m_lo[d]) / m_h);
+          if (b < 0 || a >= static_cast<double>(m_dims[d])) return false;
+          lo[d] = a > 0 ? static_cast<std::size_t>(a) : 0;
+          hi[d] = b < static_cast<double>(m_dims[d] - 1) ? static_cast<std::size_t>(b) : m_dims[d] - 1;
+      }
+      return true;
+  }
+
+  static std::size_t gap(std::size_t a, std::size_t b) { return a > b ? a - b : b - a; }
+
+  static double distance2(const double* a, const double* b) {
+      const double dx = a[0] - b[0], dy = a[1] - b[1], dz = a[2] - b[2];
+      return dx * dx + dy * dy + dz * dz;
+  }
+
+  void swap_slots(std::size_t s, std::size_t u) {
+      if (s == u) return;
+      std::swap(m_items[s], m_items[u]);
+      for (std::size_t d = 0; d < 3; ++d) std::swap(m_pos[3 * s + d], m_pos[3 * u + d]);
+      m_slot[static_cast<std::size_t>(m_items[s])] = s;
+      m_slot[static_cast<std::size_t>(m_items[u])] = u;
+  }
+
+  // Moves particle i into cell b: it walks to the edge of its cell, and each
+  // cell boundary it crosses shifts by one slot
+  void move(std::size_t i, std::size_t b) {
+      const std::size_t a = m_cell[i];
+      if (b > a) {
+          swap_slots(m_slot[i], m_start[a + 1] - 1);
+          for (std::size_t c = a + 1; c < b; ++c) {
+              --m_start[c];
+              swap_slots(m_slot[i], m_start[c + 1] - 1);
+          }
+          --m_start[b];
+      } else if (b < a) {
+          swap_slots(m_slot[i], m_start[a]);
+          for (std::size_t c = a; c-- > b + 1;) {
+              ++m_start[c + 1];
+              swap_slots(m_slot[i], m_start[c]);
+          }
+          ++m_start[b + 1];
+      }
+      m_cell[i] = b;
+  }
+};
+
+} // namespace cnda
@@ -0,0 +1,190 @@
+#pragma once
+#include <cnda/contiguous_nd.hpp>
+#include <cnda/gather.hpp>
+#include <cnda/layout.hpp>
+#include <cnda/parallel.hpp>
+#include <algorithm>
+#include <cstddef>
+#include <cstdint>
+#include <stdexcept>
+#include <string>
+#include <utility>
+#include <vector>
+
+namespace cnda {
+
+// Stream compaction: the row-major positions of the elements that satisfy a
+// predicate, and gather/scatter through such a list.
+//
+// Solvers that update only the fluid cells of a grid (flag == FLUID) can
+// build the list once, then work on a dense buffer of just those cells
+// instead of scanning the whole grid and branching per cell. Positions use
+// the flat int64 convention of take()/put(), so a list can be passed to
+// those as well.
+
+namespace detail {
+
+// f(pos, element) for the elements at row-major positions [begin, end)
+template <class T, class F>
+void for_each_flat(const ContiguousND<T>& a, std::size_t begin, std::size_t end, F f) {
+    const T* p = a.data();
+    std::size_t step;
+    if (even_step(a, step)) {
+        for (std::size_t i = begin; i < end; ++i) f(i, p[i * step]);
+        return;
+    }
+    MultiIndexIterator<const T> it = a.index_iterator(begin);
+    for (std::size_t i = begin; i < end; ++i, ++it) f(i, *it);
+}
+
+// f(n, element) for n in [0, k), where element is at row-major position
+// idx[n]. Positions must be in [0, a.size()).
+template <class A, class F>
+void for_each_listed(A& a, const std::int64_t* idx, std::size_t k, F f) {
+    auto* p = a.data();
+    std::size_t step;
+    if (even_step(a, step)) {
+        parallel_for(k, [&](std::size_t begin, std::size_t end) {
+            for (std::size_t n = begin; n < end; ++n) f(n, p[static_cast<std::size_t>(idx[n]) * step]);
+        });
+        return;
+    }
+    parallel_for(k, [&](std::size_t begin, std::size_t end) {
+        for (std::size_t n = begin; n < end; ++n) f(n, p[flat_offset(a, static_cast<std::size_t>(idx[n]))]);
+    });
+}
+
+} // namespace detail
+
+/**
+ * @brief Row-major positions of the elements for which pred(element) is true
+ *
+ * Two passes over the default pool: each task counts the matches in its
+ * range of positions, an exclusive prefix sum of the counts gives every task
+ * its place in the output, then each task writes its positions there. The
+ * result is in increasing order whatever the thread count.
+ */
+template <class T, class P>
+std::vector<std::int64_t> where(const ContiguousND<T>& a, P pred) {
+    const std::size_t n = a.size();
+    const std::size_t tasks = std::max<std::size_t>(1, std::min(n, parallel_task_count(n)));
+    std::vector<std::size_t> start(tasks + 1, 0);
+    parallel_tasks(tasks, [&](std::size_t t) {
+        std::size_t count = 0;
+        detail::for_each_flat(a, n * t / tasks, n * (t + 1) / tasks,
+                              [&](std::size_t, const T& x) { count += pred(x) ? 1 : 0; });
+        start[t + 1] = count;
+    });
+    for (std::size_t t = 0; t < tasks; ++t) start[t + 1] += start[t];
+
+    std::vector<std::int64_t> out(start[tasks]);
+    parallel_tasks(tasks, [&](std::size_t t) {
+        std::int64_t* o = out.data() + start[t];
+        detail::for_each_flat(a, n * t / tasks, n * (t + 1) / tasks, [&](std::size_t i, const T& x) {
+            if (pred(x)) *o++ = static_cast<std::int64_t>(i);
+        });
+    });
+    return out;
+}
+
+// Predicate for where() on cell structs: c.flag == value
+struct flag_equals {
+    std::int32_t value;
+    template <class S>
+    bool operator()(const S& c) const { return c.flag == value; }
+};
+
+/**
+ * @brief Sorted list of active positions in arrays of one shape
+ *
+ * Built with where() and kept in step with the flags through update(), which
+ * re-tests only the positions that changed. gather() copies the listed
+ * elements into a dense buffer and scatter() writes them back; both accept
+ * any array of the list's shape, including field views such as
+ * field_view<float>(cells, "u"), and run on the default pool.
+ */
+class ActiveSet {
+public:
+  ActiveSet() = default;
+
+  // Positions in a for which pred(element) is true
+  template <class T, class P>
+  ActiveSet(const ContiguousND<T>& a, P pred) : m_shape(a.shape()), m_indices(where(a, pred)) {}
+
+  // From a list of row-major positions in an array of the given shape; the
+  // list is sorted and duplicates are dropped
+  ActiveSet(const Extents& shape, std::vector<std::int64_t> indices)
+      : m_shape(shape), m_indices(std::move(indices)) {
+      check_positions(m_indices, "ActiveSet");
+      std::sort(m_indices.begin(), m_indices.end());
+      m_indices.erase(std::unique(m_indices.begin(), m_indices.end()), m_indices.end());
+  }
+
+  const Extents& shape() const noexcept { return m_shape; }
+  const std::vector<std::int64_t>& indices() const noexcept { return m_indices; }
+  std::size_t size() const noexcept { return m_indices.size(); }
+  bool empty() const noexcept { return m_indices.empty(); }
+
+  /**
+   * Re-test the positions in changed[0, k) against pred and add or drop them.
+   * The rest of the list is kept as is, so the cost is one pass over the
+   * list plus sorting the k changes, not a scan of a.
+   */
+  template <class T, class P>
+  void update(const ContiguousND<T>& a, P pred, const std::int64_t* changed, std::size_t k) {
+      check_shape(a, "update()");
+      std::vector<std::int64_t> c(changed, changed + k);
+      check_positions(c, "ActiveSet::update()");
+      std::sort(c.begin(), c.end());
+      c.erase(std::unique(c.begin(), c.end()), c.end());
+
+      const T* p = a.data();
+      std::vector<std::int64_t> out;
+      out.reserve(m_indices.size() + c.size());
+      std::size_t i = 0;
+      for (std::size_t j = 0; j < c.size(); ++j) {
+          while (i < m_indices.size() && m_indices[i] < c[j]) out.push_back(m_indices[i++]);
+          if (i < m_indices.size() && m_indices[i] == c[j]) ++i;
+          if (pred(p[detail::flat_offset(a, static_cast<std::size_t>(c[j]))])) out.push_back(c[j]);
+      }
+      out.insert(out.end(), m_indices.begin() + static_cast<std::ptrdiff_t>(i), m_indices.end());
+      m_indices.swap(out);
+  }
+
+  // out[n] = element at the n-th listed position of a; out holds size() elements
+  template <class T>
+  void gather(const ContiguousND<T>& a, T* out) const {
+      check_shape(a, "gather()");
+      detail::for_each_listed(a, m_indices.data(), m_indices.size(),
+                              [&](std::size_t n, const T& x) { out[n] = x; });
+  }
+
+  // Element at the n-th listed position of a = in[n]
+  template <class T>
+  void scatter(ContiguousND<T>& a, const T* in) const {
+      check_shape(a, "scatter()");
+      detail::for_each_listed(a, m_indices.data(), m_indices.size(),
+                              [&](std::size_t n, T& x) { x = in[n]; });
+  }
+
+private:
+  Extents m_shape;
+  std::vector<std::int64_t> m_indices;
+
+  template <class T>
+  void check_shape(const ContiguousND<T>& a, const char* who) const {
+      if (a.shape() != m_shape) throw std::invalid_argument(std::string("ActiveSet::") + who + ": shape mismatch");
+  }
+
+  void check_positions(const std::vector<std::int64_t>& idx, const char* who) const {
+      std::size_t size = 1;
+      for (std::size_t d = 0; d < m_shape.size(); ++d) size *= m_shape[d];
+      for (std::size_t n = 0; n < idx.size(); ++n) {
+          if (idx[n] < 0 || static_cast<std::size_t>(idx[n]) >= size) {
+              throw std::out_of_range(std::string(who) + ": index out of bounds");
+          }
+      }
+  }
+};
+
+} // namespace cnda
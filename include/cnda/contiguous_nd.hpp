@@ -8,22 +8,55 @@
 #include <type_traits>
 #include <array>
 #include <algorithm>
+#include <cstring>
+#include <cnda/extents.hpp>
+#include <cnda/iterator.hpp>
+#include <cnda/memory.hpp>
 
 namespace cnda {
 
+// Half-open range [start, stop) along one axis, visiting every `step`-th
+// element (step >= 1). Used to describe sub-array views.
+struct Range {
+  std::size_t start;
+  std::size_t stop;
+  std::size_t step;
+};
+
+// Memory order of a new owning array: row-major (C, the default) or
+// column-major (F, first index fastest, as in Fortran)
+enum class Order { C, F };
+
+// Rank of ContiguousND<T> (the default), which is only known at run time.
+// ContiguousND<T, N> with a compile-time rank N is in cnda/fixed_rank.hpp.
+constexpr std::size_t dynamic_rank = static_cast<std::size_t>(-1);
+
+template <class T, std::size_t N = dynamic_rank>
+class ContiguousND;
+
 template <class T>
-class ContiguousND {
+class ContiguousND<T, dynamic_rank> {
+  // Owning buffers are raw aligned memory: elements are never constructed
+  // or destroyed individually.
+  static_assert(std::is_trivially_destructible<T>::value,
+                "ContiguousND requires a trivially destructible element type");
+
+  struct uninitialized_tag {};
+
 public:
   // -------- Constructors --------
-  explicit ContiguousND(std::vector<std::size_t> shape)
-      : m_shape(std::move(shape))
+  // Owning, zero-filled buffer aligned to `alignment` bytes
+  explicit ContiguousND(Extents shape,
+                        std::size_t alignment = default_alignment,
+                        std::shared_ptr<Allocator> allocator = nullptr)
+      : ContiguousND(std::move(shape), alignment, uninitialized_tag(), std::move(allocator))
   {
-      compute_metadata();
-      m_buffer.resize(m_size);
-      m_data = m_buffer.data();
+      if (m_size > 0) {
+          std::memset(static_cast<void*>(m_data), 0, m_size * sizeof(T));
+      }
   }
 
-  ContiguousND(std::vector<std::size_t> shape,
+  ContiguousND(Extents shape,
                T* external_data,
                std::shared_ptr<void> external_owner)
       : m_shape(std::move(shape)),
@@ -33,21 +66,85 @@ public:
       compute_metadata();
   }
 
+  // Strided view: `strides` are in ELEMENTS and `external_data` points at the
+  // element with index (0, ..., 0). Sub-array views fold their base offset
+  // into the pointer and share the parent's owner.
+  ContiguousND(Extents shape,
+               Extents strides,
+               T* external_data,
+               std::shared_ptr<void> external_owner)
+      : m_shape(std::move(shape)),
+        m_strides(std::move(strides)),
+        m_data(external_data),
+        m_external_owner(std::move(external_owner))
+  {
+      if (m_strides.size() != m_shape.size()) {
+          throw std::invalid_argument("ContiguousND: strides and shape must have the same rank");
+      }
+      compute_view_metadata();
+  }
+
+  // -------- Factories for owning buffers --------
+  // Uninitialized: only pages that are touched get faulted in
+  // (a null allocator means get_default_allocator(), see memory.hpp)
+  static ContiguousND empty(Extents shape,
+                            std::size_t alignment = default_alignment,
+                            std::shared_ptr<Allocator> allocator = nullptr) {
+      return ContiguousND(std::move(shape), alignment, uninitialized_tag(), std::move(allocator));
+  }
+
+  static ContiguousND zeros(Extents shape,
+                            std::size_t alignment = default_alignment,
+                            std::shared_ptr<Allocator> allocator = nullptr) {
+      return ContiguousND(std::move(shape), alignment, std::move(allocator));
+  }
+
+  // The same, in either memory order
+  static ContiguousND empty(Extents shape, Order order,
+                            std::size_t alignment = default_alignment,
+                            std::shared_ptr<Allocator> allocator = nullptr) {
+      return ContiguousND(std::move(shape), alignment, uninitialized_tag(), std::move(allocator), order);
+  }
+
+  static ContiguousND zeros(Extents shape, Order order,
+                            std::size_t alignment = default_alignment,
+                            std::shared_ptr<Allocator> allocator = nullptr) {
+      ContiguousND out(std::move(shape), alignment, uninitialized_tag(), std::move(allocator), order);
+      if (out.m_size > 0) {
+          std::memset(static_cast<void*>(out.m_data), 0, out.m_size * sizeof(T));
+      }
+      return out;
+  }
+
+  static ContiguousND full(Extents shape, const T& value,
+                           std::size_t alignment = default_alignment,
+                           std::shared_ptr<Allocator> allocator = nullptr) {
+      ContiguousND out(std::move(shape), alignment, uninitialized_tag(), std::move(allocator));
+      std::fill(out.m_data, out.m_data + out.m_size, value);
+      return out;
+  }
+
+  static ContiguousND full(Extents shape, const T& value, Order order,
+                           std::size_t alignment = default_alignment,
+                           std::shared_ptr<Allocator> allocator = nullptr) {
+      ContiguousND out(std::move(shape), alignment, uninitialized_tag(), std::move(allocator), order);
+      std::fill(out.m_data, out.m_data + out.m_size, value);
+      return out;
+  }
+
   // -------- Move Semantics --------
+  // The buffer lives behind m_storage / m_external_owner, so moving never
+  // changes where m_data points.
   ContiguousND(ContiguousND&& other) noexcept
       : m_shape(std::move(other.m_shape)),
         m_strides(std::move(other.m_strides)),
         m_ndim(other.m_ndim),
         m_size(other.m_size),
-        m_buffer(std::move(other.m_buffer)),
+        m_contiguous(other.m_contiguous),
+        m_storage(std::move(other.m_storage)),
+        m_data(other.m_data),
         m_external_owner(std::move(other.m_external_owner))
   {
-      // Repoint m_data to the moved buffer if it was self-owned
-      if (other.m_data && !other.m_buffer.empty() && other.m_data == other.m_buffer.data()) {
-          m_data = m_buffer.data();
-      } else {
-          m_data = other.m_data;
-      }
       other.m_data = nullptr;
       other.m_ndim = 0;
       other.m_size = 0;
@@ -59,15 +156,11 @@ public:
           m_strides = std::move(other.m_strides);
           m_ndim = other.m_ndim;
           m_size = other.m_size;
-          m_buffer = std::move(other.m_buffer);
+          m_contiguous = other.m_contiguous;
+          m_storage = std::move(other.m_storage);
+          m_data = other.m_data;
           m_external_owner = std::move(other.m_external_owner);
-          
-          // Repoint m_data to the moved buffer if it was self-owned
-          if (other.m_data && !other.m_buffer.empty() && other.m_data == other.m_buffer.data()) {
-              m_data = m_buffer.data();
-          } else {
-              m_data = other.m_data;
-          }
+
           other.m_data = nullptr;
           other.m_ndim = 0;
           other.m_size = 0;
@@ -75,14 +168,22 @@ public:
       return *this;
   }
 
+  // Element-wise assignment from a lazy expression such as a + 2 * b
+  // (cnda/expr.hpp), evaluated in one pass into this array's elements
+  template <class E, class = typename E::cnda_expression>
+  ContiguousND& operator=(const E& e) {
+      e.assign_to(*this);
+      return *this;
+  }
+
   // Delete copy operations to prevent accidental expensive copies
   // Users should explicitly use clone() or similar if deep copy is needed
   ContiguousND(const ContiguousND&) = delete;
   ContiguousND& operator=(const ContiguousND&) = delete;
 
   // -------- Basic Accessors --------
-  const std::vector<std::size_t>& shape()   const noexcept { return m_shape;   }
-  const std::vector<std::size_t>& strides() const noexcept { return m_strides; }
+  const Extents& shape()   const noexcept { return m_shape;   }
+  const Extents& strides() const noexcept { return m_strides; }
   std::size_t ndim() const noexcept { return m_ndim; }
   std::size_t size() const noexcept { return m_size; }
 
@@ -91,6 +192,167 @@ public:
 
   bool is_view() const noexcept { return m_external_owner != nullptr; }
 
+  // True when the strides are the row-major ones for this shape
+  bool is_contiguous() const noexcept { return m_contiguous; }
+
+  // True when the strides are the column-major ones for this shape
+  bool is_f_contiguous() const noexcept {
+      std::size_t expected = 1;
+      for (std::size_t k = 0; k < m_ndim; ++k) {
+          if (m_shape[k] != 1 && m_strides[k] != expected) return false;
+          expected *= m_shape[k];
+      }
+      return true;
+  }
+
+  // Keeps the external buffer alive; null for arrays that own their storage
+  const std::shared_ptr<void>& owner() const noexcept { return m_external_owner; }
+
+  // Owner to hand to views of this array: the external owner or the buffer
+  std::shared_ptr<void> shared_owner() const noexcept {
+      return m_external_owner ? m_external_owner : m_storage;
+  }
+
+  // -------- Iteration --------
+  // Elements in row-major order (see cnda/iterator.hpp)
+  typedef FlatIterator<T> iterator;
+  typedef FlatIterator<const T> const_iterator;
+
+  iterator begin() { return iterator(m_data, m_shape.data(), m_strides.data(), m_ndim, m_contiguous, 0); }
+  iterator end() { return iterator(m_data, m_shape.data(), m_strides.data(), m_ndim, m_contiguous, m_size); }
+  const_iterator begin() const { return cbegin(); }
+  const_iterator end() const { return cend(); }
+  const_iterator cbegin() const {
+      return const_iterator(m_data, m_shape.data(), m_strides.data(), m_ndim, m_contiguous, 0);
+  }
+  const_iterator cend() const {
+      return const_iterator(m_data, m_shape.data(), m_strides.data(), m_ndim, m_contiguous, m_size);
+  }
+
+  // Multi-index iterator starting at row-major element `flat`
+  MultiIndexIterator<T> index_iterator(std::size_t flat = 0) {
+      return MultiIndexIterator<T>(m_data, m_shape.data(), m_strides.data(), m_ndim, flat);
+  }
+  MultiIndexIterator<const T> index_iterator(std::size_t flat = 0) const {
+      return MultiIndexIterator<const T>(m_data, m_shape.data(), m_strides.data(), m_ndim, flat);
+  }
+
+  // -------- Sub-array views --------
+  // Strided view over `ranges`, one per leading axis; trailing axes are kept
+  // whole and stops are clamped to the extent. No data is copied. The view
+  // shares this array's owner, or its buffer if the array owns one.
+  ContiguousND slice(const std::vector<Range>& ranges) {
+      return make_slice(ranges.data(), ranges.size(), shared_owner());
+  }
+  ContiguousND slice(std::initializer_list<Range> ranges) {
+      return make_slice(ranges.begin(), ranges.size(), shared_owner());
+  }
+
+  // Borrowed view: like slice() but holding no reference to the owner, so
+  // creating one neither allocates (rank <= 8) nor touches a reference
+  // count. The caller guarantees the buffer outlives it; views of a borrowed
+  // view are borrowed too.
+  ContiguousND borrow(const std::vector<Range>& ranges) {
+      return make_slice(ranges.data(), ranges.size(), std::shared_ptr<void>());
+  }
+  ContiguousND borrow(std::initializer_list<Range> ranges) {
+      return make_slice(ranges.begin(), ranges.size(), std::shared_ptr<void>());
+  }
+
+  // View with the axes reordered: axis k of the result is axis axes[k] of
+  // this array. No data is copied; the view shares this array's owner.
+  ContiguousND transpose(const std::vector<std::size_t>& axes) {
+      if (axes.size() != m_ndim) {
+          throw std::invalid_argument("transpose(): axes must name every dimension once");
+      }
+      Extents shape(m_ndim), strides(m_ndim);
+      std::vector<bool> seen(m_ndim, false);
+      for (std::size_t k = 0; k < m_ndim; ++k) {
+          if (axes[k] >= m_ndim || seen[axes[k]]) {
+              throw std::invalid_argument("transpose(): axes must name every dimension once");
+          }
+          seen[axes[k]] = true;
+          shape[k] = m_shape[axes[k]];
+          strides[k] = m_strides[axes[k]];
+      }
+      return ContiguousND(std::move(shape), std::move(strides), m_data, shared_owner());
+  }
+
+  // View with the axes reversed: the transpose of a C-ordered array is
+  // F-ordered and vice versa
+  ContiguousND transpose() {
+      Extents shape(m_shape), strides(m_strides);
+      std::reverse(shape.begin(), shape.end());
+      std::reverse(strides.begin(), strides.end());
+      return ContiguousND(std::move(shape), std::move(strides), m_data, shared_owner());
+  }
+
+  // -------- Shape changes (views, O(ndim), no data movement) --------
+  // View with a new shape of the same size. Works whenever the new shape
+  // can be expressed with strides over the existing elements in row-major
+  // order: always for contiguous arrays, and for views as long as merged
+  // axes are contiguous with each other.
+  ContiguousND reshape(const Extents& shape) {
+      std::size_t size = 1;
+      for (std::size_t d : shape) size *= d;
+      if (size != m_size) {
+          throw std::invalid_argument("reshape(): new shape must have the same number of elements");
+      }
+      Extents strides(shape.size());
+      if (!reshape_strides(shape, strides)) {
+          throw std::invalid_argument("reshape(): array cannot be reshaped without copying");
+      }
+      return ContiguousND(shape, std::move(strides), m_data, shared_owner());
+  }
+
+  // View without the axes of extent 1
+  ContiguousND squeeze() {
+      std::size_t n = 0;
+      for (std::size_t d = 0; d < m_ndim; ++d) n += m_shape[d] != 1;
+      Extents shape(n), strides(n);
+      std::size_t k = 0;
+      for (std::size_t d = 0; d < m_ndim; ++d) {
+          if (m_shape[d] != 1) {
+              shape[k] = m_shape[d];
+              strides[k++] = m_strides[d];
+          }
+      }
+      return ContiguousND(std::move(shape), std::move(strides), m_data, shared_owner());
+  }
+
+  // View without `axis`, which must have extent 1
+  ContiguousND squeeze(std::size_t axis) {
+      if (axis >= m_ndim) throw std::out_of_range("squeeze(): axis out of range");
+      if (m_shape[axis] != 1) throw std::invalid_argument("squeeze(): axis does not have extent 1");
+      Extents shape(m_ndim - 1), strides(m_ndim - 1);
+      for (std::size_t d = 0, k = 0; d < m_ndim; ++d) {
+          if (d == axis) continue;
+          shape[k] = m_shape[d];
+          strides[k++] = m_strides[d];
+      }
+      return ContiguousND(std::move(shape), std::move(strides), m_data, shared_owner());
+  }
+
+  // View with a new axis of extent 1 inserted before `axis` (0..ndim)
+  ContiguousND expand_dims(std::size_t axis) {
+      if (axis > m_ndim) throw std::out_of_range("expand_dims(): axis out of range");
+      Extents shape(m_ndim + 1), strides(m_ndim + 1);
+      for (std::size_t d = 0, k = 0; d <= m_ndim; ++d) {
+          if (d == axis) {
+              // Never stepped; chosen so contiguous arrays stay contiguous
+              shape[d] = 1;
+              strides[d] = axis < m_ndim ? m_strides[axis] * m_shape[axis] : 1;
+              continue;
+          }
+          shape[d] = m_shape[k];
+          strides[d] = m_strides[k++];
+      }
+      return ContiguousND(std::move(shape), std::move(strides), m_data, shared_owner());
+  }
+
+  // True for borrowed views (and views built without an owner)
+  bool is_borrowed() const noexcept { return !m_external_owner && !m_storage && m_data != nullptr; }
+
   // -------- Core offset computation (shared by all accessors) --------
   std::size_t compute_offset(const std::size_t* idx_array, std::size_t n, bool check_bounds) const {
       bool enforce_bounds = check_bounds;
@@ -120,8 +382,7 @@ public:
 
   // -------- initializer_list version --------
   std::size_t index(std::initializer_list<std::size_t> idxs, bool check_bounds = false) const {
-      std::vector<std::size_t> tmp(idxs.begin(), idxs.end());
-      return compute_offset(tmp.data(), tmp.size(), check_bounds);
+      return compute_offset(idxs.begin(), idxs.size(), check_bounds);
   }
 
   // -------- at() with bounds guaranteed --------
@@ -152,7 +413,7 @@ public:
       std::size_t idx1 = static_cast<std::size_t>(i1);
       if (idx0 >= m_shape[0] || idx1 >= m_shape[1]) 
           throw std::out_of_range("at(): index out of bounds");
-      return m_data[idx0 * m_shape[1] + idx1];
+      return m_data[offset_of(idx0, idx1)];
   }
   
   template <typename Index1, typename Index2>
@@ -162,7 +423,7 @@ public:
       std::size_t idx1 = static_cast<std::size_t>(i1);
       if (idx0 >= m_shape[0] || idx1 >= m_shape[1]) 
           throw std::out_of_range("at(): index out of bounds");
-      return m_data[idx0 * m_shape[1] + idx1];
+      return m_data[offset_of(idx0, idx1)];
   }
 
   // 3D at()
@@ -174,8 +435,7 @@ public:
       std::size_t idx2 = static_cast<std::size_t>(i2);
       if (idx0 >= m_shape[0] || idx1 >= m_shape[1] || idx2 >= m_shape[2]) 
           throw std::out_of_range("at(): index out of bounds");
-      const std::size_t dim2 = m_shape[2];
-      return m_data[idx0 * (m_shape[1] * dim2) + idx1 * dim2 + idx2];
+      return m_data[offset_of(idx0, idx1, idx2)];
   }
   
   template <typename Index1, typename Index2, typename Index3>
@@ -186,8 +446,7 @@ public:
       std::size_t idx2 = static_cast<std::size_t>(i2);
       if (idx0 >= m_shape[0] || idx1 >= m_shape[1] || idx2 >= m_shape[2]) 
           throw std::out_of_range("at(): index out of bounds");
-      const std::size_t dim2 = m_shape[2];
-      return m_data[idx0 * (m_shape[1] * dim2) + idx1 * dim2 + idx2];
+      return m_data[offset_of(idx0, idx1, idx2)];
   }
 
   // 4D at()
@@ -200,9 +459,7 @@ public:
       std::size_t idx3 = static_cast<std::size_t>(i3);
       if (idx0 >= m_shape[0] || idx1 >= m_shape[1] || idx2 >= m_shape[2] || idx3 >= m_shape[3]) 
           throw std::out_of_range("at(): index out of bounds");
-      const std::size_t dim2 = m_shape[2];
-      const std::size_t dim3 = m_shape[3];
-      return m_data[idx0 * (m_shape[1] * dim2 * dim3) + idx1 * (dim2 * dim3) + idx2 * dim3 + idx3];
+      return m_data[offset_of(idx0, idx1, idx2, idx3)];
   }
   
   template <typename Index1, typename Index2, typename Index3, typename Index4>
@@ -214,9 +471,7 @@ public:
       std::size_t idx3 = static_cast<std::size_t>(i3);
       if (idx0 >= m_shape[0] || idx1 >= m_shape[1] || idx2 >= m_shape[2] || idx3 >= m_shape[3]) 
           throw std::out_of_range("at(): index out of bounds");
-      const std::size_t dim2 = m_shape[2];
-      const std::size_t dim3 = m_shape[3];
-      return m_data[idx0 * (m_shape[1] * dim2 * dim3) + idx1 * (dim2 * dim3) + idx2 * dim3 + idx3];
+      return m_data[offset_of(idx0, idx1, idx2, idx3)];
   }
 
   // Legacy initializer_list at() for backward compatibility
@@ -262,11 +517,10 @@ public:
       std::size_t idx1 = static_cast<std::size_t>(i1);
       if (idx0 >= m_shape[0] || idx1 >= m_shape[1]) 
           throw std::out_of_range("operator(): index out of bounds");
-      return m_data[idx0 * m_shape[1] + idx1];
+      return m_data[offset_of(idx0, idx1)];
 #else
-      // Optimized: For row-major 2D, stride[0]=shape[1], stride[1]=1
-      return m_data[static_cast<std::size_t>(i0) * m_shape[1] + 
-                    static_cast<std::size_t>(i1)];
+      return m_data[offset_of(static_cast<std::size_t>(i0),
+                              static_cast<std::size_t>(i1))];
 #endif
   }
   
@@ -278,11 +532,10 @@ public:
       std::size_t idx1 = static_cast<std::size_t>(i1);
       if (idx0 >= m_shape[0] || idx1 >= m_shape[1]) 
           throw std::out_of_range("operator(): index out of bounds");
-      return m_data[idx0 * m_shape[1] + idx1];
+      return m_data[offset_of(idx0, idx1)];
 #else
-      // Optimized: For row-major 2D, stride[0]=shape[1], stride[1]=1
-      return m_data[static_cast<std::size_t>(i0) * m_shape[1] + 
-                    static_cast<std::size_t>(i1)];
+      return m_data[offset_of(static_cast<std::size_t>(i0),
+                              static_cast<std::size_t>(i1))];
 #endif
   }
   
@@ -296,14 +549,11 @@ public:
       std::size_t idx2 = static_cast<std::size_t>(i2);
       if (idx0 >= m_shape[0] || idx1 >= m_shape[1] || idx2 >= m_shape[2]) 
           throw std::out_of_range("operator(): index out of bounds");
-      const std::size_t dim2 = m_shape[2];
-      return m_data[idx0 * (m_shape[1] * dim2) + idx1 * dim2 + idx2];
+      return m_data[offset_of(idx0, idx1, idx2)];
 #else
-      // Optimized: For row-major 3D, stride[0]=shape[1]*shape[2], stride[1]=shape[2], stride[2]=1
-      const std::size_t dim2 = m_shape[2];
-      return m_data[static_cast<std::size_t>(i0) * (m_shape[1] * dim2) + 
-                    static_cast<std::size_t>(i1) * dim2 +
-                    static_cast<std::size_t>(i2)];
+      return m_data[offset_of(static_cast<std::size_t>(i0),
+                              static_cast<std::size_t>(i1),
+                              static_cast<std::size_t>(i2))];
 #endif
   }
   
@@ -316,14 +566,11 @@ public:
       std::size_t idx2 = static_cast<std::size_t>(i2);
       if (idx0 >= m_shape[0] || idx1 >= m_shape[1] || idx2 >= m_shape[2]) 
           throw std::out_of_range("operator(): index out of bounds");
-      const std::size_t dim2 = m_shape[2];
-      return m_data[idx0 * (m_shape[1] * dim2) + idx1 * dim2 + idx2];
+      return m_data[offset_of(idx0, idx1, idx2)];
 #else
-      // Optimized: For row-major 3D, stride[0]=shape[1]*shape[2], stride[1]=shape[2], stride[2]=1
-      const std::size_t dim2 = m_shape[2];
-      return m_data[static_cast<std::size_t>(i0) * (m_shape[1] * dim2) + 
-                    static_cast<std::size_t>(i1) * dim2 +
-                    static_cast<std::size_t>(i2)];
+      return m_data[offset_of(static_cast<std::size_t>(i0),
+                              static_cast<std::size_t>(i1),
+                              static_cast<std::size_t>(i2))];
 #endif
   }
   
@@ -338,17 +585,12 @@ public:
       std::size_t idx3 = static_cast<std::size_t>(i3);
       if (idx0 >= m_shape[0] || idx1 >= m_shape[1] || idx2 >= m_shape[2] || idx3 >= m_shape[3]) 
           throw std::out_of_range("operator(): index out of bounds");
-      const std::size_t dim2 = m_shape[2];
-      const std::size_t dim3 = m_shape[3];
-      return m_data[idx0 * (m_shape[1] * dim2 * dim3) + idx1 * (dim2 * dim3) + idx2 * dim3 + idx3];
+      return m_data[offset_of(idx0, idx1, idx2, idx3)];
 #else
-      // Optimized: Direct calculation eliminates strides array access
-      const std::size_t dim2 = m_shape[2];
-      const std::size_t dim3 = m_shape[3];
-      return m_data[static_cast<std::size_t>(i0) * (m_shape[1] * dim2 * dim3) + 
-                    static_cast<std::size_t>(i1) * (dim2 * dim3) +
-                    static_cast<std::size_t>(i2) * dim3 +
-                    static_cast<std::size_t>(i3)];
+      return m_data[offset_of(static_cast<std::size_t>(i0),
+                              static_cast<std::size_t>(i1),
+                              static_cast<std::size_t>(i2),
+                              static_cast<std::size_t>(i3))];
 #endif
   }
   
@@ -362,17 +604,12 @@ public:
       std::size_t idx3 = static_cast<std::size_t>(i3);
       if (idx0 >= m_shape[0] || idx1 >= m_shape[1] || idx2 >= m_shape[2] || idx3 >= m_shape[3]) 
           throw std::out_of_range("operator(): index out of bounds");
-      const std::size_t dim2 = m_shape[2];
-      const std::size_t dim3 = m_shape[3];
-      return m_data[idx0 * (m_shape[1] * dim2 * dim3) + idx1 * (dim2 * dim3) + idx2 * dim3 + idx3];
+      return m_data[offset_of(idx0, idx1, idx2, idx3)];
 #else
-      // Optimized: Direct calculation eliminates strides array access
-      const std::size_t dim2 = m_shape[2];
-      const std::size_t dim3 = m_shape[3];
-      return m_data[static_cast<std::size_t>(i0) * (m_shape[1] * dim2 * dim3) + 
-                    static_cast<std::size_t>(i1) * (dim2 * dim3) +
-                    static_cast<std::size_t>(i2) * dim3 +
-                    static_cast<std::size_t>(i3)];
+      return m_data[offset_of(static_cast<std::size_t>(i0),
+                              static_cast<std::size_t>(i1),
+                              static_cast<std::size_t>(i2),
+                              static_cast<std::size_t>(i3))];
 #endif
   }
 
@@ -404,15 +641,125 @@ public:
   }
 
 private:
-  std::vector<std::size_t> m_shape;
-  std::vector<std::size_t> m_strides;  // stride in ELEMENTS
+  Extents m_shape;
+  Extents m_strides;  // stride in ELEMENTS
   std::size_t m_ndim = 0;
   std::size_t m_size = 0;
+  bool m_contiguous = true;
 
-  std::vector<T> m_buffer;
+  std::shared_ptr<void> m_storage;  // aligned buffer of owning arrays
   T* m_data = nullptr;
   std::shared_ptr<void> m_external_owner;
 
+  ContiguousND(Extents shape, std::size_t alignment, uninitialized_tag,
+               std::shared_ptr<Allocator> allocator, Order order = Order::C)
+      : m_shape(std::move(shape))
+  {
+      compute_metadata();
+      if (order == Order::F) {
+          std::size_t step = 1;
+          for (std::size_t k = 0; k < m_ndim; ++k) {
+              m_strides[k] = step;
+              step *= m_shape[k];
+          }
+          compute_view_metadata();
+      }
+      if (alignment < alignof(T)) {
+          alignment = alignof(T);
+      }
+      m_storage = detail::allocate_buffer(m_size * sizeof(T), alignment, std::move(allocator));
+      m_data = static_cast<T*>(m_storage.get());
+  }
+
+  ContiguousND make_slice(const Range* ranges, std::size_t n, std::shared_ptr<void> owner) {
+      if (n > m_ndim) {
+          throw std::out_of_range("slice(): more ranges than dimensions");
+      }
+      Extents shape(m_shape);
+      Extents strides(m_strides);
+      std::size_t off = 0;
+      for (std::size_t d = 0; d < n; ++d) {
+          const Range& r = ranges[d];
+          if (r.step == 0) {
+              throw std::invalid_argument("slice(): step must be positive");
+          }
+          const std::size_t stop = std::min(r.stop, m_shape[d]);
+          const std::size_t start = std::min(r.start, stop);
+          shape[d] = (stop - start + r.step - 1) / r.step;
+          strides[d] = m_strides[d] * r.step;
+          off += start * m_strides[d];
+      }
+      return ContiguousND(std::move(shape), std::move(strides), m_data + off, std::move(owner));
+  }
+
+  // Strides that walk this array's elements in row-major order with
+  // `shape` (same size), or false if there are none. Runs of old axes are
+  // matched with runs of new axes of the same total extent; each old run
+  // must be contiguous within itself (NumPy's no-copy reshape rule).
+  bool reshape_strides(const Extents& shape, Extents& strides) const {
+      if (m_size == 0 || m_contiguous) {
+          std::size_t step = 1;
+          for (std::size_t k = shape.size(); k-- > 0;) {
+              strides[k] = step;
+              step *= shape[k];
+          }
+          return true;
+      }
+      // Old axes of extent 1 never step: leave them out
+      std::size_t n = 0;
+      for (std::size_t d = 0; d < m_ndim; ++d) n += m_shape[d] != 1;
+      Extents old_shape(n), old_strides(n);
+      for (std::size_t d = 0, k = 0; d < m_ndim; ++d) {
+          if (m_shape[d] == 1) continue;
+          old_shape[k] = m_shape[d];
+          old_strides[k++] = m_strides[d];
+      }
+      const std::size_t new_nd = shape.size();
+      std::size_t oi = 0, oj = 1, ni = 0, nj = 1;
+      while (ni < new_nd && oi < n) {
+          std::size_t np = shape[ni], op = old_shape[oi];
+          while (np != op) {
+              if (np < op) np *= shape[nj++];
+              else op *= old_shape[oj++];
+          }
+          for (std::size_t ok = oi; ok + 1 < oj; ++ok) {
+              if (old_strides[ok] != old_shape[ok + 1] * old_strides[ok + 1]) return false;
+          }
+          strides[nj - 1] = old_strides[oj - 1];
+          for (std::size_t nk = nj - 1; nk > ni; --nk) strides[nk - 1] = strides[nk] * shape[nk];
+          ni = nj++;
+          oi = oj++;
+      }
+      // Trailing new axes have extent 1
+      const std::size_t last = ni > 0 ? strides[ni - 1] : 1;
+      for (std::size_t nk = ni; nk < new_nd; ++nk) strides[nk] = last;
+      return true;
+  }
+
+  // Rank-specialized offsets used by the 2D-4D accessors. Contiguous arrays
+  // keep the row-major form on m_shape; only strided views read m_strides.
+  std::size_t offset_of(std::size_t i0, std::size_t i1) const noexcept {
+      if (m_contiguous) return i0 * m_shape[1] + i1;
+      return i0 * m_strides[0] + i1 * m_strides[1];
+  }
+
+  std::size_t offset_of(std::size_t i0, std::size_t i1, std::size_t i2) const noexcept {
+      if (m_contiguous) {
+          const std::size_t dim2 = m_shape[2];
+          return i0 * (m_shape[1] * dim2) + i1 * dim2 + i2;
+      }
+      return i0 * m_strides[0] + i1 * m_strides[1] + i2 * m_strides[2];
+  }
+
+  std::size_t offset_of(std::size_t i0, std::size_t i1, std::size_t i2, std::size_t i3) const noexcept {
+      if (m_contiguous) {
+          const std::size_t dim2 = m_shape[2];
+          const std::size_t dim3 = m_shape[3];
+          return i0 * (m_shape[1] * dim2 * dim3) + i1 * (dim2 * dim3) + i2 * dim3 + i3;
+      }
+      return i0 * m_strides[0] + i1 * m_strides[1] + i2 * m_strides[2] + i3 * m_strides[3];
+  }
+
   void compute_metadata() noexcept {
       m_ndim = m_shape.size();
       m_size = 1;
@@ -428,7 +775,42 @@ private:
               m_strides[k - 1] = m_strides[k] * m_shape[k];
           }
       }
+      m_contiguous = true;
+  }
+
+  // Size and contiguity for caller-supplied strides. Axes of extent 1 never
+  // step, so their stride does not affect contiguity.
+  void compute_view_metadata() noexcept {
+      m_ndim = m_shape.size();
+      m_size = 1;
+      for (std::size_t d : m_shape) {
+          m_size *= d;
+      }
+
+      m_contiguous = true;
+      std::size_t expected = 1;
+      for (std::size_t k = m_ndim; k-- > 0; ) {
+          if (m_shape[k] != 1 && m_strides[k] != expected) {
+              m_contiguous = false;
+          }
+          expected *= m_shape[k];
+      }
   }
 };
 
+// f(index, element) for every element in row-major order, where index is
+// the multi-index as a const std::vector<std::size_t>&. The innermost axis
+// is walked with a pointer increment; outer axes carry with additions.
+template <class T, class F>
+void for_each_index(ContiguousND<T>& a, F f) {
+    if (a.size() == 0) return;
+    detail::for_each_index(a.data(), a.shape().data(), a.strides().data(), a.ndim(), f);
+}
+
+template <class T, class F>
+void for_each_index(const ContiguousND<T>& a, F f) {
+    if (a.size() == 0) return;
+    detail::for_each_index(a.data(), a.shape().data(), a.strides().data(), a.ndim(), f);
+}
+
 } // namespace cnda
@@ -0,0 +1,767 @@
+#pragma once
+#include <cnda/contiguous_nd.hpp>
+#include <cnda/parallel.hpp>
+#include <algorithm>
+#include <cctype>
+#include <cstddef>
+#include <locale>
+#include <sstream>
+#include <stdexcept>
+#include <string>
+#include <type_traits>
+#include <vector>
+
+namespace cnda {
+
+// Lazy element-wise arithmetic over ContiguousND.
+//
+// +, -, * and / on arrays (and on scalars mixed with arrays) build an
+// expression tree instead of computing anything; assigning the tree to an
+// array evaluates every element in one pass, with no temporary arrays:
+//
+//     u = u + dt * (a * b - c);
+//
+// Operands broadcast as in NumPy (shapes aligned on the right, extents equal
+// or 1), and the result must broadcast to the destination's shape. When all
+// operands are contiguous with the destination's shape the pass is a flat
+// loop the compiler can vectorize; otherwise it walks rows of the
+// destination. Either way it is split across the default thread pool (see
+// parallel.hpp). The destination may appear among the operands, but must
+// not partially overlap any of them.
+//
+// expr::Program is the run-time counterpart: the same arithmetic parsed from
+// a string and evaluated in blocks that stay in L1.
+
+namespace expr {
+
+inline std::string shape_str(const Extents& s) {
+    std::string out = "(";
+    for (std::size_t d = 0; d < s.size(); ++d) {
+        if (d > 0) out += ", ";
+        out += std::to_string(s[d]);
+    }
+    return out + (s.size() == 1 ? ",)" : ")");
+}
+
+// Shape of a op b under NumPy broadcasting
+inline Extents broadcast(const Extents& a, const Extents& b) {
+    const std::size_t n = std::max(a.size(), b.size());
+    Extents out(n);
+    for (std::size_t k = 0; k < n; ++k) {
+        const std::size_t x = k < n - a.size() ? 1 : a[k - (n - a.size())];
+        const std::size_t y = k < n - b.size() ? 1 : b[k - (n - b.size())];
+        if (x != y && x != 1 && y != 1) {
+            throw std::invalid_argument("expression: shapes " + shape_str(a) + " and " + shape_str(b) +
+                                        " cannot be broadcast together");
+        }
+        out[k] = x == 1 ? y : x;
+    }
+    return out;
+}
+
+// Strides that walk an operand of `shape` / `strides` over every index of
+// `out`: 0 along axes it is broadcast over
+inline Extents broadcast_strides(const Extents& shape, const Extents& strides, const Extents& out) {
+    if (shape.size() > out.size()) {
+        throw std::invalid_argument("expression: operand of shape " + shape_str(shape) +
+                                    " cannot be broadcast to " + shape_str(out));
+    }
+    const std::size_t lead = out.size() - shape.size();
+    Extents result(out.size(), 0);
+    for (std::size_t d = 0; d < shape.size(); ++d) {
+        if (shape[d] == out[lead + d]) {
+            result[lead + d] = strides[d];
+        } else if (shape[d] != 1) {
+            throw std::invalid_argument("expression: operand of shape " + shape_str(shape) +
+                                        " cannot be broadcast to " + shape_str(out));
+        }
+    }
+    return result;
+}
+
+namespace detail {
+
+// g(idx, col, len) for the runs of row-major positions [begin, end) of
+// `shape` (rank >= 1) that lie in one row: idx is the index along all but
+// the last axis and the run covers columns [col, col + len)
+template <class G>
+void for_each_run(const Extents& shape, std::size_t begin, std::size_t end, G g) {
+    const std::size_t r = shape.size();
+    const std::size_t width = shape[r - 1];
+    Extents idx(r - 1);
+    std::size_t row = begin / width, col = begin % width;
+    for (std::size_t pos = begin; pos < end; ++row, col = 0) {
+        std::size_t rest = row;
+        for (std::size_t k = r - 1; k-- > 0;) {
+            idx[k] = rest % shape[k];
+            rest /= shape[k];
+        }
+        const std::size_t len = std::min(width - col, end - pos);
+        g(idx.data(), col, len);
+        pos += len;
+    }
+}
+
+} // namespace detail
+
+// -------- Expression nodes --------
+// Every node has a value_type, a shape(), and can be bound to the shape it
+// is evaluated over: bind(shape) (or bind_flat() when flat(shape) says all
+// its arrays are contiguous with that shape) gives a Bound whose
+// row(idx, col) is an indexable Row starting at column col of row idx.
+
+template <class T, class E>
+void assign(ContiguousND<T>& dst, const E& e);
+
+// An array operand
+template <class T>
+class Leaf {
+public:
+  typedef void cnda_expression;
+  typedef T value_type;
+
+  explicit Leaf(const ContiguousND<T>& a)
+      : m_data(a.data()), m_shape(a.shape()), m_strides(a.strides()), m_contiguous(a.is_contiguous()) {}
+
+  struct Row {
+      const T* p;
+      std::size_t step;
+      T operator[](std::size_t i) const { return p[i * step]; }
+  };
+
+  struct FlatRow {
+      const T* p;
+      T operator[](std::size_t i) const { return p[i]; }
+  };
+
+  struct Bound {
+      const T* data;
+      Extents strides;
+      Row row(const std::size_t* idx, std::size_t col) const {
+          const std::size_t last = strides.size() - 1;
+          std::size_t off = col * strides[last];
+          for (std::size_t d = 0; d < last; ++d) off += idx[d] * strides[d];
+          return Row{data + off, strides[last]};
+      }
+  };
+
+  struct FlatBound {
+      const T* data;
+      FlatRow row(std::size_t col) const { return FlatRow{data + col}; }
+  };
+
+  const Extents& shape() const noexcept { return m_shape; }
+  bool flat(const Extents& out) const noexcept { return m_contiguous && m_shape == out; }
+  Bound bind(const Extents& out) const { return Bound{m_data, broadcast_strides(m_shape, m_strides, out)}; }
+  FlatBound bind_flat() const { return FlatBound{m_data}; }
+
+  template <class U>
+  void assign_to(ContiguousND<U>& dst) const { assign(dst, *this); }
+
+private:
+  const T* m_data;
+  Extents m_shape;
+  Extents m_strides;
+  bool m_contiguous;
+};
+
+// A scalar operand, broadcast to every element
+template <class S>
+class Scalar {
+public:
+  typedef void cnda_expression;
+  typedef S value_type;
+
+  explicit Scalar(S value) : m_value(value) {}
+
+  struct Row {
+      S value;
+      S operator[](std::size_t) const { return value; }
+  };
+
+  struct Bound {
+      S value;
+      Row row(const std::size_t*, std::size_t) const { return Row{value}; }
+      Row row(std::size_t) const { return Row{value}; }
+  };
+  typedef Bound FlatBound;
+
+  const Extents& shape() const noexcept { return m_shape; }
+  bool flat(const Extents&) const noexcept { return true; }
+  Bound bind(const Extents&) const { return Bound{m_value}; }
+  FlatBound bind_flat() const { return Bound{m_value}; }
+
+  template <class U>
+  void assign_to(ContiguousND<U>& dst) const { assign(dst, *this); }
+
+private:
+  S m_value;
+  Extents m_shape;  // rank 0
+};
+
+struct Add { template <class V> static V apply(V a, V b) { return a + b; } };
+struct Sub { template <class V> static V apply(V a, V b) { return a - b; } };
+struct Mul { template <class V> static V apply(V a, V b) { return a * b; } };
+struct Div { template <class V> static V apply(V a, V b) { return a / b; } };
+
+// l op r, computed in the common type of the operands
+template <class Op, class L, class R>
+class Binary {
+public:
+  typedef void cnda_expression;
+  typedef typename std::common_type<typename L::value_type, typename R::value_type>::type value_type;
+
+  Binary(const L& l, const R& r) : m_l(l), m_r(r), m_shape(broadcast(l.shape(), r.shape())) {}
+
+  template <class LR, class RR>
+  struct RowOf {
+      LR l;
+      RR r;
+      value_type operator[](std::size_t i) const {
+          return Op::template apply<value_type>(static_cast<value_type>(l[i]), static_cast<value_type>(r[i]));
+      }
+  };
+  typedef RowOf<typename L::Row, typename R::Row> Row;
+  typedef RowOf<decltype(std::declval<typename L::FlatBound>().row(0)),
+                decltype(std::declval<typename R::FlatBound>().row(0))> FlatRow;
+
+  struct Bound {
+      typename L::Bound l;
+      typename R::Bound r;
+      Row row(const std::size_t* idx, std::size_t col) const { return Row{l.row(idx, col), r.row(idx, col)}; }
+  };
+
+  struct FlatBound {
+      typename L::FlatBound l;
+      typename R::FlatBound r;
+      FlatRow row(std::size_t col) const { return FlatRow{l.row(col), r.row(col)}; }
+  };
+
+  const Extents& shape() const noexcept { return m_shape; }
+  bool flat(const Extents& out) const noexcept { return m_l.flat(out) && m_r.flat(out); }
+  Bound bind(const Extents& out) const { return Bound{m_l.bind(out), m_r.bind(out)}; }
+  FlatBound bind_flat() const { return FlatBound{m_l.bind_flat(), m_r.bind_flat()}; }
+
+  template <class U>
+  void assign_to(ContiguousND<U>& dst) const { assign(dst, *this); }
+
+private:
+  L m_l;
+  R m_r;
+  Extents m_shape;
+};
+
+// -e
+template <class E>
+class Negate {
+public:
+  typedef void cnda_expression;
+  typedef typename E::value_type value_type;
+
+  explicit Negate(const E& e) : m_e(e) {}
+
+  template <class ER>
+  struct RowOf {
+      ER e;
+      value_type operator[](std::size_t i) const { return -e[i]; }
+  };
+  typedef RowOf<typename E::Row> Row;
+  typedef RowOf<decltype(std::declval<typename E::FlatBound>().row(0))> FlatRow;
+
+  struct Bound {
+      typename E::Bound e;
+      Row row(const std::size_t* idx, std::size_t col) const { return Row{e.row(idx, col)}; }
+  };
+
+  struct FlatBound {
+      typename E::FlatBound e;
+      FlatRow row(std::size_t col) const { return FlatRow{e.row(col)}; }
+  };
+
+  const Extents& shape() const noexcept { return m_e.shape(); }
+  bool flat(const Extents& out) const noexcept { return m_e.flat(out); }
+  Bound bind(const Extents& out) const { return Bound{m_e.bind(out)}; }
+  FlatBound bind_flat() const { return FlatBound{m_e.bind_flat()}; }
+
+  template <class U>
+  void assign_to(ContiguousND<U>& dst) const { assign(dst, *this); }
+
+private:
+  E m_e;
+};
+
+// -------- Operands --------
+// operand<X>::type is the node for an array, a node, or an arithmetic
+// scalar; other types have no operand<X>::type
+
+template <class X, class Enable = void>
+struct operand {};
+
+template <class T>
+struct operand<ContiguousND<T>, void> {
+    typedef Leaf<T> type;
+    static type make(const ContiguousND<T>& a) { return type(a); }
+};
+
+template <class E>
+struct operand<E, typename E::cnda_expression> {
+    typedef E type;
+    static const E& make(const E& e) { return e; }
+};
+
+template <class S>
+struct operand<S, typename std::enable_if<std::is_arithmetic<S>::value>::type> {
+    typedef Scalar<S> type;
+    static type make(S s) { return type(s); }
+};
+
+template <class>
+struct always_void { typedef void type; };
+
+template <class X, class = void>
+struct is_operand : std::false_type {};
+
+template <class X>
+struct is_operand<X, typename always_void<typename operand<X>::type>::type> : std::true_type {};
+
+// Node for a op b, when both sides are operands and at least one of them
+// is an array or a node
+template <class Op, class A, class B,
+          bool = is_operand<A>::value && is_operand<B>::value &&
+                 (!std::is_arithmetic<A>::value || !std::is_arithmetic<B>::value)>
+struct binary_result {};
+
+template <class Op, class A, class B>
+struct binary_result<Op, A, B, true> {
+    typedef Binary<Op, typename operand<A>::type, typename operand<B>::type> type;
+};
+
+template <class A, class B>
+typename binary_result<Add, A, B>::type operator+(const A& a, const B& b) {
+    return typename binary_result<Add, A, B>::type(operand<A>::make(a), operand<B>::make(b));
+}
+
+template <class A, class B>
+typename binary_result<Sub, A, B>::type operator-(const A& a, const B& b) {
+    return typename binary_result<Sub, A, B>::type(operand<A>::make(a), operand<B>::make(b));
+}
+
+template <class A, class B>
+typename binary_result<Mul, A, B>::type operator*(const A& a, const B& b) {
+    return typename binary_result<Mul, A, B>::type(operand<A>::make(a), operand<B>::make(b));
+}
+
+template <class A, class B>
+typename binary_result<Div, A, B>::type operator/(const A& a, const B& b) {
+    return typename binary_result<Div, A, B>::type(operand<A>::make(a), operand<B>::make(b));
+}
+
+template <class A>
+typename std::enable_if<!std::is_arithmetic<A>::value, Negate<typename operand<A>::type>>::type
+operator-(const A& a) {
+    return Negate<typename operand<A>::type>(operand<A>::make(a));
+}
+
+// dst op= b, in one pass like dst = dst op b
+template <class T, class B>
+typename std::enable_if<is_operand<B>::value, ContiguousND<T>&>::type
+operator+=(ContiguousND<T>& dst, const B& b) {
+    assign(dst, Binary<Add, Leaf<T>, typename operand<B>::type>(Leaf<T>(dst), operand<B>::make(b)));
+    return dst;
+}
+
+template <class T, class B>
+typename std::enable_if<is_operand<B>::value, ContiguousND<T>&>::type
+operator-=(ContiguousND<T>& dst, const B& b) {
+    assign(dst, Binary<Sub, Leaf<T>, typename operand<B>::type>(Leaf<T>(dst), operand<B>::make(b)));
+    return dst;
+}
+
+template <class T, class B>
+typename std::enable_if<is_operand<B>::value, ContiguousND<T>&>::type
+operator*=(ContiguousND<T>& dst, const B& b) {
+    assign(dst, Binary<Mul, Leaf<T>, typename operand<B>::type>(Leaf<T>(dst), operand<B>::make(b)));
+    return dst;
+}
+
+template <class T, class B>
+typename std::enable_if<is_operand<B>::value, ContiguousND<T>&>::type
+operator/=(ContiguousND<T>& dst, const B& b) {
+    assign(dst, Binary<Div, Leaf<T>, typename operand<B>::type>(Leaf<T>(dst), operand<B>::make(b)));
+    return dst;
+}
+
+// -------- Evaluation --------
+
+// dst = e element by element (converted with static_cast), in one pass
+template <class T, class E>
+void assign(ContiguousND<T>& dst, const E& e) {
+    const Extents& out = dst.shape();
+    if (broadcast(e.shape(), out) != out) {
+        throw std::invalid_argument("expression: result of shape " + shape_str(e.shape()) +
+                                    " cannot be assigned to an array of shape " + shape_str(out));
+    }
+    T* d = dst.data();
+    if (dst.is_contiguous() && e.flat(out)) {
+        const typename E::FlatBound b = e.bind_flat();
+        parallel_for(dst.size(), [&](std::size_t begin, std::size_t end) {
+            const auto r = b.row(begin);
+            T* p = d + begin;
+            const std::size_t n = end - begin;
+            for (std::size_t i = 0; i < n; ++i) p[i] = static_cast<T>(r[i]);
+        });
+        return;
+    }
+    // Rank 0 is evaluated as a single element of rank 1
+    const Extents shape = out.empty() ? Extents{1} : out;
+    const Extents strides = out.empty() ? Extents{0} : dst.strides();
+    const typename E::Bound b = e.bind(shape);
+    const std::size_t last = shape.size() - 1;
+    parallel_for(dst.size(), [&](std::size_t begin, std::size_t end) {
+        detail::for_each_run(shape, begin, end, [&](const std::size_t* idx, std::size_t col, std::size_t len) {
+            std::size_t off = col * strides[last];
+            for (std::size_t k = 0; k < last; ++k) off += idx[k] * strides[k];
+            T* p = d + off;
+            const std::size_t step = strides[last];
+            const typename E::Row r = b.row(idx, col);
+            for (std::size_t i = 0; i < len; ++i) p[i * step] = static_cast<T>(r[i]);
+        });
+    });
+}
+
+// New owning array holding the value of e
+template <class E>
+ContiguousND<typename E::value_type> evaluate(const E& e) {
+    ContiguousND<typename E::value_type> out = ContiguousND<typename E::value_type>::empty(e.shape());
+    assign(out, e);
+    return out;
+}
+
+// -------- Run-time expressions --------
+
+// Operand of a Program: an array, or a scalar when `array` is null
+template <class T>
+struct ProgramOperand {
+    const ContiguousND<T>* array;
+    T scalar;
+};
+
+/**
+ * @brief Arithmetic expression parsed at run time
+ *
+ * Accepts numbers, operand names, + - * /, unary minus and parentheses with
+ * the usual precedence, e.g. "u + dt*(a*b - c)". The source is compiled
+ * once into postfix code; run() evaluates it over arrays that broadcast to
+ * the output's shape in a single pass. Each thread works through its part
+ * of the output in blocks of `block` elements, keeping every intermediate
+ * result of a block in a small buffer, so only the operands are read and
+ * only the output is written.
+ */
+class Program {
+public:
+  static const std::size_t block = 256;
+
+  explicit Program(const std::string& source) : m_source(source), m_pos(0) {
+      parse_sum();
+      skip_space();
+      if (m_pos != m_source.size()) fail("unexpected '" + std::string(1, m_source[m_pos]) + "'");
+      std::size_t depth = 0;
+      for (const Instr& in : m_code) {
+          if (in.code == load || in.code == constant) {
+              m_depth = std::max(m_depth, ++depth);
+          } else if (in.code != negate) {
+              --depth;
+          }
+      }
+  }
+
+  const std::string& source() const noexcept { return m_source; }
+
+  // Operand names in order of first use; run() takes one operand per name
+  const std::vector<std::string>& names() const noexcept { return m_names; }
+
+  // out = the expression, with operands[k] bound to names()[k]. Every array
+  // must broadcast to out's shape and must not partially overlap out.
+  template <class T>
+  void run(ContiguousND<T>& out, const std::vector<ProgramOperand<T>>& operands) const {
+      if (operands.size() != m_names.size()) {
+          throw std::invalid_argument("expression: expected " + std::to_string(m_names.size()) + " operands");
+      }
+      const Extents shape = out.ndim() == 0 ? Extents{1} : out.shape();
+      const Extents out_strides = out.ndim() == 0 ? Extents{0} : out.strides();
+      std::vector<Extents> strides(operands.size());
+      for (std::size_t k = 0; k < operands.size(); ++k) {
+          const ContiguousND<T>* a = operands[k].array;
+          if (a) strides[k] = broadcast_strides(a->shape(), a->strides(), shape);
+      }
+      const std::size_t last = shape.size() - 1;
+      T* d = out.data();
+      parallel_for(out.size(), [&](std::size_t begin, std::size_t end) {
+          std::vector<T> scratch(m_depth * block);
+          std::vector<Value<T>> stack(m_depth);
+          std::vector<const T*> base(operands.size());
+          detail::for_each_run(shape, begin, end, [&](const std::size_t* idx, std::size_t col, std::size_t len) {
+              for (std::size_t k = 0; k < operands.size(); ++k) {
+                  if (!operands[k].array) continue;
+                  std::size_t off = col * strides[k][last];
+                  for (std::size_t j = 0; j < last; ++j) off += idx[j] * strides[k][j];
+                  base[k] = operands[k].array->data() + off;
+              }
+              std::size_t off = col * out_strides[last];
+              for (std::size_t j = 0; j < last; ++j) off += idx[j] * out_strides[j];
+              const std::size_t step = out_strides[last];
+              for (std::size_t b0 = 0; b0 < len; b0 += block) {
+                  const std::size_t n = len - b0 < block ? len - b0 : block;
+                  const Value<T> v = execute(scratch.data(), stack.data(), operands, base, strides, last, b0, n);
+                  T* p = d + off + b0 * step;
+                  if (v.data) {
+                      const T* r = v.data;
+                      for (std::size_t i = 0; i < n; ++i) p[i * step] = r[i];
+                  } else {
+                      for (std::size_t i = 0; i < n; ++i) p[i * step] = v.scalar;
+                  }
+              }
+          });
+      });
+  }
+
+private:
+  enum Code { load, constant, add, subtract, multiply, divide, negate };
+
+  struct Instr {
+      Code code;
+      std::size_t index;  // operand, for load
+      double value;       // for constant
+  };
+
+  std::string m_source;
+  std::size_t m_pos;
+  std::vector<Instr> m_code;
+  std::vector<std::string> m_names;
+  std::size_t m_depth = 0;
+
+  // A value on the evaluation stack: n elements at `data`, or `scalar`
+  // repeated when data is null. data points into an operand when it can be
+  // read in place, and into the slot's scratch block otherwise.
+  template <class T>
+  struct Value {
+      const T* data;
+      T scalar;
+  };
+
+  // Value of elements [b0, b0 + n) of the current run; stack slot k owns
+  // scratch[k * block, (k + 1) * block)
+  template <class T>
+  Value<T> execute(T* scratch, Value<T>* stack, const std::vector<ProgramOperand<T>>& operands,
+                   const std::vector<const T*>& base, const std::vector<Extents>& strides,
+                   std::size_t last, std::size_t b0, std::size_t n) const {
+      std::size_t sp = 0;
+      for (const Instr& in : m_code) {
+          switch (in.code) {
+          case load: {
+              const ProgramOperand<T>& op = operands[in.index];
+              const std::size_t step = op.array ? strides[in.index][last] : 0;
+              if (!op.array) {
+                  stack[sp] = Value<T>{nullptr, op.scalar};
+              } else if (step == 0) {
+                  stack[sp] = Value<T>{nullptr, base[in.index][0]};  // broadcast along the run
+              } else if (step == 1) {
+                  stack[sp] = Value<T>{base[in.index] + b0, T()};
+              } else {
+                  T* r = scratch + sp * block;
+                  const T* src = base[in.index] + b0 * step;
+                  for (std::size_t i = 0; i < n; ++i) r[i] = src[i * step];
+                  stack[sp] = Value<T>{r, T()};
+              }
+              ++sp;
+              break;
+          }
+          case constant:
+              stack[sp++] = Value<T>{nullptr, static_cast<T>(in.value)};
+              break;
+          case negate: {
+              Value<T>& x = stack[sp - 1];
+              if (!x.data) {
+                  x.scalar = -x.scalar;
+                  break;
+              }
+              T* r = scratch + (sp - 1) * block;
+              const T* a = x.data;
+              for (std::size_t i = 0; i < n; ++i) r[i] = -a[i];
+              x.data = r;
+              break;
+          }
+          case add:
+              combine(stack, scratch, sp, n, [](T a, T b) { return a + b; });
+              break;
+          case subtract:
+              combine(stack, scratch, sp, n, [](T a, T b) { return a - b; });
+              break;
+          case multiply:
+              combine(stack, scratch, sp, n, [](T a, T b) { return a * b; });
+              break;
+          case divide:
+              combine(stack, scratch, sp, n, [](T a, T b) { return a / b; });
+              break;
+          }
+      }
+      return stack[0];
+  }
+
+  // Replace the two topmost values by f(x, y), written to the lower slot
+  template <class T, class F>
+  static void combine(Value<T>* stack, T* scratch, std::size_t& sp, std::size_t n, F f) {
+      Value<T>& x = stack[sp - 2];
+      const Value<T>& y = stack[sp - 1];
+      --sp;
+      if (!x.data && !y.data) {
+          x.scalar = f(x.scalar, y.scalar);
+          return;
+      }
+      T* r = scratch + sp * block - block;
+      if (x.data && y.data) {
+          const T* a = x.data;
+          const T* b = y.data;
+          for (std::size_t i = 0; i < n; ++i) r[i] = f(a[i], b[i]);
+      } else if (x.data) {
+          const T* a = x.data;
+          const T s = y.scalar;
+          for (std::size_t i = 0; i < n; ++i) r[i] = f(a[i], s);
+      } else {
+          const T s = x.scalar;
+          const T* b = y.data;
+          for (std::size_t i = 0; i < n; ++i) r[i] = f(s, b[i]);
+      }
+      x.data = r;
+  }
+
+  // -------- Recursive-descent parser --------
+  //   sum     := product (('+' | '-') product)*
+  //   product := unary (('*' | '/') unary)*
+  //   unary   := '-' unary | '+' unary | atom
+  //   atom    := number | name | '(' sum ')'
+
+  [[noreturn]] void fail(const std::string& what) const {
+      throw std::invalid_argument("expression: " + what + " at position " + std::to_string(m_pos) +
+                                  " in '" + m_source + "'");
+  }
+
+  void skip_space() {
+      while (m_pos < m_source.size() && std::isspace(static_cast<unsigned char>(m_source[m_pos]))) ++m_pos;
+  }
+
+  bool accept(char c) {
+      skip_space();
+      if (m_pos < m_source.size() && m_source[m_pos] == c) {
+          ++m_pos;
+          return true;
+      }
+      return false;
+  }
+
+  void emit(Code code, std::size_t index = 0, double value = 0) { m_code.push_back(Instr{code, index, value}); }
+
+  void parse_sum() {
+      parse_product();
+      for (;;) {
+          if (accept('+')) {
+              parse_product();
+              emit(add);
+          } else if (accept('-')) {
+              parse_product();
+              emit(subtract);
+          } else {
+              return;
+          }
+      }
+  }
+
+  void parse_product() {
+      parse_unary();
+      for (;;) {
+          if (accept('*')) {
+              parse_unary();
+              emit(multiply);
+          } else if (accept('/')) {
+              parse_unary();
+              emit(divide);
+          } else {
+              return;
+          }
+      }
+  }
+
+  void parse_unary() {
+      if (accept('-')) {
+          parse_unary();
+          emit(negate);
+      } else if (accept('+')) {
+          parse_unary();
+      } else {
+          parse_atom();
+      }
+  }
+
+  void parse_atom() {
+      skip_space();
+      if (m_pos == m_source.size()) fail("unexpected end");
+      const char c = m_source[m_pos];
+      if (accept('(')) {
+          parse_sum();
+          if (!accept(')')) fail("expected ')'");
+      } else if (std::isdigit(static_cast<unsigned char>(c)) || c == '.') {
+          emit(constant, 0, parse_number());
+      } else if (std::isalpha(static_cast<unsigned char>(c)) || c == '_') {
+          const std::size_t start = m_pos;
+          while (m_pos < m_source.size() &&
+                 (std::isalnum(static_cast<unsigned char>(m_source[m_pos])) || m_source[m_pos] == '_')) {
+              ++m_pos;
+          }
+          const std::string name = m_source.substr(start, m_pos - start);
+          std::size_t k = std::find(m_names.begin(), m_names.end(), name) - m_names.begin();
+          if (k == m_names.size()) m_names.push_back(name);
+          emit(load, k);
+      } else {
+          fail("unexpected '" + std::string(1, c) + "'");
+      }
+  }
+
+  // Decimal literal such as 2, 0.5, .5 or 1e-3, read in the C locale
+  double parse_number() {
+      const std::size_t start = m_pos;
+      const std::string& s = m_source;
+      while (m_pos < s.size() && std::isdigit(static_cast<unsigned char>(s[m_pos]))) ++m_pos;
+      if (m_pos < s.size() && s[m_pos] == '.') ++m_pos;
+      while (m_pos < s.size() && std::isdigit(static_cast<unsigned char>(s[m_pos]))) ++m_pos;
+      if (m_pos < s.size() && (s[m_pos] == 'e' || s[m_pos] == 'E')) {
+          std::size_t p = m_pos + 1;
+          if (p < s.size() && (s[p] == '+' || s[p] == '-')) ++p;
+          if (p < s.size() && std::isdigit(static_cast<unsigned char>(s[p]))) {
+              m_pos = p;
+              while (m_pos < s.size() && std::isdigit(static_cast<unsigned char>(s[m_pos]))) ++m_pos;
+          }
+      }
+      std::istringstream in(s.substr(start, m_pos - start));
+      in.imbue(std::locale::classic());
+      double value = 0;
+      if (!(in >> value)) {
+          m_pos = start;
+          fail("malformed number");
+      }
+      return value;
+  }
+};
+
+} // namespace expr
+
+using expr::operator+;
+using expr::operator-;
+using expr::operator*;
+using expr::operator/;
+using expr::operator+=;
+using expr::operator-=;
+using expr::operator*=;
+using expr::operator/=;
+using expr::evaluate;
+
+} // namespace cnda
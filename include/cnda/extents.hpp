@@ -0,0 +1,136 @@
+#pragma once
+#include <algorithm>
+#include <cstddef>
+#include <initializer_list>
+#include <memory>
+#include <vector>
+
+namespace cnda {
+
+// Shape/stride storage of ContiguousND. Up to `inline_capacity` values live
+// inside the object, so building a view of an array with rank <= 8 does not
+// allocate; larger ranks fall back to the heap. Converts implicitly from and
+// to std::vector<std::size_t> and compares equal to one with the same
+// values.
+class Extents {
+public:
+  typedef std::size_t value_type;
+  typedef std::size_t* iterator;
+  typedef const std::size_t* const_iterator;
+
+  static constexpr std::size_t inline_capacity = 8;
+
+  Extents() noexcept : m_data(m_inline) {}
+
+  explicit Extents(std::size_t n, std::size_t value = 0) : m_data(m_inline) {
+      assign(n, value);
+  }
+
+  Extents(std::initializer_list<std::size_t> values) : m_data(m_inline) {
+      assign(values.begin(), values.end());
+  }
+
+  Extents(const std::vector<std::size_t>& values) : m_data(m_inline) {
+      assign(values.data(), values.data() + values.size());
+  }
+
+  Extents(const std::size_t* first, const std::size_t* last) : m_data(m_inline) {
+      assign(first, last);
+  }
+
+  Extents(const Extents& other) : m_data(m_inline) {
+      assign(other.begin(), other.end());
+  }
+
+  Extents(Extents&& other) noexcept : m_data(m_inline) {
+      take(other);
+  }
+
+  Extents& operator=(const Extents& other) {
+      if (this != &other) assign(other.begin(), other.end());
+      return *this;
+  }
+
+  Extents& operator=(Extents&& other) noexcept {
+      if (this != &other) {
+          m_heap.reset();
+          take(other);
+      }
+      return *this;
+  }
+
+  void assign(std::size_t n, std::size_t value) {
+      reserve(n);
+      std::fill(m_data, m_data + n, value);
+      m_size = n;
+  }
+
+  void assign(const std::size_t* first, const std::size_t* last) {
+      const std::size_t n = static_cast<std::size_t>(last - first);
+      reserve(n);
+      // A plain loop: these copies are short, and a memmove call costs more
+      for (std::size_t i = 0; i < n; ++i) m_data[i] = first[i];
+      m_size = n;
+  }
+
+  std::size_t size() const noexcept { return m_size; }
+  bool empty() const noexcept { return m_size == 0; }
+
+  std::size_t* data() noexcept { return m_data; }
+  const std::size_t* data() const noexcept { return m_data; }
+  iterator begin() noexcept { return m_data; }
+  iterator end() noexcept { return m_data + m_size; }
+  const_iterator begin() const noexcept { return m_data; }
+  const_iterator end() const noexcept { return m_data + m_size; }
+
+  std::size_t& operator[](std::size_t i) noexcept { return m_data[i]; }
+  const std::size_t& operator[](std::size_t i) const noexcept { return m_data[i]; }
+  std::size_t back() const noexcept { return m_data[m_size - 1]; }
+
+  operator std::vector<std::size_t>() const { return std::vector<std::size_t>(begin(), end()); }
+
+  friend bool operator==(const Extents& a, const Extents& b) noexcept {
+      return a.m_size == b.m_size && std::equal(a.begin(), a.end(), b.begin());
+  }
+  friend bool operator!=(const Extents& a, const Extents& b) noexcept { return !(a == b); }
+  friend bool operator==(const Extents& a, const std::vector<std::size_t>& b) noexcept {
+      return a.m_size == b.size() && std::equal(a.begin(), a.end(), b.begin());
+  }
+  friend bool operator==(const std::vector<std::size_t>& a, const Extents& b) noexcept { return b == a; }
+  friend bool operator!=(const Extents& a, const std::vector<std::size_t>& b) noexcept { return !(a == b); }
+  friend bool operator!=(const std::vector<std::size_t>& a, const Extents& b) noexcept { return !(b == a); }
+
+private:
+  std::size_t m_size = 0;
+  std::size_t* m_data;
+  std::size_t m_inline[inline_capacity];
+  std::unique_ptr<std::size_t[]> m_heap;
+
+  // Room for n values; existing values are not kept
+  void reserve(std::size_t n) {
+      if (n <= inline_capacity) {
+          m_heap.reset();
+          m_data = m_inline;
+      } else if (!m_heap || n > m_size) {
+          m_heap.reset(new std::size_t[n]);
+          m_data = m_heap.get();
+      }
+  }
+
+  void take(Extents& other) noexcept {
+      m_size = other.m_size;
+      if (other.m_heap) {
+          m_heap = std::move(other.m_heap);
+          m_data = m_heap.get();
+      } else {
+          // m_size <= inline_capacity here; the bound says so to the optimizer
+          const std::size_t n = m_size < inline_capacity ? m_size : std::size_t(inline_capacity);
+          std::copy_n(other.m_inline, n, m_inline);
+          m_data = m_inline;
+      }
+      other.m_data = other.m_inline;
+      other.m_size = 0;
+  }
+};
+
+} // namespace cnda
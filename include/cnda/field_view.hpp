@@ -0,0 +1,58 @@
+#pragma once
+#include <cnda/aos_types.hpp>
+#include <cnda/contiguous_nd.hpp>
+#include <cstddef>
+#include <memory>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+namespace cnda {
+
+// Strided scalar view of one field of every element of an AoS array, e.g.
+// field_view(particles, &Particle::mass) or field_view<float>(cells, "u").
+// The view has the array's shape, shares its owner (or buffer), and writes
+// through to the structs.
+//
+// The element strides of the view are those of `a` scaled by
+// sizeof(S) / sizeof(F), so the struct size and the field offset must both
+// be multiples of the field size; that holds for all cnda::aos structs.
+
+// Field at `byte_offset` within S, read as F
+template <class F, class S>
+ContiguousND<F> field_view(ContiguousND<S>& a, std::size_t byte_offset) {
+    if (sizeof(S) % sizeof(F) != 0 || byte_offset % sizeof(F) != 0 || byte_offset + sizeof(F) > sizeof(S)) {
+        throw std::invalid_argument("field_view(): field is not addressable with element strides");
+    }
+    const std::size_t scale = sizeof(S) / sizeof(F);
+    Extents strides(a.strides());
+    for (std::size_t& s : strides) s *= scale;
+
+    F* base = reinterpret_cast<F*>(reinterpret_cast<unsigned char*>(a.data()) + byte_offset);
+    return ContiguousND<F>(a.shape(), std::move(strides), base, a.shared_owner());
+}
+
+template <class S, class F>
+ContiguousND<F> field_view(ContiguousND<S>& a, F S::*member) {
+    S probe;
+    const std::size_t offset = static_cast<std::size_t>(
+        reinterpret_cast<const unsigned char*>(&(probe.*member)) -
+        reinterpret_cast<const unsigned char*>(&probe));
+    return field_view<F>(a, offset);
+}
+
+// Field called `name` of a described struct (see aos::struct_fields); F must
+// have the field's kind and size
+template <class F, class S>
+ContiguousND<F> field_view(ContiguousND<S>& a, const std::string& name) {
+    const aos::FieldInfo* f = aos::find_field(aos::struct_fields<S>::get(), aos::struct_fields<S>::count, name.c_str());
+    if (!f) {
+        throw std::invalid_argument("field_view(): no field named '" + name + "'");
+    }
+    if (sizeof(F) != f->size || aos::field_kind<F>() != f->kind) {
+        throw std::invalid_argument("field_view(): wrong element type for field '" + name + "'");
+    }
+    return field_view<F>(a, f->offset);
+}
+
+} // namespace cnda
@@ -0,0 +1,357 @@
+#pragma once
+#include <cnda/contiguous_nd.hpp>
+#include <algorithm>
+#include <array>
+#include <cstddef>
+#include <cstring>
+#include <initializer_list>
+#include <memory>
+#include <stdexcept>
+#include <string>
+#include <type_traits>
+#include <vector>
+
+namespace cnda {
+
+// ContiguousND<T, N>: the same strided array as ContiguousND<T>, with the
+// rank fixed at compile time. Shape and strides live inline in std::arrays,
+// so views are built without heap allocation and operator() is a fully
+// unrolled dot product over values the compiler can keep in registers
+// across a loop.
+//
+// as_fixed<N>(a) and as_dynamic(a) convert between the two without copying;
+// the result shares the buffer (and owner) of its source.
+template <class T, std::size_t N>
+class ContiguousND {
+  static_assert(N >= 1 && N != dynamic_rank, "ContiguousND<T, N> needs a rank of at least 1");
+  static_assert(std::is_trivially_destructible<T>::value,
+                "ContiguousND requires a trivially destructible element type");
+
+  struct uninitialized_tag {};
+
+public:
+  typedef std::array<std::size_t, N> shape_type;
+
+  // -------- Constructors --------
+  // Owning, zero-filled buffer aligned to `alignment` bytes
+  explicit ContiguousND(const shape_type& shape, std::size_t alignment = default_alignment,
+                        std::shared_ptr<Allocator> allocator = nullptr)
+      : ContiguousND(shape, alignment, uninitialized_tag(), std::move(allocator))
+  {
+      if (m_size > 0) {
+          std::memset(static_cast<void*>(m_data), 0, m_size * sizeof(T));
+      }
+  }
+
+  // Strided view: `strides` are in ELEMENTS and `external_data` points at the
+  // element with index (0, ..., 0)
+  ContiguousND(const shape_type& shape, const shape_type& strides,
+               T* external_data, std::shared_ptr<void> external_owner)
+      : m_shape(shape),
+        m_strides(strides),
+        m_data(external_data),
+        m_external_owner(std::move(external_owner))
+  {
+      compute_view_metadata();
+  }
+
+  // -------- Factories for owning buffers --------
+  static ContiguousND empty(const shape_type& shape, std::size_t alignment = default_alignment,
+                            std::shared_ptr<Allocator> allocator = nullptr) {
+      return ContiguousND(shape, alignment, uninitialized_tag(), std::move(allocator));
+  }
+
+  static ContiguousND zeros(const shape_type& shape, std::size_t alignment = default_alignment,
+                            std::shared_ptr<Allocator> allocator = nullptr) {
+      return ContiguousND(shape, alignment, std::move(allocator));
+  }
+
+  static ContiguousND full(const shape_type& shape, const T& value,
+                           std::size_t alignment = default_alignment,
+                           std::shared_ptr<Allocator> allocator = nullptr) {
+      ContiguousND out(shape, alignment, uninitialized_tag(), std::move(allocator));
+      std::fill(out.m_data, out.m_data + out.m_size, value);
+      return out;
+  }
+
+  // -------- Move Semantics --------
+  ContiguousND(ContiguousND&& other) noexcept
+      : m_shape(other.m_shape),
+        m_strides(other.m_strides),
+        m_size(other.m_size),
+        m_contiguous(other.m_contiguous),
+        m_storage(std::move(other.m_storage)),
+        m_data(other.m_data),
+        m_external_owner(std::move(other.m_external_owner))
+  {
+      other.m_data = nullptr;
+      other.m_shape.fill(0);
+      other.m_size = 0;
+  }
+
+  ContiguousND& operator=(ContiguousND&& other) noexcept {
+      if (this != &other) {
+          m_shape = other.m_shape;
+          m_strides = other.m_strides;
+          m_size = other.m_size;
+          m_contiguous = other.m_contiguous;
+          m_storage = std::move(other.m_storage);
+          m_data = other.m_data;
+          m_external_owner = std::move(other.m_external_owner);
+
+          other.m_data = nullptr;
+          other.m_shape.fill(0);
+          other.m_size = 0;
+      }
+      return *this;
+  }
+
+  ContiguousND(const ContiguousND&) = delete;
+  ContiguousND& operator=(const ContiguousND&) = delete;
+
+  // -------- Basic Accessors --------
+  const shape_type& shape()   const noexcept { return m_shape;   }
+  const shape_type& strides() const noexcept { return m_strides; }
+  static constexpr std::size_t ndim() noexcept { return N; }
+  std::size_t size() const noexcept { return m_size; }
+
+  T* data() noexcept { return m_data; }
+  const T* data() const noexcept { return m_data; }
+
+  bool is_view() const noexcept { return m_external_owner != nullptr; }
+  bool is_contiguous() const noexcept { return m_contiguous; }
+
+  // Keeps the external buffer alive; null for arrays that own their storage
+  const std::shared_ptr<void>& owner() const noexcept { return m_external_owner; }
+
+  // Owner to hand to views of this array: the external owner or the buffer
+  std::shared_ptr<void> shared_owner() const noexcept {
+      return m_external_owner ? m_external_owner : m_storage;
+  }
+
+  // -------- Iteration --------
+  typedef FlatIterator<T> iterator;
+  typedef FlatIterator<const T> const_iterator;
+
+  iterator begin() { return iterator(m_data, m_shape.data(), m_strides.data(), N, m_contiguous, 0); }
+  iterator end() { return iterator(m_data, m_shape.data(), m_strides.data(), N, m_contiguous, m_size); }
+  const_iterator begin() const { return cbegin(); }
+  const_iterator end() const { return cend(); }
+  const_iterator cbegin() const {
+      return const_iterator(m_data, m_shape.data(), m_strides.data(), N, m_contiguous, 0);
+  }
+  const_iterator cend() const {
+      return const_iterator(m_data, m_shape.data(), m_strides.data(), N, m_contiguous, m_size);
+  }
+
+  // -------- Sub-array views --------
+  // Same rules as ContiguousND<T>::slice() / borrow(); the rank is unchanged
+  ContiguousND slice(const std::vector<Range>& ranges) {
+      return make_slice(ranges.data(), ranges.size(), shared_owner());
+  }
+  ContiguousND slice(std::initializer_list<Range> ranges) {
+      return make_slice(ranges.begin(), ranges.size(), shared_owner());
+  }
+  ContiguousND borrow(const std::vector<Range>& ranges) {
+      return make_slice(ranges.data(), ranges.size(), std::shared_ptr<void>());
+  }
+  ContiguousND borrow(std::initializer_list<Range> ranges) {
+      return make_slice(ranges.begin(), ranges.size(), std::shared_ptr<void>());
+  }
+
+  bool is_borrowed() const noexcept { return !m_external_owner && !m_storage && m_data != nullptr; }
+
+  // -------- Element access --------
+  // Exactly N indices; checked only under CNDA_BOUNDS_CHECK
+  template <typename... Indices>
+  inline T& operator()(Indices... indices) {
+      static_assert(sizeof...(Indices) == N, "operator(): wrong number of indices");
+      const std::size_t idx[N] = { static_cast<std::size_t>(indices)... };
+#ifdef CNDA_BOUNDS_CHECK
+      check_bounds(idx, "operator()");
+#endif
+      return m_data[offset_of(idx)];
+  }
+
+  template <typename... Indices>
+  inline const T& operator()(Indices... indices) const {
+      static_assert(sizeof...(Indices) == N, "operator(): wrong number of indices");
+      const std::size_t idx[N] = { static_cast<std::size_t>(indices)... };
+#ifdef CNDA_BOUNDS_CHECK
+      check_bounds(idx, "operator()");
+#endif
+      return m_data[offset_of(idx)];
+  }
+
+  // Always bounds-checked
+  template <typename... Indices>
+  T& at(Indices... indices) {
+      static_assert(sizeof...(Indices) == N, "at(): wrong number of indices");
+      const std::size_t idx[N] = { static_cast<std::size_t>(indices)... };
+      check_bounds(idx, "at()");
+      return m_data[offset_of(idx)];
+  }
+
+  template <typename... Indices>
+  const T& at(Indices... indices) const {
+      static_assert(sizeof...(Indices) == N, "at(): wrong number of indices");
+      const std::size_t idx[N] = { static_cast<std::size_t>(indices)... };
+      check_bounds(idx, "at()");
+      return m_data[offset_of(idx)];
+  }
+
+private:
+  shape_type m_shape;
+  shape_type m_strides;  // stride in ELEMENTS
+  std::size_t m_size = 0;
+  bool m_contiguous = true;
+
+  std::shared_ptr<void> m_storage;  // aligned buffer of owning arrays
+  T* m_data = nullptr;
+  std::shared_ptr<void> m_external_owner;
+
+  ContiguousND(const shape_type& shape, std::size_t alignment, uninitialized_tag,
+               std::shared_ptr<Allocator> allocator)
+      : m_shape(shape)
+  {
+      m_size = 1;
+      for (std::size_t d = N; d-- > 0; ) {
+          m_strides[d] = m_size;
+          m_size *= m_shape[d];
+      }
+      m_contiguous = true;
+      if (alignment < alignof(T)) {
+          alignment = alignof(T);
+      }
+      m_storage = detail::allocate_buffer(m_size * sizeof(T), alignment, std::move(allocator));
+      m_data = static_cast<T*>(m_storage.get());
+  }
+
+  ContiguousND make_slice(const Range* ranges, std::size_t n, std::shared_ptr<void> owner) {
+      if (n > N) {
+          throw std::out_of_range("slice(): more ranges than dimensions");
+      }
+      shape_type shape(m_shape);
+      shape_type strides(m_strides);
+      std::size_t off = 0;
+      for (std::size_t d = 0; d < n; ++d) {
+          const Range& r = ranges[d];
+          if (r.step == 0) {
+              throw std::invalid_argument("slice(): step must be positive");
+          }
+          const std::size_t stop = std::min(r.stop, m_shape[d]);
+          const std::size_t start = std::min(r.start, stop);
+          shape[d] = (stop - start + r.step - 1) / r.step;
+          strides[d] = m_strides[d] * r.step;
+          off += start * m_strides[d];
+      }
+      return ContiguousND(shape, strides, m_data + off, std::move(owner));
+  }
+
+  std::size_t offset_of(const std::size_t (&idx)[N]) const noexcept {
+      std::size_t off = 0;
+      for (std::size_t d = 0; d < N; ++d) {
+          off += idx[d] * m_strides[d];
+      }
+      return off;
+  }
+
+  void check_bounds(const std::size_t (&idx)[N], const char* who) const {
+      for (std::size_t d = 0; d < N; ++d) {
+          if (idx[d] >= m_shape[d]) {
+              throw std::out_of_range(std::string(who) + ": index out of bounds");
+          }
+      }
+  }
+
+  // Same rule as the dynamic class: axes of extent 1 never step
+  void compute_view_metadata() noexcept {
+      m_size = 1;
+      m_contiguous = true;
+      for (std::size_t k = N; k-- > 0; ) {
+          if (m_shape[k] != 1 && m_strides[k] != m_size) {
+              m_contiguous = false;
+          }
+          m_size *= m_shape[k];
+      }
+  }
+};
+
+namespace detail {
+
+template <std::size_t... I> struct index_list {};
+template <std::size_t N, std::size_t... I>
+struct make_index_list : make_index_list<N - 1, N - 1, I...> {};
+template <std::size_t... I>
+struct make_index_list<0, I...> { typedef index_list<I...> type; };
+
+template <class F, class T, std::size_t N, std::size_t... I>
+inline void call_with_index(F& f, const std::size_t (&idx)[N], T& x, index_list<I...>) {
+    f(idx[I]..., x);
+}
+
+template <class T, std::size_t N, class F>
+void for_each_index_fixed(T* data, const std::array<std::size_t, N>& shape,
+                          const std::array<std::size_t, N>& strides, F& f) {
+    typedef typename make_index_list<N>::type indices;
+    const std::size_t inner = shape[N - 1];
+    const std::size_t step = strides[N - 1];
+    std::size_t idx[N] = {};
+    std::size_t off = 0;
+    for (;;) {
+        T* p = data + off;
+        for (idx[N - 1] = 0; idx[N - 1] < inner; ++idx[N - 1], p += step) {
+            call_with_index(f, idx, *p, indices());
+        }
+        idx[N - 1] = 0;
+        std::size_t d = N - 1;
+        for (;;) {
+            if (d == 0) return;
+            --d;
+            off += strides[d];
+            if (++idx[d] < shape[d]) break;
+            off -= idx[d] * strides[d];
+            idx[d] = 0;
+        }
+    }
+}
+
+} // namespace detail
+
+// f(i0, ..., iN-1, element) for every element in row-major order, walking
+// the innermost axis with a pointer increment
+template <class T, std::size_t N, class F>
+void for_each_index(ContiguousND<T, N>& a, F f) {
+    if (a.size() == 0) return;
+    detail::for_each_index_fixed(a.data(), a.shape(), a.strides(), f);
+}
+
+template <class T, std::size_t N, class F>
+void for_each_index(const ContiguousND<T, N>& a, F f) {
+    if (a.size() == 0) return;
+    detail::for_each_index_fixed(a.data(), a.shape(), a.strides(), f);
+}
+
+// View of a dynamic-rank array as rank N; throws std::invalid_argument if
+// a.ndim() != N
+template <std::size_t N, class T>
+ContiguousND<T, N> as_fixed(ContiguousND<T>& a) {
+    if (a.ndim() != N) {
+        throw std::invalid_argument("as_fixed(): rank mismatch");
+    }
+    typename ContiguousND<T, N>::shape_type shape, strides;
+    std::copy(a.shape().begin(), a.shape().end(), shape.begin());
+    std::copy(a.strides().begin(), a.strides().end(), strides.begin());
+    return ContiguousND<T, N>(shape, strides, a.data(), a.shared_owner());
+}
+
+// View of a fixed-rank array as a dynamic-rank one, e.g. to pass it to the
+// kernels, reductions or the Python bindings
+template <class T, std::size_t N>
+ContiguousND<T> as_dynamic(ContiguousND<T, N>& a) {
+    return ContiguousND<T>(Extents(a.shape().data(), a.shape().data() + N),
+                           Extents(a.strides().data(), a.strides().data() + N),
+                           a.data(), a.shared_owner());
+}
+
+} // namespace cnda
@@ -0,0 +1,92 @@
+#pragma once
+#include <cnda/contiguous_nd.hpp>
+#include <cstddef>
+#include <cstdint>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+namespace cnda {
+
+// Batched gather/scatter over a ContiguousND.
+//
+// An index buffer holds k entries stored back to back. With flat == true each
+// entry is one row-major position in [0, size()); otherwise each entry is a
+// multi-index of ndim() values. Negative values are out of bounds, matching
+// at(). All indices are validated before anything is written, so a failing
+// put() leaves the array untouched.
+
+namespace detail {
+
+// Row-major position -> element offset, for pos in [0, size())
+template <class T>
+std::size_t flat_offset(const ContiguousND<T>& a, std::size_t pos) {
+    if (a.is_contiguous()) {
+        return pos;
+    }
+    std::size_t off = 0;
+    for (std::size_t d = a.ndim(); d-- > 0; ) {
+        off += (pos % a.shape()[d]) * a.strides()[d];
+        pos /= a.shape()[d];
+    }
+    return off;
+}
+
+template <class T>
+std::size_t checked_offset(const ContiguousND<T>& a, const std::int64_t* entry,
+                           bool flat, const char* who) {
+    const std::size_t* shape = a.shape().data();
+    const std::size_t* strides = a.strides().data();
+    if (flat) {
+        const std::int64_t i = entry[0];
+        if (i < 0 || static_cast<std::size_t>(i) >= a.size()) {
+            throw std::out_of_range(std::string(who) + ": index out of bounds");
+        }
+        return flat_offset(a, static_cast<std::size_t>(i));
+    }
+    std::size_t off = 0;
+    for (std::size_t d = 0; d < a.ndim(); ++d) {
+        const std::int64_t i = entry[d];
+        if (i < 0 || static_cast<std::size_t>(i) >= shape[d]) {
+            throw std::out_of_range(std::string(who) + ": index out of bounds");
+        }
+        off += static_cast<std::size_t>(i) * strides[d];
+    }
+    return off;
+}
+
+} // namespace detail
+
+// out[n] = element at the n-th index entry, for n in [0, k)
+template <class T>
+void take(const ContiguousND<T>& a, const std::int64_t* indices, std::size_t k,
+          bool flat, T* out) {
+    const std::size_t step = flat ? 1 : a.ndim();
+    const T* src = a.data();
+    for (std::size_t n = 0; n < k; ++n) {
+        out[n] = src[detail::checked_offset(a, indices + n * step, flat, "take()")];
+    }
+}
+
+// Element at the n-th index entry = values[n], or values[0] for every entry
+// when n_values == 1. Later entries win when an index repeats.
+template <class T>
+void put(ContiguousND<T>& a, const std::int64_t* indices, std::size_t k,
+         bool flat, const T* values, std::size_t n_values) {
+    if (n_values != k && n_values != 1) {
+        throw std::invalid_argument("put(): values must have one entry per index or a single entry");
+    }
+    // One validating pass; its offsets drive the write pass
+    const std::size_t step = flat ? 1 : a.ndim();
+    std::vector<std::size_t> offsets(k);
+    for (std::size_t n = 0; n < k; ++n) {
+        offsets[n] = detail::checked_offset(a, indices + n * step, flat, "put()");
+    }
+    T* dst = a.data();
+    const std::size_t vstep = n_values == 1 ? 0 : 1;
+    for (std::size_t n = 0; n < k; ++n) {
+        dst[offsets[n]] = values[n * vstep];
+    }
+}
+
+} // namespace cnda
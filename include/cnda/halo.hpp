@@ -0,0 +1,287 @@
+#pragma once
+#include <cnda/contiguous_nd.hpp>
+#include <cnda/kernels.hpp>
+#include <cnda/parallel.hpp>
+#include <algorithm>
+#include <cstddef>
+#include <memory>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+namespace cnda {
+
+// Grids padded with ghost cells, and stencil sweeps over them.
+//
+// A HaloGrid stores its interior surrounded by `halo` ghost layers on every
+// side of every axis, so a stencil of radius <= halo can read neighbours of
+// any interior cell without boundary checks. fill_halo() sets the ghost
+// layers from the interior (periodic, reflect) or to a constant, and
+// exchange_halo() copies edges between grids that are neighbours in a
+// decomposed domain. apply_stencil() sweeps the interior in tiles sized to
+// stay in cache, running tiles on the default thread pool (parallel.hpp).
+
+// How fill_halo() sets the ghost layers along an axis:
+//   periodic - copies of the interior from the opposite side
+//   reflect  - the interior mirrored about the boundary face, so the first
+//              ghost cell equals the edge cell (numpy.pad mode 'symmetric')
+//   constant - a fixed value
+enum class Boundary { periodic, reflect, constant };
+
+/**
+ * @brief ContiguousND padded with ghost cells
+ *
+ * Owns a row-major array of shape interior + 2 * halo along every axis.
+ * interior() and padded() are views of it that share its ownership.
+ * Ghost layers are zero-filled on construction.
+ */
+template <class T>
+class HaloGrid {
+public:
+  HaloGrid(const Extents& shape, std::size_t halo,
+           std::size_t alignment = default_alignment,
+           std::shared_ptr<Allocator> allocator = nullptr)
+      : m_shape(shape), m_halo(halo),
+        m_padded(padded_shape(shape, halo), alignment, std::move(allocator)) {
+      if (shape.size() == 0) {
+          throw std::invalid_argument("HaloGrid: rank must be at least 1");
+      }
+  }
+
+  HaloGrid(HaloGrid&&) = default;
+  HaloGrid& operator=(HaloGrid&&) = default;
+
+  // Interior shape
+  const Extents& shape() const noexcept { return m_shape; }
+  std::size_t ndim() const noexcept { return m_shape.size(); }
+  std::size_t halo() const noexcept { return m_halo; }
+
+  // The whole buffer, ghost layers included
+  ContiguousND<T>& padded() noexcept { return m_padded; }
+  const ContiguousND<T>& padded() const noexcept { return m_padded; }
+
+  // View of the interior cells
+  ContiguousND<T> interior() {
+      std::vector<Range> ranges(ndim());
+      for (std::size_t d = 0; d < ndim(); ++d) ranges[d] = Range{m_halo, m_halo + m_shape[d], 1};
+      return m_padded.slice(ranges);
+  }
+
+  // Set every ghost layer, axis by axis. Later axes span the ghost layers
+  // already set along earlier ones, so edges and corners come out as if
+  // each boundary were applied in turn.
+  void fill_halo(Boundary boundary, const T& value = T()) {
+      fill_halo(std::vector<Boundary>(ndim(), boundary), value);
+  }
+
+  // One boundary per axis
+  void fill_halo(const std::vector<Boundary>& boundaries, const T& value = T()) {
+      if (boundaries.size() != ndim()) {
+          throw std::invalid_argument("fill_halo(): expected one boundary per axis");
+      }
+      for (std::size_t d = 0; d < ndim(); ++d) {
+          if (boundaries[d] != Boundary::constant && m_shape[d] < m_halo) {
+              throw std::invalid_argument("fill_halo(): axis " + std::to_string(d) +
+                                          " has fewer interior cells than the halo width");
+          }
+      }
+      if (m_halo == 0) return;
+      const std::size_t h = m_halo;
+      for (std::size_t d = 0; d < ndim(); ++d) {
+          const std::size_t n = m_shape[d];
+          switch (boundaries[d]) {
+          case Boundary::periodic: {
+              ContiguousND<T> lo = layers(d, 0, h);
+              copy_from(lo, layers(d, n, n + h));
+              ContiguousND<T> hi = layers(d, h + n, n + 2 * h);
+              copy_from(hi, layers(d, h, 2 * h));
+              break;
+          }
+          case Boundary::reflect:
+              for (std::size_t k = 0; k < h; ++k) {
+                  ContiguousND<T> lo = layers(d, h - 1 - k, h - k);
+                  copy_from(lo, layers(d, h + k, h + k + 1));
+                  ContiguousND<T> hi = layers(d, h + n + k, h + n + k + 1);
+                  copy_from(hi, layers(d, h + n - 1 - k, h + n - k));
+              }
+              break;
+          case Boundary::constant: {
+              ContiguousND<T> lo = layers(d, 0, h);
+              fill(lo, value);
+              ContiguousND<T> hi = layers(d, h + n, n + 2 * h);
+              fill(hi, value);
+              break;
+          }
+          }
+      }
+  }
+
+  // Positions [begin, end) of the padded array along `axis`, spanning the
+  // whole padded extent of the other axes (a borrowed view)
+  ContiguousND<T> layers(std::size_t axis, std::size_t begin, std::size_t end) {
+      std::vector<Range> ranges(axis + 1);
+      for (std::size_t d = 0; d < axis; ++d) ranges[d] = Range{0, m_padded.shape()[d], 1};
+      ranges[axis] = Range{begin, end, 1};
+      return m_padded.borrow(ranges);
+  }
+
+private:
+  Extents m_shape;
+  std::size_t m_halo;
+  ContiguousND<T> m_padded;
+
+  static Extents padded_shape(const Extents& shape, std::size_t halo) {
+      Extents out(shape);
+      for (std::size_t& n : out) n += 2 * halo;
+      return out;
+  }
+};
+
+// Fill the ghost layers between two grids that meet along `axis`, `low`
+// before `high`: low's upper ghost layers get high's first interior layers
+// and high's lower ghost layers get low's last ones. The grids must have the
+// same halo and the same padded extent along every other axis.
+template <class T>
+void exchange_halo(HaloGrid<T>& low, HaloGrid<T>& high, std::size_t axis) {
+    if (axis >= low.ndim() || low.ndim() != high.ndim()) {
+        throw std::invalid_argument("exchange_halo(): axis out of range or rank mismatch");
+    }
+    if (low.halo() != high.halo()) {
+        throw std::invalid_argument("exchange_halo(): grids have different halo widths");
+    }
+    for (std::size_t d = 0; d < low.ndim(); ++d) {
+        if (d != axis && low.shape()[d] != high.shape()[d]) {
+            throw std::invalid_argument("exchange_halo(): grids differ along an axis other than " +
+                                        std::to_string(axis));
+        }
+    }
+    const std::size_t h = low.halo();
+    const std::size_t nl = low.shape()[axis];
+    const std::size_t nh = high.shape()[axis];
+    if (nl < h || nh < h) {
+        throw std::invalid_argument("exchange_halo(): a grid has fewer interior cells than the halo width");
+    }
+    ContiguousND<T> low_ghost = low.layers(axis, h + nl, nl + 2 * h);
+    copy_from(low_ghost, high.layers(axis, h, 2 * h));
+    ContiguousND<T> high_ghost = high.layers(axis, 0, h);
+    copy_from(high_ghost, low.layers(axis, nl, nl + h));
+}
+
+/**
+ * @brief A cell of a HaloGrid and its neighbours, as seen by a stencil
+ *
+ * p(di, dj) is the cell di rows and dj columns away (one offset per axis,
+ * as many as the grid has; unchecked), p() the cell itself, and p[k] the
+ * element k positions away in the padded buffer, for precomputed offsets
+ * built from stride(). Offsets must stay within the halo width.
+ */
+template <class T>
+class StencilPoint {
+public:
+  StencilPoint(const T* center, const std::ptrdiff_t* strides) : m_center(center), m_strides(strides) {}
+
+  const T& operator()() const { return *m_center; }
+  const T& operator()(std::ptrdiff_t i) const { return m_center[i * m_strides[0]]; }
+  const T& operator()(std::ptrdiff_t i, std::ptrdiff_t j) const {
+      return m_center[i * m_strides[0] + j * m_strides[1]];
+  }
+  const T& operator()(std::ptrdiff_t i, std::ptrdiff_t j, std::ptrdiff_t k) const {
+      return m_center[i * m_strides[0] + j * m_strides[1] + k * m_strides[2]];
+  }
+  const T& operator[](std::ptrdiff_t offset) const { return m_center[offset]; }
+
+  // Elements between neighbours along `axis`
+  std::ptrdiff_t stride(std::size_t axis) const { return m_strides[axis]; }
+
+private:
+  const T* m_center;
+  const std::ptrdiff_t* m_strides;
+};
+
+namespace detail {
+
+// Stencil tile: 4 KB of T along the last axis and 16 cells along the two
+// before it, so the rows a radius-1 or -2 stencil reads around one tile fit
+// in L2 even in 3-D
+constexpr std::size_t stencil_tile_bytes = 4096;
+constexpr std::size_t stencil_tile_rows = 16;
+
+} // namespace detail
+
+// out(x) = f(StencilPoint at interior cell x) for every interior cell of
+// `in`; out has the interior's shape (e.g. another grid's interior()) and
+// must not overlap in. The ghost layers must already be filled.
+template <class T, class U, class F>
+void apply_stencil(const HaloGrid<T>& in, ContiguousND<U>& out, F f) {
+    if (out.shape() != in.shape()) {
+        throw std::invalid_argument("apply_stencil(): out must have the grid's interior shape");
+    }
+    if (out.size() == 0) return;
+    const std::size_t nd = in.ndim();
+    const std::size_t last = nd - 1;
+    const std::size_t h = in.halo();
+    const ContiguousND<T>& padded = in.padded();
+    std::vector<std::ptrdiff_t> strides(nd);
+    for (std::size_t d = 0; d < nd; ++d) strides[d] = static_cast<std::ptrdiff_t>(padded.strides()[d]);
+    const T* origin = padded.data();
+    for (std::size_t d = 0; d < nd; ++d) origin += h * padded.strides()[d];
+
+    // Tile grid over the interior, tiles in row-major order
+    Extents tile(nd, 1), count(nd);
+    tile[last] = std::max<std::size_t>(1, detail::stencil_tile_bytes / sizeof(T));
+    for (std::size_t d = nd >= 3 ? nd - 3 : 0; d < last; ++d) tile[d] = detail::stencil_tile_rows;
+    std::size_t items = 1;
+    for (std::size_t d = 0; d < nd; ++d) {
+        count[d] = (in.shape()[d] + tile[d] - 1) / tile[d];
+        items *= count[d];
+    }
+
+    U* dst = out.data();
+    const Extents& ostrides = out.strides();
+    const std::size_t tasks = std::min(items, parallel_task_count(out.size()));
+    parallel_tasks(tasks, [&](std::size_t t) {
+        Extents lo(nd), hi(nd), idx(nd);
+        const std::ptrdiff_t* s = strides.data();
+        for (std::size_t item = items * t / tasks; item < items * (t + 1) / tasks; ++item) {
+            std::size_t rest = item;
+            for (std::size_t d = nd; d-- > 0;) {
+                lo[d] = rest % count[d] * tile[d];
+                hi[d] = std::min(lo[d] + tile[d], in.shape()[d]);
+                rest /= count[d];
+            }
+            // Rows of the tile, i.e. every index in it along the outer axes
+            idx = lo;
+            bool more = true;
+            while (more) {
+                const T* src = origin;
+                U* row = dst;
+                for (std::size_t d = 0; d < last; ++d) {
+                    src += idx[d] * strides[d];
+                    row += idx[d] * ostrides[d];
+                }
+                // The padded buffer is row-major, so cells along the last
+                // axis are adjacent
+                const std::size_t ostep = ostrides[last];
+                if (ostep == 1) {
+                    for (std::size_t i = lo[last]; i < hi[last]; ++i) {
+                        row[i] = f(StencilPoint<T>(src + i, s));
+                    }
+                } else {
+                    for (std::size_t i = lo[last]; i < hi[last]; ++i) {
+                        row[i * ostep] = f(StencilPoint<T>(src + i, s));
+                    }
+                }
+                more = false;
+                for (std::size_t d = last; d-- > 0;) {
+                    if (++idx[d] < hi[d]) {
+                        more = true;
+                        break;
+                    }
+                    idx[d] = lo[d];
+                }
+            }
+        }
+    });
+}
+
+} // namespace cnda
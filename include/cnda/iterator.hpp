@@ -0,0 +1,162 @@
+#pragma once
+#include <cstddef>
+#include <iterator>
+#include <vector>
+
+namespace cnda {
+
+// Row-major iteration over the elements of a (possibly strided) array.
+//
+// MultiIndexIterator keeps the multi-index and the element offset of its
+// position and carries both forward with additions, so a step costs one add
+// in the common case and never multiplies through the dimensions.
+// FlatIterator, returned by ContiguousND::begin()/end(), is a plain pointer
+// walk for contiguous arrays and a MultiIndexIterator otherwise.
+//
+// Both are STL forward iterators. They point into the array's shape and
+// strides, which must outlive them; iterators compare by flat position.
+
+template <class T>
+class MultiIndexIterator {
+public:
+  typedef std::forward_iterator_tag iterator_category;
+  typedef T value_type;
+  typedef std::ptrdiff_t difference_type;
+  typedef T* pointer;
+  typedef T& reference;
+
+  MultiIndexIterator() = default;
+
+  // Positioned at row-major element `flat` (flat == size gives the end)
+  MultiIndexIterator(T* data, const std::size_t* shape, const std::size_t* strides,
+                     std::size_t ndim, std::size_t flat)
+      : m_data(data), m_shape(shape), m_strides(strides), m_idx(ndim, 0), m_pos(flat)
+  {
+      std::size_t size = 1;
+      for (std::size_t d = 0; d < ndim; ++d) size *= shape[d];
+      if (flat >= size) return;
+      for (std::size_t d = ndim; d-- > 0; ) {
+          m_idx[d] = flat % m_shape[d];
+          flat /= m_shape[d];
+          m_off += m_idx[d] * m_strides[d];
+      }
+  }
+
+  reference operator*() const noexcept { return m_data[m_off]; }
+  pointer operator->() const noexcept { return m_data + m_off; }
+
+  MultiIndexIterator& operator++() noexcept {
+      ++m_pos;
+      for (std::size_t d = m_idx.size(); d-- > 0; ) {
+          m_off += m_strides[d];
+          if (++m_idx[d] < m_shape[d]) return *this;
+          m_off -= m_idx[d] * m_strides[d];
+          m_idx[d] = 0;
+      }
+      return *this;
+  }
+
+  MultiIndexIterator operator++(int) {
+      MultiIndexIterator old(*this);
+      ++*this;
+      return old;
+  }
+
+  bool operator==(const MultiIndexIterator& other) const noexcept { return m_pos == other.m_pos; }
+  bool operator!=(const MultiIndexIterator& other) const noexcept { return m_pos != other.m_pos; }
+
+  // Multi-index, element offset and row-major position of the current element
+  const std::vector<std::size_t>& index() const noexcept { return m_idx; }
+  std::size_t offset() const noexcept { return m_off; }
+  std::size_t position() const noexcept { return m_pos; }
+
+private:
+  T* m_data = nullptr;
+  const std::size_t* m_shape = nullptr;
+  const std::size_t* m_strides = nullptr;
+  std::vector<std::size_t> m_idx;
+  std::size_t m_off = 0;
+  std::size_t m_pos = 0;
+};
+
+template <class T>
+class FlatIterator {
+public:
+  typedef std::forward_iterator_tag iterator_category;
+  typedef T value_type;
+  typedef std::ptrdiff_t difference_type;
+  typedef T* pointer;
+  typedef T& reference;
+
+  FlatIterator() = default;
+
+  FlatIterator(T* data, const std::size_t* shape, const std::size_t* strides,
+               std::size_t ndim, bool contiguous, std::size_t flat)
+      : m_data(data), m_pos(flat), m_contiguous(contiguous)
+  {
+      // Only strided arrays need (and allocate) a multi-index
+      if (!contiguous) m_cursor = MultiIndexIterator<T>(data, shape, strides, ndim, flat);
+  }
+
+  reference operator*() const noexcept { return m_contiguous ? m_data[m_pos] : *m_cursor; }
+  pointer operator->() const noexcept { return &**this; }
+
+  FlatIterator& operator++() noexcept {
+      ++m_pos;
+      if (!m_contiguous) ++m_cursor;
+      return *this;
+  }
+
+  FlatIterator operator++(int) {
+      FlatIterator old(*this);
+      ++*this;
+      return old;
+  }
+
+  bool operator==(const FlatIterator& other) const noexcept { return m_pos == other.m_pos; }
+  bool operator!=(const FlatIterator& other) const noexcept { return m_pos != other.m_pos; }
+
+private:
+  T* m_data = nullptr;
+  std::size_t m_pos = 0;
+  bool m_contiguous = true;
+  MultiIndexIterator<T> m_cursor;
+};
+
+namespace detail {
+
+// for_each_index() over the raw shape/strides of a non-empty array:
+// f(idx, data[offset]) with idx a std::vector<std::size_t> multi-index
+template <class T, class F>
+void for_each_index(T* data, const std::size_t* shape, const std::size_t* strides,
+                    std::size_t ndim, F& f) {
+    std::vector<std::size_t> idx(ndim, 0);
+    if (ndim == 0) {
+        f(static_cast<const std::vector<std::size_t>&>(idx), data[0]);
+        return;
+    }
+    const std::size_t last = ndim - 1;
+    const std::size_t inner = shape[last];
+    const std::size_t step = strides[last];
+    std::size_t off = 0;
+    for (;;) {
+        T* p = data + off;
+        for (idx[last] = 0; idx[last] < inner; ++idx[last], p += step) {
+            f(static_cast<const std::vector<std::size_t>&>(idx), *p);
+        }
+        idx[last] = 0;
+        std::size_t d = last;
+        for (;;) {
+            if (d == 0) return;
+            --d;
+            off += strides[d];
+            if (++idx[d] < shape[d]) break;
+            off -= idx[d] * strides[d];
+            idx[d] = 0;
+        }
+    }
+}
+
+} // namespace detail
+
+} // namespace cnda
@@ -0,0 +1,143 @@
+#pragma once
+#include <cnda/contiguous_nd.hpp>
+#include <cnda/layout.hpp>
+#include <cnda/parallel.hpp>
+#include <cstddef>
+#include <cstdint>
+#include <stdexcept>
+#include <string>
+#include <type_traits>
+#include <vector>
+
+namespace cnda {
+
+// Element-wise kernels over ContiguousND, split across the default thread
+// pool (see parallel.hpp) for arrays above the parallel threshold.
+// Contiguous arrays run plain indexed loops the compiler can vectorize, and
+// so do views whose elements are evenly spaced (e.g. a field_view of a whole
+// AoS array); other strided views walk their elements in row-major order.
+// Operands of binary kernels must have equal shapes and must not partially
+// overlap; may_overlap() tells callers when to copy the source first.
+
+namespace detail {
+
+// f(element) for every element of a
+template <class T, class F>
+void apply(ContiguousND<T>& a, F f) {
+    T* p = a.data();
+    std::size_t step;
+    if (a.is_contiguous()) {
+        parallel_for(a.size(), [&](std::size_t begin, std::size_t end) {
+            for (std::size_t i = begin; i < end; ++i) f(p[i]);
+        });
+        return;
+    }
+    if (even_step(a, step)) {
+        parallel_for(a.size(), [&](std::size_t begin, std::size_t end) {
+            for (std::size_t i = begin; i < end; ++i) f(p[i * step]);
+        });
+        return;
+    }
+    parallel_for(a.size(), [&](std::size_t begin, std::size_t end) {
+        MultiIndexIterator<T> it = a.index_iterator(begin);
+        for (std::size_t i = begin; i < end; ++i, ++it) f(*it);
+    });
+}
+
+// f(dst element, src element) for every pair of elements in row-major order
+template <class T, class U, class F>
+void apply(ContiguousND<T>& dst, const ContiguousND<U>& src, F f, const char* who) {
+    if (dst.shape() != src.shape()) {
+        throw std::invalid_argument(std::string(who) + ": shape mismatch");
+    }
+    T* d = dst.data();
+    const U* s = src.data();
+    if (dst.is_contiguous() && src.is_contiguous()) {
+        parallel_for(dst.size(), [&](std::size_t begin, std::size_t end) {
+            for (std::size_t i = begin; i < end; ++i) f(d[i], s[i]);
+        });
+        return;
+    }
+    std::size_t dstep, sstep;
+    if (even_step(dst, dstep) && even_step(src, sstep)) {
+        parallel_for(dst.size(), [&](std::size_t begin, std::size_t end) {
+            for (std::size_t i = begin; i < end; ++i) f(d[i * dstep], s[i * sstep]);
+        });
+        return;
+    }
+    parallel_for(dst.size(), [&](std::size_t begin, std::size_t end) {
+        MultiIndexIterator<T> di = dst.index_iterator(begin);
+        MultiIndexIterator<const U> si = src.index_iterator(begin);
+        for (std::size_t i = begin; i < end; ++i, ++di, ++si) f(*di, *si);
+    });
+}
+
+// Bytes from the first to one past the last element of a (a non-empty)
+template <class T>
+std::size_t byte_extent(const ContiguousND<T>& a) {
+    std::size_t last = 0;
+    for (std::size_t d = 0; d < a.ndim(); ++d) last += (a.shape()[d] - 1) * a.strides()[d];
+    return (last + 1) * sizeof(T);
+}
+
+} // namespace detail
+
+// Whether the memory spanned by a and b intersects. Only the extents are
+// compared, so views that interleave without sharing an element (two fields
+// of one AoS array, say) also count as overlapping.
+template <class T, class U>
+bool may_overlap(const ContiguousND<T>& a, const ContiguousND<U>& b) {
+    if (a.size() == 0 || b.size() == 0) return false;
+    const std::uintptr_t a_lo = reinterpret_cast<std::uintptr_t>(a.data());
+    const std::uintptr_t b_lo = reinterpret_cast<std::uintptr_t>(b.data());
+    return a_lo < b_lo + detail::byte_extent(b) && b_lo < a_lo + detail::byte_extent(a);
+}
+
+// Every element = value
+template <class T>
+void fill(ContiguousND<T>& a, const T& value) {
+    detail::apply(a, [&](T& x) { x = value; });
+}
+
+// dst = src element by element, converting with static_cast when the
+// element types differ (e.g. double -> int32 truncates like NumPy's
+// unsafe casting).
+template <class T, class U>
+void copy_from(ContiguousND<T>& dst, const ContiguousND<U>& src) {
+    detail::apply(dst, src, [](T& d, const U& s) { d = static_cast<T>(s); }, "copy_from()");
+}
+
+// Same element type: the layouts may differ freely (see layout.hpp)
+template <class T>
+void copy_from(ContiguousND<T>& dst, const ContiguousND<T>& src) {
+    if (dst.shape() != src.shape()) {
+        throw std::invalid_argument("copy_from(): shape mismatch");
+    }
+    copy_to_layout(src, dst);
+}
+
+// a *= alpha
+template <class T>
+void scale(ContiguousND<T>& a, T alpha) {
+    static_assert(std::is_arithmetic<T>::value, "scale() needs an arithmetic element type");
+    detail::apply(a, [alpha](T& x) { x *= alpha; });
+}
+
+// y += alpha * x
+template <class T>
+void axpy(ContiguousND<T>& y, T alpha, const ContiguousND<T>& x) {
+    static_assert(std::is_arithmetic<T>::value, "axpy() needs an arithmetic element type");
+    detail::apply(y, x, [alpha](T& d, const T& s) { d += alpha * s; }, "axpy()");
+}
+
+// Every element limited to [lo, hi]
+template <class T>
+void clip(ContiguousND<T>& a, T lo, T hi) {
+    static_assert(std::is_arithmetic<T>::value, "clip() needs an arithmetic element type");
+    if (hi < lo) {
+        throw std::invalid_argument("clip(): lo must not exceed hi");
+    }
+    detail::apply(a, [lo, hi](T& x) { x = x < lo ? lo : (hi < x ? hi : x); });
+}
+
+} // namespace cnda
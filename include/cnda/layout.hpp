@@ -0,0 +1,205 @@
+#pragma once
+#include <cnda/contiguous_nd.hpp>
+#include <cnda/parallel.hpp>
+#include <algorithm>
+#include <cstddef>
+#include <stdexcept>
+#include <vector>
+
+namespace cnda {
+
+// Copies between arrays of the same shape whose memory layouts differ:
+// C <-> F order, axis permutations (transpose() views) and strided views.
+// The axes are put in the destination's memory order and merged where both
+// layouts allow, so most copies reduce to a handful of long runs. When the
+// source's fastest axis is not the destination's, elements are moved in
+// square tiles small enough to stay in L1, so both sides are read and
+// written a cache line at a time. Work is split across the default thread
+// pool (see parallel.hpp). flatten() and the copying case of ravel() use it
+// too.
+
+namespace detail {
+
+// True if the elements of `a`, in row-major order, are `step` elements apart
+// (step 1 for contiguous arrays)
+template <class T>
+bool even_step(const ContiguousND<T>& a, std::size_t& step) {
+    step = 1;
+    bool first = true;
+    std::size_t expected = 0;  // stride the next outer axis needs
+    for (std::size_t d = a.ndim(); d-- > 0;) {
+        if (a.shape()[d] == 1) continue;
+        if (first) {
+            step = expected = a.strides()[d];
+            first = false;
+        } else if (a.strides()[d] != expected) {
+            return false;
+        }
+        expected *= a.shape()[d];
+    }
+    return true;
+}
+
+// One axis of a layout copy: extent and strides (in elements) on each side
+struct CopyAxis {
+    std::size_t n;
+    std::size_t src;
+    std::size_t dst;
+};
+
+// Axes of extent > 1, slowest destination axis first, with neighbours that
+// are contiguous with each other in both layouts merged into one
+inline std::vector<CopyAxis> copy_axes(const Extents& shape, const Extents& src, const Extents& dst) {
+    std::vector<CopyAxis> axes;
+    for (std::size_t d = 0; d < shape.size(); ++d) {
+        if (shape[d] != 1) axes.push_back(CopyAxis{shape[d], src[d], dst[d]});
+    }
+    std::stable_sort(axes.begin(), axes.end(),
+                     [](const CopyAxis& a, const CopyAxis& b) { return a.dst > b.dst; });
+    std::vector<CopyAxis> merged;
+    for (const CopyAxis& a : axes) {
+        if (!merged.empty()) {
+            CopyAxis& outer = merged.back();
+            if (outer.src == a.src * a.n && outer.dst == a.dst * a.n) {
+                outer = CopyAxis{outer.n * a.n, a.src, a.dst};
+                continue;
+            }
+        }
+        merged.push_back(a);
+    }
+    return merged;
+}
+
+// Edge of the square tiles: 128 bytes of T per tile row
+template <class T>
+constexpr std::size_t transpose_tile() {
+    return sizeof(T) >= 64 ? 2 : 128 / sizeof(T);
+}
+
+// dst[i * dstep] = src[i * sstep] for i in [0, n)
+template <class T>
+void copy_run(const T* src, std::size_t sstep, T* dst, std::size_t dstep, std::size_t n) {
+    if (sstep == 1 && dstep == 1) {
+        std::copy(src, src + n, dst);
+        return;
+    }
+    for (std::size_t i = 0; i < n; ++i) dst[i * dstep] = src[i * sstep];
+}
+
+// Offsets of flat position `flat` over `axes` [0, count), row-major
+inline void offsets_of(const std::vector<CopyAxis>& axes, std::size_t count, std::size_t flat,
+                       std::size_t& src, std::size_t& dst) {
+    src = dst = 0;
+    for (std::size_t k = count; k-- > 0;) {
+        const std::size_t i = flat % axes[k].n;
+        flat /= axes[k].n;
+        src += i * axes[k].src;
+        dst += i * axes[k].dst;
+    }
+}
+
+} // namespace detail
+
+// dst = src for arrays of the same shape in any two layouts. The arrays
+// must not overlap.
+template <class T>
+void copy_to_layout(const ContiguousND<T>& src, ContiguousND<T>& dst) {
+    if (src.shape() != dst.shape()) {
+        throw std::invalid_argument("copy_to_layout(): shape mismatch");
+    }
+    if (src.size() == 0) return;
+    const std::vector<detail::CopyAxis> axes = detail::copy_axes(src.shape(), src.strides(), dst.strides());
+    const T* s = src.data();
+    T* d = dst.data();
+    if (axes.empty()) {
+        *d = *s;
+        return;
+    }
+    const std::size_t k = axes.size();
+    const detail::CopyAxis& inner = axes[k - 1];  // fastest destination axis
+    std::size_t b = k - 1;                          // fastest source axis
+    for (std::size_t j = 0; j + 1 < k; ++j) {
+        if (axes[j].src < axes[b].src) b = j;
+    }
+
+    const std::size_t tasks = parallel_task_count(src.size());
+    if (b == k - 1) {
+        // Both sides are fastest along the same axis: copy runs along it,
+        // splitting the elements evenly even when there are few runs
+        const std::size_t n = src.size();
+        parallel_tasks(tasks, [&](std::size_t t) {
+            const std::size_t end = n * (t + 1) / tasks;
+            std::size_t pos = n * t / tasks;
+            std::size_t row = pos / inner.n, col = pos % inner.n;
+            for (; pos < end; ++row, col = 0) {
+                const std::size_t len = std::min(inner.n - col, end - pos);
+                std::size_t so, dof;
+                detail::offsets_of(axes, k - 1, row, so, dof);
+                detail::copy_run(s + so + col * inner.src, inner.src, d + dof + col * inner.dst, inner.dst, len);
+                pos += len;
+            }
+        });
+        return;
+    }
+
+    // Tiles of B x B over the two fastest axes; the remaining axes (in
+    // destination order) and the tile grid are flattened into work items
+    const std::size_t B = detail::transpose_tile<T>();
+    const detail::CopyAxis& other = axes[b];
+    std::vector<detail::CopyAxis> outer;
+    for (std::size_t j = 0; j + 1 < k; ++j) {
+        if (j != b) outer.push_back(axes[j]);
+    }
+    const std::size_t tiles_b = (other.n + B - 1) / B;
+    const std::size_t tiles_a = (inner.n + B - 1) / B;
+    const std::size_t items = src.size() / (other.n * inner.n) * tiles_b * tiles_a;
+    parallel_tasks(tasks, [&](std::size_t t) {
+        for (std::size_t item = items * t / tasks; item < items * (t + 1) / tasks; ++item) {
+            const std::size_t ta = item % tiles_a;
+            const std::size_t tb = item / tiles_a % tiles_b;
+            std::size_t so, dof;
+            detail::offsets_of(outer, outer.size(), item / tiles_a / tiles_b, so, dof);
+            const std::size_t a0 = ta * B, a1 = std::min(a0 + B, inner.n);
+            const std::size_t b0 = tb * B, b1 = std::min(b0 + B, other.n);
+            for (std::size_t ib = b0; ib < b1; ++ib) {
+                const T* sp = s + so + ib * other.src;
+                T* dp = d + dof + ib * other.dst;
+                if (inner.dst == 1) {
+                    for (std::size_t ia = a0; ia < a1; ++ia) dp[ia] = sp[ia * inner.src];
+                } else {
+                    for (std::size_t ia = a0; ia < a1; ++ia) dp[ia * inner.dst] = sp[ia * inner.src];
+                }
+            }
+        }
+    });
+}
+
+// New owning 1-D array of the elements of a in row-major order
+template <class T>
+ContiguousND<T> flatten(const ContiguousND<T>& a) {
+    ContiguousND<T> out = ContiguousND<T>::empty(Extents{a.size()});
+    ContiguousND<T> dst = out.reshape(a.shape());
+    copy_to_layout(a, dst);
+    return out;
+}
+
+// 1-D array of the elements of a in row-major order: a view when they are
+// evenly spaced in memory (e.g. a is contiguous), otherwise a copy
+template <class T>
+ContiguousND<T> ravel(ContiguousND<T>& a) {
+    std::size_t step;
+    if (detail::even_step(a, step)) {
+        return ContiguousND<T>(Extents{a.size()}, Extents{step}, a.data(), a.shared_owner());
+    }
+    return flatten(a);
+}
+
+// New owning array holding the elements of src in the given order
+template <class T>
+ContiguousND<T> copy_in_order(const ContiguousND<T>& src, Order order) {
+    ContiguousND<T> out = ContiguousND<T>::empty(src.shape(), order);
+    copy_to_layout(src, out);
+    return out;
+}
+
+} // namespace cnda
@@ -0,0 +1,141 @@
+#pragma once
+#include <cstddef>
+#include <cstdlib>
+#include <memory>
+#include <mutex>
+#include <new>
+#include <stdexcept>
+
+#if defined(_WIN32)
+#include <malloc.h>
+#elif defined(__linux__)
+#include <sys/mman.h>
+#endif
+
+namespace cnda {
+
+// Default alignment of owning buffers: one cache line, enough for aligned
+// AVX-512 loads.
+constexpr std::size_t default_alignment = 64;
+
+// Alignment that lets Linux back a buffer with transparent huge pages
+constexpr std::size_t huge_page_alignment = std::size_t(2) << 20;
+
+// Allocate `bytes` of uninitialized memory aligned to `alignment` (a power of
+// two). Release with aligned_free(). Throws std::bad_alloc on failure and
+// std::invalid_argument for a bad alignment.
+inline void* aligned_allocate(std::size_t bytes, std::size_t alignment) {
+    if (alignment == 0 || (alignment & (alignment - 1)) != 0) {
+        throw std::invalid_argument("aligned_allocate: alignment must be a power of two");
+    }
+    if (alignment < sizeof(void*)) {
+        alignment = sizeof(void*);
+    }
+    if (bytes == 0) {
+        bytes = 1;
+    }
+
+    void* p = nullptr;
+#if defined(_WIN32)
+    p = _aligned_malloc(bytes, alignment);
+#else
+    if (posix_memalign(&p, alignment, bytes) != 0) {
+        p = nullptr;
+    }
+#endif
+    if (!p) {
+        throw std::bad_alloc();
+    }
+
+#if defined(__linux__) && defined(MADV_HUGEPAGE)
+    if (alignment >= huge_page_alignment) {
+        // Advisory only: ignore failures (e.g. THP disabled)
+        madvise(p, bytes, MADV_HUGEPAGE);
+    }
+#endif
+    return p;
+}
+
+inline void aligned_free(void* p) noexcept {
+#if defined(_WIN32)
+    _aligned_free(p);
+#else
+    std::free(p);
+#endif
+}
+
+/**
+ * @brief Source of the owning buffers of ContiguousND
+ *
+ * allocate() returns uninitialized memory of at least `bytes` bytes aligned
+ * to `alignment` (a power of two) or throws; deallocate() receives the same
+ * size and alignment back. Buffers may be released from any thread, so
+ * implementations must be thread-safe. Every buffer keeps its allocator
+ * alive until it is released.
+ */
+class Allocator {
+public:
+  virtual ~Allocator() {}
+  virtual void* allocate(std::size_t bytes, std::size_t alignment) = 0;
+  virtual void deallocate(void* p, std::size_t bytes, std::size_t alignment) noexcept = 0;
+};
+
+// aligned_allocate() / aligned_free(): the default
+class AlignedAllocator : public Allocator {
+public:
+  void* allocate(std::size_t bytes, std::size_t alignment) override {
+      return aligned_allocate(bytes, alignment);
+  }
+  void deallocate(void* p, std::size_t, std::size_t) noexcept override {
+      aligned_free(p);
+  }
+};
+
+namespace detail {
+
+struct allocator_settings {
+    std::mutex mutex;
+    std::shared_ptr<Allocator> allocator = std::make_shared<AlignedAllocator>();
+};
+
+// Never destroyed, like the thread pool settings: buffers released during
+// static destruction still find their allocator.
+inline allocator_settings& allocator_state() {
+    static allocator_settings* s = new allocator_settings();
+    return *s;
+}
+
+} // namespace detail
+
+// Allocator used by ContiguousND constructors that are not given one;
+// nullptr restores AlignedAllocator. Existing buffers are unaffected.
+inline void set_default_allocator(std::shared_ptr<Allocator> allocator) {
+    detail::allocator_settings& s = detail::allocator_state();
+    if (!allocator) allocator = std::make_shared<AlignedAllocator>();
+    std::lock_guard<std::mutex> lock(s.mutex);
+    s.allocator = std::move(allocator);
+}
+
+inline std::shared_ptr<Allocator> get_default_allocator() {
+    detail::allocator_settings& s = detail::allocator_state();
+    std::lock_guard<std::mutex> lock(s.mutex);
+    return s.allocator;
+}
+
+namespace detail {
+
+// Buffer from `allocator` (the default one if null), returned to it when
+// the last reference goes away
+inline std::shared_ptr<void> allocate_buffer(std::size_t bytes, std::size_t alignment,
+                                             std::shared_ptr<Allocator> allocator) {
+    if (!allocator) allocator = get_default_allocator();
+    void* p = allocator->allocate(bytes, alignment);
+    // If the control block cannot be allocated, shared_ptr runs the deleter
+    return std::shared_ptr<void>(p, [allocator, bytes, alignment](void* q) {
+        allocator->deallocate(q, bytes, alignment);
+    });
+}
+
+} // namespace detail
+
+} // namespace cnda
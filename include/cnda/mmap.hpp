@@ -0,0 +1,255 @@
+#pragma once
+#include <cnda/contiguous_nd.hpp>
+#include <cnda/npy.hpp>
+#include <cstddef>
+#include <cstdint>
+#include <memory>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+#if defined(_WIN32)
+#ifndef NOMINMAX
+#define NOMINMAX
+#endif
+#ifndef WIN32_LEAN_AND_MEAN
+#define WIN32_LEAN_AND_MEAN
+#endif
+#include <windows.h>
+#else
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
+
+namespace cnda {
+
+// How a file is mapped, mirroring numpy.memmap's modes
+enum class MapMode {
+    read_only,      // 'r':  pages are read-only; writing through the array is undefined
+    read_write,     // 'r+': writes go to the file
+    copy_on_write   // 'c':  writes stay private to this mapping
+};
+
+// Access-pattern hints for the kernel (madvise)
+enum class MapAdvice { normal, sequential, random, willneed };
+
+/**
+ * @brief A read-only, read-write or copy-on-write mapping of part of a file
+ *
+ * Pages are faulted in lazily on first access, so opening a large file costs
+ * nothing until its elements are touched. The mapping is released when the
+ * object is destroyed; ContiguousND views keep it alive through their owner.
+ */
+class MappedFile {
+public:
+  // Map `length` bytes of `path` starting at byte `offset`. length == 0 maps
+  // nothing (data() is null), which is what an empty array needs.
+  MappedFile(const std::string& path, MapMode mode, std::size_t offset, std::size_t length)
+      : m_mode(mode), m_length(length)
+  {
+      open_and_map(path, offset);
+  }
+
+  MappedFile(const MappedFile&) = delete;
+  MappedFile& operator=(const MappedFile&) = delete;
+
+  ~MappedFile() { unmap(); }
+
+  void* data() const noexcept { return m_data; }
+  std::size_t size() const noexcept { return m_length; }
+  MapMode mode() const noexcept { return m_mode; }
+
+  // Write dirty pages of a read-write mapping back to the file. A no-op for
+  // the other modes.
+  void flush() {
+      if (m_mode != MapMode::read_write || m_length == 0) return;
+#if defined(_WIN32)
+      if (!FlushViewOfFile(m_base, 0) || !FlushFileBuffers(m_file)) {
+          throw std::runtime_error("MappedFile: flush failed");
+      }
+#else
+      if (msync(m_base, m_base_length, MS_SYNC) != 0) {
+          throw std::runtime_error("MappedFile: flush failed");
+      }
+#endif
+  }
+
+  // Tell the kernel how the mapping will be accessed. Advisory only:
+  // unsupported hints are ignored.
+  void advise(MapAdvice advice) {
+      if (m_length == 0) return;
+#if defined(_WIN32)
+      (void)advice;
+#else
+      int flag = MADV_NORMAL;
+      switch (advice) {
+      case MapAdvice::normal: flag = MADV_NORMAL; break;
+      case MapAdvice::sequential: flag = MADV_SEQUENTIAL; break;
+      case MapAdvice::random: flag = MADV_RANDOM; break;
+      case MapAdvice::willneed: flag = MADV_WILLNEED; break;
+      }
+      madvise(m_base, m_base_length, flag);
+#endif
+  }
+
+private:
+  MapMode m_mode;
+  std::size_t m_length;
+  void* m_data = nullptr;       // first requested byte
+  void* m_base = nullptr;       // start of the mapping (granularity-aligned)
+  std::size_t m_base_length = 0;
+#if defined(_WIN32)
+  HANDLE m_file = INVALID_HANDLE_VALUE;
+  HANDLE m_mapping = nullptr;
+#endif
+
+  void open_and_map(const std::string& path, std::size_t offset) {
+#if defined(_WIN32)
+      const DWORD access = m_mode == MapMode::read_write ? (GENERIC_READ | GENERIC_WRITE) : GENERIC_READ;
+      m_file = CreateFileA(path.c_str(), access, FILE_SHARE_READ | FILE_SHARE_WRITE, nullptr,
+                           OPEN_EXISTING, FILE_ATTRIBUTE_NORMAL, nullptr);
+      if (m_file == INVALID_HANDLE_VALUE) {
+          throw std::runtime_error("MappedFile: cannot open '" + path + "'");
+      }
+      LARGE_INTEGER file_size;
+      if (!GetFileSizeEx(m_file, &file_size)) {
+          unmap();
+          throw std::runtime_error("MappedFile: cannot stat '" + path + "'");
+      }
+      try {
+          check_extent(static_cast<std::uint64_t>(file_size.QuadPart), offset, path);
+      } catch (...) {
+          unmap();
+          throw;
+      }
+      if (m_length == 0) return;
+
+      const DWORD protect = m_mode == MapMode::read_write ? PAGE_READWRITE
+                          : m_mode == MapMode::copy_on_write ? PAGE_WRITECOPY : PAGE_READONLY;
+      m_mapping = CreateFileMappingA(m_file, nullptr, protect, 0, 0, nullptr);
+      if (!m_mapping) {
+          unmap();
+          throw std::runtime_error("MappedFile: cannot map '" + path + "'");
+      }
+      SYSTEM_INFO info;
+      GetSystemInfo(&info);
+      const std::size_t gran = info.dwAllocationGranularity;
+      const std::uint64_t base_off = (offset / gran) * gran;
+      m_base_length = m_length + static_cast<std::size_t>(offset - base_off);
+      const DWORD view_access = m_mode == MapMode::read_write ? FILE_MAP_WRITE
+                              : m_mode == MapMode::copy_on_write ? FILE_MAP_COPY : FILE_MAP_READ;
+      m_base = MapViewOfFile(m_mapping, view_access, static_cast<DWORD>(base_off >> 32),
+                             static_cast<DWORD>(base_off & 0xffffffffu), m_base_length);
+      if (!m_base) {
+          unmap();
+          throw std::runtime_error("MappedFile: cannot map '" + path + "'");
+      }
+#else
+      const int fd = ::open(path.c_str(), m_mode == MapMode::read_write ? O_RDWR : O_RDONLY);
+      if (fd < 0) {
+          throw std::runtime_error("MappedFile: cannot open '" + path + "'");
+      }
+      struct stat st;
+      if (fstat(fd, &st) != 0) {
+          ::close(fd);
+          throw std::runtime_error("MappedFile: cannot stat '" + path + "'");
+      }
+      try {
+          check_extent(static_cast<std::uint64_t>(st.st_size), offset, path);
+      } catch (...) {
+          ::close(fd);
+          throw;
+      }
+      if (m_length == 0) {
+          ::close(fd);
+          return;
+      }
+
+      const std::size_t page = static_cast<std::size_t>(sysconf(_SC_PAGESIZE));
+      const std::size_t base_off = (offset / page) * page;
+      m_base_length = m_length + (offset - base_off);
+      const int prot = m_mode == MapMode::read_only ? PROT_READ : (PROT_READ | PROT_WRITE);
+      const int flags = m_mode == MapMode::read_write ? MAP_SHARED : MAP_PRIVATE;
+      void* p = mmap(nullptr, m_base_length, prot, flags, fd, static_cast<off_t>(base_off));
+      ::close(fd);  // the mapping keeps its own reference to the file
+      if (p == MAP_FAILED) {
+          throw std::runtime_error("MappedFile: cannot map '" + path + "'");
+      }
+      m_base = p;
+#endif
+      m_data = static_cast<unsigned char*>(m_base) + (offset - base_off);
+  }
+
+  void check_extent(std::uint64_t file_size, std::size_t offset, const std::string& path) const {
+      if (offset > file_size || m_length > file_size - offset) {
+          throw std::invalid_argument("MappedFile: '" + path + "' is too small for the requested array");
+      }
+  }
+
+  void unmap() noexcept {
+#if defined(_WIN32)
+      if (m_base) UnmapViewOfFile(m_base);
+      if (m_mapping) CloseHandle(m_mapping);
+      if (m_file != INVALID_HANDLE_VALUE) CloseHandle(m_file);
+      m_mapping = nullptr;
+      m_file = INVALID_HANDLE_VALUE;
+#else
+      if (m_base) munmap(m_base, m_base_length);
+#endif
+      m_base = nullptr;
+      m_data = nullptr;
+  }
+};
+
+namespace detail {
+
+// Deleter type that tags an owner as a MappedFile, so mapped_file_of() can
+// recover it from a type-erased shared_ptr<void>.
+struct mapped_file_deleter {
+    void operator()(void* p) const { delete static_cast<MappedFile*>(p); }
+};
+
+} // namespace detail
+
+// The mapping behind an array's owner(), or nullptr if it is not file-backed
+inline MappedFile* mapped_file_of(const std::shared_ptr<void>& owner) {
+    if (owner && std::get_deleter<detail::mapped_file_deleter>(owner)) {
+        return static_cast<MappedFile*>(owner.get());
+    }
+    return nullptr;
+}
+
+// Map `shape` elements of raw T data stored row-major in `path` at byte
+// `offset`. The returned array is a view: it owns the mapping, and slices
+// of it share that ownership.
+template <class T>
+ContiguousND<T> open_mmap(const std::string& path, const std::vector<std::size_t>& shape,
+                          MapMode mode = MapMode::read_only, std::size_t offset = 0) {
+    if (offset % alignof(T) != 0) {
+        throw std::invalid_argument("open_mmap(): offset is not aligned for the element type");
+    }
+    std::size_t count = 1;
+    for (std::size_t d : shape) count *= d;
+    std::shared_ptr<void> owner(new MappedFile(path, mode, offset, count * sizeof(T)),
+                                detail::mapped_file_deleter());
+    T* data = static_cast<T*>(static_cast<MappedFile*>(owner.get())->data());
+    return ContiguousND<T>(shape, data, owner);
+}
+
+// Map the array stored in a .npy file. Its dtype must be T and it must be
+// C-ordered.
+template <class T>
+ContiguousND<T> open_npy_mmap(const std::string& path, MapMode mode = MapMode::read_only) {
+    const npy::Header h = npy::read_header(path);
+    if (!npy::descr_matches<T>(h.descr)) {
+        throw std::invalid_argument("open_npy_mmap(): file dtype " + h.descr + " does not match " + npy::descr<T>());
+    }
+    if (h.fortran_order) {
+        throw std::invalid_argument("open_npy_mmap(): Fortran-ordered arrays are not supported");
+    }
+    return open_mmap<T>(path, h.shape, mode, h.data_offset);
+}
+
+} // namespace cnda
@@ -0,0 +1,275 @@
+#pragma once
+#include <cnda/contiguous_nd.hpp>
+#include <cnda/parallel.hpp>
+#include <algorithm>
+#include <array>
+#include <cstddef>
+#include <cstdint>
+#include <memory>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+namespace cnda {
+
+// Z-order (Morton) indexing and a bricked array layout built on it.
+//
+// In a row-major n^3 grid, cells next to each other along axis 0 are n^2
+// elements apart, so a sweep that steps along it touches a new page (and
+// TLB entry) on every access. MortonArray stores the grid as bricks of
+// 2^b cells per side; inside a brick the cells follow the Z-order curve, so
+// neighbours along every axis are usually in the same brick, and a brick is
+// a few KB. Bricks themselves are row-major, which keeps the padding to at
+// most one partial brick per axis for any shape.
+
+namespace morton {
+
+// Bits of x moved to every second (spread2) or third (spread3) position:
+// abc -> a0b0c / a00b00c. spread2 takes 32 bits, spread3 21 bits.
+inline std::uint64_t spread2(std::uint64_t x) {
+    x &= 0xffffffffULL;
+    x = (x | (x << 16)) & 0x0000ffff0000ffffULL;
+    x = (x | (x << 8)) & 0x00ff00ff00ff00ffULL;
+    x = (x | (x << 4)) & 0x0f0f0f0f0f0f0f0fULL;
+    x = (x | (x << 2)) & 0x3333333333333333ULL;
+    x = (x | (x << 1)) & 0x5555555555555555ULL;
+    return x;
+}
+
+inline std::uint64_t spread3(std::uint64_t x) {
+    x &= 0x1fffffULL;
+    x = (x | (x << 32)) & 0x001f00000000ffffULL;
+    x = (x | (x << 16)) & 0x001f0000ff0000ffULL;
+    x = (x | (x << 8)) & 0x100f00f00f00f00fULL;
+    x = (x | (x << 4)) & 0x10c30c30c30c30c3ULL;
+    x = (x | (x << 2)) & 0x1249249249249249ULL;
+    return x;
+}
+
+// Inverses of spread2 / spread3
+inline std::uint64_t compact2(std::uint64_t x) {
+    x &= 0x5555555555555555ULL;
+    x = (x | (x >> 1)) & 0x3333333333333333ULL;
+    x = (x | (x >> 2)) & 0x0f0f0f0f0f0f0f0fULL;
+    x = (x | (x >> 4)) & 0x00ff00ff00ff00ffULL;
+    x = (x | (x >> 8)) & 0x0000ffff0000ffffULL;
+    x = (x | (x >> 16)) & 0x00000000ffffffffULL;
+    return x;
+}
+
+inline std::uint64_t compact3(std::uint64_t x) {
+    x &= 0x1249249249249249ULL;
+    x = (x | (x >> 2)) & 0x10c30c30c30c30c3ULL;
+    x = (x | (x >> 4)) & 0x100f00f00f00f00fULL;
+    x = (x | (x >> 8)) & 0x001f0000ff0000ffULL;
+    x = (x | (x >> 16)) & 0x001f00000000ffffULL;
+    x = (x | (x >> 32)) & 0x00000000001fffffULL;
+    return x;
+}
+
+// Morton code of (i, j) / (i, j, k); the last index supplies the lowest bit
+inline std::uint64_t encode(std::uint32_t i, std::uint32_t j) {
+    return (spread2(i) << 1) | spread2(j);
+}
+
+inline std::uint64_t encode(std::uint32_t i, std::uint32_t j, std::uint32_t k) {
+    return (spread3(i) << 2) | (spread3(j) << 1) | spread3(k);
+}
+
+inline void decode(std::uint64_t code, std::uint32_t& i, std::uint32_t& j) {
+    i = static_cast<std::uint32_t>(compact2(code >> 1));
+    j = static_cast<std::uint32_t>(compact2(code));
+}
+
+inline void decode(std::uint64_t code, std::uint32_t& i, std::uint32_t& j, std::uint32_t& k) {
+    i = static_cast<std::uint32_t>(compact3(code >> 2));
+    j = static_cast<std::uint32_t>(compact3(code >> 1));
+    k = static_cast<std::uint32_t>(compact3(code));
+}
+
+} // namespace morton
+
+/**
+ * @brief 2-D or 3-D array stored as Z-ordered bricks
+ *
+ * Same element access as ContiguousND<T, N> through operator()(i, j[, k]),
+ * but the memory order is bricked: bricks of brick_side^N cells (16 x 16 in
+ * 2-D, 8 x 8 x 8 in 3-D) in row-major order, and Z-order inside each brick.
+ * Converting from and to row-major arrays copies brick by brick on the
+ * default thread pool. Owning and move-only; cells in the padding of
+ * partial bricks are zero and never visited.
+ */
+template <class T, std::size_t N>
+class MortonArray {
+  static_assert(N == 2 || N == 3, "MortonArray supports 2-D and 3-D arrays");
+
+public:
+  typedef std::array<std::size_t, N> shape_type;
+
+  static const unsigned brick_bits = N == 2 ? 4 : 3;
+  static const std::size_t brick_side = std::size_t(1) << brick_bits;
+  static const std::size_t brick_size = std::size_t(1) << (N * brick_bits);
+
+  // Zero-filled
+  explicit MortonArray(const shape_type& shape, std::size_t alignment = default_alignment,
+                       std::shared_ptr<Allocator> allocator = nullptr)
+      : m_shape(shape), m_size(1), m_storage(Extents{padded_size(shape)}, alignment, std::move(allocator))
+  {
+      // offset(i, j, k) = m_axis[0][i] + m_axis[1][j] + m_axis[2][k]: the
+      // bricks' row-major offsets plus the index's bits of the Morton code
+      std::size_t brick_stride = brick_size;
+      for (std::size_t d = N; d-- > 0;) {
+          m_size *= shape[d];
+          m_axis[d].resize(shape[d]);
+          for (std::size_t x = 0; x < shape[d]; ++x) {
+              const std::uint64_t bits = N == 2 ? morton::spread2(x & (brick_side - 1))
+                                                : morton::spread3(x & (brick_side - 1));
+              m_axis[d][x] = (x >> brick_bits) * brick_stride + static_cast<std::size_t>(bits << (N - 1 - d));
+          }
+          brick_stride *= (shape[d] + brick_side - 1) >> brick_bits;
+      }
+      m_data = m_storage.data();
+  }
+
+  // Bricked copy of a row-major (or any strided) array of rank N
+  static MortonArray from(const ContiguousND<T>& src) {
+      if (src.ndim() != N) throw std::invalid_argument("MortonArray: rank mismatch");
+      shape_type shape;
+      for (std::size_t d = 0; d < N; ++d) shape[d] = src.shape()[d];
+      MortonArray out(shape);
+      out.copy_from(src);
+      return out;
+  }
+
+  MortonArray(MortonArray&&) = default;
+  MortonArray& operator=(MortonArray&&) = default;
+
+  const shape_type& shape() const noexcept { return m_shape; }
+  std::size_t ndim() const noexcept { return N; }
+  std::size_t size() const noexcept { return m_size; }
+
+  // The bricks, padding included
+  T* data() noexcept { return m_data; }
+  const T* data() const noexcept { return m_data; }
+  std::size_t storage_size() const noexcept { return m_storage.size(); }
+
+  // Position of a cell in data()
+  std::size_t offset(std::size_t i, std::size_t j) const noexcept {
+      static_assert(N == 2, "MortonArray: two indices need a 2-D array");
+      return m_axis[0][i] + m_axis[1][j];
+  }
+
+  std::size_t offset(std::size_t i, std::size_t j, std::size_t k) const noexcept {
+      static_assert(N == 3, "MortonArray: three indices need a 3-D array");
+      return m_axis[0][i] + m_axis[1][j] + m_axis[2][k];
+  }
+
+  // Unchecked element access, as ContiguousND::operator()
+  T& operator()(std::size_t i, std::size_t j) noexcept { return m_data[offset(i, j)]; }
+  const T& operator()(std::size_t i, std::size_t j) const noexcept { return m_data[offset(i, j)]; }
+  T& operator()(std::size_t i, std::size_t j, std::size_t k) noexcept { return m_data[offset(i, j, k)]; }
+  const T& operator()(std::size_t i, std::size_t j, std::size_t k) const noexcept {
+      return m_data[offset(i, j, k)];
+  }
+
+  // this = src, for src of the same shape in any layout
+  void copy_from(const ContiguousND<T>& src) {
+      check_shape(src, "copy_from()");
+      const T* s = src.data();
+      for_each_row([&](const shape_type& idx, std::size_t len, T* row, const std::size_t* col) {
+          std::size_t so = 0;
+          for (std::size_t d = 0; d < N; ++d) so += idx[d] * src.strides()[d];
+          const std::size_t step = src.strides()[N - 1];
+          for (std::size_t k = 0; k < len; ++k) row[col[k]] = s[so + k * step];
+      });
+  }
+
+  // dst = this, for dst of the same shape in any layout
+  void copy_to(ContiguousND<T>& dst) const {
+      check_shape(dst, "copy_to()");
+      T* t = dst.data();
+      for_each_row([&](const shape_type& idx, std::size_t len, const T* row, const std::size_t* col) {
+          std::size_t to = 0;
+          for (std::size_t d = 0; d < N; ++d) to += idx[d] * dst.strides()[d];
+          const std::size_t step = dst.strides()[N - 1];
+          for (std::size_t k = 0; k < len; ++k) t[to + k * step] = row[col[k]];
+      });
+  }
+
+  // New row-major array with the same elements
+  ContiguousND<T> to_contiguous() const {
+      ContiguousND<T> out = ContiguousND<T>::empty(Extents(m_shape.data(), m_shape.data() + N));
+      copy_to(out);
+      return out;
+  }
+
+private:
+  shape_type m_shape;
+  std::size_t m_size;
+  std::array<std::vector<std::size_t>, N> m_axis;  // each index's share of the offset
+  ContiguousND<T> m_storage;
+  T* m_data;
+
+  static std::size_t padded_size(const shape_type& shape) {
+      std::size_t n = 1;
+      for (std::size_t d = 0; d < N; ++d) n *= (shape[d] + brick_side - 1) >> brick_bits << brick_bits;
+      return n;
+  }
+
+  void check_shape(const ContiguousND<T>& a, const char* who) const {
+      bool same = a.ndim() == N;
+      for (std::size_t d = 0; same && d < N; ++d) same = a.shape()[d] == m_shape[d];
+      if (!same) throw std::invalid_argument(std::string("MortonArray::") + who + ": shape mismatch");
+  }
+
+  // f(idx, len, row, col) for the rows of every brick: the cells from idx
+  // to idx + (0, ..., len - 1) are at row[col[0]], ..., row[col[len - 1]].
+  // Bricks are split across the default pool.
+  template <class F>
+  void for_each_row(F f) const {
+      if (m_size == 0) return;
+      shape_type count;
+      std::size_t bricks = 1;
+      for (std::size_t d = 0; d < N; ++d) {
+          count[d] = (m_shape[d] + brick_side - 1) >> brick_bits;
+          bricks *= count[d];
+      }
+      const std::size_t tasks = std::min(bricks, parallel_task_count(m_size));
+      parallel_tasks(tasks, [&](std::size_t t) {
+          shape_type lo, hi, idx;
+          for (std::size_t b = bricks * t / tasks; b < bricks * (t + 1) / tasks; ++b) {
+              std::size_t rest = b;
+              for (std::size_t d = N; d-- > 0;) {
+                  lo[d] = rest % count[d] << brick_bits;
+                  hi[d] = std::min(lo[d] + brick_side, m_shape[d]);
+                  rest /= count[d];
+              }
+              idx = lo;
+              bool more = true;
+              while (more) {
+                  std::size_t outer = 0;
+                  for (std::size_t d = 0; d + 1 < N; ++d) outer += m_axis[d][idx[d]];
+                  f(static_cast<const shape_type&>(idx), hi[N - 1] - lo[N - 1], m_data + outer,
+                    m_axis[N - 1].data() + lo[N - 1]);
+                  more = false;
+                  for (std::size_t d = N - 1; d-- > 0;) {
+                      if (++idx[d] < hi[d]) {
+                          more = true;
+                          break;
+                      }
+                      idx[d] = lo[d];
+                  }
+              }
+          }
+      });
+  }
+};
+
+template <class T, std::size_t N>
+const unsigned MortonArray<T, N>::brick_bits;
+template <class T, std::size_t N>
+const std::size_t MortonArray<T, N>::brick_side;
+template <class T, std::size_t N>
+const std::size_t MortonArray<T, N>::brick_size;
+
+} // namespace cnda
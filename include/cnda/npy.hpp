@@ -0,0 +1,353 @@
+#pragma once
+#include <cnda/aos_types.hpp>
+#include <cnda/contiguous_nd.hpp>
+#include <algorithm>
+#include <cstddef>
+#include <cstdint>
+#include <cstring>
+#include <fstream>
+#include <stdexcept>
+#include <string>
+#include <type_traits>
+#include <vector>
+
+namespace cnda {
+namespace npy {
+
+// NumPy .npy files: header parsing (format versions 1.0-3.0), save() and
+// load() for ContiguousND, and a Writer that streams data in pieces.
+// See https://numpy.org/doc/stable/reference/generated/numpy.lib.format.html
+
+struct Header {
+    std::string descr;               // dtype.descr as written, e.g. "<f4" or "[('x', '<f4'), ...]"
+    bool fortran_order = false;
+    std::vector<std::size_t> shape;
+    std::size_t data_offset = 0;     // bytes from the start of the file to the array data
+};
+
+namespace detail {
+
+inline bool host_is_little_endian() {
+    const std::uint16_t probe = 1;
+    unsigned char first;
+    std::memcpy(&first, &probe, 1);
+    return first == 1;
+}
+
+inline std::string scalar_descr(char kind, std::size_t size) {
+    const char order = size == 1 ? '|' : (host_is_little_endian() ? '<' : '>');
+    return std::string(1, order) + kind + std::to_string(size);
+}
+
+template <class T>
+std::string descr_of(std::true_type /* arithmetic */) {
+    return scalar_descr(aos::field_kind<T>(), sizeof(T));
+}
+
+template <class T>
+std::string descr_of(std::false_type /* described struct */) {
+    const aos::FieldInfo* f = aos::struct_fields<T>::get();
+    std::string out = "[";
+    for (std::size_t i = 0; i < aos::struct_fields<T>::count; ++i) {
+        if (i > 0) out += ", ";
+        out += "('" + std::string(f[i].name) + "', '" + scalar_descr(f[i].kind, f[i].size) + "')";
+    }
+    return out + "]";
+}
+
+inline std::string strip_spaces(const std::string& s) {
+    std::string out;
+    for (char c : s) {
+        if (c != ' ') out += c;
+    }
+    return out;
+}
+
+// Value that follows 'key': in a Python dict literal, up to the end of that
+// value (a quoted string, a bracketed list/tuple, or a bare word).
+inline std::string dict_value(const std::string& dict, const std::string& key) {
+    const std::string needle = "'" + key + "'";
+    std::size_t pos = dict.find(needle);
+    if (pos == std::string::npos) {
+        throw std::runtime_error("npy: header has no '" + key + "' entry");
+    }
+    pos = dict.find(':', pos + needle.size());
+    if (pos == std::string::npos) {
+        throw std::runtime_error("npy: malformed header");
+    }
+    ++pos;
+    while (pos < dict.size() && dict[pos] == ' ') ++pos;
+    if (pos >= dict.size()) {
+        throw std::runtime_error("npy: malformed header");
+    }
+
+    const char open = dict[pos];
+    if (open == '\'' || open == '"') {
+        const std::size_t end = dict.find(open, pos + 1);
+        if (end == std::string::npos) throw std::runtime_error("npy: malformed header");
+        return dict.substr(pos + 1, end - pos - 1);
+    }
+    if (open == '[' || open == '(') {
+        int depth = 0;
+        char quote = 0;
+        for (std::size_t i = pos; i < dict.size(); ++i) {
+            const char c = dict[i];
+            if (quote) {
+                if (c == quote) quote = 0;
+            } else if (c == '\'' || c == '"') {
+                quote = c;
+            } else if (c == '[' || c == '(') {
+                ++depth;
+            } else if (c == ']' || c == ')') {
+                if (--depth == 0) return dict.substr(pos, i - pos + 1);
+            }
+        }
+        throw std::runtime_error("npy: malformed header");
+    }
+    std::size_t end = pos;
+    while (end < dict.size() && dict[end] != ',' && dict[end] != '}') ++end;
+    return strip_spaces(dict.substr(pos, end - pos));
+}
+
+inline std::vector<std::size_t> parse_shape(const std::string& tuple) {
+    std::vector<std::size_t> shape;
+    std::size_t i = 1;  // skip '('
+    while (i < tuple.size()) {
+        while (i < tuple.size() && (tuple[i] == ' ' || tuple[i] == ',')) ++i;
+        if (i >= tuple.size() || tuple[i] == ')') break;
+        std::size_t v = 0;
+        bool any = false;
+        while (i < tuple.size() && tuple[i] >= '0' && tuple[i] <= '9') {
+            v = v * 10 + static_cast<std::size_t>(tuple[i] - '0');
+            ++i;
+            any = true;
+        }
+        if (!any) throw std::runtime_error("npy: malformed shape in header");
+        shape.push_back(v);
+    }
+    return shape;
+}
+
+} // namespace detail
+
+// descr string NumPy writes for T: "<f4" for float, a field list for the
+// cnda::aos structs.
+template <class T>
+std::string descr() {
+    return detail::descr_of<T>(typename std::is_arithmetic<T>::type());
+}
+
+// True if a header descr describes exactly T (whitespace-insensitive)
+template <class T>
+bool descr_matches(const std::string& header_descr) {
+    return detail::strip_spaces(header_descr) == detail::strip_spaces(descr<T>());
+}
+
+inline Header read_header(std::istream& in) {
+    char magic[8];
+    in.read(magic, 8);
+    if (!in || std::memcmp(magic, "\x93NUMPY", 6) != 0) {
+        throw std::runtime_error("npy: not a .npy file");
+    }
+    const unsigned char major = static_cast<unsigned char>(magic[6]);
+    std::size_t header_len = 0;
+    std::size_t prefix = 10;
+    if (major == 1) {
+        unsigned char len[2];
+        in.read(reinterpret_cast<char*>(len), 2);
+        header_len = static_cast<std::size_t>(len[0]) | (static_cast<std::size_t>(len[1]) << 8);
+    } else if (major == 2 || major == 3) {
+        unsigned char len[4];
+        in.read(reinterpret_cast<char*>(len), 4);
+        header_len = static_cast<std::size_t>(len[0]) | (static_cast<std::size_t>(len[1]) << 8) |
+                     (static_cast<std::size_t>(len[2]) << 16) | (static_cast<std::size_t>(len[3]) << 24);
+        prefix = 12;
+    } else {
+        throw std::runtime_error("npy: unsupported format version");
+    }
+
+    std::string dict(header_len, '\0');
+    in.read(&dict[0], static_cast<std::streamsize>(header_len));
+    if (!in) {
+        throw std::runtime_error("npy: truncated header");
+    }
+
+    Header h;
+    h.descr = detail::dict_value(dict, "descr");
+    h.fortran_order = detail::dict_value(dict, "fortran_order") == "True";
+    h.shape = detail::parse_shape(detail::dict_value(dict, "shape"));
+    h.data_offset = prefix + header_len;
+    return h;
+}
+
+inline Header read_header(const std::string& path) {
+    std::ifstream in(path.c_str(), std::ios::binary);
+    if (!in) {
+        throw std::runtime_error("npy: cannot open '" + path + "'");
+    }
+    return read_header(in);
+}
+
+// Complete header (magic, version, length and padded dict) for a C-ordered
+// array. The data that follows starts at a multiple of 64 bytes.
+inline std::string header_bytes(const std::string& descr, const std::vector<std::size_t>& shape) {
+    std::string dict = "{'descr': ";
+    dict += descr.empty() || descr[0] == '[' ? descr : "'" + descr + "'";
+    dict += ", 'fortran_order': False, 'shape': (";
+    for (std::size_t d = 0; d < shape.size(); ++d) {
+        dict += std::to_string(shape[d]);
+        if (d + 1 < shape.size() || shape.size() == 1) dict += ",";
+        if (d + 1 < shape.size()) dict += " ";
+    }
+    dict += "), }";
+
+    // Version 1.0 stores the header length in 2 bytes, 2.0 in 4
+    const bool v2 = 10 + dict.size() + 1 + 63 > 0xffff;
+    const std::size_t prefix = v2 ? 12 : 10;
+    const std::size_t total = (prefix + dict.size() + 1 + 63) / 64 * 64;
+    dict.append(total - prefix - dict.size() - 1, ' ');
+    dict += '\n';
+
+    std::string out("\x93NUMPY", 6);
+    out += static_cast<char>(v2 ? 2 : 1);
+    out += '\0';
+    const std::size_t len = dict.size();
+    for (std::size_t b = 0; b < (v2 ? 4u : 2u); ++b) {
+        out += static_cast<char>((len >> (8 * b)) & 0xff);
+    }
+    return out + dict;
+}
+
+/**
+ * @brief Streams the elements of one array into a .npy file
+ *
+ * The header is written up front, then write() appends elements in row-major
+ * order in as many pieces as the caller likes, so an array never has to be
+ * resident in full. close() checks that exactly shape-many elements arrived.
+ */
+template <class T>
+class Writer {
+public:
+  Writer(const std::string& path, const std::vector<std::size_t>& shape)
+      : m_path(path), m_out(path.c_str(), std::ios::binary | std::ios::trunc)
+  {
+      if (!m_out) {
+          throw std::runtime_error("npy: cannot open '" + path + "' for writing");
+      }
+      m_remaining = 1;
+      for (std::size_t d : shape) m_remaining *= d;
+      const std::string header = header_bytes(descr<T>(), shape);
+      write_bytes(header.data(), header.size());
+  }
+
+  Writer(const Writer&) = delete;
+  Writer& operator=(const Writer&) = delete;
+
+  // Elements still expected before close()
+  std::size_t remaining() const noexcept { return m_remaining; }
+
+  void write(const T* values, std::size_t n) {
+      if (n > m_remaining) {
+          throw std::invalid_argument("npy: more elements written than the shape holds");
+      }
+      write_bytes(reinterpret_cast<const char*>(values), n * sizeof(T));
+      m_remaining -= n;
+  }
+
+  void close() {
+      if (m_remaining != 0) {
+          throw std::invalid_argument("npy: '" + m_path + "' closed before all elements were written");
+      }
+      m_out.close();
+      if (!m_out) {
+          throw std::runtime_error("npy: error writing '" + m_path + "'");
+      }
+  }
+
+private:
+  std::string m_path;
+  std::ofstream m_out;
+  std::size_t m_remaining = 0;
+
+  void write_bytes(const char* p, std::size_t n) {
+      m_out.write(p, static_cast<std::streamsize>(n));
+      if (!m_out) {
+          throw std::runtime_error("npy: error writing '" + m_path + "'");
+      }
+  }
+};
+
+// Bytes staged per write() when saving a strided view with no chunk size given
+constexpr std::size_t default_stage_bytes = std::size_t(8) << 20;
+
+// Write `a` to `path` in .npy format. Contiguous data goes to the file
+// straight from a.data(), in one call or in pieces of about chunk_bytes;
+// strided views are gathered through a staging buffer of that size.
+template <class T>
+void save(const std::string& path, const ContiguousND<T>& a, std::size_t chunk_bytes = 0) {
+    Writer<T> w(path, a.shape());
+    const std::size_t n = a.size();
+    const std::size_t chunk = chunk_bytes ? std::max<std::size_t>(1, chunk_bytes / sizeof(T)) : 0;
+
+    if (a.is_contiguous()) {
+        const std::size_t step = chunk ? chunk : std::max<std::size_t>(n, 1);
+        for (std::size_t i = 0; i < n; i += step) {
+            w.write(a.data() + i, std::min(step, n - i));
+        }
+    } else if (n > 0) {
+        const std::size_t stage = chunk ? chunk : std::max<std::size_t>(1, default_stage_bytes / sizeof(T));
+        std::vector<T> buf;
+        buf.reserve(std::min(stage, n));
+        const std::size_t nd = a.ndim();
+        std::vector<std::size_t> idx(nd, 0);
+        std::size_t off = 0;
+        for (std::size_t k = 0; k < n; ++k) {
+            buf.push_back(a.data()[off]);
+            if (buf.size() == stage) {
+                w.write(buf.data(), buf.size());
+                buf.clear();
+            }
+            for (std::size_t d = nd; d-- > 0; ) {
+                off += a.strides()[d];
+                if (++idx[d] < a.shape()[d]) break;
+                off -= idx[d] * a.strides()[d];
+                idx[d] = 0;
+            }
+        }
+        w.write(buf.data(), buf.size());
+    }
+    w.close();
+}
+
+// Read a C-ordered .npy file whose dtype is T into a new owning array,
+// chunk_bytes at a time (0: one read). Throws std::invalid_argument if the
+// dtype or order does not match and std::runtime_error on I/O errors.
+template <class T>
+ContiguousND<T> load(const std::string& path, std::size_t chunk_bytes = 0) {
+    std::ifstream in(path.c_str(), std::ios::binary);
+    if (!in) {
+        throw std::runtime_error("npy: cannot open '" + path + "'");
+    }
+    const Header h = read_header(in);
+    if (!descr_matches<T>(h.descr)) {
+        throw std::invalid_argument("npy: file dtype " + h.descr + " does not match " + descr<T>());
+    }
+    if (h.fortran_order) {
+        throw std::invalid_argument("npy: Fortran-ordered arrays are not supported");
+    }
+
+    ContiguousND<T> out = ContiguousND<T>::empty(h.shape);
+    char* dst = reinterpret_cast<char*>(out.data());
+    const std::size_t bytes = out.size() * sizeof(T);
+    const std::size_t step = chunk_bytes ? chunk_bytes : std::max<std::size_t>(bytes, 1);
+    for (std::size_t done = 0; done < bytes; done += step) {
+        in.read(dst + done, static_cast<std::streamsize>(std::min(step, bytes - done)));
+        if (!in) {
+            throw std::runtime_error("npy: '" + path + "' is truncated");
+        }
+    }
+    return out;
+}
+
+} // namespace npy
+} // namespace cnda
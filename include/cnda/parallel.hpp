@@ -0,0 +1,232 @@
+#pragma once
+#include <algorithm>
+#include <condition_variable>
+#include <cstddef>
+#include <exception>
+#include <functional>
+#include <memory>
+#include <mutex>
+#include <thread>
+#include <vector>
+
+namespace cnda {
+
+/**
+ * @brief Fixed set of worker threads that run batches of tasks
+ *
+ * run(tasks, f) calls f(0) ... f(tasks - 1) spread over the workers and the
+ * calling thread, and returns once all of them have finished. Batches from
+ * different threads are serialized; a run() issued from inside a task
+ * executes inline, so nesting cannot deadlock. The first exception thrown
+ * by a task is rethrown from run().
+ */
+class ThreadPool {
+public:
+  // A pool of n threads in total, counting the caller (n - 1 workers)
+  explicit ThreadPool(std::size_t n) {
+      for (std::size_t i = 1; i < n; ++i) {
+          m_workers.push_back(std::thread(&ThreadPool::worker_loop, this));
+      }
+  }
+
+  ThreadPool(const ThreadPool&) = delete;
+  ThreadPool& operator=(const ThreadPool&) = delete;
+
+  ~ThreadPool() {
+      {
+          std::lock_guard<std::mutex> lock(m_mutex);
+          m_stop = true;
+      }
+      m_wake.notify_all();
+      for (std::thread& t : m_workers) t.join();
+  }
+
+  std::size_t size() const noexcept { return m_workers.size() + 1; }
+
+  void run(std::size_t tasks, const std::function<void(std::size_t)>& f) {
+      if (tasks == 0) return;
+      if (tasks == 1 || m_workers.empty() || in_task()) {
+          for (std::size_t i = 0; i < tasks; ++i) f(i);
+          return;
+      }
+
+      std::lock_guard<std::mutex> batch(m_run_mutex);
+      {
+          std::lock_guard<std::mutex> lock(m_mutex);
+          m_task = &f;
+          m_tasks = tasks;
+          m_next = 0;
+          m_pending = tasks;
+          m_error = nullptr;
+          ++m_generation;
+      }
+      m_wake.notify_all();
+      work();
+
+      std::unique_lock<std::mutex> lock(m_mutex);
+      m_done.wait(lock, [this] { return m_pending == 0; });
+      m_task = nullptr;
+      if (m_error) {
+          std::exception_ptr e = m_error;
+          m_error = nullptr;
+          std::rethrow_exception(e);
+      }
+  }
+
+private:
+  std::vector<std::thread> m_workers;
+  std::mutex m_run_mutex;             // one batch at a time
+  std::mutex m_mutex;                 // guards everything below
+  std::condition_variable m_wake;
+  std::condition_variable m_done;
+  const std::function<void(std::size_t)>* m_task = nullptr;
+  std::size_t m_tasks = 0;
+  std::size_t m_next = 0;
+  std::size_t m_pending = 0;
+  std::size_t m_generation = 0;
+  std::exception_ptr m_error;
+  bool m_stop = false;
+
+  static bool& in_task() {
+      static thread_local bool flag = false;
+      return flag;
+  }
+
+  // Claim and run tasks of the current batch until none are left
+  void work() {
+      for (;;) {
+          std::size_t i;
+          const std::function<void(std::size_t)>* f;
+          {
+              std::lock_guard<std::mutex> lock(m_mutex);
+              if (!m_task || m_next >= m_tasks) return;
+              i = m_next++;
+              f = m_task;
+          }
+          in_task() = true;
+          try {
+              (*f)(i);
+          } catch (...) {
+              std::lock_guard<std::mutex> lock(m_mutex);
+              if (!m_error) m_error = std::current_exception();
+          }
+          in_task() = false;
+          std::lock_guard<std::mutex> lock(m_mutex);
+          if (--m_pending == 0) m_done.notify_all();
+      }
+  }
+
+  void worker_loop() {
+      std::size_t seen = 0;
+      for (;;) {
+          {
+              std::unique_lock<std::mutex> lock(m_mutex);
+              m_wake.wait(lock, [&] { return m_stop || m_generation != seen; });
+              if (m_stop) return;
+              seen = m_generation;
+          }
+          work();
+      }
+  }
+};
+
+namespace detail {
+
+struct parallel_settings {
+    std::mutex mutex;
+    std::shared_ptr<ThreadPool> pool;
+    std::size_t threads = 0;          // 0: one per hardware thread
+    std::size_t threshold = 32768;    // smaller loops stay on the caller
+};
+
+// Never destroyed: joining workers from static destructors can deadlock
+// when the library is unloaded (e.g. a Python extension on Windows).
+inline parallel_settings& settings() {
+    static parallel_settings* s = new parallel_settings();
+    return *s;
+}
+
+inline std::size_t hardware_threads() {
+    const unsigned n = std::thread::hardware_concurrency();
+    return n == 0 ? 1 : n;
+}
+
+// Shared so that a batch still running on a pool that set_num_threads()
+// has since replaced keeps it alive until the batch ends.
+inline std::shared_ptr<ThreadPool> default_pool() {
+    parallel_settings& s = settings();
+    std::lock_guard<std::mutex> lock(s.mutex);
+    const std::size_t want = s.threads ? s.threads : hardware_threads();
+    if (!s.pool || s.pool->size() != want) {
+        s.pool = std::make_shared<ThreadPool>(want);
+    }
+    return s.pool;
+}
+
+} // namespace detail
+
+// Threads used by the built-in kernels; 0 restores the default (one per
+// hardware thread). The pool is rebuilt on the next parallel loop.
+inline void set_num_threads(std::size_t n) {
+    detail::parallel_settings& s = detail::settings();
+    std::lock_guard<std::mutex> lock(s.mutex);
+    s.threads = n;
+}
+
+inline std::size_t get_num_threads() {
+    detail::parallel_settings& s = detail::settings();
+    std::lock_guard<std::mutex> lock(s.mutex);
+    return s.threads ? s.threads : detail::hardware_threads();
+}
+
+// Loops over fewer elements than this run on the calling thread
+inline void set_parallel_threshold(std::size_t elements) {
+    detail::parallel_settings& s = detail::settings();
+    std::lock_guard<std::mutex> lock(s.mutex);
+    s.threshold = elements;
+}
+
+inline std::size_t get_parallel_threshold() {
+    detail::parallel_settings& s = detail::settings();
+    std::lock_guard<std::mutex> lock(s.mutex);
+    return s.threshold;
+}
+
+// Number of tasks worth splitting `work` elements of work into: one per pool
+// thread, or 1 below the parallel threshold
+inline std::size_t parallel_task_count(std::size_t work) {
+    const std::size_t threads = get_num_threads();
+    return threads <= 1 || work < get_parallel_threshold() ? 1 : threads;
+}
+
+// Call f(t) for t in [0, tasks) on the default pool
+template <class F>
+void parallel_tasks(std::size_t tasks, F f) {
+    if (tasks <= 1) {
+        if (tasks == 1) f(std::size_t(0));
+        return;
+    }
+    detail::default_pool()->run(tasks, [&](std::size_t t) { f(t); });
+}
+
+// Call f(begin, end) over disjoint ranges covering [0, n), one per thread of
+// the default pool. Range boundaries are multiples of 16 elements so threads
+// do not share cache lines at the seams.
+template <class F>
+void parallel_for(std::size_t n, F f) {
+    if (n == 0) return;
+    const std::size_t threads = parallel_task_count(n);
+    if (threads == 1) {
+        f(std::size_t(0), n);
+        return;
+    }
+    std::size_t chunk = (n + threads - 1) / threads;
+    chunk = (chunk + 15) / 16 * 16;
+    const std::size_t tasks = (n + chunk - 1) / chunk;
+    parallel_tasks(tasks, [&](std::size_t t) {
+        const std::size_t begin = t * chunk;
+        f(begin, std::min(n, begin + chunk));
+    });
+}
+
+} // namespace cnda
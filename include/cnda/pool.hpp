@@ -0,0 +1,175 @@
+#pragma once
+#include <cnda/memory.hpp>
+#include <cstddef>
+#include <list>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <utility>
+#include <vector>
+
+namespace cnda {
+
+// Counters of a BufferPool
+struct PoolStats {
+    std::size_t hits = 0;          // allocations served from an idle block
+    std::size_t misses = 0;        // allocations passed to the upstream allocator
+    std::size_t evictions = 0;     // idle blocks returned upstream to honour the cap
+    std::size_t bytes_held = 0;    // bytes in idle blocks
+    std::size_t bytes_in_use = 0;  // bytes in blocks handed out
+    std::size_t capacity = 0;      // cap on bytes_held
+};
+
+/**
+ * @brief Allocator that keeps released buffers for reuse
+ *
+ * Requests are rounded up to a size class (four classes per power of two,
+ * so at most 25% slack) and served from an idle block of the same class and
+ * alignment when there is one. Released blocks stay in the pool, already
+ * faulted in, until the idle bytes would exceed `capacity`; then the least
+ * recently released blocks go back to the upstream allocator. Thread-safe.
+ *
+ * Install it for all new arrays with
+ * set_default_allocator(std::make_shared<BufferPool>(cap)), or pass it to
+ * individual constructors.
+ */
+class BufferPool : public Allocator {
+public:
+  explicit BufferPool(std::size_t capacity = default_capacity,
+                      std::shared_ptr<Allocator> upstream = std::make_shared<AlignedAllocator>())
+      : m_upstream(std::move(upstream)), m_capacity(capacity) {}
+
+  BufferPool(const BufferPool&) = delete;
+  BufferPool& operator=(const BufferPool&) = delete;
+
+  ~BufferPool() override { trim(0); }
+
+  static const std::size_t default_capacity = std::size_t(256) << 20;
+
+  // Bytes actually reserved for a request of `bytes`
+  static std::size_t size_class(std::size_t bytes) noexcept {
+      if (bytes <= min_block) return min_block;
+      std::size_t top = min_block;
+      while (top <= bytes / 2) top <<= 1;  // largest power of two <= bytes
+      const std::size_t step = top / 4;
+      return (bytes + step - 1) / step * step;
+  }
+
+  void* allocate(std::size_t bytes, std::size_t alignment) override {
+      const Key key(size_class(bytes), alignment);
+      {
+          std::lock_guard<std::mutex> lock(m_mutex);
+          std::map<Key, std::vector<LruIt>>::iterator it = m_idle.find(key);
+          if (it != m_idle.end() && !it->second.empty()) {
+              // Most recently released first: its pages are the warmest
+              const LruIt block = it->second.back();
+              it->second.pop_back();
+              void* p = block->ptr;
+              m_lru.erase(block);
+              m_stats.hits += 1;
+              m_stats.bytes_held -= key.first;
+              m_stats.bytes_in_use += key.first;
+              return p;
+          }
+          m_stats.misses += 1;
+      }
+      void* p = m_upstream->allocate(key.first, alignment);
+      std::lock_guard<std::mutex> lock(m_mutex);
+      m_stats.bytes_in_use += key.first;
+      return p;
+  }
+
+  void deallocate(void* p, std::size_t bytes, std::size_t alignment) noexcept override {
+      const Key key(size_class(bytes), alignment);
+      std::vector<Block> evicted;
+      bool kept = false;
+      {
+          std::lock_guard<std::mutex> lock(m_mutex);
+          m_stats.bytes_in_use -= key.first;
+          if (key.first <= m_capacity) {
+              try {
+                  std::vector<LruIt>& idle = m_idle[key];
+                  idle.reserve(idle.size() + 1);
+                  m_lru.push_front(Block(p, key));
+                  idle.push_back(m_lru.begin());
+                  m_stats.bytes_held += key.first;
+                  kept = true;
+              } catch (...) {
+                  // No room to track it: hand it straight back
+              }
+              evict_to(m_capacity, evicted);
+          }
+          if (!kept) m_stats.evictions += 1;
+      }
+      if (!kept) m_upstream->deallocate(p, key.first, key.second);
+      release(evicted);
+  }
+
+  // Return idle blocks upstream until at most `bytes` are held
+  void trim(std::size_t bytes = 0) {
+      std::vector<Block> evicted;
+      {
+          std::lock_guard<std::mutex> lock(m_mutex);
+          evict_to(bytes, evicted);
+      }
+      release(evicted);
+  }
+
+  void set_capacity(std::size_t bytes) {
+      {
+          std::lock_guard<std::mutex> lock(m_mutex);
+          m_capacity = bytes;
+      }
+      trim(bytes);
+  }
+
+  PoolStats stats() const {
+      std::lock_guard<std::mutex> lock(m_mutex);
+      PoolStats s = m_stats;
+      s.capacity = m_capacity;
+      return s;
+  }
+
+private:
+  static const std::size_t min_block = 64;
+
+  typedef std::pair<std::size_t, std::size_t> Key;  // (size class, alignment)
+
+  struct Block {
+      void* ptr;
+      Key key;
+      Block(void* p, Key k) : ptr(p), key(k) {}
+  };
+  typedef std::list<Block>::iterator LruIt;
+
+  std::shared_ptr<Allocator> m_upstream;
+  mutable std::mutex m_mutex;
+  std::size_t m_capacity;
+  PoolStats m_stats;
+  std::list<Block> m_lru;                      // idle blocks, most recent first
+  std::map<Key, std::vector<LruIt>> m_idle;   // idle blocks per class, oldest first
+
+  // Caller holds m_mutex; evicted blocks are released after unlocking
+  void evict_to(std::size_t bytes, std::vector<Block>& evicted) noexcept {
+      while (m_stats.bytes_held > bytes && !m_lru.empty()) {
+          const Block oldest = m_lru.back();
+          std::vector<LruIt>& idle = m_idle.find(oldest.key)->second;
+          // The oldest block of the pool is the oldest of its class
+          idle.erase(idle.begin());
+          m_lru.pop_back();
+          m_stats.bytes_held -= oldest.key.first;
+          m_stats.evictions += 1;
+          try {
+              evicted.push_back(oldest);
+          } catch (...) {
+              m_upstream->deallocate(oldest.ptr, oldest.key.first, oldest.key.second);
+          }
+      }
+  }
+
+  void release(const std::vector<Block>& blocks) noexcept {
+      for (const Block& b : blocks) m_upstream->deallocate(b.ptr, b.key.first, b.key.second);
+  }
+};
+
+} // namespace cnda
@@ -0,0 +1,246 @@
+#pragma once
+#include <cnda/aos_types.hpp>
+#include <cnda/contiguous_nd.hpp>
+#include <cnda/gather.hpp>
+#include <cstddef>
+#include <cstdint>
+#include <cstring>
+#include <memory>
+#include <stdexcept>
+#include <string>
+#include <utility>
+#include <vector>
+
+namespace cnda {
+
+/**
+ * @brief One field of a RecordLayout
+ *
+ * `kind` follows NumPy's dtype.kind for plain native-endian scalars ('f',
+ * 'i', 'u', 'b'); 'V' marks bytes cnda does not interpret (nested records,
+ * subarrays, strings, byte-swapped values), which are still stored and
+ * copied but have no typed view.
+ */
+struct RecordField {
+    std::string name;
+    std::size_t offset;  // bytes from the start of the record
+    std::size_t size;    // bytes
+    char        kind;
+};
+
+/**
+ * @brief Record layout known only at run time
+ *
+ * The run-time counterpart of aos::struct_fields: a record of `itemsize`
+ * bytes with named fields at fixed offsets, e.g. built from a NumPy
+ * structured dtype. Fields must lie inside the record and have distinct
+ * names; they may leave gaps.
+ */
+class RecordLayout {
+public:
+  RecordLayout(std::vector<RecordField> fields, std::size_t itemsize)
+      : m_fields(std::move(fields)), m_itemsize(itemsize)
+  {
+      if (m_itemsize == 0) {
+          throw std::invalid_argument("RecordLayout: itemsize must be positive");
+      }
+      for (std::size_t i = 0; i < m_fields.size(); ++i) {
+          const RecordField& f = m_fields[i];
+          if (f.offset > m_itemsize || f.size > m_itemsize - f.offset) {
+              throw std::invalid_argument("RecordLayout: field '" + f.name + "' lies outside the record");
+          }
+          for (std::size_t j = 0; j < i; ++j) {
+              if (m_fields[j].name == f.name) {
+                  throw std::invalid_argument("RecordLayout: duplicate field '" + f.name + "'");
+              }
+          }
+      }
+  }
+
+  // Layout of one of the cnda::aos structs
+  template <class S>
+  static RecordLayout of() {
+      std::vector<RecordField> fields;
+      const aos::FieldInfo* f = aos::struct_fields<S>::get();
+      for (std::size_t i = 0; i < aos::struct_fields<S>::count; ++i) {
+          fields.push_back(RecordField{f[i].name, f[i].offset, f[i].size, f[i].kind});
+      }
+      return RecordLayout(std::move(fields), sizeof(S));
+  }
+
+  std::size_t itemsize() const noexcept { return m_itemsize; }
+  std::size_t num_fields() const noexcept { return m_fields.size(); }
+  const std::vector<RecordField>& fields() const noexcept { return m_fields; }
+
+  // Field called `name`, or nullptr
+  const RecordField* find(const std::string& name) const noexcept {
+      for (const RecordField& f : m_fields) {
+          if (f.name == name) return &f;
+      }
+      return nullptr;
+  }
+
+private:
+  std::vector<RecordField> m_fields;
+  std::size_t m_itemsize;
+};
+
+/**
+ * @brief N-d array of records whose layout is a run-time RecordLayout
+ *
+ * Stores raw records of layout().itemsize() bytes with strides in BYTES.
+ * Slices are zero-copy views sharing the owner, field<F>(name) is a
+ * ContiguousND<F> view of one field, and take()/put() copy whole records
+ * in bulk. Like ContiguousND it is move-only.
+ */
+class RecordArray {
+public:
+  // Owning, zero-filled records
+  RecordArray(const Extents& shape, std::shared_ptr<const RecordLayout> layout,
+              std::size_t alignment = default_alignment,
+              std::shared_ptr<Allocator> allocator = nullptr)
+      : m_layout(checked(std::move(layout))),
+        m_rows(packed_rows(shape, m_layout->itemsize(), alignment, std::move(allocator))),
+        m_owning(true) {}
+
+  // View of records at `data` with byte `strides`, kept alive by `owner`
+  RecordArray(const Extents& shape, const Extents& strides, void* data,
+              std::shared_ptr<void> owner, std::shared_ptr<const RecordLayout> layout)
+      : m_layout(checked(std::move(layout))),
+        m_rows(shape, strides, static_cast<unsigned char*>(data), std::move(owner)),
+        m_owning(false) {}
+
+  RecordArray(RecordArray&&) = default;
+  RecordArray& operator=(RecordArray&&) = default;
+
+  const RecordLayout& layout() const noexcept { return *m_layout; }
+  const std::shared_ptr<const RecordLayout>& shared_layout() const noexcept { return m_layout; }
+  std::size_t itemsize() const noexcept { return m_layout->itemsize(); }
+
+  const Extents& shape() const noexcept { return m_rows.shape(); }
+  const Extents& strides() const noexcept { return m_rows.strides(); }  // in bytes
+  std::size_t ndim() const noexcept { return m_rows.ndim(); }
+  std::size_t size() const noexcept { return m_rows.size(); }
+
+  unsigned char* data() noexcept { return m_rows.data(); }
+  const unsigned char* data() const noexcept { return m_rows.data(); }
+
+  bool is_view() const noexcept { return !m_owning; }
+  const std::shared_ptr<void>& owner() const noexcept { return m_rows.owner(); }
+
+  // True when the records are packed back to back in row-major order
+  bool is_contiguous() const noexcept {
+      std::size_t step = itemsize();
+      for (std::size_t d = ndim(); d-- > 0;) {
+          if (shape()[d] != 1 && strides()[d] != step) return false;
+          step *= shape()[d];
+      }
+      return true;
+  }
+
+  // One record per position: shape() with byte strides(), as raw bytes
+  ContiguousND<unsigned char>& rows() noexcept { return m_rows; }
+  const ContiguousND<unsigned char>& rows() const noexcept { return m_rows; }
+
+  // Record at a multi-index (bounds-checked)
+  unsigned char* record(const std::vector<std::size_t>& index) {
+      if (index.size() != ndim()) throw std::invalid_argument("RecordArray: rank mismatch");
+      std::size_t off = 0;
+      for (std::size_t d = 0; d < ndim(); ++d) {
+          if (index[d] >= shape()[d]) throw std::out_of_range("RecordArray: index out of bounds");
+          off += index[d] * strides()[d];
+      }
+      return data() + off;
+  }
+
+  // Zero-copy view over `ranges`, as ContiguousND::slice()
+  RecordArray slice(const std::vector<Range>& ranges) {
+      return RecordArray(m_rows.slice(ranges), m_layout);
+  }
+
+  // ContiguousND<F> view of field `name`; F must have the field's kind and
+  // size, and the field must be addressable in whole elements of F
+  template <class F>
+  ContiguousND<F> field(const std::string& name) {
+      const RecordField* f = m_layout->find(name);
+      if (!f) {
+          throw std::invalid_argument("RecordArray: no field named '" + name + "'");
+      }
+      if (sizeof(F) != f->size || aos::field_kind<F>() != f->kind) {
+          throw std::invalid_argument("RecordArray: wrong element type for field '" + name + "'");
+      }
+      unsigned char* base = data() + f->offset;
+      Extents strides(m_rows.strides());
+      for (std::size_t& s : strides) {
+          if (s % sizeof(F) != 0) {
+              throw std::invalid_argument("RecordArray: field '" + name + "' is not addressable with element strides");
+          }
+          s /= sizeof(F);
+      }
+      if (reinterpret_cast<std::uintptr_t>(base) % alignof(F) != 0) {
+          throw std::invalid_argument("RecordArray: field '" + name + "' is misaligned");
+      }
+      return ContiguousND<F>(shape(), std::move(strides), reinterpret_cast<F*>(base), m_rows.shared_owner());
+  }
+
+  // Copy the records at k index entries (see gather.hpp for the format)
+  // back to back into `out`
+  void take(const std::int64_t* indices, std::size_t k, bool flat, void* out) const {
+      const std::size_t step = flat ? 1 : ndim();
+      unsigned char* dst = static_cast<unsigned char*>(out);
+      for (std::size_t n = 0; n < k; ++n) {
+          const std::size_t off = detail::checked_offset(m_rows, indices + n * step, flat, "take()");
+          std::memcpy(dst + n * itemsize(), data() + off, itemsize());
+      }
+  }
+
+  // Records at k index entries = the n-th record of `values`, or its only
+  // record when n_values == 1; all indices are checked before any write
+  void put(const std::int64_t* indices, std::size_t k, bool flat,
+           const void* values, std::size_t n_values) {
+      if (n_values != k && n_values != 1) {
+          throw std::invalid_argument("put(): values must have one entry per index or a single entry");
+      }
+      // One validating pass; its offsets drive the write pass
+      const std::size_t step = flat ? 1 : ndim();
+      std::vector<std::size_t> offsets(k);
+      for (std::size_t n = 0; n < k; ++n) {
+          offsets[n] = detail::checked_offset(m_rows, indices + n * step, flat, "put()");
+      }
+      const unsigned char* src = static_cast<const unsigned char*>(values);
+      const std::size_t vstep = n_values == 1 ? 0 : itemsize();
+      for (std::size_t n = 0; n < k; ++n) {
+          std::memcpy(data() + offsets[n], src + n * vstep, itemsize());
+      }
+  }
+
+private:
+  std::shared_ptr<const RecordLayout> m_layout;
+  ContiguousND<unsigned char> m_rows;
+  bool m_owning;
+
+  RecordArray(ContiguousND<unsigned char> rows, std::shared_ptr<const RecordLayout> layout)
+      : m_layout(std::move(layout)), m_rows(std::move(rows)), m_owning(false) {}
+
+  // Zero-filled row-major records, viewed with byte strides
+  static ContiguousND<unsigned char> packed_rows(const Extents& shape, std::size_t itemsize,
+                                                 std::size_t alignment, std::shared_ptr<Allocator> allocator) {
+      std::size_t count = 1;
+      for (std::size_t d : shape) count *= d;
+      ContiguousND<unsigned char> bytes(Extents{count * itemsize}, alignment, std::move(allocator));
+      Extents strides(shape.size());
+      std::size_t step = itemsize;
+      for (std::size_t d = shape.size(); d-- > 0;) {
+          strides[d] = step;
+          step *= shape[d];
+      }
+      return ContiguousND<unsigned char>(shape, std::move(strides), bytes.data(), bytes.shared_owner());
+  }
+
+  static std::shared_ptr<const RecordLayout> checked(std::shared_ptr<const RecordLayout> layout) {
+      if (!layout) throw std::invalid_argument("RecordArray: layout is required");
+      return layout;
+  }
+};
+
+} // namespace cnda
@@ -0,0 +1,473 @@
+#pragma once
+#include <cnda/contiguous_nd.hpp>
+#include <cnda/kernels.hpp>
+#include <cnda/parallel.hpp>
+#include <algorithm>
+#include <cstddef>
+#include <cstdint>
+#include <limits>
+#include <stdexcept>
+#include <string>
+#include <type_traits>
+#include <vector>
+
+namespace cnda {
+
+// Reductions over all elements or along one axis of a ContiguousND:
+// sum, mean, amin, amax and argmax. Floating-point sums use pairwise
+// summation by default (error grows with log n, like NumPy); Kahan
+// compensation and plain left-to-right summation are also available.
+// amin/amax propagate NaN and argmax returns the first NaN, as NumPy does.
+//
+// Work is split across the default thread pool above the parallel
+// threshold. Reducing a contiguous array along any axis but the last
+// accumulates whole rows, so the inner loop is unit-stride.
+
+enum class Summation { naive, pairwise, kahan };
+
+// Result type of sum(): int64 for integers, T itself for floating point
+template <class T>
+struct sum_type {
+    typedef typename std::conditional<std::is_integral<T>::value, std::int64_t, T>::type type;
+};
+
+namespace detail {
+
+template <class T>
+bool is_nan(T x) { return x != x; }
+
+template <class A>
+struct kahan_acc {
+    A sum = 0;
+    A c = 0;    // running compensation: what the last additions lost
+    void add(A x) {
+        const A y = x - c;
+        const A t = sum + y;
+        c = (t - sum) - y;
+        sum = t;
+    }
+    A value() const { return sum - c; }
+};
+
+// ---- Lanes: n values at p[0], p[stride], p[2 * stride], ... ----
+
+constexpr std::size_t pairwise_block = 128;
+
+template <class A, class T>
+A lane_sum_naive(const T* p, std::size_t n, std::size_t stride) {
+    A s = 0;
+    for (std::size_t i = 0; i < n; ++i) s += static_cast<A>(p[i * stride]);
+    return s;
+}
+
+// Blocks of up to pairwise_block values keep eight independent partial sums
+// (one SIMD register's worth); larger lanes are halved recursively.
+template <class A, class T>
+A lane_sum_pairwise(const T* p, std::size_t n, std::size_t stride) {
+    if (n < 8) return lane_sum_naive<A>(p, n, stride);
+    if (n <= pairwise_block) {
+        A r[8];
+        for (std::size_t k = 0; k < 8; ++k) r[k] = static_cast<A>(p[k * stride]);
+        std::size_t i = 8;
+        for (; i + 8 <= n; i += 8) {
+            for (std::size_t k = 0; k < 8; ++k) r[k] += static_cast<A>(p[(i + k) * stride]);
+        }
+        A s = ((r[0] + r[1]) + (r[2] + r[3])) + ((r[4] + r[5]) + (r[6] + r[7]));
+        for (; i < n; ++i) s += static_cast<A>(p[i * stride]);
+        return s;
+    }
+    std::size_t half = n / 2;
+    half -= half % 8;
+    return lane_sum_pairwise<A>(p, half, stride) + lane_sum_pairwise<A>(p + half * stride, n - half, stride);
+}
+
+template <class A, class T>
+A lane_sum(const T* p, std::size_t n, std::size_t stride, Summation mode) {
+    if (std::is_integral<T>::value || mode == Summation::naive) {
+        return lane_sum_naive<A>(p, n, stride);
+    }
+    if (mode == Summation::pairwise) {
+        return lane_sum_pairwise<A>(p, n, stride);
+    }
+    kahan_acc<A> k;
+    for (std::size_t i = 0; i < n; ++i) k.add(static_cast<A>(p[i * stride]));
+    return k.value();
+}
+
+// Smallest (Better = less) or largest (Better = greater) value; NaN wins
+template <class T, class Better>
+T lane_extreme(const T* p, std::size_t n, std::size_t stride, Better better) {
+    T m = p[0];
+    bool nan = is_nan(m);
+    for (std::size_t i = 1; i < n; ++i) {
+        const T x = p[i * stride];
+        m = better(x, m) ? x : m;
+        nan = nan || is_nan(x);
+    }
+    return nan ? std::numeric_limits<T>::quiet_NaN() : m;
+}
+
+template <class T>
+std::size_t lane_argmax(const T* p, std::size_t n, std::size_t stride) {
+    T m = p[0];
+    if (is_nan(m)) return 0;
+    std::size_t best = 0;
+    for (std::size_t i = 1; i < n; ++i) {
+        const T x = p[i * stride];
+        if (x > m) {
+            m = x;
+            best = i;
+        } else if (is_nan(x)) {
+            return i;
+        }
+    }
+    return best;
+}
+
+struct less_than {
+    template <class T> bool operator()(const T& a, const T& b) const { return a < b; }
+};
+struct greater_than {
+    template <class T> bool operator()(const T& a, const T& b) const { return a > b; }
+};
+
+// ---- Rows: n rows of w values, row k at p + k * row_stride, reduced
+// column by column into out[0 .. w) ----
+
+template <class A, class T>
+void rows_sum_naive(const T* p, std::size_t n, std::size_t row_stride, std::size_t w, A* out) {
+    for (std::size_t j = 0; j < w; ++j) out[j] = 0;
+    for (std::size_t k = 0; k < n; ++k) {
+        const T* row = p + k * row_stride;
+        for (std::size_t j = 0; j < w; ++j) out[j] += static_cast<A>(row[j]);
+    }
+}
+
+// Pairwise over rows; scratch holds w values per recursion level
+template <class A, class T>
+void rows_sum_pairwise(const T* p, std::size_t n, std::size_t row_stride, std::size_t w, A* out, A* scratch) {
+    if (n <= 8) {
+        rows_sum_naive(p, n, row_stride, w, out);
+        return;
+    }
+    const std::size_t half = n / 2;
+    rows_sum_pairwise(p, half, row_stride, w, out, scratch + w);
+    rows_sum_pairwise(p + half * row_stride, n - half, row_stride, w, scratch, scratch + w);
+    for (std::size_t j = 0; j < w; ++j) out[j] += scratch[j];
+}
+
+inline std::size_t pairwise_levels(std::size_t n) {
+    std::size_t levels = 1;
+    while (n > 8) {
+        n -= n / 2;
+        ++levels;
+    }
+    return levels;
+}
+
+template <class A, class T>
+void rows_sum(const T* p, std::size_t n, std::size_t row_stride, std::size_t w, A* out, Summation mode) {
+    if (std::is_integral<T>::value || mode == Summation::naive) {
+        rows_sum_naive(p, n, row_stride, w, out);
+    } else if (mode == Summation::pairwise) {
+        std::vector<A> scratch(w * pairwise_levels(n));
+        rows_sum_pairwise(p, n, row_stride, w, out, scratch.data());
+    } else {
+        std::vector<A> c(w, A(0));
+        for (std::size_t j = 0; j < w; ++j) out[j] = 0;
+        for (std::size_t k = 0; k < n; ++k) {
+            const T* row = p + k * row_stride;
+            for (std::size_t j = 0; j < w; ++j) {
+                const A y = static_cast<A>(row[j]) - c[j];
+                const A t = out[j] + y;
+                c[j] = (t - out[j]) - y;
+                out[j] = t;
+            }
+        }
+        for (std::size_t j = 0; j < w; ++j) out[j] -= c[j];
+    }
+}
+
+template <class T, class Better>
+void rows_extreme(const T* p, std::size_t n, std::size_t row_stride, std::size_t w, T* out, Better better) {
+    std::vector<char> nan(w, 0);
+    for (std::size_t j = 0; j < w; ++j) {
+        out[j] = p[j];
+        nan[j] = is_nan(p[j]);
+    }
+    for (std::size_t k = 1; k < n; ++k) {
+        const T* row = p + k * row_stride;
+        for (std::size_t j = 0; j < w; ++j) {
+            const T x = row[j];
+            out[j] = better(x, out[j]) ? x : out[j];
+            nan[j] = nan[j] || is_nan(x);
+        }
+    }
+    for (std::size_t j = 0; j < w; ++j) {
+        if (nan[j]) out[j] = std::numeric_limits<T>::quiet_NaN();
+    }
+}
+
+template <class T>
+void rows_argmax(const T* p, std::size_t n, std::size_t row_stride, std::size_t w, std::int64_t* out) {
+    std::vector<T> best(p, p + w);
+    for (std::size_t j = 0; j < w; ++j) out[j] = 0;
+    for (std::size_t k = 1; k < n; ++k) {
+        const T* row = p + k * row_stride;
+        for (std::size_t j = 0; j < w; ++j) {
+            const T x = row[j];
+            if (!is_nan(best[j]) && (x > best[j] || is_nan(x))) {
+                best[j] = x;
+                out[j] = static_cast<std::int64_t>(k);
+            }
+        }
+    }
+}
+
+// ---- Drivers ----
+
+// Columns reduced together by the row path: 2 KiB of doubles keeps the
+// accumulators and pairwise scratch in L1.
+constexpr std::size_t row_block = 256;
+
+// Reduce `a` along `axis` into a new array without that axis.
+// lane(p, n, stride) -> R reduces one strided lane; rows(p, n, row_stride,
+// w, out) reduces w adjacent lanes of a contiguous array at once.
+template <class R, class T, class LaneF, class RowsF>
+ContiguousND<R> reduce_axis(const ContiguousND<T>& a, std::size_t axis, bool needs_values,
+                            LaneF lane, RowsF rows, const char* who) {
+    if (axis >= a.ndim()) {
+        throw std::out_of_range(std::string(who) + ": axis out of range");
+    }
+    const std::size_t n = a.shape()[axis];
+    std::vector<std::size_t> shape, strides;
+    for (std::size_t d = 0; d < a.ndim(); ++d) {
+        if (d == axis) continue;
+        shape.push_back(a.shape()[d]);
+        strides.push_back(a.strides()[d]);
+    }
+    ContiguousND<R> out = ContiguousND<R>::empty(shape);
+    const std::size_t outputs = out.size();
+    if (outputs == 0) return out;
+    if (n == 0 && needs_values) {
+        throw std::invalid_argument(std::string(who) + ": reduction over a zero-size axis");
+    }
+
+    R* dst = out.data();
+    const T* src = a.data();
+    if (a.is_contiguous() && axis + 1 < a.ndim() && n > 0) {
+        // [outer][n][inner] -> [outer][inner], row_block columns at a time
+        // Extent-1 axes may carry any stride, so size rows from the shape
+        std::size_t inner = 1;
+        for (std::size_t d = axis + 1; d < a.ndim(); ++d) inner *= a.shape()[d];
+        const std::size_t blocks = (inner + row_block - 1) / row_block;
+        const std::size_t units = (outputs / inner) * blocks;
+        const std::size_t tasks = std::min(parallel_task_count(a.size()), units);
+        parallel_tasks(tasks, [&](std::size_t t) {
+            for (std::size_t u = t * units / tasks; u < (t + 1) * units / tasks; ++u) {
+                const std::size_t o = u / blocks;
+                const std::size_t j0 = (u % blocks) * row_block;
+                const std::size_t w = std::min(row_block, inner - j0);
+                rows(src + o * n * inner + j0, n, inner, w, dst + o * inner + j0);
+            }
+        });
+        return out;
+    }
+
+    // One strided lane per output element
+    const std::size_t lane_stride = a.strides()[axis];
+    const std::size_t tasks = std::min(parallel_task_count(a.size()), outputs);
+    parallel_tasks(tasks, [&](std::size_t t) {
+        const std::size_t begin = t * outputs / tasks;
+        const std::size_t end = (t + 1) * outputs / tasks;
+        MultiIndexIterator<const T> it(src, shape.data(), strides.data(), shape.size(), begin);
+        for (std::size_t o = begin; o < end; ++o, ++it) {
+            dst[o] = lane(&*it, n, lane_stride);
+        }
+    });
+    return out;
+}
+
+// Partial results over lanes that cover a non-empty array in row-major
+// order: one chunk per task for contiguous arrays, one row along the last
+// axis for strided views. lane(p, n, stride, first) also receives the flat
+// index of the lane's first element.
+template <class R, class T, class LaneF>
+std::vector<R> reduce_partials(const ContiguousND<T>& a, LaneF lane) {
+    const T* src = a.data();
+    const std::size_t n = a.size();
+    if (a.is_contiguous()) {
+        const std::size_t tasks = parallel_task_count(n);
+        const std::size_t chunk = (n + tasks - 1) / tasks;
+        std::vector<R> partials(tasks);
+        parallel_tasks(tasks, [&](std::size_t t) {
+            const std::size_t begin = std::min(n, t * chunk);
+            const std::size_t len = std::min(chunk, n - begin);
+            partials[t] = len ? lane(src + begin, len, std::size_t(1), begin) : R();
+        });
+        // Empty trailing chunks (tiny n) would skew amin/amax/argmax
+        while (partials.size() > 1 && (partials.size() - 1) * chunk >= n) partials.pop_back();
+        return partials;
+    }
+
+    const std::size_t last = a.ndim() - 1;
+    const std::size_t len = a.shape()[last];
+    const std::size_t stride = a.strides()[last];
+    const std::size_t rows = n / len;
+    std::vector<std::size_t> shape(a.shape().begin(), a.shape().end() - 1);
+    std::vector<std::size_t> strides(a.strides().begin(), a.strides().end() - 1);
+    std::vector<R> partials(rows);
+    const std::size_t tasks = std::min(parallel_task_count(n), rows);
+    parallel_tasks(tasks, [&](std::size_t t) {
+        const std::size_t begin = t * rows / tasks;
+        const std::size_t end = (t + 1) * rows / tasks;
+        MultiIndexIterator<const T> it(src, shape.data(), strides.data(), shape.size(), begin);
+        for (std::size_t r = begin; r < end; ++r, ++it) {
+            partials[r] = lane(&*it, len, stride, r * len);
+        }
+    });
+    return partials;
+}
+
+template <class T>
+void require_arithmetic() {
+    static_assert(std::is_arithmetic<T>::value, "reductions need an arithmetic element type");
+}
+
+inline void require_values(std::size_t n, const char* who) {
+    if (n == 0) {
+        throw std::invalid_argument(std::string(who) + ": zero-size array has no such value");
+    }
+}
+
+} // namespace detail
+
+// ---- Sum and mean ----
+
+template <class T>
+typename sum_type<T>::type sum(const ContiguousND<T>& a, Summation mode = Summation::pairwise) {
+    detail::require_arithmetic<T>();
+    typedef typename sum_type<T>::type A;
+    if (a.size() == 0) return A(0);
+    std::vector<A> partials = detail::reduce_partials<A>(a,
+        [mode](const T* p, std::size_t n, std::size_t stride, std::size_t) {
+            return detail::lane_sum<A>(p, n, stride, mode);
+        });
+    return detail::lane_sum<A>(partials.data(), partials.size(), 1, mode);
+}
+
+template <class T>
+ContiguousND<typename sum_type<T>::type> sum(const ContiguousND<T>& a, std::size_t axis,
+                                             Summation mode = Summation::pairwise) {
+    detail::require_arithmetic<T>();
+    typedef typename sum_type<T>::type A;
+    return detail::reduce_axis<A>(a, axis, false,
+        [mode](const T* p, std::size_t n, std::size_t stride) {
+            return detail::lane_sum<A>(p, n, stride, mode);
+        },
+        [mode](const T* p, std::size_t n, std::size_t rs, std::size_t w, A* out) {
+            detail::rows_sum(p, n, rs, w, out, mode);
+        }, "sum()");
+}
+
+// Arithmetic mean as double; NaN for an empty array
+template <class T>
+double mean(const ContiguousND<T>& a, Summation mode = Summation::pairwise) {
+    return static_cast<double>(sum(a, mode)) / static_cast<double>(a.size());
+}
+
+template <class T>
+ContiguousND<double> mean(const ContiguousND<T>& a, std::size_t axis, Summation mode = Summation::pairwise) {
+    ContiguousND<typename sum_type<T>::type> s = sum(a, axis, mode);
+    ContiguousND<double> out = ContiguousND<double>::empty(s.shape());
+    const double n = static_cast<double>(a.shape()[axis]);
+    for (std::size_t i = 0; i < s.size(); ++i) {
+        out.data()[i] = static_cast<double>(s.data()[i]) / n;
+    }
+    return out;
+}
+
+// ---- Extrema ----
+
+template <class T>
+T amin(const ContiguousND<T>& a) {
+    detail::require_arithmetic<T>();
+    detail::require_values(a.size(), "amin()");
+    std::vector<T> partials = detail::reduce_partials<T>(a,
+        [](const T* p, std::size_t n, std::size_t stride, std::size_t) {
+            return detail::lane_extreme(p, n, stride, detail::less_than());
+        });
+    return detail::lane_extreme(partials.data(), partials.size(), 1, detail::less_than());
+}
+
+template <class T>
+ContiguousND<T> amin(const ContiguousND<T>& a, std::size_t axis) {
+    detail::require_arithmetic<T>();
+    return detail::reduce_axis<T>(a, axis, true,
+        [](const T* p, std::size_t n, std::size_t stride) {
+            return detail::lane_extreme(p, n, stride, detail::less_than());
+        },
+        [](const T* p, std::size_t n, std::size_t rs, std::size_t w, T* out) {
+            detail::rows_extreme(p, n, rs, w, out, detail::less_than());
+        }, "amin()");
+}
+
+template <class T>
+T amax(const ContiguousND<T>& a) {
+    detail::require_arithmetic<T>();
+    detail::require_values(a.size(), "amax()");
+    std::vector<T> partials = detail::reduce_partials<T>(a,
+        [](const T* p, std::size_t n, std::size_t stride, std::size_t) {
+            return detail::lane_extreme(p, n, stride, detail::greater_than());
+        });
+    return detail::lane_extreme(partials.data(), partials.size(), 1, detail::greater_than());
+}
+
+template <class T>
+ContiguousND<T> amax(const ContiguousND<T>& a, std::size_t axis) {
+    detail::require_arithmetic<T>();
+    return detail::reduce_axis<T>(a, axis, true,
+        [](const T* p, std::size_t n, std::size_t stride) {
+            return detail::lane_extreme(p, n, stride, detail::greater_than());
+        },
+        [](const T* p, std::size_t n, std::size_t rs, std::size_t w, T* out) {
+            detail::rows_extreme(p, n, rs, w, out, detail::greater_than());
+        }, "amax()");
+}
+
+// ---- Argmax ----
+
+// Row-major flat index of the first maximum (or of the first NaN)
+template <class T>
+std::size_t argmax(const ContiguousND<T>& a) {
+    detail::require_arithmetic<T>();
+    detail::require_values(a.size(), "argmax()");
+    typedef std::pair<T, std::size_t> candidate;
+    std::vector<candidate> partials = detail::reduce_partials<candidate>(a,
+        [](const T* p, std::size_t n, std::size_t stride, std::size_t first) {
+            const std::size_t i = detail::lane_argmax(p, n, stride);
+            return candidate(p[i * stride], first + i);
+        });
+    // Partials are in row-major order, so the first winner is the first index
+    std::size_t best = 0;
+    for (std::size_t k = 1; k < partials.size(); ++k) {
+        if (detail::is_nan(partials[best].first)) break;
+        if (partials[k].first > partials[best].first || detail::is_nan(partials[k].first)) best = k;
+    }
+    return partials[best].second;
+}
+
+// Index along `axis` of the first maximum of each lane
+template <class T>
+ContiguousND<std::int64_t> argmax(const ContiguousND<T>& a, std::size_t axis) {
+    detail::require_arithmetic<T>();
+    return detail::reduce_axis<std::int64_t>(a, axis, true,
+        [](const T* p, std::size_t n, std::size_t stride) {
+            return static_cast<std::int64_t>(detail::lane_argmax(p, n, stride));
+        },
+        [](const T* p, std::size_t n, std::size_t rs, std::size_t w, std::int64_t* out) {
+            detail::rows_argmax(p, n, rs, w, out);
+        }, "argmax()");
+}
+
+} // namespace cnda
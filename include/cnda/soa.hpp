@@ -0,0 +1,251 @@
+#pragma once
+#include <cnda/contiguous_nd.hpp>
+#include <cnda/aos_types.hpp>
+#include <cnda/parallel.hpp>
+#include <algorithm>
+#include <cstddef>
+#include <cstdint>
+#include <cstring>
+#include <memory>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+namespace cnda {
+namespace soa {
+
+/**
+ * @brief Structure-of-Arrays storage for one of the cnda::aos structs
+ *
+ * Every field of S lives in its own contiguous row-major buffer of the
+ * container's shape, so kernels that read only some fields stream only those
+ * bytes. field() returns a ContiguousND view of one field that shares the
+ * buffer's ownership and stays valid after the container is destroyed.
+ */
+template <class S>
+class SoA {
+public:
+  typedef aos::struct_fields<S> fields_type;
+
+  explicit SoA(std::vector<std::size_t> shape)
+      : m_shape(std::move(shape))
+  {
+      m_size = 1;
+      for (std::size_t d : m_shape) {
+          m_size *= d;
+      }
+      const aos::FieldInfo* f = fields_type::get();
+      for (std::size_t i = 0; i < fields_type::count; ++i) {
+          // uint64 words keep every field (at most 8 bytes) aligned
+          const std::size_t words = (m_size * f[i].size + 7) / 8;
+          m_fields.push_back(std::make_shared<std::vector<std::uint64_t>>(words));
+      }
+  }
+
+  SoA(SoA&&) = default;
+  SoA& operator=(SoA&&) = default;
+
+  // Copies would silently share the field buffers
+  SoA(const SoA&) = delete;
+  SoA& operator=(const SoA&) = delete;
+
+  const std::vector<std::size_t>& shape() const noexcept { return m_shape; }
+  std::size_t ndim() const noexcept { return m_shape.size(); }
+  std::size_t size() const noexcept { return m_size; }
+  std::size_t num_fields() const noexcept { return fields_type::count; }
+
+  // Field descriptions, in declaration order
+  static const aos::FieldInfo& field_info(std::size_t i) {
+      if (i >= fields_type::count) throw std::out_of_range("SoA: field index out of range");
+      return fields_type::get()[i];
+  }
+
+  // Position of the field called `name`; throws std::invalid_argument if none
+  static std::size_t field_index(const std::string& name) {
+      const aos::FieldInfo* f = fields_type::get();
+      for (std::size_t i = 0; i < fields_type::count; ++i) {
+          if (name == f[i].name) return i;
+      }
+      throw std::invalid_argument("SoA: no field named '" + name + "'");
+  }
+
+  void* field_data(std::size_t i) { return m_fields.at(i)->data(); }
+  const void* field_data(std::size_t i) const { return m_fields.at(i)->data(); }
+
+  // Typed view of field i; F must match the field's size and kind
+  template <class F>
+  ContiguousND<F> field(std::size_t i) {
+      const aos::FieldInfo& info = field_info(i);
+      if (sizeof(F) != info.size || aos::field_kind<F>() != info.kind) {
+          throw std::invalid_argument(std::string("SoA: wrong element type for field '") + info.name + "'");
+      }
+      return ContiguousND<F>(m_shape, static_cast<F*>(field_data(i)), m_fields[i]);
+  }
+
+  template <class F>
+  ContiguousND<F> field(const std::string& name) { return field<F>(field_index(name)); }
+
+  // View selected by member pointer, e.g. soa.field(&Particle::mass)
+  template <class F>
+  ContiguousND<F> field(F S::*member) {
+      S probe;
+      const std::size_t offset = static_cast<std::size_t>(
+          reinterpret_cast<const unsigned char*>(&(probe.*member)) -
+          reinterpret_cast<const unsigned char*>(&probe));
+      const aos::FieldInfo* f = fields_type::get();
+      for (std::size_t i = 0; i < fields_type::count; ++i) {
+          if (f[i].offset == offset) return field<F>(i);
+      }
+      throw std::invalid_argument("SoA: member is not a described field");
+  }
+
+private:
+  std::vector<std::size_t> m_shape;
+  std::size_t m_size = 0;
+  std::vector<std::shared_ptr<std::vector<std::uint64_t>>> m_fields;
+};
+
+namespace detail {
+
+// Elements per cache block: the AoS side of a block spans about 16 KiB, so it
+// stays in L1 while each field is streamed in or out of it in turn.
+inline std::size_t block_elems(std::size_t struct_size) {
+    return std::max<std::size_t>(1, 16384 / struct_size);
+}
+
+// Copy n values of width W between a strided and a packed stream
+template <class W>
+void unpack_words(const unsigned char* src, std::size_t src_stride, unsigned char* dst, std::size_t n) {
+    W* out = reinterpret_cast<W*>(dst);
+    for (std::size_t i = 0; i < n; ++i) {
+        W w;
+        std::memcpy(&w, src + i * src_stride, sizeof(W));
+        out[i] = w;
+    }
+}
+
+template <class W>
+void pack_words(const unsigned char* src, unsigned char* dst, std::size_t dst_stride, std::size_t n) {
+    const W* in = reinterpret_cast<const W*>(src);
+    for (std::size_t i = 0; i < n; ++i) {
+        const W w = in[i];
+        std::memcpy(dst + i * dst_stride, &w, sizeof(W));
+    }
+}
+
+inline void unpack_field(const unsigned char* src, std::size_t src_stride,
+                         unsigned char* dst, std::size_t size, std::size_t n) {
+    switch (size) {
+    case 1: unpack_words<std::uint8_t>(src, src_stride, dst, n); break;
+    case 2: unpack_words<std::uint16_t>(src, src_stride, dst, n); break;
+    case 4: unpack_words<std::uint32_t>(src, src_stride, dst, n); break;
+    case 8: unpack_words<std::uint64_t>(src, src_stride, dst, n); break;
+    default:
+        for (std::size_t i = 0; i < n; ++i) std::memcpy(dst + i * size, src + i * src_stride, size);
+    }
+}
+
+inline void pack_field(const unsigned char* src, unsigned char* dst, std::size_t dst_stride,
+                       std::size_t size, std::size_t n) {
+    switch (size) {
+    case 1: pack_words<std::uint8_t>(src, dst, dst_stride, n); break;
+    case 2: pack_words<std::uint16_t>(src, dst, dst_stride, n); break;
+    case 4: pack_words<std::uint32_t>(src, dst, dst_stride, n); break;
+    case 8: pack_words<std::uint64_t>(src, dst, dst_stride, n); break;
+    default:
+        for (std::size_t i = 0; i < n; ++i) std::memcpy(dst + i * dst_stride, src + i * size, size);
+    }
+}
+
+template <class S>
+void check_layout_match(const ContiguousND<S>& aos_arr, const SoA<S>& soa_arr, const char* who) {
+    if (aos_arr.shape() != soa_arr.shape()) {
+        throw std::invalid_argument(std::string(who) + ": shape mismatch");
+    }
+    if (!aos_arr.is_contiguous()) {
+        throw std::invalid_argument(std::string(who) + ": AoS array must be contiguous");
+    }
+}
+
+} // namespace detail
+
+// -------- Column packing --------
+// `columns[k]` points at size() packed values of field k of S, in row-major
+// order, for every described field. Both directions split the array across
+// the default thread pool and move one cache block at a time. The AoS array
+// must be contiguous.
+
+// AoS -> columns
+template <class S>
+void aos_to_columns(const ContiguousND<S>& src, void* const* columns) {
+    if (!src.is_contiguous()) {
+        throw std::invalid_argument("aos_to_columns(): AoS array must be contiguous");
+    }
+    const aos::FieldInfo* f = aos::struct_fields<S>::get();
+    const unsigned char* base = reinterpret_cast<const unsigned char*>(src.data());
+    const std::size_t block = detail::block_elems(sizeof(S));
+    parallel_for(src.size(), [&](std::size_t begin, std::size_t end) {
+        for (std::size_t b0 = begin; b0 < end; b0 += block) {
+            const std::size_t len = std::min(block, end - b0);
+            for (std::size_t k = 0; k < aos::struct_fields<S>::count; ++k) {
+                unsigned char* out = static_cast<unsigned char*>(columns[k]) + b0 * f[k].size;
+                detail::unpack_field(base + b0 * sizeof(S) + f[k].offset, sizeof(S), out, f[k].size, len);
+            }
+        }
+    });
+}
+
+// Columns -> AoS
+template <class S>
+void columns_to_aos(const void* const* columns, ContiguousND<S>& dst) {
+    if (!dst.is_contiguous()) {
+        throw std::invalid_argument("columns_to_aos(): AoS array must be contiguous");
+    }
+    const aos::FieldInfo* f = aos::struct_fields<S>::get();
+    unsigned char* base = reinterpret_cast<unsigned char*>(dst.data());
+    const std::size_t block = detail::block_elems(sizeof(S));
+    parallel_for(dst.size(), [&](std::size_t begin, std::size_t end) {
+        for (std::size_t b0 = begin; b0 < end; b0 += block) {
+            const std::size_t len = std::min(block, end - b0);
+            for (std::size_t k = 0; k < aos::struct_fields<S>::count; ++k) {
+                const unsigned char* in = static_cast<const unsigned char*>(columns[k]) + b0 * f[k].size;
+                detail::pack_field(in, base + b0 * sizeof(S) + f[k].offset, sizeof(S), f[k].size, len);
+            }
+        }
+    });
+}
+
+// AoS -> SoA
+template <class S>
+void aos_to_soa(const ContiguousND<S>& src, SoA<S>& dst) {
+    detail::check_layout_match(src, dst, "aos_to_soa()");
+    void* columns[aos::struct_fields<S>::count];
+    for (std::size_t k = 0; k < aos::struct_fields<S>::count; ++k) columns[k] = dst.field_data(k);
+    aos_to_columns(src, columns);
+}
+
+// SoA -> AoS
+template <class S>
+void soa_to_aos(const SoA<S>& src, ContiguousND<S>& dst) {
+    detail::check_layout_match(dst, src, "soa_to_aos()");
+    const void* columns[aos::struct_fields<S>::count];
+    for (std::size_t k = 0; k < aos::struct_fields<S>::count; ++k) columns[k] = src.field_data(k);
+    columns_to_aos(columns, dst);
+}
+
+template <class S>
+SoA<S> to_soa(const ContiguousND<S>& src) {
+    SoA<S> out(src.shape());
+    aos_to_soa(src, out);
+    return out;
+}
+
+template <class S>
+ContiguousND<S> to_aos(const SoA<S>& src) {
+    ContiguousND<S> out(src.shape());
+    soa_to_aos(src, out);
+    return out;
+}
+
+} // namespace soa
+} // namespace cnda
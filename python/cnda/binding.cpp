@@ -1,24 +1,777 @@
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>      // suport std::vector
+#include <pybind11/numpy.h>    // py::array, structured dtypes
 #include <cnda/contiguous_nd.hpp>  // include/cnda/
 // AoS types (Vec2f, Vec3f, Cell2D, ...)
 #include <cnda/aos_types.hpp>
+#include <cnda/cell_list.hpp>
+#include <cnda/compact.hpp>
+#include <cnda/expr.hpp>
+#include <cnda/field_view.hpp>
+#include <cnda/gather.hpp>
+#include <cnda/halo.hpp>
+#include <cnda/kernels.hpp>
+#include <cnda/layout.hpp>
+#include <cnda/mmap.hpp>
+#include <cnda/pool.hpp>
+#include <cnda/record.hpp>
+#include <cnda/reduce.hpp>
+#include <cnda/soa.hpp>
+#include <algorithm>
 #include <cstddef>
 #include <cstdint>
+#include <cstring>
+#include <memory>
+#include <string>
+#include <type_traits>
+#include <unordered_map>
+#include <utility>
+#include <vector>
 
 //py is the abbrivation of pybind11
 namespace py = pybind11;
+
+// Shapes and strides (cnda::Extents) convert like std::vector<size_t>:
+// from any sequence of ints, to a Python list
+namespace pybind11 { namespace detail {
+template <> struct type_caster<cnda::Extents> {
+    PYBIND11_TYPE_CASTER(cnda::Extents, const_name("List[int]"));
+
+    bool load(handle src, bool convert) {
+        make_caster<std::vector<std::size_t>> values;
+        if (!values.load(src, convert)) return false;
+        value = cast_op<std::vector<std::size_t> &>(values);
+        return true;
+    }
+
+    static handle cast(const cnda::Extents &src, return_value_policy policy, handle parent) {
+        return make_caster<std::vector<std::size_t>>::cast(std::vector<std::size_t>(src), policy, parent);
+    }
+};
+}} // namespace pybind11::detail
+
 using namespace cnda;
 using namespace cnda::aos;
 
+// Wrap a Python object (typically the source ndarray) in a shared_ptr so it
+// can serve as the external owner of a ContiguousND view. The last reference
+// may be dropped from C++ without the GIL held, so reacquire it on release.
+static std::shared_ptr<void> make_py_owner(py::object obj) {
+    return std::shared_ptr<void>(new py::object(std::move(obj)), [](void *p) {
+        py::gil_scoped_acquire gil;
+        delete static_cast<py::object *>(p);
+    });
+}
+
+// Arrays over a read-only ('r') file mapping must never be written: the pages
+// are mapped without write permission.
+template <typename T>
+bool is_read_only(const ContiguousND<T> &a) {
+    MappedFile *f = mapped_file_of(a.owner());
+    return f && f->mode() == MapMode::read_only;
+}
+
+template <typename T>
+void check_writable(const ContiguousND<T> &a, const char *who) {
+    if (is_read_only(a)) throw py::value_error(std::string(who) + ": array is read-only");
+}
+
+// Byte strides of a ContiguousND (which stores them in elements)
+template <typename T>
+std::vector<py::ssize_t> byte_strides(const ContiguousND<T> &a) {
+    std::vector<py::ssize_t> out(a.ndim());
+    for (std::size_t d = 0; d < a.ndim(); ++d) {
+        out[d] = static_cast<py::ssize_t>(a.strides()[d] * sizeof(T));
+    }
+    return out;
+}
+
+// NumPy array over the memory of `a`. With a valid `base` the result is a
+// view that keeps `base` alive; without one, NumPy copies the data.
+template <typename T>
+py::array numpy_array_of(ContiguousND<T> &a, py::handle base) {
+    std::vector<py::ssize_t> shape(a.shape().begin(), a.shape().end());
+    py::array out(py::dtype::of<T>(), shape, byte_strides(a), a.data(), base);
+    if (base && is_read_only(a)) {
+        out.attr("setflags")(py::arg("write") = false);
+    }
+    return out;
+}
+
+// PEP 3118 description of the buffer; AoS types use the structured format
+// string pybind11 derives from the registered NumPy dtype.
+template <typename T>
+py::buffer_info buffer_info_of(ContiguousND<T> &a) {
+    std::vector<py::ssize_t> shape(a.shape().begin(), a.shape().end());
+    return py::buffer_info(a.data(), static_cast<py::ssize_t>(sizeof(T)),
+                           py::format_descriptor<T>::format(),
+                           static_cast<py::ssize_t>(a.ndim()), shape, byte_strides(a),
+                           is_read_only(a));
+}
+
+// NumPy __array_interface__ (version 3); NumPy keeps the exporting object
+// alive for as long as arrays built from it exist.
+template <typename T>
+py::dict array_interface_of(ContiguousND<T> &a) {
+    py::dtype dt = py::dtype::of<T>();
+    std::vector<py::ssize_t> shape(a.shape().begin(), a.shape().end());
+    py::dict d;
+    d["version"] = 3;
+    d["shape"] = py::tuple(py::cast(shape));
+    d["strides"] = py::tuple(py::cast(byte_strides(a)));
+    d["typestr"] = dt.attr("str");
+    d["descr"] = dt.attr("descr");
+    d["data"] = py::make_tuple(reinterpret_cast<std::uintptr_t>(a.data()), is_read_only(a));
+    return d;
+}
+
+// Index arrays for take()/put(): (k, ndim) multi-indices or (k,) flat
+// row-major positions. Only integer dtypes are accepted, so float positions
+// are not truncated and boolean masks are not read as 0/1 indices; empty
+// sequences pass whatever their dtype, as np.asarray([]) is float64.
+typedef py::array_t<std::int64_t, py::array::c_style> index_array;
+
+static index_array as_index_array(py::handle obj, const char *who) {
+    py::array a = py::array::ensure(obj);
+    if (!a) throw py::type_error(std::string(who) + ": indices must be an integer array");
+    const char kind = a.dtype().kind();
+    if (kind != 'i' && kind != 'u' && a.size() != 0) {
+        throw py::type_error(std::string(who) + ": indices must be an integer array, got dtype " +
+                             py::str(a.dtype()).cast<std::string>());
+    }
+    return index_array::ensure(a.attr("astype")(py::dtype::of<std::int64_t>(), py::arg("order") = "C",
+                                                 py::arg("copy") = false));
+}
+
+// Returns k and whether the indices are flat
+
+template <typename T>
+std::pair<std::size_t, bool> parse_indices(const ContiguousND<T> &self, const index_array &idx, const char *who) {
+    if (idx.ndim() == 1) {
+        return std::make_pair(static_cast<std::size_t>(idx.shape(0)), true);
+    }
+    if (idx.ndim() == 2 && static_cast<std::size_t>(idx.shape(1)) == self.ndim()) {
+        return std::make_pair(static_cast<std::size_t>(idx.shape(0)), false);
+    }
+    throw py::value_error(std::string(who) + ": indices must have shape (k, ndim) or (k,)");
+}
+
+template <typename T>
+py::array take_t(const ContiguousND<T> &self, py::object indices) {
+    const index_array idx = as_index_array(indices, "take()");
+    std::pair<std::size_t, bool> k = parse_indices(self, idx, "take()");
+    py::array_t<T> out(static_cast<py::ssize_t>(k.first));
+    T *dst = out.mutable_data();
+    const std::int64_t *src = idx.data();
+    {
+        py::gil_scoped_release release;
+        cnda::take(self, src, k.first, k.second, dst);
+    }
+    return out;
+}
+
+template <typename T>
+void put_t(ContiguousND<T> &self, py::object indices,
+           const py::array_t<T, py::array::c_style | py::array::forcecast> &values) {
+    check_writable(self, "put()");
+    const index_array idx = as_index_array(indices, "put()");
+    std::pair<std::size_t, bool> k = parse_indices(self, idx, "put()");
+    const std::size_t n_values = static_cast<std::size_t>(values.size());
+    if (n_values != k.first && n_values != 1) {
+        throw py::value_error("put(): values must have one entry per index or a single entry");
+    }
+    const std::int64_t *src = idx.data();
+    const T *vals = values.data();
+    py::gil_scoped_release release;
+    cnda::put(self, src, k.first, k.second, vals, n_values);
+}
+
+// Active-cell lists of Cell2D/Cell3D grids: sorted flat positions of the
+// cells whose flag equals k, ready for take()/put()
+static py::array_t<std::int64_t> index_list(const std::vector<std::int64_t> &idx) {
+    py::array_t<std::int64_t> out(static_cast<py::ssize_t>(idx.size()));
+    if (!idx.empty()) std::memcpy(out.mutable_data(), idx.data(), idx.size() * sizeof(std::int64_t));
+    return out;
+}
+
+template <typename T>
+py::array_t<std::int64_t> where_flag_t(const ContiguousND<T> &self, std::int32_t k) {
+    std::vector<std::int64_t> idx;
+    {
+        py::gil_scoped_release release;
+        idx = cnda::where(self, flag_equals{k});
+    }
+    return index_list(idx);
+}
+
+template <typename T>
+py::array_t<std::int64_t> update_where_flag_t(const ContiguousND<T> &self, py::object indices_obj,
+                                              py::object changed_obj, std::int32_t k) {
+    const index_array indices = as_index_array(indices_obj, "update_where_flag()");
+    const index_array changed = as_index_array(changed_obj, "update_where_flag()");
+    if (indices.ndim() != 1 || changed.ndim() != 1) {
+        throw py::value_error("update_where_flag(): indices and changed must be 1-D");
+    }
+    std::vector<std::int64_t> list(indices.data(), indices.data() + indices.size());
+    const std::int64_t *c = changed.data();
+    const std::size_t n_changed = static_cast<std::size_t>(changed.size());
+    ActiveSet set;
+    {
+        py::gil_scoped_release release;
+        set = ActiveSet(self.shape(), std::move(list));
+        set.update(self, flag_equals{k}, c, n_changed);
+    }
+    return index_list(set.indices());
+}
+
+// Element addressed by an int (1D) or a tuple/list with one index per axis
+template <typename T>
+T &element_from_key(ContiguousND<T> &self, py::object key) {
+    if (py::isinstance<py::int_>(key)) {
+        std::size_t i = key.cast<std::size_t>();
+        return self(i);
+    }
+    if (py::isinstance<py::tuple>(key) || py::isinstance<py::list>(key)) {
+        std::vector<std::size_t> idx = key.cast<std::vector<std::size_t>>();
+        const auto &sh = self.shape();
+        const auto &str = self.strides();
+        if (idx.size() != sh.size()) throw std::runtime_error("index: rank mismatch");
+        std::size_t off = 0;
+        for (std::size_t a = 0; a < idx.size(); ++a) {
+            if (idx[a] >= sh[a]) throw std::out_of_range("index: out of bounds");
+            off += idx[a] * str[a];
+        }
+        return self.data()[off];
+    }
+    throw std::runtime_error("Unsupported index type");
+}
+
+static bool is_slice_key(const py::object &key) {
+    if (py::isinstance<py::slice>(key)) return true;
+    if (!py::isinstance<py::tuple>(key)) return false;
+    for (py::handle k : key.cast<py::tuple>()) {
+        if (py::isinstance<py::slice>(k)) return true;
+    }
+    return false;
+}
+
+// Strided view for a slice key: a slice or a tuple of ints and slices with
+// at most ndim entries (missing trailing axes are taken whole). Integers
+// pick one position and drop that axis; both accept negative values.
+template <typename T>
+ContiguousND<T> view_from_key(ContiguousND<T> &self, py::object key) {
+    py::tuple parts = py::isinstance<py::tuple>(key) ? key.cast<py::tuple>() : py::make_tuple(key);
+    if (parts.size() > self.ndim()) throw py::index_error("index: too many indices");
+
+    std::vector<Range> ranges;
+    std::vector<bool> keep(self.ndim(), true);
+    for (std::size_t d = 0; d < parts.size(); ++d) {
+        const py::ssize_t n = static_cast<py::ssize_t>(self.shape()[d]);
+        py::handle k = parts[d];
+        if (py::isinstance<py::slice>(k)) {
+            py::ssize_t start = 0, stop = 0, step = 0, len = 0;
+            if (!k.cast<py::slice>().compute(n, &start, &stop, &step, &len)) {
+                throw py::error_already_set();
+            }
+            if (step < 0) throw py::value_error("index: negative slice steps are not supported");
+            Range r = { static_cast<std::size_t>(start),
+                        static_cast<std::size_t>(start + len * step),
+                        static_cast<std::size_t>(step) };
+            ranges.push_back(r);
+        } else if (py::isinstance<py::int_>(k)) {
+            py::ssize_t i = k.cast<py::ssize_t>();
+            if (i < 0) i += n;
+            if (i < 0 || i >= n) throw py::index_error("index: out of bounds");
+            Range r = { static_cast<std::size_t>(i), static_cast<std::size_t>(i) + 1, 1 };
+            ranges.push_back(r);
+            keep[d] = false;
+        } else {
+            throw std::runtime_error("Unsupported index type");
+        }
+    }
+
+    ContiguousND<T> sliced = self.slice(ranges);
+    std::vector<std::size_t> shape, strides;
+    for (std::size_t d = 0; d < self.ndim(); ++d) {
+        if (!keep[d]) continue;
+        shape.push_back(sliced.shape()[d]);
+        strides.push_back(sliced.strides()[d]);
+    }
+    // The slice already shares the parent's owner or buffer
+    return ContiguousND<T>(std::move(shape), std::move(strides), sliced.data(), sliced.owner());
+}
+
+// view[...] = value with NumPy broadcasting; AoS views also accept a single
+// struct instance, which is written to every element.
+template <typename T>
+void assign_to_view(ContiguousND<T> &view, py::object value) {
+    // `a[k] op= x` ends with a[k] = (the view that was just updated): nothing to do
+    if (py::isinstance<ContiguousND<T>>(value)) {
+        const ContiguousND<T> &src = value.cast<const ContiguousND<T> &>();
+        if (src.data() == view.data() && src.shape() == view.shape() && src.strides() == view.strides()) return;
+    }
+    py::capsule scratch(view.data(), [](void *) {});
+    py::array dst = numpy_array_of(view, scratch);
+    if constexpr (!std::is_arithmetic<T>::value) {
+        if (py::isinstance<T>(value)) {
+            value = py::array_t<T>(1, &value.cast<T &>());
+        }
+    }
+    dst[py::ellipsis()] = value;
+}
+
+template <typename T>
+py::array to_numpy_t(py::object self_obj, bool copy) {
+    ContiguousND<T> &self = self_obj.cast<ContiguousND<T> &>();
+    if (copy) {
+        return numpy_array_of(self, py::handle());
+    }
+    // Views hand their owner to a capsule so the NumPy array stays valid even
+    // after the ContiguousND wrapper is gone; owning arrays pin the wrapper.
+    if (self.is_view()) {
+        py::capsule owner(new std::shared_ptr<void>(self.owner()), [](void *p) {
+            delete static_cast<std::shared_ptr<void> *>(p);
+        });
+        return numpy_array_of(self, owner);
+    }
+    return numpy_array_of(self, self_obj);
+}
+
+// I/O failures (std::runtime_error from mmap.hpp / npy.hpp) surface as OSError
+[[noreturn]] static void raise_os_error(const std::runtime_error &e) {
+    PyErr_SetString(PyExc_OSError, e.what());
+    throw py::error_already_set();
+}
+
+// Whether src must be copied before a kernel writing dst reads it: their
+// memory overlaps (e.g. b[1:] and b[:-1]) and they are not the same view, in
+// which case every element would only read itself.
+template <typename T, typename U>
+bool needs_copy(const ContiguousND<T> &dst, const ContiguousND<U> &src) {
+    if (!cnda::may_overlap(dst, src)) return false;
+    return !(std::is_same<T, U>::value && static_cast<const void *>(dst.data()) == src.data() &&
+             dst.shape() == src.shape() && dst.strides() == src.strides());
+}
+
+// copy_from(src): any scalar ContiguousND_* is cast element by element into
+// a scalar array; AoS arrays copy only from their own type.
+template <typename T, typename U>
+bool try_copy_from(ContiguousND<T> &self, const py::object &src) {
+    if (!py::isinstance<ContiguousND<U>>(src)) return false;
+    const ContiguousND<U> &s = src.cast<const ContiguousND<U> &>();
+    if (self.shape() != s.shape()) throw py::value_error("copy_from(): shape mismatch");
+    py::gil_scoped_release release;
+    if (needs_copy(self, s)) {
+        cnda::copy_from(self, copy_in_order(s, Order::C));
+    } else {
+        cnda::copy_from(self, s);
+    }
+    return true;
+}
+
+template <typename T>
+void copy_from_t(ContiguousND<T> &self, py::object src) {
+    check_writable(self, "copy_from()");
+    if constexpr (std::is_arithmetic<T>::value) {
+        if (try_copy_from<T, int32_t>(self, src)) return;
+        if (try_copy_from<T, int64_t>(self, src)) return;
+        if (try_copy_from<T, float>(self, src)) return;
+        if (try_copy_from<T, double>(self, src)) return;
+    } else {
+        if (try_copy_from<T, T>(self, src)) return;
+    }
+    throw py::type_error("copy_from(): unsupported source type");
+}
+
+// self op= operand for the in-place operators of the scalar classes: the
+// operand is a number or a ContiguousND of the same type and shape, read as
+// it was before the update even when it overlaps self. Slices write
+// through, so `a.field("u")[:] *= 0.5` scales the field in place.
+template <typename T, typename Op>
+py::object inplace_t(py::object self_obj, py::object operand, const char *who, Op op) {
+    ContiguousND<T> &self = self_obj.cast<ContiguousND<T> &>();
+    if (py::isinstance<ContiguousND<T>>(operand)) {
+        check_writable(self, who);
+        const ContiguousND<T> &x = operand.cast<const ContiguousND<T> &>();
+        if (self.shape() != x.shape()) throw py::value_error(std::string(who) + ": shape mismatch");
+        py::gil_scoped_release release;
+        if (needs_copy(self, x)) {
+            cnda::detail::apply(self, copy_in_order(x, Order::C), op, who);
+        } else {
+            cnda::detail::apply(self, x, op, who);
+        }
+        return self_obj;
+    }
+    T value;
+    try {
+        value = operand.cast<T>();
+    } catch (const py::cast_error &) {
+        return py::reinterpret_borrow<py::object>(py::handle(Py_NotImplemented));
+    }
+    check_writable(self, who);
+    {
+        py::gil_scoped_release release;
+        cnda::detail::apply(self, [&](T &d) { op(d, value); });
+    }
+    return self_obj;
+}
+
+// Parallel element-wise kernels (kernels.hpp), all with the GIL released.
+// scale/axpy/clip and the in-place operators exist only on the scalar
+// classes.
+template <typename T>
+void bind_kernels(py::class_<ContiguousND<T>> &cls) {
+    cls.def("fill", [](ContiguousND<T> &self, const T &value) {
+            check_writable(self, "fill()");
+            py::gil_scoped_release release;
+            cnda::fill(self, value);
+        }, py::arg("value"))
+        .def("copy_from", &copy_from_t<T>, py::arg("src"));
+    if constexpr (std::is_arithmetic<T>::value) {
+        cls.def("scale", [](ContiguousND<T> &self, T alpha) {
+                check_writable(self, "scale()");
+                py::gil_scoped_release release;
+                cnda::scale(self, alpha);
+            }, py::arg("alpha"))
+            .def("axpy", [](ContiguousND<T> &self, T alpha, const ContiguousND<T> &x) {
+                check_writable(self, "axpy()");
+                if (self.shape() != x.shape()) throw py::value_error("axpy(): shape mismatch");
+                py::gil_scoped_release release;
+                if (needs_copy(self, x)) {
+                    cnda::axpy(self, alpha, copy_in_order(x, Order::C));
+                } else {
+                    cnda::axpy(self, alpha, x);
+                }
+            }, py::arg("alpha"), py::arg("x"))
+            .def("clip", [](ContiguousND<T> &self, T lo, T hi) {
+                check_writable(self, "clip()");
+                if (hi < lo) throw py::value_error("clip(): lo must not exceed hi");
+                py::gil_scoped_release release;
+                cnda::clip(self, lo, hi);
+            }, py::arg("lo"), py::arg("hi"))
+            .def("__iadd__", [](py::object self, py::object x) {
+                return inplace_t<T>(self, x, "+=", [](T &d, const T &s) { d += s; });
+            })
+            .def("__isub__", [](py::object self, py::object x) {
+                return inplace_t<T>(self, x, "-=", [](T &d, const T &s) { d -= s; });
+            })
+            .def("__imul__", [](py::object self, py::object x) {
+                return inplace_t<T>(self, x, "*=", [](T &d, const T &s) { d *= s; });
+            });
+        if constexpr (std::is_floating_point<T>::value) {
+            cls.def("__itruediv__", [](py::object self, py::object x) {
+                return inplace_t<T>(self, x, "/=", [](T &d, const T &s) { d /= s; });
+            });
+        }
+    }
+}
+
+static Summation parse_summation(const std::string &method) {
+    if (method == "pairwise") return Summation::pairwise;
+    if (method == "kahan") return Summation::kahan;
+    if (method == "naive") return Summation::naive;
+    throw py::value_error("method must be 'pairwise', 'kahan' or 'naive'");
+}
+
+// Python-style axis (negative counts from the end)
+static std::size_t normalize_axis(py::object axis, std::size_t ndim, const char *who) {
+    py::ssize_t ax = axis.cast<py::ssize_t>();
+    if (ax < 0) ax += static_cast<py::ssize_t>(ndim);
+    if (ax < 0 || ax >= static_cast<py::ssize_t>(ndim)) {
+        throw py::index_error(std::string(who) + ": axis out of range");
+    }
+    return static_cast<std::size_t>(ax);
+}
+
+// Reductions (reduce.hpp) with the GIL released. axis=None reduces
+// everything to a Python scalar; an axis gives a ContiguousND_* without it.
+template <typename T>
+py::object sum_t(const ContiguousND<T> &a, py::object axis, const std::string &method) {
+    const Summation mode = parse_summation(method);
+    if (axis.is_none()) {
+        typename sum_type<T>::type r;
+        {
+            py::gil_scoped_release release;
+            r = cnda::sum(a, mode);
+        }
+        return py::cast(r);
+    }
+    const std::size_t ax = normalize_axis(axis, a.ndim(), "sum()");
+    return py::cast([&] { py::gil_scoped_release release; return cnda::sum(a, ax, mode); }());
+}
+
+template <typename T>
+py::object mean_t(const ContiguousND<T> &a, py::object axis, const std::string &method) {
+    const Summation mode = parse_summation(method);
+    if (axis.is_none()) {
+        double r;
+        {
+            py::gil_scoped_release release;
+            r = cnda::mean(a, mode);
+        }
+        return py::cast(r);
+    }
+    const std::size_t ax = normalize_axis(axis, a.ndim(), "mean()");
+    return py::cast([&] { py::gil_scoped_release release; return cnda::mean(a, ax, mode); }());
+}
+
+template <typename T>
+py::object min_t(const ContiguousND<T> &a, py::object axis) {
+    if (axis.is_none()) {
+        T r;
+        {
+            py::gil_scoped_release release;
+            r = cnda::amin(a);
+        }
+        return py::cast(r);
+    }
+    const std::size_t ax = normalize_axis(axis, a.ndim(), "min()");
+    return py::cast([&] { py::gil_scoped_release release; return cnda::amin(a, ax); }());
+}
+
+template <typename T>
+py::object max_t(const ContiguousND<T> &a, py::object axis) {
+    if (axis.is_none()) {
+        T r;
+        {
+            py::gil_scoped_release release;
+            r = cnda::amax(a);
+        }
+        return py::cast(r);
+    }
+    const std::size_t ax = normalize_axis(axis, a.ndim(), "max()");
+    return py::cast([&] { py::gil_scoped_release release; return cnda::amax(a, ax); }());
+}
+
+template <typename T>
+py::object argmax_t(const ContiguousND<T> &a, py::object axis) {
+    if (axis.is_none()) {
+        std::size_t r;
+        {
+            py::gil_scoped_release release;
+            r = cnda::argmax(a);
+        }
+        return py::cast(r);
+    }
+    const std::size_t ax = normalize_axis(axis, a.ndim(), "argmax()");
+    return py::cast([&] { py::gil_scoped_release release; return cnda::argmax(a, ax); }());
+}
+
+// Run fn on the scalar view of AoS field `name` (KeyError if there is none)
+template <typename S, typename Fn>
+py::object with_field(ContiguousND<S> &self, const std::string &name, Fn fn) {
+    const aos::FieldInfo *f = aos::struct_fields<S>::get();
+    for (std::size_t i = 0; i < aos::struct_fields<S>::count; ++i) {
+        if (name != f[i].name) continue;
+        if (f[i].kind == 'f' && f[i].size == sizeof(float)) return fn(field_view<float>(self, f[i].offset));
+        if (f[i].kind == 'f' && f[i].size == sizeof(double)) return fn(field_view<double>(self, f[i].offset));
+        if (f[i].kind == 'i' && f[i].size == sizeof(int32_t)) return fn(field_view<int32_t>(self, f[i].offset));
+        if (f[i].kind == 'i' && f[i].size == sizeof(int64_t)) return fn(field_view<int64_t>(self, f[i].offset));
+        throw py::type_error("field '" + name + "' has an unsupported type");
+    }
+    throw py::key_error("no field named '" + name + "'");
+}
+
+// from_columns(shape, **fields): one array-like per field, each holding
+// prod(shape) values, cast to the field's type and interleaved into a new
+// AoS array without the GIL
+template <typename S>
+ContiguousND<S> from_columns_t(const std::vector<std::size_t> &shape, const py::kwargs &fields) {
+    typedef aos::struct_fields<S> Fields;
+    const aos::FieldInfo *f = Fields::get();
+    for (const auto &item : fields) {
+        const std::string name = py::str(item.first);
+        if (!aos::find_field(f, Fields::count, name.c_str())) {
+            throw py::type_error("from_columns(): no field named '" + name + "'");
+        }
+    }
+    std::size_t count = 1;
+    for (std::size_t d : shape) count *= d;
+    py::object ascontiguousarray = py::module_::import("numpy").attr("ascontiguousarray");
+    std::vector<py::array> columns;
+    const void *data[Fields::count];
+    for (std::size_t k = 0; k < Fields::count; ++k) {
+        if (!fields.contains(f[k].name)) {
+            throw py::type_error(std::string("from_columns(): missing field '") + f[k].name + "'");
+        }
+        const py::dtype dt(std::string("=") + f[k].kind + std::to_string(f[k].size));
+        columns.push_back(ascontiguousarray(fields[f[k].name], py::arg("dtype") = dt));
+        if (static_cast<std::size_t>(columns.back().size()) != count) {
+            throw py::value_error(std::string("from_columns(): field '") + f[k].name +
+                                  "' does not have one value per element");
+        }
+        data[k] = columns.back().data();
+    }
+    ContiguousND<S> out = ContiguousND<S>::empty(shape);
+    py::gil_scoped_release release;
+    soa::columns_to_aos(data, out);
+    return out;
+}
+
+// to_columns(): {field name: new NumPy array of that field}
+template <typename S>
+py::dict to_columns_t(const ContiguousND<S> &self) {
+    typedef aos::struct_fields<S> Fields;
+    const aos::FieldInfo *f = Fields::get();
+    std::vector<py::ssize_t> shape(self.shape().begin(), self.shape().end());
+    py::dict out;
+    void *data[Fields::count];
+    for (std::size_t k = 0; k < Fields::count; ++k) {
+        const py::dtype dt(std::string("=") + f[k].kind + std::to_string(f[k].size));
+        py::array column(dt, shape);
+        data[k] = column.mutable_data();
+        out[f[k].name] = column;
+    }
+    py::gil_scoped_release release;
+    if (self.is_contiguous()) {
+        soa::aos_to_columns(self, data);
+    } else {
+        ContiguousND<S> packed = ContiguousND<S>::empty(self.shape());
+        cnda::copy_from(packed, self);
+        soa::aos_to_columns(packed, data);
+    }
+    return out;
+}
+
+// Scalar classes reduce their elements; AoS classes reduce one named field
+template <typename T>
+void bind_reductions(py::class_<ContiguousND<T>> &cls) {
+    if constexpr (std::is_arithmetic<T>::value) {
+        cls.def("sum", &sum_t<T>, py::arg("axis") = py::none(), py::arg("method") = "pairwise")
+            .def("mean", &mean_t<T>, py::arg("axis") = py::none(), py::arg("method") = "pairwise")
+            .def("min", &min_t<T>, py::arg("axis") = py::none())
+            .def("max", &max_t<T>, py::arg("axis") = py::none())
+            .def("argmax", &argmax_t<T>, py::arg("axis") = py::none());
+    } else {
+        cls.def("sum", [](ContiguousND<T> &self, const std::string &field, py::object axis, const std::string &method) {
+                return with_field(self, field, [&](const auto &v) { return sum_t(v, axis, method); });
+            }, py::arg("field"), py::arg("axis") = py::none(), py::arg("method") = "pairwise")
+            .def("mean", [](ContiguousND<T> &self, const std::string &field, py::object axis, const std::string &method) {
+                return with_field(self, field, [&](const auto &v) { return mean_t(v, axis, method); });
+            }, py::arg("field"), py::arg("axis") = py::none(), py::arg("method") = "pairwise")
+            .def("min", [](ContiguousND<T> &self, const std::string &field, py::object axis) {
+                return with_field(self, field, [&](const auto &v) { return min_t(v, axis); });
+            }, py::arg("field"), py::arg("axis") = py::none())
+            .def("max", [](ContiguousND<T> &self, const std::string &field, py::object axis) {
+                return with_field(self, field, [&](const auto &v) { return max_t(v, axis); });
+            }, py::arg("field"), py::arg("axis") = py::none())
+            .def("argmax", [](ContiguousND<T> &self, const std::string &field, py::object axis) {
+                return with_field(self, field, [&](const auto &v) { return argmax_t(v, axis); });
+            }, py::arg("field"), py::arg("axis") = py::none());
+    }
+}
+
+// Pool installed by enable_pool(); it stays the default allocator until
+// disable_pool(). Leaked like the C++ settings: buffers may outlive the module.
+static std::shared_ptr<BufferPool> &python_pool() {
+    static std::shared_ptr<BufferPool> *pool = new std::shared_ptr<BufferPool>();
+    return *pool;
+}
+
+static void enable_pool(std::size_t capacity) {
+    std::shared_ptr<BufferPool> &pool = python_pool();
+    if (pool) {
+        pool->set_capacity(capacity);
+        return;
+    }
+    pool = std::make_shared<BufferPool>(capacity);
+    set_default_allocator(pool);
+}
+
+// Buffers still alive return to the pool, which is freed with the last one
+static void disable_pool() {
+    std::shared_ptr<BufferPool> &pool = python_pool();
+    if (!pool) return;
+    set_default_allocator(nullptr);
+    pool->trim();
+    pool.reset();
+}
+
+static py::object pool_stats() {
+    const std::shared_ptr<BufferPool> &pool = python_pool();
+    if (!pool) return py::none();
+    const PoolStats s = pool->stats();
+    py::dict d;
+    d["hits"] = s.hits;
+    d["misses"] = s.misses;
+    d["evictions"] = s.evictions;
+    d["bytes_held"] = s.bytes_held;
+    d["bytes_in_use"] = s.bytes_in_use;
+    d["capacity"] = s.capacity;
+    return std::move(d);
+}
+
+static MapMode parse_map_mode(const std::string &mode) {
+    if (mode == "r") return MapMode::read_only;
+    if (mode == "r+") return MapMode::read_write;
+    if (mode == "c") return MapMode::copy_on_write;
+    throw py::value_error("open_mmap(): mode must be 'r', 'r+' or 'c'");
+}
+
+static MapAdvice parse_advice(const std::string &advice) {
+    if (advice == "normal") return MapAdvice::normal;
+    if (advice == "sequential") return MapAdvice::sequential;
+    if (advice == "random") return MapAdvice::random;
+    if (advice == "willneed") return MapAdvice::willneed;
+    throw py::value_error("madvise(): advice must be 'normal', 'sequential', 'random' or 'willneed'");
+}
+
+// reshape(): one extent may be -1, meaning whatever makes the sizes match
+static Extents resolve_shape(const std::vector<py::ssize_t> &shape, std::size_t size) {
+    Extents out(shape.size());
+    std::size_t known = 1;
+    std::size_t unknown = shape.size();
+    for (std::size_t d = 0; d < shape.size(); ++d) {
+        if (shape[d] == -1 && unknown == shape.size()) {
+            unknown = d;
+            continue;
+        }
+        if (shape[d] < 0) throw py::value_error("reshape(): extents must be non-negative, with at most one -1");
+        out[d] = static_cast<std::size_t>(shape[d]);
+        known *= out[d];
+    }
+    if (unknown != shape.size()) {
+        if (known == 0 || size % known != 0) {
+            throw py::value_error("reshape(): new shape must have the same number of elements");
+        }
+        out[unknown] = size / known;
+    }
+    return out;
+}
+
+static Order parse_order(const std::string &order, const char *who) {
+    if (order == "C") return Order::C;
+    if (order == "F") return Order::F;
+    throw py::value_error(std::string(who) + ": order must be 'C' or 'F'");
+}
+
 // Use template to do binding for different types.
 // It helps to bind the C++ class ContiguousND<T> to a Python class.
 template <typename T>
 // Bind c++ function to python function
 void bind_contiguous_nd(py::module_ &m, const std::string &class_name) {
-    py::class_<ContiguousND<T>>(m, class_name.c_str())
+    py::class_<ContiguousND<T>> cls(m, class_name.c_str(), py::buffer_protocol());
+    cls
         //Bind c++ constructor to python __init__
-        .def(py::init<std::vector<std::size_t>>(), py::arg("shape")) // size_t -> python int
+        .def(py::init([](const Extents &shape, std::size_t alignment, const std::string &order) {
+            return ContiguousND<T>::zeros(shape, parse_order(order, "ContiguousND()"), alignment);
+        }), py::arg("shape"), py::arg("alignment") = cnda::default_alignment, py::arg("order") = "C")
+        // Owning factories: uninitialized, zero-filled, or filled with a value,
+        // row-major ("C") or column-major ("F")
+        // (buffers come from the pool while enable_pool() is in effect)
+        .def_static("empty", [](const Extents &shape, std::size_t alignment, const std::string &order) {
+            return ContiguousND<T>::empty(shape, parse_order(order, "empty()"), alignment);
+        }, py::arg("shape"), py::arg("alignment") = cnda::default_alignment, py::arg("order") = "C")
+        .def_static("zeros", [](const Extents &shape, std::size_t alignment, const std::string &order) {
+            return ContiguousND<T>::zeros(shape, parse_order(order, "zeros()"), alignment);
+        }, py::arg("shape"), py::arg("alignment") = cnda::default_alignment, py::arg("order") = "C")
+        .def_static("full", [](const Extents &shape, const T &value, std::size_t alignment, const std::string &order) {
+            return ContiguousND<T>::full(shape, value, parse_order(order, "full()"), alignment);
+        }, py::arg("shape"), py::arg("value"), py::arg("alignment") = cnda::default_alignment,
+           py::arg("order") = "C")
+        // Zero-copy export to memoryview / np.asarray / any PEP 3118 consumer
+        .def_buffer(&buffer_info_of<T>)
+        .def_property_readonly("__array_interface__", &array_interface_of<T>)
         .def("shape", &ContiguousND<T>::shape) // std::vector<size_t> -> python list
         .def("strides", &ContiguousND<T>::strides)
         .def("ndim", &ContiguousND<T>::ndim)
@@ -42,51 +795,84 @@ void bind_contiguous_nd(py::module_ &m, const std::string &class_name) {
             }
             return off;
         })
+        .def("is_contiguous", &ContiguousND<T>::is_contiguous)
+        .def("is_f_contiguous", &ContiguousND<T>::is_f_contiguous)
+        // Axis permutation as a view (axes=None reverses them, so the
+        // transpose of a C-ordered array is F-ordered)
+        .def("transpose", [](ContiguousND<T> &self, py::object axes) {
+            if (axes.is_none()) return self.transpose();
+            return self.transpose(axes.cast<std::vector<std::size_t>>());
+        }, py::arg("axes") = py::none())
+        // Shape changes: views of the same buffer, O(ndim)
+        .def("reshape", [](ContiguousND<T> &self, const std::vector<py::ssize_t> &shape) {
+            return self.reshape(resolve_shape(shape, self.size()));
+        }, py::arg("shape"))
+        .def("squeeze", [](ContiguousND<T> &self, py::object axis) {
+            if (axis.is_none()) return self.squeeze();
+            return self.squeeze(normalize_axis(axis, self.ndim(), "squeeze()"));
+        }, py::arg("axis") = py::none())
+        .def("expand_dims", [](ContiguousND<T> &self, py::ssize_t axis) {
+            // axis counts positions in the result, as in NumPy
+            return self.expand_dims(normalize_axis(py::cast(axis), self.ndim() + 1, "expand_dims()"));
+        }, py::arg("axis"))
+        // 1-D: ravel() is a view when the elements are evenly spaced and a
+        // copy otherwise; flatten() always copies
+        .def("ravel", [](ContiguousND<T> &self) {
+            py::gil_scoped_release release;
+            return cnda::ravel(self);
+        })
+        .def("flatten", [](const ContiguousND<T> &self) {
+            py::gil_scoped_release release;
+            return cnda::flatten(self);
+        })
+        // New owning array with the same elements in the given order,
+        // copied in cache-sized tiles without the GIL
+        .def("copy", [](const ContiguousND<T> &self, const std::string &order) {
+            const Order o = parse_order(order, "copy()");
+            py::gil_scoped_release release;
+            return cnda::copy_in_order(self, o);
+        }, py::arg("order") = "C")
         // Because python does not support pointer, we convert the data to vector
         .def("data", [](ContiguousND<T> &self) {
-            return std::vector<T>(self.data(), self.data() + self.size());
-        })
-        // To allow type int, list and tuple as indices (support arbitrary ndim)
-        .def("__getitem__", [](ContiguousND<T>& self, py::object key) -> T& {
-            if (py::isinstance<py::int_>(key)) {
-                std::size_t i = key.cast<std::size_t>();
-                return self(i);
+            if (self.is_contiguous()) {
+                return std::vector<T>(self.data(), self.data() + self.size());
             }
-            if (py::isinstance<py::tuple>(key) || py::isinstance<py::list>(key)) {
-                std::vector<std::size_t> idx = key.cast<std::vector<std::size_t>>();
-                const auto &sh = self.shape();
-                const auto &str = self.strides();
-                if (idx.size() != sh.size()) throw std::runtime_error("index: rank mismatch");
-                std::size_t off = 0;
-                for (std::size_t a = 0; a < idx.size(); ++a) {
-                    if (idx[a] >= sh[a]) throw std::out_of_range("index: out of bounds");
-                    off += idx[a] * str[a];
-                }
-                return self.data()[off];
+            std::vector<T> out;
+            out.reserve(self.size());
+            for (const T &x : self) out.push_back(x);
+            return out;
+        })
+        // Batched gather/scatter: one C++ loop with the GIL released
+        .def("take", &take_t<T>, py::arg("indices"))
+        .def("put", &put_t<T>, py::arg("indices"), py::arg("values"))
+        // NumPy view of the buffer (no copy) unless copy=True
+        .def("to_numpy", &to_numpy_t<T>, py::arg("copy") = false)
+        // To allow type int, list and tuple as indices (support arbitrary ndim).
+        // Slices, alone or inside a tuple, return a strided view instead.
+        .def("__getitem__", [](py::object self_obj, py::object key) -> py::object {
+            ContiguousND<T> &self = self_obj.cast<ContiguousND<T> &>();
+            if (is_slice_key(key)) {
+                return py::cast(view_from_key(self, key));
             }
-
-            throw std::runtime_error("Unsupported index type");
-        }, py::return_value_policy::reference_internal)
-        .def("__setitem__", [](ContiguousND<T>& self, py::object key, T value) {
-            if (py::isinstance<py::int_>(key)) {
-                self(key.cast<std::size_t>()) = value;
+            // Elements of a read-only mapping come back as copies
+            const py::return_value_policy policy = is_read_only(self)
+                ? py::return_value_policy::copy : py::return_value_policy::reference_internal;
+            return py::cast(element_from_key(self, key), policy, self_obj);
+        })
+        .def("__setitem__", [](py::object self_obj, py::object key, py::object value) {
+            ContiguousND<T> &self = self_obj.cast<ContiguousND<T> &>();
+            if (is_slice_key(key)) {
+                ContiguousND<T> view = view_from_key(self, key);
+                assign_to_view(view, value);
                 return;
             }
-
-            if (py::isinstance<py::tuple>(key) || py::isinstance<py::list>(key)) {
-                std::vector<std::size_t> idx = key.cast<std::vector<std::size_t>>();
-                const auto &sh = self.shape();
-                const auto &str = self.strides();
-                if (idx.size() != sh.size()) throw std::runtime_error("index: rank mismatch");
-                std::size_t off = 0;
-                for (std::size_t a = 0; a < idx.size(); ++a) {
-                    if (idx[a] >= sh[a]) throw std::out_of_range("index: out of bounds");
-                    off += idx[a] * str[a];
-                }
-                self.data()[off] = value;
-                return;
+            check_writable(self, "__setitem__");
+            T &dst = element_from_key(self, key);
+            try {
+                dst = value.cast<T>();
+            } catch (const py::cast_error &) {
+                throw py::type_error("__setitem__: value has the wrong type");
             }
-            throw std::runtime_error("Unsupported index type");
         })
         // Expose raw pointer helpers (as integer addresses) so Python tests
         // can perform byte-level offset checks against C++ expectations.
@@ -113,7 +899,8 @@ void bind_contiguous_nd(py::module_ &m, const std::string &class_name) {
             return reinterpret_cast<std::uintptr_t>(&self.data()[off]);
         })
         // .at() method for bounds-checked access
-        .def("at", [](ContiguousND<T>& self, py::object key) -> T& {
+        .def("at", [](py::object self_obj, py::object key) -> py::object {
+            ContiguousND<T> &self = self_obj.cast<ContiguousND<T> &>();
             if (py::isinstance<py::tuple>(key) || py::isinstance<py::list>(key)) {
                 // Try to cast as signed integers first to detect negative indices
                 std::vector<py::ssize_t> signed_idx;
@@ -148,10 +935,116 @@ void bind_contiguous_nd(py::module_ &m, const std::string &class_name) {
                     }
                     off += idx[a] * str[a];
                 }
-                return self.data()[off];
+                const py::return_value_policy policy = is_read_only(self)
+                    ? py::return_value_policy::copy : py::return_value_policy::reference_internal;
+                return py::cast(self.data()[off], policy, self_obj);
             }
             throw py::index_error("at(): requires tuple or list of indices");
-        }, py::return_value_policy::reference_internal);
+        })
+        // .npy export straight from the buffer, optionally in chunk_bytes pieces
+        .def("save", [](const ContiguousND<T> &self, const std::string &path, std::size_t chunk_bytes) {
+            try {
+                py::gil_scoped_release release;
+                npy::save(path, self, chunk_bytes);
+            } catch (const std::runtime_error &e) {
+                raise_os_error(e);
+            }
+        }, py::arg("path"), py::arg("chunk_bytes") = 0)
+        // File-backed arrays (open_mmap): write back dirty pages / hint the
+        // access pattern. Other arrays raise ValueError.
+        .def("is_mapped", [](const ContiguousND<T> &self) {
+            return mapped_file_of(self.owner()) != nullptr;
+        })
+        .def("flush", [](ContiguousND<T> &self) {
+            MappedFile *f = mapped_file_of(self.owner());
+            if (!f) throw py::value_error("flush(): array is not backed by a mapped file");
+            py::gil_scoped_release release;
+            f->flush();
+        })
+        .def("madvise", [](ContiguousND<T> &self, const std::string &advice) {
+            MappedFile *f = mapped_file_of(self.owner());
+            if (!f) throw py::value_error("madvise(): array is not backed by a mapped file");
+            f->advise(parse_advice(advice));
+        }, py::arg("advice"));
+    bind_kernels<T>(cls);
+    bind_reductions<T>(cls);
+    if constexpr (!std::is_arithmetic<T>::value) {
+        // Zero-copy scalar view of one field, e.g. cells.field("u")
+        cls.def("field", [](ContiguousND<T> &self, const std::string &name) {
+            return with_field(self, name, [](auto view) { return py::cast(std::move(view)); });
+        }, py::arg("name"));
+        // Bulk packing from / unpacking to one NumPy array per field
+        cls.def_static("from_columns", &from_columns_t<T>, py::arg("shape"));
+        cls.def("to_columns", &to_columns_t<T>);
+    }
+    if constexpr (std::is_same<T, aos::Cell2D>::value || std::is_same<T, aos::Cell3D>::value) {
+        cls.def("where_flag", &where_flag_t<T>, py::arg("k"));
+        cls.def("update_where_flag", &update_where_flag_t<T>,
+                py::arg("indices"), py::arg("changed"), py::arg("k"));
+    }
+}
+
+// Structure-of-Arrays containers: one class per AoS struct, named SoA_<struct>.
+// Field views are ContiguousND_* objects sharing the field's buffer.
+template <typename S>
+py::object soa_field(soa::SoA<S> &self, const std::string &name) {
+    std::size_t i = 0;
+    try {
+        i = soa::SoA<S>::field_index(name);
+    } catch (const std::invalid_argument &e) {
+        throw py::key_error(e.what());
+    }
+    const aos::FieldInfo &f = soa::SoA<S>::field_info(i);
+    if (f.kind == 'f' && f.size == sizeof(float)) return py::cast(self.template field<float>(i));
+    if (f.kind == 'f' && f.size == sizeof(double)) return py::cast(self.template field<double>(i));
+    if (f.kind == 'i' && f.size == sizeof(int32_t)) return py::cast(self.template field<int32_t>(i));
+    if (f.kind == 'i' && f.size == sizeof(int64_t)) return py::cast(self.template field<int64_t>(i));
+    throw std::runtime_error("field: unsupported field type");
+}
+
+template <typename S>
+void bind_soa(py::module_ &m, const std::string &class_name) {
+    typedef soa::SoA<S> SoAType;
+    py::class_<SoAType>(m, class_name.c_str())
+        .def(py::init<std::vector<std::size_t>>(), py::arg("shape"))
+        .def("shape", &SoAType::shape)
+        .def("ndim", &SoAType::ndim)
+        .def("size", &SoAType::size)
+        .def("fields", [](const SoAType &) {
+            std::vector<std::string> names;
+            for (std::size_t i = 0; i < SoAType::fields_type::count; ++i) {
+                names.push_back(SoAType::field_info(i).name);
+            }
+            return names;
+        })
+        .def("field", &soa_field<S>, py::arg("name"))
+        // {field name: NumPy view of that field}
+        .def("to_numpy", [](SoAType &self) {
+            py::dict out;
+            for (std::size_t i = 0; i < SoAType::fields_type::count; ++i) {
+                const char *name = SoAType::field_info(i).name;
+                out[name] = soa_field<S>(self, name).attr("to_numpy")();
+            }
+            return out;
+        })
+        .def_static("from_aos", [](const ContiguousND<S> &src) {
+            py::gil_scoped_release release;
+            return soa::to_soa(src);
+        }, py::arg("arr"))
+        .def("to_aos", [](const SoAType &self) {
+            py::gil_scoped_release release;
+            return soa::to_aos(self);
+        })
+        // In-place conversions into existing buffers of the same shape
+        .def("copy_from_aos", [](SoAType &self, const ContiguousND<S> &src) {
+            py::gil_scoped_release release;
+            soa::aos_to_soa(src, self);
+        }, py::arg("arr"))
+        .def("copy_to_aos", [](const SoAType &self, ContiguousND<S> &dst) {
+            check_writable(dst, "copy_to_aos()");
+            py::gil_scoped_release release;
+            soa::soa_to_aos(self, dst);
+        }, py::arg("arr"));
 }
 
 // Templated helpers
@@ -195,6 +1088,347 @@ static py::object make_view_dispatch(std::vector<std::size_t> shape, py::object
     throw std::runtime_error("Unsupported dtype string");
 }
 
+// -------- Element types --------
+// The element types of the ContiguousND_* classes. match_dtype() and
+// element_index() return positions in this list; visit_element() turns a
+// position back into a type.
+static const char *const element_names[] = {
+    "int32", "int64", "float", "double",
+    "Vec2f", "Vec3f", "Cell2D", "Cell3D", "Particle", "MaterialPoint"};
+static const int element_count = 10;
+static const int first_aos_element = 4;
+
+template <typename T>
+struct type_tag {
+    using type = T;
+};
+
+template <typename F>
+decltype(auto) visit_element(int index, F &&f) {
+    switch (index) {
+    case 0: return f(type_tag<int32_t>());
+    case 1: return f(type_tag<int64_t>());
+    case 2: return f(type_tag<float>());
+    case 3: return f(type_tag<double>());
+    case 4: return f(type_tag<aos::Vec2f>());
+    case 5: return f(type_tag<aos::Vec3f>());
+    case 6: return f(type_tag<aos::Cell2D>());
+    case 7: return f(type_tag<aos::Cell3D>());
+    case 8: return f(type_tag<aos::Particle>());
+    default: return f(type_tag<aos::MaterialPoint>());
+    }
+}
+
+// Position of one of this module's type names, or -1
+static int element_index(const std::string &name) {
+    for (int i = 0; i < element_count; ++i) {
+        if (name == element_names[i]) return i;
+    }
+    return -1;
+}
+
+// What a NumPy dtype can become
+struct DtypeMatch {
+    int index;   // element type, or -1 if no class takes it
+    bool exact;  // the dtype has the element type's memory layout (zero-copy)
+};
+
+// A field of a structured dtype; `kind` is 0 for subarrays
+struct DtypeField {
+    std::string name;
+    std::size_t offset;
+    std::size_t size;
+    char kind;
+    bool native;
+};
+
+// Fields of a structured dtype, in dtype.names order
+static std::vector<DtypeField> dtype_fields(const py::dtype &dt) {
+    std::vector<DtypeField> fields;
+    py::dict by_name = dt.attr("fields");
+    for (py::handle name : dt.attr("names")) {
+        py::tuple entry = by_name[name];
+        py::dtype sub = entry[0].cast<py::dtype>();
+        fields.push_back(DtypeField{name.cast<std::string>(), entry[1].cast<std::size_t>(),
+                                    static_cast<std::size_t>(sub.itemsize()),
+                                    sub.attr("subdtype").is_none() ? sub.kind() : '\0',
+                                    sub.attr("isnative").cast<bool>()});
+    }
+    return fields;
+}
+
+static DtypeMatch match_dtype_uncached(const py::dtype &dt) {
+    const char kind = dt.kind();
+    const std::size_t size = static_cast<std::size_t>(dt.itemsize());
+    if (dt.attr("fields").is_none()) {
+        for (int i = 0; i < first_aos_element; ++i) {
+            const bool same = visit_element(i, [&](auto t) {
+                using T = typename decltype(t)::type;
+                return kind == aos::field_kind<T>() && size == sizeof(T);
+            });
+            if (same) return DtypeMatch{i, dt.attr("isnative").cast<bool>()};
+        }
+        return DtypeMatch{-1, false};
+    }
+
+    const std::vector<DtypeField> fields = dtype_fields(dt);
+    // Byte-swapped fields never have a struct's layout
+    std::vector<aos::FieldInfo> info;
+    for (const DtypeField &f : fields) {
+        info.push_back(aos::FieldInfo{f.name.c_str(), f.offset, f.size, f.native ? f.kind : '\0'});
+    }
+
+    for (int i = first_aos_element; i < element_count; ++i) {
+        const DtypeMatch m = visit_element(i, [&](auto t) {
+            using S = typename decltype(t)::type;
+            if constexpr (std::is_arithmetic<S>::value) {
+                return DtypeMatch{-1, false};
+            } else {
+                if (aos::layout_matches<S>(info.data(), info.size(), size)) return DtypeMatch{i, true};
+                // The same fields with the same kinds in another layout: copyable
+                if (info.size() != aos::struct_fields<S>::count) return DtypeMatch{-1, false};
+                const aos::FieldInfo *f = aos::struct_fields<S>::get();
+                for (std::size_t k = 0; k < info.size(); ++k) {
+                    const aos::FieldInfo *g = aos::find_field(info.data(), info.size(), f[k].name);
+                    if (!g || fields[static_cast<std::size_t>(g - info.data())].kind != f[k].kind) {
+                        return DtypeMatch{-1, false};
+                    }
+                }
+                return DtypeMatch{i, false};
+            }
+        });
+        if (m.index >= 0) return m;
+    }
+    return DtypeMatch{-1, false};
+}
+
+// Walking the fields of a structured dtype costs more than importing a small
+// array, so the answer is remembered per dtype object. The cache holds a
+// reference to each key, so an address cannot be reused while it is cached;
+// it is simply emptied when it fills up. Called with the GIL held.
+static DtypeMatch match_dtype(const py::dtype &dt) {
+    using Cache = std::unordered_map<PyObject *, std::pair<py::object, DtypeMatch>>;
+    static Cache *cache = new Cache();  // leaked: dtypes must not be released after interpreter teardown
+    const Cache::const_iterator hit = cache->find(dt.ptr());
+    if (hit != cache->end()) return hit->second.second;
+    const DtypeMatch m = match_dtype_uncached(dt);
+    if (cache->size() >= 256) cache->clear();
+    cache->emplace(dt.ptr(), std::make_pair(py::object(dt), m));
+    return m;
+}
+
+// from_numpy(): wrap an aligned, writeable ndarray whose dtype has T's
+// layout and whose memory is in the requested order (C-contiguous, or
+// F-contiguous for order="F") in place (the ndarray becomes the view's
+// owner); anything else is copied into a new owning ContiguousND of that
+// order if copy=True and rejected otherwise. Structs are copied field by
+// field, by name.
+template <typename T>
+py::object from_numpy_t(py::array arr, bool copy, bool exact, Order order) {
+    std::vector<std::size_t> shape(arr.shape(), arr.shape() + arr.ndim());
+    const bool contiguous = (arr.flags() & (order == Order::F ? py::array::f_style : py::array::c_style)) != 0;
+    const bool aligned = reinterpret_cast<std::uintptr_t>(arr.data()) % alignof(T) == 0;
+
+    if (exact && contiguous && aligned && arr.writeable()) {
+        T *ptr = static_cast<T *>(arr.mutable_data());
+        if (order == Order::C) return py::cast(ContiguousND<T>(std::move(shape), ptr, make_py_owner(arr)));
+        Extents strides(shape.size());
+        std::size_t step = 1;
+        for (std::size_t d = 0; d < shape.size(); ++d) {
+            strides[d] = step;
+            step *= shape[d];
+        }
+        return py::cast(ContiguousND<T>(std::move(shape), std::move(strides), ptr, make_py_owner(arr)));
+    }
+    if (!copy) {
+        if (!contiguous) {
+            throw py::value_error(std::string("from_numpy: array is not ") + (order == Order::F ? "F" : "C") +
+                                  "-contiguous; pass copy=True");
+        }
+        if (!aligned) throw py::value_error("from_numpy: array data is misaligned; pass copy=True");
+        throw py::value_error("from_numpy: array is read-only; pass copy=True");
+    }
+
+    ContiguousND<T> out = ContiguousND<T>::zeros(std::move(shape), order);
+    py::capsule scratch(out.data(), [](void *) {});
+    py::array dst = numpy_array_of(out, scratch);
+    py::object copyto = py::module_::import("numpy").attr("copyto");
+    if constexpr (std::is_arithmetic<T>::value) {
+        copyto(dst, arr);
+    } else {
+        const aos::FieldInfo *f = aos::struct_fields<T>::get();
+        for (std::size_t k = 0; k < aos::struct_fields<T>::count; ++k) {
+            copyto(dst[py::str(f[k].name)], arr[py::str(f[k].name)]);
+        }
+    }
+    return py::cast(std::move(out));
+}
+
+static py::object from_numpy_dispatch(py::array arr, bool copy, const std::string &order) {
+    const Order o = parse_order(order, "from_numpy");
+    const DtypeMatch m = match_dtype(arr.dtype());
+    if (m.index < 0) {
+        throw py::type_error("from_numpy: unsupported dtype " + py::str(arr.dtype()).cast<std::string>());
+    }
+    if (!m.exact && !copy) {
+        throw py::type_error("from_numpy: dtype " + py::str(arr.dtype()).cast<std::string>() +
+                             " does not have the memory layout of " + element_names[m.index] +
+                             "; pass copy=True");
+    }
+    return visit_element(m.index, [&](auto t) {
+        return from_numpy_t<typename decltype(t)::type>(arr, copy, m.exact, o);
+    });
+}
+
+// open_mmap(): the dtype may be one of this module's names ("int32",
+// "float", "Particle", ...; note "float" is float32 here) or anything
+// np.dtype() accepts. Without a dtype the file is read as .npy.
+static py::dtype dtype_from_arg(const py::object &dtype) {
+    if (py::isinstance<py::str>(dtype)) {
+        const int index = element_index(dtype.cast<std::string>());
+        if (index >= 0) {
+            return visit_element(index, [](auto t) { return py::dtype::of<typename decltype(t)::type>(); });
+        }
+    }
+    return py::dtype::from_args(dtype);
+}
+
+// File-local: py::object fields have hidden visibility, so the struct must too
+namespace {
+struct MmapRequest {
+    std::string path;
+    MapMode mode;
+    std::size_t offset;
+    std::vector<std::size_t> shape;   // empty with shape_from_file: 1D, to the end of the file
+    bool shape_from_file;
+    py::object dtype;                 // None for .npy files
+    std::string descr;                // .npy header descr
+    int element;                      // element type, -1 if none matches
+};
+} // namespace
+
+template <typename T>
+py::object open_mmap_t(const MmapRequest &req) {
+    if (req.offset % alignof(T) != 0) {
+        throw py::value_error("open_mmap(): offset is not aligned for the element type");
+    }
+    std::vector<std::size_t> shape = req.shape;
+    if (req.shape_from_file) {
+        const std::size_t bytes = py::module_::import("os").attr("path").attr("getsize")(req.path).cast<std::size_t>();
+        if (bytes < req.offset) throw py::value_error("open_mmap(): offset is past the end of the file");
+        shape.assign(1, (bytes - req.offset) / sizeof(T));
+    }
+    try {
+        return py::cast(cnda::open_mmap<T>(req.path, shape, req.mode, req.offset));
+    } catch (const std::runtime_error &e) {
+        raise_os_error(e);
+    }
+}
+
+static py::object open_mmap_dispatch(const std::string &path, py::object dtype, py::object shape,
+                                     const std::string &mode, std::size_t offset) {
+    MmapRequest req;
+    req.path = path;
+    req.mode = parse_map_mode(mode);
+    req.offset = offset;
+    req.shape_from_file = false;
+    if (dtype.is_none()) {
+        if (!shape.is_none()) throw py::value_error("open_mmap(): shape comes from the .npy header; pass dtype for raw files");
+        npy::Header h;
+        try {
+            h = npy::read_header(path);
+        } catch (const std::runtime_error &e) {
+            raise_os_error(e);
+        }
+        if (h.fortran_order) throw py::value_error("open_mmap(): Fortran-ordered .npy files are not supported");
+        req.shape = h.shape;
+        req.offset = h.data_offset;
+        req.descr = h.descr;
+        req.dtype = py::none();
+    } else {
+        req.dtype = dtype_from_arg(dtype);
+        if (shape.is_none()) {
+            req.shape_from_file = true;
+        } else if (py::isinstance<py::int_>(shape)) {
+            req.shape.assign(1, shape.cast<std::size_t>());
+        } else {
+            req.shape = shape.cast<std::vector<std::size_t>>();
+        }
+    }
+
+    req.element = -1;
+    if (req.dtype.is_none()) {
+        for (int i = 0; i < element_count && req.element < 0; ++i) {
+            const bool same = visit_element(i, [&](auto t) {
+                return npy::descr_matches<typename decltype(t)::type>(req.descr);
+            });
+            if (same) req.element = i;
+        }
+    } else {
+        // The file is used as it is, so only an exact layout will do
+        const DtypeMatch m = match_dtype(req.dtype.cast<py::dtype>());
+        if (m.exact) req.element = m.index;
+    }
+    if (req.element < 0) {
+        const std::string name = req.dtype.is_none() ? req.descr : py::str(req.dtype).cast<std::string>();
+        throw py::type_error("open_mmap(): unsupported dtype " + name);
+    }
+    return visit_element(req.element, [&](auto t) { return open_mmap_t<typename decltype(t)::type>(req); });
+}
+
+// load(): read a .npy file into a new owning ContiguousND_* picked from the
+// header's dtype; the read runs with the GIL released.
+template <typename T>
+bool try_load(const std::string &path, const npy::Header &h, std::size_t chunk_bytes, py::object &out) {
+    if (!npy::descr_matches<T>(h.descr)) return false;
+    if (h.fortran_order) throw py::value_error("load(): Fortran-ordered .npy files are not supported");
+    std::unique_ptr<ContiguousND<T>> arr;
+    try {
+        py::gil_scoped_release release;
+        arr.reset(new ContiguousND<T>(npy::load<T>(path, chunk_bytes)));
+    } catch (const std::runtime_error &e) {
+        raise_os_error(e);
+    }
+    out = py::cast(std::move(*arr));
+    return true;
+}
+
+static py::object load_dispatch(const std::string &path, std::size_t chunk_bytes) {
+    npy::Header h;
+    try {
+        h = npy::read_header(path);
+    } catch (const std::runtime_error &e) {
+        raise_os_error(e);
+    }
+    py::object out;
+    if (try_load<int32_t>(path, h, chunk_bytes, out)) return out;
+    if (try_load<int64_t>(path, h, chunk_bytes, out)) return out;
+    if (try_load<float>(path, h, chunk_bytes, out)) return out;
+    if (try_load<double>(path, h, chunk_bytes, out)) return out;
+    if (try_load<aos::Vec2f>(path, h, chunk_bytes, out)) return out;
+    if (try_load<aos::Vec3f>(path, h, chunk_bytes, out)) return out;
+    if (try_load<aos::Cell2D>(path, h, chunk_bytes, out)) return out;
+    if (try_load<aos::Cell3D>(path, h, chunk_bytes, out)) return out;
+    if (try_load<aos::Particle>(path, h, chunk_bytes, out)) return out;
+    if (try_load<aos::MaterialPoint>(path, h, chunk_bytes, out)) return out;
+    throw py::type_error("load(): unsupported dtype " + h.descr);
+}
+
+static py::dict read_npy_header_py(const std::string &path) {
+    npy::Header h;
+    try {
+        h = npy::read_header(path);
+    } catch (const std::runtime_error &e) {
+        raise_os_error(e);
+    }
+    py::dict d;
+    d["descr"] = h.descr;
+    d["fortran_order"] = h.fortran_order;
+    d["shape"] = py::tuple(py::cast(h.shape));
+    d["offset"] = h.data_offset;
+    return d;
+}
+
 static py::object make_two_views_dispatch(std::vector<std::size_t> shape1, std::vector<std::size_t> shape2, py::object buf_obj, const std::string &dtype) {
     if (dtype.empty()) {
         throw std::runtime_error("make_two_views: dtype is required (e.g. dtype='int32'|'int64'|'float'|'double')");
@@ -208,8 +1442,443 @@ static py::object make_two_views_dispatch(std::vector<std::size_t> shape1, std::
 }
 
 
+// -------- Run-time records --------
+// ContiguousND_record: a RecordArray plus the structured dtype it was made
+// from, which to_numpy()/take() hand back so nested fields, subarrays and
+// byte order survive the round trip.
+namespace {
+struct PyRecordArray {
+    RecordArray array;
+    py::dtype dtype;
+};
+} // namespace
+
+// Layout of a structured dtype; fields without a typed view become 'V'
+static std::shared_ptr<const RecordLayout> layout_from_dtype(const py::dtype &dt) {
+    if (dt.attr("fields").is_none()) {
+        throw py::type_error("record dtype must be structured, got " + py::str(dt).cast<std::string>());
+    }
+    if (dt.attr("hasobject").cast<bool>()) {
+        throw py::type_error("record dtype must not contain Python objects");
+    }
+    std::vector<RecordField> fields;
+    for (const DtypeField &f : dtype_fields(dt)) {
+        const bool typed = f.native && f.kind != '\0' && std::strchr("fiub", f.kind) != nullptr;
+        fields.push_back(RecordField{f.name, f.offset, f.size, typed ? f.kind : 'V'});
+    }
+    try {
+        return std::make_shared<const RecordLayout>(std::move(fields), static_cast<std::size_t>(dt.itemsize()));
+    } catch (const std::invalid_argument &e) {
+        throw py::value_error(e.what());
+    }
+}
+
+static py::array record_numpy_of(PyRecordArray &self, bool copy) {
+    std::vector<py::ssize_t> shape(self.array.shape().begin(), self.array.shape().end());
+    std::vector<py::ssize_t> strides(self.array.strides().begin(), self.array.strides().end());
+    if (copy) {
+        return py::array(self.dtype, shape, strides, self.array.data());
+    }
+    py::capsule owner(new std::shared_ptr<void>(self.array.rows().shared_owner()), [](void *p) {
+        delete static_cast<std::shared_ptr<void> *>(p);
+    });
+    return py::array(self.dtype, shape, strides, self.array.data(), owner);
+}
+
+// Zero-copy for C-contiguous, writeable arrays, as from_numpy()
+static PyRecordArray record_from_numpy(py::array arr, bool copy) {
+    py::dtype dt = arr.dtype();
+    std::shared_ptr<const RecordLayout> layout = layout_from_dtype(dt);
+    Extents shape(std::vector<std::size_t>(arr.shape(), arr.shape() + arr.ndim()));
+    const bool contiguous = (arr.flags() & py::array::c_style) != 0;
+    if (contiguous && arr.writeable()) {
+        Extents strides(shape.size());
+        std::size_t step = layout->itemsize();
+        for (std::size_t d = shape.size(); d-- > 0;) {
+            strides[d] = step;
+            step *= shape[d];
+        }
+        return PyRecordArray{RecordArray(shape, strides, arr.mutable_data(), make_py_owner(arr), layout), dt};
+    }
+    if (!copy) {
+        if (!contiguous) throw py::value_error("from_numpy: array is not C-contiguous; pass copy=True");
+        throw py::value_error("from_numpy: array is read-only; pass copy=True");
+    }
+    PyRecordArray out{RecordArray(shape, layout), dt};
+    py::module_::import("numpy").attr("copyto")(record_numpy_of(out, false), arr);
+    return out;
+}
+
+// Scalar ContiguousND_* view of one field
+static py::object record_field(PyRecordArray &self, const std::string &name) {
+    const RecordField *f = self.array.layout().find(name);
+    if (!f) throw py::key_error("no field named '" + name + "'");
+    if (f->kind == 'f' && f->size == sizeof(float)) return py::cast(self.array.field<float>(name));
+    if (f->kind == 'f' && f->size == sizeof(double)) return py::cast(self.array.field<double>(name));
+    if (f->kind == 'i' && f->size == sizeof(int32_t)) return py::cast(self.array.field<int32_t>(name));
+    if (f->kind == 'i' && f->size == sizeof(int64_t)) return py::cast(self.array.field<int64_t>(name));
+    throw py::type_error("field '" + name + "' has no ContiguousND class; use to_numpy()['" + name + "']");
+}
+
+static py::array record_take(const PyRecordArray &self, py::object indices) {
+    const index_array idx = as_index_array(indices, "take()");
+    std::pair<std::size_t, bool> k = parse_indices(self.array.rows(), idx, "take()");
+    py::array out(self.dtype, std::vector<py::ssize_t>{static_cast<py::ssize_t>(k.first)});
+    void *dst = out.mutable_data();
+    const std::int64_t *src = idx.data();
+    {
+        py::gil_scoped_release release;
+        self.array.take(src, k.first, k.second, dst);
+    }
+    return out;
+}
+
+static void record_put(PyRecordArray &self, py::object indices, py::object values) {
+    const index_array idx = as_index_array(indices, "put()");
+    std::pair<std::size_t, bool> k = parse_indices(self.array.rows(), idx, "put()");
+    py::array vals = py::module_::import("numpy").attr("ascontiguousarray")(values, self.dtype);
+    const std::size_t n_values = static_cast<std::size_t>(vals.size());
+    if (n_values != k.first && n_values != 1) {
+        throw py::value_error("put(): values must have one entry per index or a single entry");
+    }
+    const std::int64_t *src = idx.data();
+    const void *data = vals.data();
+    py::gil_scoped_release release;
+    self.array.put(src, k.first, k.second, data, n_values);
+}
+
+static void bind_records(py::module_ &m) {
+    py::class_<PyRecordArray>(m, "ContiguousND_record")
+        // Zero-filled records of a structured dtype
+        .def(py::init([](const Extents &shape, py::object dtype, std::size_t alignment) {
+            py::dtype dt = py::dtype::from_args(dtype);
+            return PyRecordArray{RecordArray(shape, layout_from_dtype(dt), alignment), dt};
+        }), py::arg("shape"), py::arg("dtype"), py::arg("alignment") = cnda::default_alignment)
+        .def_static("from_numpy", &record_from_numpy, py::arg("arr"), py::arg("copy") = false)
+        .def_property_readonly("dtype", [](const PyRecordArray &self) { return self.dtype; })
+        .def("shape", [](const PyRecordArray &self) { return self.array.shape(); })
+        // In bytes, like NumPy's
+        .def("strides", [](const PyRecordArray &self) { return self.array.strides(); })
+        .def("ndim", [](const PyRecordArray &self) { return self.array.ndim(); })
+        .def("size", [](const PyRecordArray &self) { return self.array.size(); })
+        .def("itemsize", [](const PyRecordArray &self) { return self.array.itemsize(); })
+        .def("is_view", [](const PyRecordArray &self) { return self.array.is_view(); })
+        .def("is_contiguous", [](const PyRecordArray &self) { return self.array.is_contiguous(); })
+        .def("data_ptr", [](PyRecordArray &self) { return reinterpret_cast<std::uintptr_t>(self.array.data()); })
+        .def("to_numpy", &record_numpy_of, py::arg("copy") = false)
+        .def_property_readonly("__array_interface__", [](PyRecordArray &self) {
+            std::vector<py::ssize_t> shape(self.array.shape().begin(), self.array.shape().end());
+            std::vector<py::ssize_t> strides(self.array.strides().begin(), self.array.strides().end());
+            py::dict d;
+            d["version"] = 3;
+            d["shape"] = py::tuple(py::cast(shape));
+            d["strides"] = py::tuple(py::cast(strides));
+            d["typestr"] = self.dtype.attr("str");
+            d["descr"] = self.dtype.attr("descr");
+            d["data"] = py::make_tuple(reinterpret_cast<std::uintptr_t>(self.array.data()), false);
+            return d;
+        })
+        .def("field", &record_field, py::arg("name"))
+        // Whole records in bulk, as a structured ndarray / from anything
+        // np.ascontiguousarray(values, dtype) accepts
+        .def("take", &record_take, py::arg("indices"))
+        .def("put", &record_put, py::arg("indices"), py::arg("values"))
+        // Slices are record views; other keys go through NumPy, so a single
+        // element comes back as a np.void over the same memory
+        .def("__getitem__", [](PyRecordArray &self, py::object key) -> py::object {
+            if (is_slice_key(key)) {
+                ContiguousND<unsigned char> v = view_from_key(self.array.rows(), key);
+                return py::cast(PyRecordArray{
+                    RecordArray(v.shape(), v.strides(), v.data(), v.owner(), self.array.shared_layout()), self.dtype});
+            }
+            return record_numpy_of(self, false)[key];
+        })
+        .def("__setitem__", [](PyRecordArray &self, py::object key, py::object value) {
+            record_numpy_of(self, false)[key] = value;
+        });
+}
+
+// -------- Run-time compiled expressions --------
+
+// Bind program's operands to `operands` (arrays of T or Python numbers) and
+// evaluate into out, or into a new array of the arrays' broadcast shape
+template <typename T>
+static py::object run_program_t(const expr::Program &program, py::object out, const py::dict &operands) {
+    const std::string type_name = std::is_same<T, float>::value ? "float" : "double";
+    std::vector<expr::ProgramOperand<T>> ops;
+    Extents shape;
+    for (const std::string &name : program.names()) {
+        py::str key(name);
+        if (!operands.contains(key)) throw py::type_error("expression: missing operand '" + name + "'");
+        py::handle value = operands[key];
+        if (py::isinstance<ContiguousND<T>>(value)) {
+            const ContiguousND<T> &a = value.cast<const ContiguousND<T> &>();
+            shape = expr::broadcast(shape, a.shape());
+            ops.push_back(expr::ProgramOperand<T>{&a, T()});
+        } else if (py::isinstance<py::int_>(value) || py::isinstance<py::float_>(value)) {
+            ops.push_back(expr::ProgramOperand<T>{nullptr, value.cast<T>()});
+        } else {
+            throw py::type_error("expression: operand '" + name + "' must be a ContiguousND_" +
+                                 type_name + " or a number");
+        }
+    }
+    if (out.is_none()) {
+        ContiguousND<T> result(shape);
+        {
+            py::gil_scoped_release release;
+            program.run(result, ops);
+        }
+        return py::cast(std::move(result));
+    }
+    if (!py::isinstance<ContiguousND<T>>(out)) {
+        throw py::type_error("expression: out must be a ContiguousND_" + type_name);
+    }
+    ContiguousND<T> &dst = out.cast<ContiguousND<T> &>();
+    check_writable(dst, "expression");
+    {
+        py::gil_scoped_release release;
+        program.run(dst, ops);
+    }
+    return out;
+}
+
+// The element type comes from out, or else from the first array operand;
+// only float and double arrays are supported
+static py::object run_program(const expr::Program &program, py::object out, const py::dict &operands) {
+    for (auto item : operands) {
+        const std::string key = item.first.cast<std::string>();
+        const std::vector<std::string> &names = program.names();
+        if (std::find(names.begin(), names.end(), key) == names.end()) {
+            throw py::type_error("expression: unexpected operand '" + key + "'");
+        }
+    }
+    py::handle first = out;
+    if (first.is_none()) {
+        for (const std::string &name : program.names()) {
+            py::str key(name);
+            if (!operands.contains(key)) continue;
+            py::handle value = operands[key];
+            if (!py::isinstance<py::int_>(value) && !py::isinstance<py::float_>(value)) {
+                first = value;
+                break;
+            }
+        }
+    }
+    if (first.is_none() || py::isinstance<ContiguousND<double>>(first)) {
+        return run_program_t<double>(program, out, operands);
+    }
+    if (py::isinstance<ContiguousND<float>>(first)) {
+        return run_program_t<float>(program, out, operands);
+    }
+    throw py::type_error("expression: arrays must be ContiguousND_float or ContiguousND_double");
+}
+
+static void bind_expressions(py::module_ &m) {
+    py::class_<expr::Program>(m, "Expression")
+        // Parse once; raises ValueError on syntax errors
+        .def(py::init<std::string>(), py::arg("source"))
+        .def_property_readonly("source", &expr::Program::source)
+        .def("names", &expr::Program::names)
+        .def("__call__", [](const expr::Program &self, py::object out, py::kwargs operands) {
+            return run_program(self, out, operands);
+        }, py::arg("out") = py::none())
+        .def("__repr__", [](const expr::Program &self) {
+            return "Expression(" + py::repr(py::str(self.source())).cast<std::string>() + ")";
+        });
+    m.def("evaluate", [](const std::string &source, py::object out, py::kwargs operands) {
+        return run_program(expr::Program(source), out, operands);
+    }, py::arg("source"), py::arg("out") = py::none());
+}
+
+// -------- Halo grids --------
+
+static Boundary parse_boundary(const std::string &mode) {
+    if (mode == "periodic") return Boundary::periodic;
+    if (mode == "reflect") return Boundary::reflect;
+    if (mode == "constant") return Boundary::constant;
+    throw py::value_error("fill_halo(): mode must be 'periodic', 'reflect' or 'constant', got '" + mode + "'");
+}
+
+// out = sum of weights[k] * (cell at offsets[k]) over every interior cell
+template <typename T>
+static py::object halo_stencil(const HaloGrid<T> &self, const std::vector<std::vector<std::ptrdiff_t>> &offsets,
+                               const std::vector<T> &weights, py::object out) {
+    if (offsets.size() != weights.size()) {
+        throw py::value_error("stencil(): offsets and weights must have the same length");
+    }
+    const std::ptrdiff_t h = static_cast<std::ptrdiff_t>(self.halo());
+    std::vector<std::ptrdiff_t> flat;
+    for (const std::vector<std::ptrdiff_t> &o : offsets) {
+        if (o.size() != self.ndim()) throw py::value_error("stencil(): each offset needs one entry per axis");
+        std::ptrdiff_t k = 0;
+        for (std::size_t d = 0; d < o.size(); ++d) {
+            if (o[d] < -h || o[d] > h) throw py::value_error("stencil(): offsets must lie within the halo");
+            k += o[d] * static_cast<std::ptrdiff_t>(self.padded().strides()[d]);
+        }
+        flat.push_back(k);
+    }
+    auto weighted = [&](const StencilPoint<T> &p) {
+        T sum = 0;
+        for (std::size_t k = 0; k < flat.size(); ++k) sum += weights[k] * p[flat[k]];
+        return sum;
+    };
+    if (out.is_none()) {
+        ContiguousND<T> result(self.shape());
+        {
+            py::gil_scoped_release release;
+            apply_stencil(self, result, weighted);
+        }
+        return py::cast(std::move(result));
+    }
+    ContiguousND<T> &dst = out.cast<ContiguousND<T> &>();
+    check_writable(dst, "stencil()");
+    {
+        py::gil_scoped_release release;
+        apply_stencil(self, dst, weighted);
+    }
+    return out;
+}
+
+template <typename T>
+void bind_halo(py::module_ &m, const std::string &class_name) {
+    py::class_<HaloGrid<T>> cls(m, class_name.c_str());
+    cls.def(py::init<const Extents &, std::size_t, std::size_t>(),
+            py::arg("shape"), py::arg("halo"), py::arg("alignment") = cnda::default_alignment)
+        .def("shape", &HaloGrid<T>::shape)
+        .def("ndim", &HaloGrid<T>::ndim)
+        .def("halo", &HaloGrid<T>::halo)
+        // Views sharing the grid's buffer
+        .def("interior", [](HaloGrid<T> &self) { return self.interior(); })
+        .def("padded", [](HaloGrid<T> &self) { return self.padded().slice({}); })
+        // mode is one name for every axis or a list with one per axis
+        .def("fill_halo", [](HaloGrid<T> &self, py::object mode, py::object value) {
+            std::vector<Boundary> boundaries;
+            if (py::isinstance<py::str>(mode)) {
+                boundaries.assign(self.ndim(), parse_boundary(mode.cast<std::string>()));
+            } else {
+                for (const std::string &name : mode.cast<std::vector<std::string>>()) {
+                    boundaries.push_back(parse_boundary(name));
+                }
+            }
+            const T fill_value = value.is_none() ? T() : value.cast<T>();
+            py::gil_scoped_release release;
+            self.fill_halo(boundaries, fill_value);
+        }, py::arg("mode") = "periodic", py::arg("value") = py::none())
+        // self is the grid before `other` along `axis`
+        .def("exchange_halo", [](HaloGrid<T> &self, HaloGrid<T> &other, std::size_t axis) {
+            if (&self == &other) throw py::value_error("exchange_halo(): use fill_halo('periodic') for one grid");
+            py::gil_scoped_release release;
+            exchange_halo(self, other, axis);
+        }, py::arg("other"), py::arg("axis"));
+    if constexpr (std::is_floating_point<T>::value) {
+        cls.def("stencil", &halo_stencil<T>, py::arg("offsets"), py::arg("weights"), py::arg("out") = py::none());
+    }
+}
+
+// Neighbour queries over ContiguousND_Particle. Query points are one (3,)
+// point or an (m, 3) batch; batches run on the thread pool without the GIL.
+typedef py::array_t<double, py::array::c_style | py::array::forcecast> point_array;
+
+static std::size_t parse_points(const point_array &points, const char *who) {
+    if (points.ndim() == 1 && points.shape(0) == 3) return 1;
+    if (points.ndim() == 2 && points.shape(1) == 3) return static_cast<std::size_t>(points.shape(0));
+    throw py::value_error(std::string(who) + ": points must have shape (3,) or (m, 3)");
+}
+
+static py::object cell_list_radius(const CellList &self, const point_array &points, double r) {
+    const std::size_t m = parse_points(points, "query_radius()");
+    if (!(r >= 0)) throw py::value_error("query_radius(): r must be non-negative");
+    const double *p = points.data();
+    std::vector<std::vector<std::int64_t>> found(m);
+    {
+        py::gil_scoped_release release;
+        parallel_for(m, [&](std::size_t begin, std::size_t end) {
+            for (std::size_t q = begin; q < end; ++q) self.query_radius(p + 3 * q, r, found[q]);
+        });
+    }
+    if (points.ndim() == 1) return index_list(found[0]);
+    py::list out;
+    for (const std::vector<std::int64_t> &idx : found) out.append(index_list(idx));
+    return out;
+}
+
+static py::array_t<std::int64_t> cell_list_knn(const CellList &self, const point_array &points, std::size_t k) {
+    const std::size_t m = parse_points(points, "query_knn()");
+    if (k > self.size()) throw py::value_error("query_knn(): k exceeds the particle count");
+    const double *p = points.data();
+    std::vector<py::ssize_t> shape{static_cast<py::ssize_t>(m), static_cast<py::ssize_t>(k)};
+    if (points.ndim() == 1) shape.erase(shape.begin());
+    py::array_t<std::int64_t> out(shape);
+    std::int64_t *dst = out.mutable_data();
+    {
+        py::gil_scoped_release release;
+        parallel_for(m, [&](std::size_t begin, std::size_t end) {
+            std::vector<std::int64_t> idx;
+            for (std::size_t q = begin; q < end; ++q) {
+                idx.clear();
+                self.query_nearest(p + 3 * q, k, idx);
+                std::copy(idx.begin(), idx.end(), dst + q * k);
+            }
+        });
+    }
+    return out;
+}
+
+static void bind_cell_list(py::module_ &m) {
+    py::class_<CellList>(m, "CellList")
+        .def(py::init<double>(), py::arg("cell_size"))
+        .def_property_readonly("cell_size", &CellList::cell_size)
+        .def("shape", [](const CellList &self) {
+            return std::vector<std::size_t>(self.shape().begin(), self.shape().end());
+        })
+        .def("num_cells", &CellList::num_cells)
+        .def("__len__", &CellList::size)
+        .def("build", [](CellList &self, const ContiguousND<aos::Particle> &particles) {
+            py::gil_scoped_release release;
+            self.build(particles);
+        }, py::arg("particles"))
+        // True if the bins were patched in place, False if rebuilt
+        .def("update", [](CellList &self, const ContiguousND<aos::Particle> &particles) {
+            py::gil_scoped_release release;
+            return self.update(particles);
+        }, py::arg("particles"))
+        // Sorts the particles by cell in place; returns the old index of each
+        .def("reorder", [](CellList &self, ContiguousND<aos::Particle> &particles) {
+            check_writable(particles, "reorder()");
+            std::vector<std::int64_t> order;
+            {
+                py::gil_scoped_release release;
+                order = self.reorder(particles);
+            }
+            return index_list(order);
+        }, py::arg("particles"))
+        .def("query_radius", &cell_list_radius, py::arg("points"), py::arg("r"))
+        .def("query_knn", &cell_list_knn, py::arg("points"), py::arg("k"));
+}
+
 PYBIND11_MODULE(cnda, m) {
     m.doc() = "Python bindings for ContiguousND C++ template class";
+    m.attr("DEFAULT_ALIGNMENT") = cnda::default_alignment;
+    m.attr("HUGE_PAGE_ALIGNMENT") = cnda::huge_page_alignment;
+    // Thread pool used by the element-wise kernels
+    m.def("set_num_threads", &cnda::set_num_threads, py::arg("n"));
+    m.def("get_num_threads", &cnda::get_num_threads);
+    m.def("set_parallel_threshold", &cnda::set_parallel_threshold, py::arg("elements"));
+    m.def("get_parallel_threshold", &cnda::get_parallel_threshold);
+    // Buffer pool for the owning buffers of new arrays; the default capacity
+    // is passed as a copy, since py::arg binds its value by reference and
+    // default_capacity has no out-of-line definition
+    m.def("enable_pool", &enable_pool, py::arg("capacity") = std::size_t(BufferPool::default_capacity));
+    m.def("disable_pool", &disable_pool);
+    m.def("pool_stats", &pool_stats);
+    // NumPy structured dtypes matching the AoS struct layouts
+    PYBIND11_NUMPY_DTYPE(aos::Vec2f, x, y);
+    PYBIND11_NUMPY_DTYPE(aos::Vec3f, x, y, z);
+    PYBIND11_NUMPY_DTYPE(aos::Cell2D, u, v, flag);
+    PYBIND11_NUMPY_DTYPE(aos::Cell3D, u, v, w, flag);
+    PYBIND11_NUMPY_DTYPE(aos::Particle, x, y, z, vx, vy, vz, mass);
+    PYBIND11_NUMPY_DTYPE(aos::MaterialPoint, density, temperature, pressure, id);
+
     bind_contiguous_nd<int32_t>(m, "ContiguousND_int32");
     bind_contiguous_nd<int64_t>(m, "ContiguousND_int64");
     bind_contiguous_nd<float>(m, "ContiguousND_float");
@@ -264,18 +1933,40 @@ PYBIND11_MODULE(cnda, m) {
     bind_contiguous_nd<aos::Cell3D>(m, "ContiguousND_Cell3D");
     bind_contiguous_nd<aos::Particle>(m, "ContiguousND_Particle");
     bind_contiguous_nd<aos::MaterialPoint>(m, "ContiguousND_MaterialPoint");
+    // Structure-of-Arrays counterparts
+    bind_soa<aos::Vec2f>(m, "SoA_Vec2f");
+    bind_soa<aos::Vec3f>(m, "SoA_Vec3f");
+    bind_soa<aos::Cell2D>(m, "SoA_Cell2D");
+    bind_soa<aos::Cell3D>(m, "SoA_Cell3D");
+    bind_soa<aos::Particle>(m, "SoA_Particle");
+    bind_soa<aos::MaterialPoint>(m, "SoA_MaterialPoint");
+    // Records whose layout comes from a structured dtype at run time
+    bind_records(m);
+    // Element-wise arithmetic compiled from a string
+    bind_expressions(m);
+    // Grids padded with ghost cells, for stencils
+    bind_halo<float>(m, "HaloGrid_float");
+    bind_halo<double>(m, "HaloGrid_double");
+    bind_halo<aos::Cell2D>(m, "HaloGrid_Cell2D");
+    bind_halo<aos::Cell3D>(m, "HaloGrid_Cell3D");
+    // Uniform-grid neighbour search over particles
+    bind_cell_list(m);
     // Expose sizeof helper for AoS types to Python tests
     m.def("sizeof_aos", [](const std::string &name) -> std::size_t {
-        if (name == "Vec2f") return sizeof(aos::Vec2f);
-        if (name == "Vec3f") return sizeof(aos::Vec3f);
-        if (name == "Cell2D") return sizeof(aos::Cell2D);
-        if (name == "Cell3D") return sizeof(aos::Cell3D);
-        if (name == "Particle") return sizeof(aos::Particle);
-        if (name == "MaterialPoint") return sizeof(aos::MaterialPoint);
-        throw std::runtime_error("sizeof_aos: unknown AoS type '" + name + "'");
+        const int index = element_index(name);
+        if (index < first_aos_element) throw std::runtime_error("sizeof_aos: unknown AoS type '" + name + "'");
+        return visit_element(index, [](auto t) { return sizeof(typename decltype(t)::type); });
     }, py::arg("name"));
     // Accept (shape, buf, dtype) where dtype is required and must be one of
     // "int32", "int64", "float", or "double".
     m.def("make_view", &make_view_dispatch, py::arg("shape"), py::arg("buf"), py::arg("dtype"));
     m.def("make_two_views", &make_two_views_dispatch, py::arg("shape1"), py::arg("shape2"), py::arg("buf"), py::arg("dtype"));
+    // Zero-copy NumPy import; the ContiguousND_* class is picked from arr.dtype
+    m.def("from_numpy", &from_numpy_dispatch, py::arg("arr"), py::arg("copy") = false, py::arg("order") = "C");
+    // File-backed arrays: raw files (dtype and shape given) or .npy files
+    m.def("open_mmap", &open_mmap_dispatch, py::arg("path"), py::arg("dtype") = py::none(),
+          py::arg("shape") = py::none(), py::arg("mode") = "r", py::arg("offset") = 0);
+    m.def("read_npy_header", &read_npy_header_py, py::arg("path"));
+    // .npy import; arrays are written with ContiguousND_*.save(path)
+    m.def("load", &load_dispatch, py::arg("path"), py::arg("chunk_bytes") = 0);
 }
@@ -20,6 +20,10 @@ else:
     if sys.platform == 'darwin':
         extra_compile_args.append('-stdlib=libc++')
         extra_link_args.append('-stdlib=libc++')
+    else:
+        # std::thread (parallel kernels)
+        extra_compile_args.append('-pthread')
+        extra_link_args.append('-pthread')
 
 ext_modules = [
     Extension(
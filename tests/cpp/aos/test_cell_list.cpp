@@ -0,0 +1,198 @@
+#include <catch2/catch_test_macros.hpp>
+#include <cnda/aos_types.hpp>
+#include <cnda/cell_list.hpp>
+#include <cnda/contiguous_nd.hpp>
+#include <cnda/parallel.hpp>
+#include <algorithm>
+#include <cstddef>
+#include <cstdint>
+#include <limits>
+#include <random>
+#include <stdexcept>
+#include <utility>
+#include <vector>
+
+using namespace cnda;
+
+namespace {
+
+ContiguousND<aos::Particle> cloud(std::size_t n, unsigned seed) {
+    std::mt19937 gen(seed);
+    std::uniform_real_distribution<double> u(-2.0, 3.0);
+    ContiguousND<aos::Particle> p({n});
+    for (std::size_t i = 0; i < n; ++i) p(i) = aos::Particle{u(gen), u(gen), 0.25 * u(gen), 0, 0, 0, 1.0};
+    return p;
+}
+
+double distance2(const aos::Particle& p, const double* q) {
+    const double dx = p.x - q[0], dy = p.y - q[1], dz = p.z - q[2];
+    return dx * dx + dy * dy + dz * dz;
+}
+
+std::vector<std::int64_t> radius_brute(const ContiguousND<aos::Particle>& p, const double* q, double r) {
+    std::vector<std::int64_t> out;
+    for (std::size_t i = 0; i < p.size(); ++i)
+        if (distance2(p(i), q) <= r * r) out.push_back(static_cast<std::int64_t>(i));
+    return out;
+}
+
+std::vector<std::int64_t> nearest_brute(const ContiguousND<aos::Particle>& p, const double* q, std::size_t k) {
+    std::vector<std::pair<double, std::int64_t>> all;
+    for (std::size_t i = 0; i < p.size(); ++i) all.push_back(std::make_pair(distance2(p(i), q), static_cast<std::int64_t>(i)));
+    std::sort(all.begin(), all.end());
+    std::vector<std::int64_t> out;
+    for (std::size_t m = 0; m < k; ++m) out.push_back(all[m].second);
+    return out;
+}
+
+// Every cell holds exactly the particles whose cell_of() it is
+void check_bins(const CellList& cl) {
+    std::vector<char> seen(cl.size(), 0);
+    for (std::size_t c = 0; c < cl.num_cells(); ++c)
+        for (std::size_t s = cl.cell_start(c); s < cl.cell_start(c + 1); ++s) {
+            const std::size_t i = static_cast<std::size_t>(cl.items()[s]);
+            REQUIRE(cl.cell_of(i) == c);
+            REQUIRE(seen[i] == 0);
+            seen[i] = 1;
+        }
+    REQUIRE(std::count(seen.begin(), seen.end(), 1) == static_cast<std::ptrdiff_t>(cl.size()));
+}
+
+void check_queries(const CellList& cl, const ContiguousND<aos::Particle>& p) {
+    const double points[][3] = {{0.0, 0.0, 0.0}, {2.9, -1.9, 0.7}, {-5.0, 1.0, 0.0}, {0.5, 0.5, 10.0}};
+    for (const double* q : points) {
+        for (double r : {0.0, 0.3, 1.1, 50.0}) {
+            std::vector<std::int64_t> got;
+            cl.query_radius(q, r, got);
+            REQUIRE(got == radius_brute(p, q, r));
+        }
+        for (std::size_t k : {std::size_t(1), std::size_t(7), std::size_t(40)}) {
+            std::vector<std::int64_t> got;
+            cl.query_nearest(q, k, got);
+            REQUIRE(got == nearest_brute(p, q, k));
+        }
+    }
+}
+
+} // namespace
+
+TEST_CASE("CellList answers radius and nearest queries", "[aos][cell_list]") {
+    ContiguousND<aos::Particle> p = cloud(500, 1);
+    CellList cl(0.4);
+    cl.build(p);
+    REQUIRE(cl.size() == 500);
+    REQUIRE(cl.cell_size() == 0.4);
+    REQUIRE(cl.num_cells() == cl.shape()[0] * cl.shape()[1] * cl.shape()[2]);
+    check_bins(cl);
+    check_queries(cl, p);
+
+    // Each cell lists its particles in increasing order after a build
+    for (std::size_t c = 0; c < cl.num_cells(); ++c)
+        REQUIRE(std::is_sorted(cl.items().begin() + static_cast<std::ptrdiff_t>(cl.cell_start(c)),
+                               cl.items().begin() + static_cast<std::ptrdiff_t>(cl.cell_start(c + 1))));
+
+    SECTION("Several threads give the same bins") {
+        struct Scope {
+            std::size_t threads = get_num_threads(), threshold = get_parallel_threshold();
+            Scope() { set_num_threads(3); set_parallel_threshold(1); }
+            ~Scope() { set_num_threads(threads); set_parallel_threshold(threshold); }
+        } scope;
+        CellList par(0.4);
+        par.build(p);
+        REQUIRE(par.items() == cl.items());
+    }
+
+    // Tiny cells are enlarged; queries stay exact
+    CellList fine(1e-6);
+    fine.build(p);
+    REQUIRE(fine.cell_size() > 1e-6);
+    REQUIRE(fine.num_cells() <= 4 * 500 + 64);
+    check_queries(fine, p);
+
+    std::vector<std::int64_t> out;
+    const double origin[3] = {0.0, 0.0, 0.0};
+    REQUIRE_THROWS_AS(cl.query_nearest(origin, 501, out), std::invalid_argument);
+    REQUIRE_THROWS_AS((void)CellList(0.0), std::invalid_argument);
+    p(3).y = std::numeric_limits<double>::quiet_NaN();
+    REQUIRE_THROWS_AS(cl.build(p), std::invalid_argument);
+}
+
+TEST_CASE("CellList builds with many threads and small cells", "[aos][cell_list]") {
+    // About four cells per particle (a single sort task), then fewer cells
+    // than particles (several)
+    const double sizes[] = {1e-3, 0.4};
+    ContiguousND<aos::Particle> p = cloud(5000, 6);
+    std::vector<std::vector<std::int64_t>> serial;
+    for (double h : sizes) {
+        CellList cl(h);
+        cl.build(p);
+        serial.push_back(cl.items());
+    }
+
+    struct Scope {
+        std::size_t threads = get_num_threads(), threshold = get_parallel_threshold();
+        Scope() { set_num_threads(64); set_parallel_threshold(1); }
+        ~Scope() { set_num_threads(threads); set_parallel_threshold(threshold); }
+    } scope;
+    for (std::size_t k = 0; k < 2; ++k) {
+        CellList cl(sizes[k]);
+        cl.build(p);
+        REQUIRE(cl.items() == serial[k]);
+        check_bins(cl);
+        check_queries(cl, p);
+    }
+}
+
+TEST_CASE("CellList::update patches small moves and rebuilds large ones", "[aos][cell_list]") {
+    struct Scope {
+        std::size_t threads = get_num_threads(), threshold = get_parallel_threshold();
+        Scope() { set_num_threads(3); set_parallel_threshold(1); }
+        ~Scope() { set_num_threads(threads); set_parallel_threshold(threshold); }
+    } scope;
+    ContiguousND<aos::Particle> p = cloud(800, 2);
+    CellList cl(0.5);
+    REQUIRE(cl.update(p) == false);     // first call builds
+
+    std::mt19937 gen(3);
+    std::uniform_real_distribution<double> step(-0.1, 0.1);
+    std::size_t moved = 0;
+    for (int t = 0; t < 5; ++t) {
+        // A few particles move, a fraction of a cell each, inside the
+        // original bounding box
+        std::vector<std::size_t> cells;
+        for (std::size_t i = 0; i < p.size(); ++i) cells.push_back(cl.cell_of(i));
+        for (std::size_t i = t; i < p.size(); i += 16) {
+            const double x = p(i).x + step(gen), y = p(i).y + step(gen);
+            if (x > -1.5 && x < 2.5) p(i).x = x;
+            if (y > -1.5 && y < 2.5) p(i).y = y;
+        }
+        REQUIRE(cl.update(p) == true);
+        for (std::size_t i = 0; i < p.size(); ++i) moved += cl.cell_of(i) != cells[i];
+        check_bins(cl);
+        check_queries(cl, p);
+    }
+    REQUIRE(moved > 0);
+
+    p(0).x = 40.0;                      // leaves the grid
+    REQUIRE(cl.update(p) == false);
+    check_bins(cl);
+    check_queries(cl, p);
+}
+
+TEST_CASE("CellList::reorder sorts the particles by cell", "[aos][cell_list]") {
+    ContiguousND<aos::Particle> p = cloud(300, 4);
+    std::vector<aos::Particle> before(p.data(), p.data() + p.size());
+    CellList cl(0.5);
+    cl.build(p);
+    const std::vector<std::int64_t> order = cl.reorder(p);
+    for (std::size_t i = 0; i < p.size(); ++i) {
+        REQUIRE(p(i).x == before[static_cast<std::size_t>(order[i])].x);
+        REQUIRE(static_cast<std::size_t>(cl.items()[i]) == i);
+    }
+    for (std::size_t i = 1; i < p.size(); ++i) REQUIRE(cl.cell_of(i - 1) <= cl.cell_of(i));
+    check_bins(cl);
+    check_queries(cl, p);
+
+    ContiguousND<aos::Particle> other = cloud(10, 5);
+    REQUIRE_THROWS_AS(cl.reorder(other), std::invalid_argument);
+}
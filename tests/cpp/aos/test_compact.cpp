@@ -0,0 +1,126 @@
+#include <catch2/catch_test_macros.hpp>
+#include <cnda/aos_types.hpp>
+#include <cnda/compact.hpp>
+#include <cnda/contiguous_nd.hpp>
+#include <cnda/field_view.hpp>
+#include <cnda/parallel.hpp>
+#include <cstddef>
+#include <cstdint>
+#include <stdexcept>
+#include <vector>
+
+using namespace cnda;
+
+namespace {
+
+// Fluid (1) everywhere except a one-cell boundary (0) and a few obstacles (2)
+ContiguousND<aos::Cell2D> channel(std::size_t rows, std::size_t cols) {
+    ContiguousND<aos::Cell2D> cells({rows, cols});
+    for (std::size_t i = 0; i < rows; ++i)
+        for (std::size_t j = 0; j < cols; ++j) {
+            const bool wall = i == 0 || j == 0 || i + 1 == rows || j + 1 == cols;
+            const std::int32_t flag = wall ? 0 : ((i * cols + j) % 7 == 0 ? 2 : 1);
+            cells(i, j) = aos::Cell2D{static_cast<float>(i), static_cast<float>(j), flag};
+        }
+    return cells;
+}
+
+std::vector<std::int64_t> where_serial(const ContiguousND<aos::Cell2D>& cells, std::int32_t k) {
+    std::vector<std::int64_t> out;
+    for (std::size_t n = 0; n < cells.size(); ++n)
+        if (cells.data()[n].flag == k) out.push_back(static_cast<std::int64_t>(n));
+    return out;
+}
+
+} // namespace
+
+TEST_CASE("where() lists matching positions in order", "[aos][compact]") {
+    ContiguousND<aos::Cell2D> cells = channel(37, 51);
+    REQUIRE(where(cells, flag_equals{1}) == where_serial(cells, 1));
+    REQUIRE(where(cells, flag_equals{2}) == where_serial(cells, 2));
+    REQUIRE(where(cells, flag_equals{9}).empty());
+
+    SECTION("Several threads, views and fields") {
+        struct Scope {
+            std::size_t threads = get_num_threads(), threshold = get_parallel_threshold();
+            Scope() { set_num_threads(3); set_parallel_threshold(1); }
+            ~Scope() { set_num_threads(threads); set_parallel_threshold(threshold); }
+        } scope;
+        REQUIRE(where(cells, flag_equals{1}) == where_serial(cells, 1));
+
+        ContiguousND<std::int32_t> flags = field_view<std::int32_t>(cells, "flag");
+        REQUIRE(where(flags, [](std::int32_t f) { return f == 2; }) == where_serial(cells, 2));
+
+        // Positions are row-major in the view, not offsets in the buffer
+        ContiguousND<aos::Cell2D> t = cells.transpose();
+        const std::vector<std::int64_t> idx = where(t, flag_equals{2});
+        for (std::int64_t p : idx) {
+            const std::size_t i = static_cast<std::size_t>(p) / 37, j = static_cast<std::size_t>(p) % 37;
+            REQUIRE(cells(j, i).flag == 2);
+        }
+        REQUIRE(idx.size() == where_serial(cells, 2).size());
+    }
+}
+
+TEST_CASE("ActiveSet gathers and scatters the active cells", "[aos][compact]") {
+    struct Scope {
+        std::size_t threads = get_num_threads(), threshold = get_parallel_threshold();
+        Scope() { set_num_threads(3); set_parallel_threshold(1); }
+        ~Scope() { set_num_threads(threads); set_parallel_threshold(threshold); }
+    } scope;
+    ContiguousND<aos::Cell2D> cells = channel(20, 30);
+    ActiveSet fluid(cells, flag_equals{1});
+    REQUIRE(fluid.indices() == where_serial(cells, 1));
+
+    std::vector<aos::Cell2D> work(fluid.size());
+    fluid.gather(cells, work.data());
+    for (std::size_t n = 0; n < work.size(); ++n) {
+        REQUIRE(work[n].flag == 1);
+        REQUIRE(work[n].u == static_cast<float>(fluid.indices()[n] / 30));
+        work[n].v = -1.0f;
+    }
+    fluid.scatter(cells, work.data());
+
+    // One field at a time through a strided field view
+    ContiguousND<float> u = field_view<float>(cells, "u");
+    std::vector<float> us(fluid.size());
+    fluid.gather(u, us.data());
+    for (float& x : us) x += 100.0f;
+    fluid.scatter(u, us.data());
+
+    for (std::size_t n = 0; n < cells.size(); ++n) {
+        const aos::Cell2D& c = cells.data()[n];
+        const float i = static_cast<float>(n / 30), j = static_cast<float>(n % 30);
+        REQUIRE(c.u == (c.flag == 1 ? i + 100.0f : i));
+        REQUIRE(c.v == (c.flag == 1 ? -1.0f : j));
+    }
+
+    ContiguousND<float> other({30, 20});
+    REQUIRE_THROWS_AS(fluid.gather(other, us.data()), std::invalid_argument);
+    REQUIRE_THROWS_AS(fluid.scatter(other, us.data()), std::invalid_argument);
+}
+
+TEST_CASE("ActiveSet::update re-tests only the changed cells", "[aos][compact]") {
+    ContiguousND<aos::Cell3D> cells({6, 7, 8});
+    for (std::size_t n = 0; n < cells.size(); ++n) cells.data()[n].flag = n % 3 == 0 ? 1 : 0;
+    ActiveSet fluid(cells, flag_equals{1});
+    const std::size_t before = fluid.size();
+
+    // 0 -> 1 at 1 and 335 (last), 1 -> 0 at 0 and 42, 3 unchanged but listed twice
+    const std::int64_t changed[] = {335, 1, 0, 42, 3, 3};
+    cells.data()[1].flag = 1;
+    cells.data()[335].flag = 1;
+    cells.data()[0].flag = 0;
+    cells.data()[42].flag = 0;
+    fluid.update(cells, flag_equals{1}, changed, 6);
+    REQUIRE(fluid.size() == before);
+    REQUIRE(fluid.indices() == ActiveSet(cells, flag_equals{1}).indices());
+
+    const std::int64_t bad[] = {336};
+    REQUIRE_THROWS_AS(fluid.update(cells, flag_equals{1}, bad, 1), std::out_of_range);
+    REQUIRE(fluid.size() == before);
+
+    ActiveSet listed(Extents{6, 7, 8}, std::vector<std::int64_t>{5, 2, 5, 0});
+    REQUIRE(listed.indices() == (std::vector<std::int64_t>{0, 2, 5}));
+    REQUIRE_THROWS_AS((ActiveSet(Extents{6, 7, 8}, std::vector<std::int64_t>{-1})), std::out_of_range);
+}
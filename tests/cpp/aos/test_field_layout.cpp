@@ -346,3 +346,43 @@ TEST_CASE("sizeof() validation for all AoS types", "[aos][layout][sizeof]") {
     REQUIRE(sizeof(aos::Particle) == 56); // 7 * 8
     REQUIRE(sizeof(aos::MaterialPoint) == 16); // 3 * 4 + 4
 }
+
+// ==============================================================================
+// Layout Matching Tests (foreign record descriptions)
+// ==============================================================================
+
+TEST_CASE("layout_matches() compares offsets, kinds and sizes", "[aos][layout][match]") {
+    using aos::FieldInfo;
+
+    SECTION("the struct's own table matches") {
+        REQUIRE(aos::layout_matches<aos::Cell2D>(aos::struct_fields<aos::Cell2D>::get(), 3, sizeof(aos::Cell2D)));
+    }
+
+    SECTION("field order does not matter") {
+        const FieldInfo f[] = {{"flag", 8, 4, 'i'}, {"u", 0, 4, 'f'}, {"v", 4, 4, 'f'}};
+        REQUIRE(aos::layout_matches<aos::Cell2D>(f, 3, 12));
+    }
+
+    SECTION("different offsets, kinds, sizes or itemsize do not match") {
+        const FieldInfo shifted[] = {{"u", 0, 4, 'f'}, {"v", 8, 4, 'f'}, {"flag", 4, 4, 'i'}};
+        REQUIRE_FALSE(aos::layout_matches<aos::Cell2D>(shifted, 3, 12));
+        const FieldInfo kind[] = {{"u", 0, 4, 'f'}, {"v", 4, 4, 'f'}, {"flag", 8, 4, 'f'}};
+        REQUIRE_FALSE(aos::layout_matches<aos::Cell2D>(kind, 3, 12));
+        const FieldInfo wide[] = {{"u", 0, 8, 'f'}, {"v", 4, 4, 'f'}, {"flag", 8, 4, 'i'}};
+        REQUIRE_FALSE(aos::layout_matches<aos::Cell2D>(wide, 3, 12));
+        REQUIRE_FALSE(aos::layout_matches<aos::Cell2D>(aos::struct_fields<aos::Cell2D>::get(), 3, 16));
+    }
+
+    SECTION("missing, renamed or extra fields do not match") {
+        const FieldInfo renamed[] = {{"u", 0, 4, 'f'}, {"w", 4, 4, 'f'}, {"flag", 8, 4, 'i'}};
+        REQUIRE_FALSE(aos::layout_matches<aos::Cell2D>(renamed, 3, 12));
+        REQUIRE_FALSE(aos::layout_matches<aos::Cell2D>(aos::struct_fields<aos::Cell2D>::get(), 2, 12));
+        REQUIRE_FALSE(aos::layout_matches<aos::Cell2D>(aos::struct_fields<aos::Cell3D>::get(), 4, 12));
+    }
+
+    SECTION("find_field() looks fields up by name") {
+        const FieldInfo* p = aos::struct_fields<aos::Particle>::get();
+        REQUIRE(aos::find_field(p, 7, "vz") == p + 5);
+        REQUIRE(aos::find_field(p, 7, "w") == nullptr);
+    }
+}
@@ -0,0 +1,58 @@
+/**
+ * @file test_field_view.cpp
+ * @brief Tests for strided per-field views of AoS arrays
+ */
+
+#include <catch2/catch_test_macros.hpp>
+#include <cnda/field_view.hpp>
+#include <cnda/kernels.hpp>
+#include <cstdint>
+#include <stdexcept>
+
+using namespace cnda;
+using namespace cnda::aos;
+
+TEST_CASE("field_view() by name is a strided view of one field", "[aos][field]") {
+    ContiguousND<Cell2D> cells({3, 4});
+    for (std::size_t i = 0; i < cells.size(); ++i) {
+        cells.data()[i] = Cell2D{static_cast<float>(i), -static_cast<float>(i), static_cast<std::int32_t>(i)};
+    }
+
+    ContiguousND<float> v = field_view<float>(cells, "v");
+    REQUIRE(v.shape() == cells.shape());
+    REQUIRE(v.strides() == std::vector<std::size_t>({12, 3}));
+    REQUIRE(v.is_view());
+    REQUIRE_FALSE(v.is_contiguous());
+    REQUIRE(reinterpret_cast<unsigned char*>(v.data()) ==
+            reinterpret_cast<unsigned char*>(cells.data()) + offsetof(Cell2D, v));
+    REQUIRE(v(2, 1) == -9.0f);
+
+    // Writes land in the structs and leave the other fields alone
+    scale(v, 2.0f);
+    REQUIRE(cells(2, 1).v == -18.0f);
+    REQUIRE(cells(2, 1).u == 9.0f);
+    REQUIRE(cells(2, 1).flag == 9);
+
+    ContiguousND<std::int32_t> flag = field_view<std::int32_t>(cells, "flag");
+    REQUIRE(flag(1, 3) == 7);
+}
+
+TEST_CASE("field_view() composes with slices and keeps the buffer alive", "[aos][field]") {
+    ContiguousND<double> mass({1});
+    {
+        ContiguousND<Particle> p({4, 4});
+        for (std::size_t i = 0; i < p.size(); ++i) p.data()[i].mass = static_cast<double>(i);
+        ContiguousND<Particle> corners = p.slice({{1, 4, 2}, {0, 4, 3}});
+        mass = field_view<double>(corners, "mass");
+    }
+    REQUIRE(mass.shape() == std::vector<std::size_t>({2, 2}));
+    REQUIRE(mass(0, 0) == 4.0);
+    REQUIRE(mass(1, 1) == 15.0);
+}
+
+TEST_CASE("field_view() rejects unknown fields and wrong types", "[aos][field]") {
+    ContiguousND<Cell3D> cells({2});
+    REQUIRE_THROWS_AS(field_view<float>(cells, "x"), std::invalid_argument);
+    REQUIRE_THROWS_AS(field_view<float>(cells, "flag"), std::invalid_argument);
+    REQUIRE_THROWS_AS(field_view<double>(cells, "u"), std::invalid_argument);
+}
@@ -0,0 +1,142 @@
+/**
+ * @file test_soa.cpp
+ * @brief Tests for the Structure-of-Arrays container and AoS <-> SoA kernels
+ */
+
+#include <catch2/catch_test_macros.hpp>
+#include <cnda/soa.hpp>
+#include <cstdint>
+#include <vector>
+
+using namespace cnda;
+using namespace cnda::aos;
+
+TEST_CASE("Field tables describe the struct layout", "[soa][fields]") {
+    const FieldInfo* f = struct_fields<Cell2D>::get();
+    REQUIRE(struct_fields<Cell2D>::count == 3);
+    REQUIRE(std::string(f[0].name) == "u");
+    REQUIRE(f[1].offset == offsetof(Cell2D, v));
+    REQUIRE(f[2].size == sizeof(std::int32_t));
+    REQUIRE(f[2].kind == 'i');
+    REQUIRE(f[0].kind == 'f');
+
+    const FieldInfo* p = struct_fields<Particle>::get();
+    REQUIRE(std::string(p[6].name) == "mass");
+    REQUIRE(p[6].offset == offsetof(Particle, mass));
+    REQUIRE(p[6].size == sizeof(double));
+}
+
+TEST_CASE("SoA stores each field contiguously", "[soa]") {
+    soa::SoA<Particle> s({4, 5});
+    REQUIRE(s.size() == 20);
+    REQUIRE(s.num_fields() == 7);
+
+    ContiguousND<double> mass = s.field<double>("mass");
+    REQUIRE(mass.shape() == s.shape());
+    REQUIRE(mass.is_view());
+    REQUIRE(mass.strides()[1] == 1);
+    mass(3, 4) = 2.5;
+
+    ContiguousND<double> again = s.field(&Particle::mass);
+    REQUIRE(again(3, 4) == 2.5);
+    REQUIRE(again.data() == mass.data());
+
+    REQUIRE_THROWS_AS(s.field<float>("mass"), std::invalid_argument);
+    REQUIRE_THROWS_AS(s.field<double>("charge"), std::invalid_argument);
+}
+
+TEST_CASE("Field views outlive the SoA container", "[soa]") {
+    ContiguousND<float> u({1});
+    {
+        soa::SoA<Cell2D> s({8});
+        ContiguousND<float> tmp = s.field<float>("u");
+        tmp(7) = 1.25f;
+        u = std::move(tmp);
+    }
+    REQUIRE(u(7) == 1.25f);
+}
+
+TEST_CASE("AoS -> SoA -> AoS round trip", "[soa][convert]") {
+    // Larger than one cache block so the blocking loop is exercised
+    ContiguousND<Cell3D> cells({50, 40});
+    for (std::size_t i = 0; i < cells.size(); ++i) {
+        Cell3D& c = cells.data()[i];
+        c.u = static_cast<float>(i);
+        c.v = static_cast<float>(i) * 0.5f;
+        c.w = -static_cast<float>(i);
+        c.flag = static_cast<std::int32_t>(i % 3);
+    }
+
+    soa::SoA<Cell3D> s = soa::to_soa(cells);
+    ContiguousND<float> w = s.field<float>("w");
+    ContiguousND<std::int32_t> flag = s.field<std::int32_t>("flag");
+    REQUIRE(w(49, 39) == -1999.0f);
+    REQUIRE(flag(1, 2) == 42 % 3);
+
+    w(0, 1) = 100.0f;
+    ContiguousND<Cell3D> back = soa::to_aos(s);
+    REQUIRE(back(0, 1).w == 100.0f);
+    REQUIRE(back(0, 1).u == 1.0f);
+    for (std::size_t i = 2; i < back.size(); ++i) {
+        REQUIRE(back.data()[i].u == cells.data()[i].u);
+        REQUIRE(back.data()[i].v == cells.data()[i].v);
+        REQUIRE(back.data()[i].flag == cells.data()[i].flag);
+    }
+}
+
+TEST_CASE("Conversions validate shape and contiguity", "[soa][convert]") {
+    ContiguousND<Vec2f> a({3, 4});
+    soa::SoA<Vec2f> wrong({4, 3});
+    REQUIRE_THROWS_AS(soa::aos_to_soa(a, wrong), std::invalid_argument);
+
+    ContiguousND<Vec2f> cols = a.slice({{0, 3, 1}, {0, 4, 2}});
+    soa::SoA<Vec2f> s({3, 2});
+    REQUIRE_THROWS_AS(soa::aos_to_soa(cols, s), std::invalid_argument);
+}
+
+// Run the kernels on n threads even for small arrays
+struct ParallelScope {
+    std::size_t threads, threshold;
+    ParallelScope(std::size_t n) : threads(get_num_threads()), threshold(get_parallel_threshold()) {
+        set_num_threads(n);
+        set_parallel_threshold(1);
+    }
+    ~ParallelScope() {
+        set_num_threads(threads);
+        set_parallel_threshold(threshold);
+    }
+};
+
+TEST_CASE("Columns pack into and unpack from AoS in parallel", "[soa][columns]") {
+    ParallelScope scope(4);
+
+    // Several cache blocks per thread, and a ragged last block
+    const std::size_t n = 3 * 1000 + 7;
+    std::vector<double> x(n), mass(n);
+    std::vector<double> zero(n, 0.0);
+    for (std::size_t i = 0; i < n; ++i) {
+        x[i] = static_cast<double>(i);
+        mass[i] = 0.5 * static_cast<double>(i);
+    }
+    const void* in[7] = {x.data(), zero.data(), zero.data(), zero.data(), zero.data(), zero.data(), mass.data()};
+    ContiguousND<Particle> q({n});
+    soa::columns_to_aos(in, q);
+    REQUIRE(q(n - 1).x == static_cast<double>(n - 1));
+    REQUIRE(q(17).mass == 8.5);
+    REQUIRE(q(17).vy == 0.0);
+
+    std::vector<double> cols[7];
+    void* out[7];
+    for (std::size_t k = 0; k < 7; ++k) {
+        cols[k].assign(n, -1.0);
+        out[k] = cols[k].data();
+    }
+    soa::aos_to_columns(q, out);
+    REQUIRE(cols[0] == x);
+    REQUIRE(cols[6] == mass);
+    REQUIRE(cols[3] == zero);
+
+    ContiguousND<Particle> strided = q.slice({{0, n, 2}});
+    REQUIRE_THROWS_AS(soa::aos_to_columns(strided, out), std::invalid_argument);
+    REQUIRE_THROWS_AS(soa::columns_to_aos(in, strided), std::invalid_argument);
+}
@@ -0,0 +1,73 @@
+#include <catch2/catch_test_macros.hpp>
+#include <cnda/contiguous_nd.hpp>
+#include <cstdint>
+
+static bool aligned_to(const void* p, std::size_t alignment) {
+    return reinterpret_cast<std::uintptr_t>(p) % alignment == 0;
+}
+
+TEST_CASE("owning buffers are 64-byte aligned by default", "[alloc]") {
+    cnda::ContiguousND<float> a({3, 5});
+    REQUIRE(aligned_to(a.data(), cnda::default_alignment));
+    for (std::size_t i = 0; i < a.size(); ++i) {
+        REQUIRE(a.data()[i] == 0.0f);
+    }
+}
+
+TEST_CASE("factory modes", "[alloc]") {
+    SECTION("empty() allocates without initializing") {
+        auto a = cnda::ContiguousND<double>::empty({4, 4});
+        REQUIRE(a.size() == 16);
+        REQUIRE_FALSE(a.is_view());
+        REQUIRE(aligned_to(a.data(), 64));
+        a(3, 3) = 1.0;
+        REQUIRE(a(3, 3) == 1.0);
+    }
+
+    SECTION("zeros()") {
+        auto a = cnda::ContiguousND<std::int64_t>::zeros({7});
+        for (std::size_t i = 0; i < 7; ++i) REQUIRE(a(i) == 0);
+    }
+
+    SECTION("full()") {
+        auto a = cnda::ContiguousND<int>::full({2, 3}, 42);
+        for (std::size_t i = 0; i < a.size(); ++i) REQUIRE(a.data()[i] == 42);
+    }
+
+    SECTION("zero-sized arrays still get a buffer") {
+        auto a = cnda::ContiguousND<int>::empty({0, 3});
+        REQUIRE(a.size() == 0);
+        REQUIRE(a.data() != nullptr);
+    }
+}
+
+TEST_CASE("custom alignment", "[alloc]") {
+    SECTION("larger alignments are honoured") {
+        auto a = cnda::ContiguousND<float>::empty({100}, 4096);
+        REQUIRE(aligned_to(a.data(), 4096));
+    }
+
+    SECTION("huge-page alignment") {
+        auto a = cnda::ContiguousND<float>::zeros({1024}, cnda::huge_page_alignment);
+        REQUIRE(aligned_to(a.data(), cnda::huge_page_alignment));
+        REQUIRE(a(1023) == 0.0f);
+    }
+
+    SECTION("alignment never drops below alignof(T)") {
+        cnda::ContiguousND<double> a({4}, 1);
+        REQUIRE(aligned_to(a.data(), alignof(double)));
+    }
+
+    SECTION("non power-of-two alignment throws") {
+        REQUIRE_THROWS_AS(cnda::ContiguousND<float>({4}, 48), std::invalid_argument);
+    }
+}
+
+TEST_CASE("moving an owning array keeps its buffer", "[alloc]") {
+    auto a = cnda::ContiguousND<int>::full({8}, 3);
+    const int* p = a.data();
+    cnda::ContiguousND<int> b(std::move(a));
+    REQUIRE(b.data() == p);
+    REQUIRE(b(7) == 3);
+    REQUIRE(a.data() == nullptr);
+}
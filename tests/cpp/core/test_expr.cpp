@@ -0,0 +1,165 @@
+#include <catch2/catch_test_macros.hpp>
+#include <catch2/catch_approx.hpp>
+#include <cnda/contiguous_nd.hpp>
+#include <cnda/expr.hpp>
+#include <cnda/parallel.hpp>
+#include <cstddef>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+using namespace cnda;
+
+// Element i (row-major) = scale * i + offset
+static ContiguousND<double> ramp(const Extents& shape, double scale, double offset) {
+    ContiguousND<double> a(shape);
+    double i = 0;
+    for (double& x : a) x = scale * i++ + offset;
+    return a;
+}
+
+TEST_CASE("Expressions evaluate in one pass on assignment", "[expr]") {
+    ContiguousND<double> a = ramp({3, 4}, 1.0, 0.0);
+    ContiguousND<double> b = ramp({3, 4}, 0.5, 2.0);
+    ContiguousND<double> c = ramp({3, 4}, -1.0, 1.0);
+
+    SECTION("Contiguous operands") {
+        ContiguousND<double> u = ContiguousND<double>::full({3, 4}, 1.0);
+        const double dt = 0.25;
+        u = u + dt * (a * b - c);
+        for (std::size_t i = 0; i < 3; ++i)
+            for (std::size_t j = 0; j < 4; ++j)
+                REQUIRE(u(i, j) == Catch::Approx(1.0 + dt * (a(i, j) * b(i, j) - c(i, j))));
+
+        ContiguousND<double> r = evaluate(-a / 2.0 + 1);
+        REQUIRE(r.shape() == a.shape());
+        REQUIRE(r(2, 3) == Catch::Approx(-4.5));
+    }
+
+    SECTION("Compound assignment") {
+        ContiguousND<double> u = ContiguousND<double>::full({3, 4}, 2.0);
+        u += a;
+        u *= 2;
+        u -= b * c;
+        u /= 4.0;
+        REQUIRE(u(1, 2) == Catch::Approx(((2.0 + a(1, 2)) * 2 - b(1, 2) * c(1, 2)) / 4.0));
+    }
+
+    SECTION("Mixed element types use the common type") {
+        ContiguousND<int> n({3, 4});
+        for (int& x : n) x = 3;
+        ContiguousND<float> f = ContiguousND<float>::full({3, 4}, 0.5f);
+        ContiguousND<double> d({3, 4});
+        d = n / 2 + f;                                // int / int, then float
+        REQUIRE(d(0, 0) == Catch::Approx(1.5));
+        d = n * a;
+        REQUIRE(d(2, 3) == Catch::Approx(33.0));
+    }
+}
+
+TEST_CASE("Expressions broadcast like NumPy", "[expr]") {
+    ContiguousND<double> a = ramp({2, 3, 4}, 1.0, 0.0);
+    ContiguousND<double> row = ramp({4}, 10.0, 0.0);
+    ContiguousND<double> col = ramp({3, 1}, 100.0, 0.0);
+
+    ContiguousND<double> r = evaluate(a + row + col);
+    REQUIRE(r.shape() == std::vector<std::size_t>{2, 3, 4});
+    for (std::size_t i = 0; i < 2; ++i)
+        for (std::size_t j = 0; j < 3; ++j)
+            for (std::size_t k = 0; k < 4; ++k)
+                REQUIRE(r(i, j, k) == a(i, j, k) + row(k) + col(j, 0));
+
+    // The result may broadcast to a larger destination
+    ContiguousND<double> wide({2, 3, 4});
+    wide = row * 2;
+    REQUIRE(wide(1, 2, 3) == 60.0);
+
+    // ... but not the other way round
+    ContiguousND<double> small({3, 4});
+    REQUIRE_THROWS_AS(small = a + 1, std::invalid_argument);
+    REQUIRE_THROWS_AS(evaluate(a + ramp({3}, 1.0, 0.0)), std::invalid_argument);
+}
+
+TEST_CASE("Expressions over strided views", "[expr]") {
+    ContiguousND<double> a = ramp({6, 8}, 1.0, 0.0);
+    ContiguousND<double> t = a.transpose();         // 8 x 6
+    ContiguousND<double> v = a.slice({{0, 6, 2}, {1, 8, 3}});  // 3 x 3
+
+    ContiguousND<double> r = evaluate(t * 2.0);
+    REQUIRE(r(5, 3) == 2.0 * a(3, 5));
+
+    // Destination is a view, and appears on the right-hand side
+    v = v + ramp({3, 3}, 1.0, 0.0);
+    REQUIRE(a(0, 1) == 1.0);
+    REQUIRE(a(2, 4) == 20.0 + 4.0);
+    REQUIRE(a(4, 7) == 39.0 + 8.0);
+    REQUIRE(a(1, 1) == 9.0);                        // outside the view
+
+    ContiguousND<double> s = ContiguousND<double>::zeros({0, 4});
+    s = s + 1.0;                                    // empty arrays are fine
+    REQUIRE(s.size() == 0);
+}
+
+TEST_CASE("Parallel evaluation covers every element once", "[expr]") {
+    struct Scope {
+        std::size_t threads = get_num_threads(), threshold = get_parallel_threshold();
+        Scope() { set_num_threads(3); set_parallel_threshold(1); }
+        ~Scope() { set_num_threads(threads); set_parallel_threshold(threshold); }
+    } scope;
+    ContiguousND<double> a = ramp({37, 53}, 1.0, 0.0);
+    ContiguousND<double> col = ramp({37, 1}, 1.0, 0.0);
+
+    ContiguousND<double> flat({37, 53});
+    flat = a * 2 - 1;
+    ContiguousND<double> rows({37, 53});
+    rows = a + col;
+    expr::Program p("2*a - 1 + col");
+    ContiguousND<double> out({37, 53});
+    p.run(out, {{&a, 0.0}, {&col, 0.0}});
+    for (std::size_t i = 0; i < 37; ++i)
+        for (std::size_t j = 0; j < 53; ++j) {
+            REQUIRE(flat(i, j) == 2 * a(i, j) - 1);
+            REQUIRE(rows(i, j) == a(i, j) + col(i, 0));
+            REQUIRE(out(i, j) == 2 * a(i, j) - 1 + col(i, 0));
+        }
+}
+
+TEST_CASE("Program parses and runs arithmetic at run time", "[expr]") {
+    expr::Program p("u + dt*(a*b - c) / -2");
+    REQUIRE(p.names() == std::vector<std::string>{"u", "dt", "a", "b", "c"});
+    REQUIRE(p.source() == "u + dt*(a*b - c) / -2");
+
+    // More elements than one block per row, with broadcast and strided operands
+    const std::size_t n = 3 * expr::Program::block + 7;
+    ContiguousND<double> u = ramp({2, n}, 1.0, 0.0);
+    ContiguousND<double> a = ramp({n}, 0.5, 1.0);
+    ContiguousND<double> b = ramp({2, 1}, 1.0, 3.0);
+    ContiguousND<double> c = ramp({n, 2}, 1.0, 0.0).transpose();
+    ContiguousND<double> out({2, n});
+    p.run(out, {{&u, 0.0}, {nullptr, 0.5}, {&a, 0.0}, {&b, 0.0}, {&c, 0.0}});
+    for (std::size_t i = 0; i < 2; ++i)
+        for (std::size_t j = 0; j < n; ++j)
+            REQUIRE(out(i, j) == Catch::Approx(u(i, j) + 0.5 * (a(j) * b(i, 0) - c(i, j)) / -2));
+
+    // In place, into the only operand
+    expr::Program twice("x + x");
+    twice.run(u, {{&u, 0.0}});
+    REQUIRE(u(1, n - 1) == 2.0 * (2 * n - 1));
+
+    // Constants only, into a rank-0 array
+    ContiguousND<double> scalar((Extents()));
+    expr::Program("1.5e1 - 2*(3 + -1)").run(scalar, {});
+    REQUIRE(*scalar.data() == 11.0);
+
+    REQUIRE_THROWS_AS(p.run(out, {{&u, 0.0}}), std::invalid_argument);
+    ContiguousND<double> odd = ramp({5}, 1.0, 0.0);
+    REQUIRE_THROWS_AS(twice.run(out, {{&odd, 0.0}}), std::invalid_argument);
+}
+
+TEST_CASE("Program rejects malformed sources", "[expr]") {
+    const char* bad[] = {"", "a +", "a * * b", "(a + b", "a + b)", "2a", "a $ b", "1e"};
+    for (const char* source : bad) {
+        REQUIRE_THROWS_AS((void)expr::Program(source), std::invalid_argument);
+    }
+    REQUIRE_NOTHROW((void)expr::Program(" ( a_1 + .5 ) * -(-b) "));
+}
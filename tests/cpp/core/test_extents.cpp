@@ -0,0 +1,59 @@
+#include <catch2/catch_test_macros.hpp>
+#include <cnda/contiguous_nd.hpp>
+#include <cnda/extents.hpp>
+#include <utility>
+#include <vector>
+
+TEST_CASE("Extents stores small ranks inline and larger ones on the heap", "[extents]") {
+    SECTION("inline") {
+        cnda::Extents e{2, 3, 4};
+        REQUIRE(e.size() == 3);
+        REQUIRE(e[2] == 4);
+        REQUIRE(e.back() == 4);
+        REQUIRE(e == std::vector<std::size_t>{2, 3, 4});
+        REQUIRE(std::vector<std::size_t>{2, 3} != e);
+
+        cnda::Extents copy(e);
+        copy[0] = 9;
+        REQUIRE(e[0] == 2);
+        cnda::Extents moved(std::move(copy));
+        REQUIRE(moved == cnda::Extents{9, 3, 4});
+        REQUIRE(copy.empty());
+        REQUIRE(moved.data() != copy.data());
+    }
+
+    SECTION("heap fallback") {
+        std::vector<std::size_t> big(11);
+        for (std::size_t i = 0; i < big.size(); ++i) big[i] = i + 1;
+        cnda::Extents e(big);
+        REQUIRE(e.size() == 11);
+        REQUIRE(std::vector<std::size_t>(e) == big);
+
+        const std::size_t* heap = e.data();
+        cnda::Extents moved(std::move(e));
+        REQUIRE(moved.data() == heap);
+        REQUIRE(e.empty());
+
+        cnda::Extents small{1, 2};
+        small = moved;
+        REQUIRE(small == big);
+        small = cnda::Extents{5};
+        REQUIRE(small == std::vector<std::size_t>{5});
+        moved.assign(3, 7);
+        REQUIRE(moved == cnda::Extents{7, 7, 7});
+    }
+}
+
+TEST_CASE("arrays above the inline rank still index and slice", "[extents]") {
+    cnda::ContiguousND<int> a({2, 1, 2, 1, 2, 1, 2, 1, 2, 3});
+    REQUIRE(a.ndim() == 10);
+    REQUIRE(a.size() == 96);
+    REQUIRE(a.strides()[0] == 48);
+    a.data()[95] = 5;
+    REQUIRE(a(1, 0, 1, 0, 1, 0, 1, 0, 1, 2) == 5);
+
+    auto v = a.slice({cnda::Range{1, 2, 1}});
+    REQUIRE(v.shape()[0] == 1);
+    REQUIRE(v(0, 0, 1, 0, 1, 0, 1, 0, 1, 2) == 5);
+    REQUIRE(v.shape().size() == 10);
+}
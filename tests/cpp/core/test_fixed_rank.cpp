@@ -0,0 +1,91 @@
+#include <catch2/catch_test_macros.hpp>
+#include <cnda/fixed_rank.hpp>
+#include <cnda/reduce.hpp>
+#include <cstdint>
+#include <stdexcept>
+#include <type_traits>
+#include <vector>
+
+static_assert(cnda::ContiguousND<float, 3>::ndim() == 3, "rank is a compile-time constant");
+static_assert(std::is_same<cnda::ContiguousND<float>, cnda::ContiguousND<float, cnda::dynamic_rank>>::value,
+              "the default rank is dynamic");
+
+TEST_CASE("fixed-rank arrays index like the dynamic class", "[fixed_rank]") {
+    cnda::ContiguousND<int, 3> a({2, 3, 4});
+    REQUIRE(a.size() == 24);
+    REQUIRE(a.strides() == (std::array<std::size_t, 3>{{12, 4, 1}}));
+    REQUIRE(a.is_contiguous());
+    REQUIRE_FALSE(a.is_view());
+    REQUIRE(a(1, 2, 3) == 0);
+    REQUIRE(reinterpret_cast<std::uintptr_t>(a.data()) % cnda::default_alignment == 0);
+
+    for (std::size_t i = 0; i < 2; ++i)
+        for (std::size_t j = 0; j < 3; ++j)
+            for (std::size_t k = 0; k < 4; ++k) a(i, j, k) = static_cast<int>(100 * i + 10 * j + k);
+    REQUIRE(a.data()[23] == 123);
+    REQUIRE(a.at(1, 0, 2) == 102);
+    REQUIRE_THROWS_AS(a.at(2, 0, 0), std::out_of_range);
+    REQUIRE_THROWS_AS(a.at(0, 0, 4), std::out_of_range);
+
+    SECTION("factories") {
+        auto f = cnda::ContiguousND<double, 2>::full({3, 3}, 1.5);
+        REQUIRE(f(2, 2) == 1.5);
+        auto e = cnda::ContiguousND<double, 1>::empty({5}, 4096);
+        REQUIRE(reinterpret_cast<std::uintptr_t>(e.data()) % 4096 == 0);
+    }
+
+    SECTION("slices keep the rank and share the buffer") {
+        auto v = a.slice({cnda::Range{1, 2, 1}, cnda::Range{0, 3, 2}});
+        REQUIRE(v.shape() == (std::array<std::size_t, 3>{{1, 2, 4}}));
+        REQUIRE_FALSE(v.is_contiguous());
+        REQUIRE(v.is_view());
+        REQUIRE(v(0, 1, 3) == 123);
+        v(0, 0, 0) = -1;
+        REQUIRE(a(1, 0, 0) == -1);
+        REQUIRE_THROWS_AS(a.slice({cnda::Range{0, 1, 0}}), std::invalid_argument);
+    }
+
+    SECTION("moves") {
+        int* p = a.data();
+        cnda::ContiguousND<int, 3> b(std::move(a));
+        REQUIRE(b.data() == p);
+        REQUIRE(a.size() == 0);
+        REQUIRE(b(1, 2, 3) == 123);
+    }
+}
+
+TEST_CASE("conversion between fixed and dynamic rank", "[fixed_rank]") {
+    cnda::ContiguousND<double> d({4, 5});
+    d(3, 4) = 7.0;
+
+    auto f = cnda::as_fixed<2>(d);
+    REQUIRE(f.data() == d.data());
+    REQUIRE(f.shape() == (std::array<std::size_t, 2>{{4, 5}}));
+    REQUIRE(f(3, 4) == 7.0);
+    REQUIRE(f.owner() != nullptr);
+    REQUIRE_THROWS_AS(cnda::as_fixed<3>(d), std::invalid_argument);
+
+    SECTION("strided views round-trip") {
+        auto v = d.slice({cnda::Range{0, 4, 2}, cnda::Range{1, 5, 3}});
+        auto fv = cnda::as_fixed<2>(v);
+        REQUIRE_FALSE(fv.is_contiguous());
+        REQUIRE(fv(1, 1) == 0.0);
+        fv(1, 1) = 9.0;
+        REQUIRE(d(2, 4) == 9.0);
+
+        auto back = cnda::as_dynamic(fv);
+        REQUIRE(back.shape() == std::vector<std::size_t>{2, 2});
+        REQUIRE(back.strides() == std::vector<std::size_t>{10, 3});
+        REQUIRE(back(1, 1) == 9.0);
+    }
+
+    SECTION("the buffer outlives the fixed-rank owner") {
+        cnda::ContiguousND<double> back({1});
+        {
+            auto owning = cnda::ContiguousND<double, 2>::full({2, 2}, 3.0);
+            back = cnda::as_dynamic(owning);
+        }
+        REQUIRE(back.is_view());
+        REQUIRE(cnda::sum(back) == 12.0);
+    }
+}
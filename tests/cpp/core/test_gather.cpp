@@ -0,0 +1,71 @@
+#include <catch2/catch_test_macros.hpp>
+#include <cnda/gather.hpp>
+#include <cstdint>
+#include <vector>
+
+TEST_CASE("take() gathers by multi-index and by flat position", "[gather]") {
+    cnda::ContiguousND<int> a({3, 4});
+    for (std::size_t i = 0; i < a.size(); ++i) a.data()[i] = static_cast<int>(i * 10);
+
+    SECTION("multi-index entries") {
+        std::vector<std::int64_t> idx = {0, 0, 1, 2, 2, 3};
+        std::vector<int> out(3);
+        cnda::take(a, idx.data(), 3, false, out.data());
+        REQUIRE(out[0] == 0);
+        REQUIRE(out[1] == 60);
+        REQUIRE(out[2] == 110);
+    }
+
+    SECTION("flat entries") {
+        std::vector<std::int64_t> idx = {11, 5, 5};
+        std::vector<int> out(3);
+        cnda::take(a, idx.data(), 3, true, out.data());
+        REQUIRE(out[0] == 110);
+        REQUIRE(out[1] == 50);
+        REQUIRE(out[2] == 50);
+    }
+
+    SECTION("out of bounds throws") {
+        std::vector<std::int64_t> idx = {0, 4};
+        std::vector<int> out(1);
+        REQUIRE_THROWS_AS(cnda::take(a, idx.data(), 1, false, out.data()), std::out_of_range);
+        std::vector<std::int64_t> neg = {-1};
+        REQUIRE_THROWS_AS(cnda::take(a, neg.data(), 1, true, out.data()), std::out_of_range);
+    }
+}
+
+TEST_CASE("put() scatters and validates before writing", "[gather]") {
+    cnda::ContiguousND<double> a({2, 3});
+    for (std::size_t i = 0; i < a.size(); ++i) a.data()[i] = 0.0;
+
+    SECTION("one value per index") {
+        std::vector<std::int64_t> idx = {0, 1, 1, 2};
+        std::vector<double> vals = {1.5, 2.5};
+        cnda::put(a, idx.data(), 2, false, vals.data(), 2);
+        REQUIRE(a(0, 1) == 1.5);
+        REQUIRE(a(1, 2) == 2.5);
+    }
+
+    SECTION("single value is broadcast") {
+        std::vector<std::int64_t> idx = {0, 3, 5};
+        double v = 7.0;
+        cnda::put(a, idx.data(), 3, true, &v, 1);
+        REQUIRE(a(0, 0) == 7.0);
+        REQUIRE(a(1, 0) == 7.0);
+        REQUIRE(a(1, 2) == 7.0);
+        REQUIRE(a(0, 1) == 0.0);
+    }
+
+    SECTION("a bad index leaves the array untouched") {
+        std::vector<std::int64_t> idx = {0, 6};
+        std::vector<double> vals = {1.0, 2.0};
+        REQUIRE_THROWS_AS(cnda::put(a, idx.data(), 2, true, vals.data(), 2), std::out_of_range);
+        REQUIRE(a(0, 0) == 0.0);
+    }
+
+    SECTION("value count mismatch throws") {
+        std::vector<std::int64_t> idx = {0, 1, 2};
+        std::vector<double> vals = {1.0, 2.0};
+        REQUIRE_THROWS_AS(cnda::put(a, idx.data(), 3, true, vals.data(), 2), std::invalid_argument);
+    }
+}
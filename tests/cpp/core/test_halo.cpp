@@ -0,0 +1,169 @@
+#include <catch2/catch_test_macros.hpp>
+#include <cnda/aos_types.hpp>
+#include <cnda/contiguous_nd.hpp>
+#include <cnda/halo.hpp>
+#include <cnda/parallel.hpp>
+#include <cstddef>
+#include <stdexcept>
+#include <vector>
+
+using namespace cnda;
+
+// Interior cell (i, j) = 100 * i + j
+static HaloGrid<int> numbered(std::size_t rows, std::size_t cols, std::size_t halo) {
+    HaloGrid<int> g({rows, cols}, halo);
+    ContiguousND<int> in = g.interior();
+    for (std::size_t i = 0; i < rows; ++i)
+        for (std::size_t j = 0; j < cols; ++j) in(i, j) = static_cast<int>(100 * i + j);
+    return g;
+}
+
+TEST_CASE("HaloGrid pads the interior with ghost layers", "[halo]") {
+    HaloGrid<float> g({4, 5}, 2);
+    REQUIRE(g.shape() == std::vector<std::size_t>{4, 5});
+    REQUIRE(g.halo() == 2);
+    REQUIRE(g.padded().shape() == std::vector<std::size_t>{8, 9});
+    ContiguousND<float> in = g.interior();
+    REQUIRE(in.shape() == std::vector<std::size_t>{4, 5});
+    REQUIRE(in.data() == &g.padded()(2, 2));
+    REQUIRE(in.owner() != nullptr);  // shares the grid's buffer
+    in(3, 4) = 1.5f;
+    REQUIRE(g.padded()(5, 6) == 1.5f);
+    for (float x : g.padded()) REQUIRE((x == 0.0f || x == 1.5f));
+
+    REQUIRE_THROWS_AS(HaloGrid<float>(Extents(), 1), std::invalid_argument);
+}
+
+TEST_CASE("fill_halo boundaries", "[halo]") {
+    SECTION("Periodic, corners included") {
+        HaloGrid<int> g = numbered(3, 4, 2);
+        g.fill_halo(Boundary::periodic);
+        const ContiguousND<int>& p = g.padded();
+        for (std::size_t i = 0; i < 7; ++i)
+            for (std::size_t j = 0; j < 8; ++j) {
+                const std::size_t si = (i + 3 - 2) % 3, sj = (j + 4 - 2) % 4;
+                REQUIRE(p(i, j) == static_cast<int>(100 * si + sj));
+            }
+    }
+
+    SECTION("Reflect mirrors about the boundary face") {
+        HaloGrid<int> g = numbered(3, 4, 2);
+        g.fill_halo(Boundary::reflect);
+        const ContiguousND<int>& p = g.padded();
+        REQUIRE(p(2, 1) == 0);     // first ghost column = edge column
+        REQUIRE(p(2, 0) == 1);
+        REQUIRE(p(2, 6) == 3);
+        REQUIRE(p(2, 7) == 2);
+        REQUIRE(p(0, 3) == 101);
+        REQUIRE(p(6, 3) == 101);
+        REQUIRE(p(0, 0) == 101);   // corner: mirrored along both axes
+    }
+
+    SECTION("Constant and mixed per axis") {
+        HaloGrid<int> g = numbered(3, 4, 1);
+        g.fill_halo({Boundary::constant, Boundary::periodic}, -1);
+        const ContiguousND<int>& p = g.padded();
+        for (std::size_t j = 0; j < 6; ++j) REQUIRE(p(0, j) == -1);
+        REQUIRE(p(4, 0) == -1);    // the periodic pass copies the constant rows' ends
+        REQUIRE(p(1, 0) == 3);
+        REQUIRE(p(3, 5) == 200);
+    }
+
+    SECTION("AoS cells") {
+        HaloGrid<aos::Cell2D> g({2, 2}, 1);
+        g.interior()(0, 1) = aos::Cell2D{1.0f, 2.0f, 7};
+        g.fill_halo(Boundary::constant, aos::Cell2D{0.0f, 0.0f, -1});
+        REQUIRE(g.padded()(0, 0).flag == -1);
+        g.fill_halo({Boundary::periodic, Boundary::reflect});
+        REQUIRE(g.padded()(3, 3).flag == 7);
+        REQUIRE(g.padded()(3, 3).v == 2.0f);
+    }
+
+    HaloGrid<int> thin = numbered(1, 4, 2);
+    REQUIRE_THROWS_AS(thin.fill_halo(Boundary::periodic), std::invalid_argument);
+    REQUIRE_NOTHROW(thin.fill_halo({Boundary::constant, Boundary::reflect}));
+    REQUIRE_THROWS_AS(thin.fill_halo({Boundary::periodic}), std::invalid_argument);
+}
+
+TEST_CASE("exchange_halo joins neighbouring grids", "[halo]") {
+    HaloGrid<int> a = numbered(3, 4, 1);
+    HaloGrid<int> b = numbered(2, 4, 1);
+    exchange_halo(a, b, 0);
+    for (std::size_t j = 1; j < 5; ++j) {
+        REQUIRE(a.padded()(4, j) == b.padded()(1, j));  // below a: b's first row
+        REQUIRE(b.padded()(0, j) == a.padded()(3, j));  // above b: a's last row
+    }
+
+    HaloGrid<int> c = numbered(3, 5, 1);
+    REQUIRE_THROWS_AS(exchange_halo(a, c, 0), std::invalid_argument);
+    REQUIRE_NOTHROW(exchange_halo(a, c, 1));
+    HaloGrid<int> wide = numbered(3, 4, 2);
+    REQUIRE_THROWS_AS(exchange_halo(a, wide, 0), std::invalid_argument);
+}
+
+TEST_CASE("apply_stencil sweeps every interior cell", "[halo]") {
+    // Tiles of 16 rows by 1024 floats: use extents that leave partial tiles
+    const std::size_t n0 = 37, n1 = 1100;
+    HaloGrid<float> g({n0, n1}, 1);
+    ContiguousND<float> in = g.interior();
+    for (std::size_t i = 0; i < n0; ++i)
+        for (std::size_t j = 0; j < n1; ++j) in(i, j) = static_cast<float>((i * 7 + j * 3) % 11);
+    g.fill_halo(Boundary::periodic);
+    const ContiguousND<float>& p = g.padded();
+
+    auto laplacian = [](const StencilPoint<float>& s) {
+        return s(-1, 0) + s(1, 0) + s(0, -1) + s(0, 1) - 4 * s();
+    };
+    auto check = [&](const ContiguousND<float>& out) {
+        for (std::size_t i = 0; i < n0; ++i)
+            for (std::size_t j = 0; j < n1; ++j)
+                REQUIRE(out(i, j) == p(i, j + 1) + p(i + 2, j + 1) + p(i + 1, j) + p(i + 1, j + 2) -
+                                         4 * p(i + 1, j + 1));
+    };
+
+    ContiguousND<float> out({n0, n1});
+    apply_stencil(g, out, laplacian);
+    check(out);
+
+    SECTION("Into another grid's interior, on several threads") {
+        struct Scope {
+            std::size_t threads = get_num_threads(), threshold = get_parallel_threshold();
+            Scope() { set_num_threads(3); set_parallel_threshold(1); }
+            ~Scope() { set_num_threads(threads); set_parallel_threshold(threshold); }
+        } scope;
+        HaloGrid<float> next({n0, n1}, 1);
+        ContiguousND<float> dst = next.interior();
+        apply_stencil(g, dst, laplacian);
+        check(dst);
+        REQUIRE(next.padded()(0, 0) == 0.0f);
+    }
+
+    ContiguousND<float> wrong({n0, n1 + 2});
+    REQUIRE_THROWS_AS(apply_stencil(g, wrong, laplacian), std::invalid_argument);
+}
+
+TEST_CASE("apply_stencil in 1-D and 3-D", "[halo]") {
+    HaloGrid<double> line({10}, 2);
+    for (std::size_t i = 0; i < 10; ++i) line.interior()(i) = static_cast<double>(i * i);
+    line.fill_halo(Boundary::reflect);
+    ContiguousND<double> d2({10});
+    apply_stencil(line, d2, [](const StencilPoint<double>& s) { return s(-2) + s(2) - 2 * s(); });
+    REQUIRE(d2(5) == 8.0);
+    REQUIRE(d2(0) == 1.0 + 4.0);   // s(-2) is the reflected cell 1
+
+    HaloGrid<aos::Cell3D> cube({5, 6, 7}, 1);
+    ContiguousND<aos::Cell3D> c = cube.interior();
+    for (std::size_t i = 0; i < 5; ++i)
+        for (std::size_t j = 0; j < 6; ++j)
+            for (std::size_t k = 0; k < 7; ++k)
+                c(i, j, k) = aos::Cell3D{static_cast<float>(i), static_cast<float>(j), static_cast<float>(k), 0};
+    cube.fill_halo(Boundary::periodic);
+    // Divergence by central differences, with precomputed offsets
+    ContiguousND<float> div({5, 6, 7});
+    apply_stencil(cube, div, [](const StencilPoint<aos::Cell3D>& s) {
+        return (s[s.stride(0)].u - s[-s.stride(0)].u) + (s(0, 1, 0).v - s(0, -1, 0).v) +
+               (s(0, 0, 1).w - s(0, 0, -1).w);
+    });
+    REQUIRE(div(2, 3, 4) == 6.0f);
+    REQUIRE(div(0, 3, 4) == 4.0f + (1.0f - 4.0f));   // wraps around along axis 0
+}
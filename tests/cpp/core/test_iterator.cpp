@@ -0,0 +1,116 @@
+#include <catch2/catch_test_macros.hpp>
+#include <cnda/contiguous_nd.hpp>
+#include <cnda/fixed_rank.hpp>
+#include <algorithm>
+#include <iterator>
+#include <numeric>
+#include <type_traits>
+#include <vector>
+
+static_assert(std::is_same<std::iterator_traits<cnda::ContiguousND<int>::iterator>::iterator_category,
+                           std::forward_iterator_tag>::value, "flat iterators are forward iterators");
+
+// Every element holds its row-major position
+static cnda::ContiguousND<int> iota_array(std::vector<std::size_t> shape) {
+    cnda::ContiguousND<int> a(std::move(shape));
+    for (std::size_t i = 0; i < a.size(); ++i) a.data()[i] = static_cast<int>(i);
+    return a;
+}
+
+TEST_CASE("flat iterators visit elements in row-major order", "[iterator]") {
+    auto a = iota_array({3, 4, 5});
+
+    SECTION("contiguous") {
+        std::vector<int> seen(a.begin(), a.end());
+        REQUIRE(seen.size() == 60);
+        for (std::size_t i = 0; i < seen.size(); ++i) REQUIRE(seen[i] == static_cast<int>(i));
+        REQUIRE(std::accumulate(a.cbegin(), a.cend(), 0) == 59 * 60 / 2);
+    }
+
+    SECTION("strided views and STL algorithms") {
+        auto v = a.slice({cnda::Range{1, 3, 1}, cnda::Range{0, 4, 3}, cnda::Range{1, 5, 2}});
+        REQUIRE_FALSE(v.is_contiguous());
+        std::vector<int> seen;
+        for (int x : v) seen.push_back(x);
+        REQUIRE(seen == std::vector<int>{21, 23, 36, 38, 41, 43, 56, 58});
+        REQUIRE(*std::max_element(v.begin(), v.end()) == 58);
+
+        std::fill(v.begin(), v.end(), -1);
+        REQUIRE(a(1, 3, 3) == -1);
+        REQUIRE(a(1, 3, 2) == 37);
+        REQUIRE(std::count(a.begin(), a.end(), -1) == 8);
+    }
+
+    SECTION("empty and moved-from arrays") {
+        cnda::ContiguousND<int> e({4, 0, 2});
+        REQUIRE(e.begin() == e.end());
+        auto e2 = e.slice({cnda::Range{0, 4, 2}});
+        REQUIRE(e2.begin() == e2.end());
+    }
+}
+
+TEST_CASE("multi-index iterator carries index and offset", "[iterator]") {
+    auto a = iota_array({2, 3, 4, 2, 3});
+    auto v = a.slice({cnda::Range{0, 2, 1}, cnda::Range{1, 3, 1}, cnda::Range{0, 4, 2}});
+
+    auto it = v.index_iterator();
+    std::size_t n = 0;
+    for (std::size_t i0 = 0; i0 < 2; ++i0)
+        for (std::size_t i1 = 0; i1 < 2; ++i1)
+            for (std::size_t i2 = 0; i2 < 2; ++i2)
+                for (std::size_t i3 = 0; i3 < 2; ++i3)
+                    for (std::size_t i4 = 0; i4 < 3; ++i4, ++it, ++n) {
+                        REQUIRE(it.index() == std::vector<std::size_t>{i0, i1, i2, i3, i4});
+                        REQUIRE(it.position() == n);
+                        REQUIRE(*it == v(i0, i1, i2, i3, i4));
+                    }
+    REQUIRE(it == v.index_iterator(v.size()));
+
+    auto mid = v.index_iterator(7);
+    REQUIRE(mid.index() == std::vector<std::size_t>{0, 0, 1, 0, 1});
+    REQUIRE(&*mid == &v(0, 0, 1, 0, 1));
+}
+
+TEST_CASE("for_each_index passes the multi-index and element", "[iterator]") {
+    SECTION("dynamic rank") {
+        auto a = iota_array({2, 3, 2, 2, 2, 2});
+        auto v = a.slice({cnda::Range{0, 2, 1}, cnda::Range{0, 3, 2}});
+        std::size_t count = 0;
+        cnda::for_each_index(v, [&](const std::vector<std::size_t>& idx, int& x) {
+            REQUIRE(idx.size() == 6);
+            REQUIRE(&x == &v(idx[0], idx[1], idx[2], idx[3], idx[4], idx[5]));
+            x = -x;
+            ++count;
+        });
+        REQUIRE(count == v.size());
+        REQUIRE(a(1, 2, 1, 1, 1, 1) == -95);
+        REQUIRE(a(1, 1, 1, 1, 1, 1) == 79);
+
+        const cnda::ContiguousND<int>& c = a;
+        long total = 0;
+        cnda::for_each_index(c, [&](const std::vector<std::size_t>&, const int& x) { total += x; });
+        REQUIRE(total == std::accumulate(a.begin(), a.end(), 0L));
+    }
+
+    SECTION("fixed rank unpacks the indices") {
+        cnda::ContiguousND<double, 3> f({3, 4, 5});
+        cnda::for_each_index(f, [](std::size_t i, std::size_t j, std::size_t k, double& x) {
+            x = 100.0 * i + 10.0 * j + k;
+        });
+        REQUIRE(f(2, 3, 4) == 234.0);
+        auto fv = f.slice({cnda::Range{0, 3, 2}, cnda::Range{1, 4, 2}});
+        std::vector<double> seen;
+        cnda::for_each_index(fv, [&](std::size_t, std::size_t, std::size_t k, double& x) {
+            if (k == 0) seen.push_back(x);
+        });
+        REQUIRE(seen == std::vector<double>{10.0, 30.0, 210.0, 230.0});
+        REQUIRE(std::vector<double>(fv.begin(), fv.end()).size() == 20);
+    }
+
+    SECTION("empty arrays visit nothing") {
+        cnda::ContiguousND<int> e({3, 0});
+        cnda::for_each_index(e, [](const std::vector<std::size_t>&, int&) { FAIL("visited"); });
+        cnda::ContiguousND<int, 2> fe({0, 3});
+        cnda::for_each_index(fe, [](std::size_t, std::size_t, int&) { FAIL("visited"); });
+    }
+}
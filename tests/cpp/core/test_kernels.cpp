@@ -0,0 +1,172 @@
+#include <catch2/catch_test_macros.hpp>
+#include <cnda/aos_types.hpp>
+#include <cnda/kernels.hpp>
+#include <atomic>
+#include <cstdint>
+#include <stdexcept>
+#include <vector>
+
+// Force the parallel path even for the small arrays used here
+struct ParallelScope {
+    std::size_t threads, threshold;
+    ParallelScope(std::size_t n) : threads(cnda::get_num_threads()), threshold(cnda::get_parallel_threshold()) {
+        cnda::set_num_threads(n);
+        cnda::set_parallel_threshold(1);
+    }
+    ~ParallelScope() {
+        cnda::set_num_threads(threads);
+        cnda::set_parallel_threshold(threshold);
+    }
+};
+
+TEST_CASE("ThreadPool runs every task once", "[parallel]") {
+    cnda::ThreadPool pool(4);
+    REQUIRE(pool.size() == 4);
+
+    SECTION("all tasks") {
+        std::vector<int> hits(1000, 0);
+        pool.run(hits.size(), [&](std::size_t i) { hits[i] += 1; });
+        for (int h : hits) REQUIRE(h == 1);
+    }
+
+    SECTION("back-to-back batches") {
+        std::atomic<int> total(0);
+        for (int b = 0; b < 50; ++b) {
+            pool.run(7, [&](std::size_t) { ++total; });
+        }
+        REQUIRE(total == 350);
+    }
+
+    SECTION("nested runs execute inline") {
+        std::atomic<int> total(0);
+        pool.run(4, [&](std::size_t) {
+            pool.run(3, [&](std::size_t) { ++total; });
+        });
+        REQUIRE(total == 12);
+    }
+
+    SECTION("exceptions reach the caller") {
+        REQUIRE_THROWS_AS(pool.run(8, [](std::size_t i) {
+            if (i == 5) throw std::runtime_error("task failed");
+        }), std::runtime_error);
+        std::atomic<int> total(0);
+        pool.run(8, [&](std::size_t) { ++total; });
+        REQUIRE(total == 8);
+    }
+}
+
+TEST_CASE("parallel_for covers the range exactly once", "[parallel]") {
+    ParallelScope scope(3);
+    for (std::size_t n : {std::size_t(1), std::size_t(17), std::size_t(1000)}) {
+        std::vector<int> hits(n, 0);
+        cnda::parallel_for(n, [&](std::size_t b, std::size_t e) {
+            for (std::size_t i = b; i < e; ++i) hits[i] += 1;
+        });
+        for (int h : hits) REQUIRE(h == 1);
+    }
+}
+
+TEST_CASE("element-wise kernels", "[kernels]") {
+    ParallelScope scope(4);
+    cnda::ContiguousND<double> a({40, 30});
+    for (std::size_t i = 0; i < a.size(); ++i) a.data()[i] = static_cast<double>(i);
+
+    SECTION("fill") {
+        cnda::fill(a, 2.5);
+        for (std::size_t i = 0; i < a.size(); ++i) REQUIRE(a.data()[i] == 2.5);
+    }
+
+    SECTION("scale and clip") {
+        cnda::scale(a, 0.5);
+        REQUIRE(a(1, 0) == 15.0);
+        cnda::clip(a, 10.0, 20.0);
+        REQUIRE(a(0, 0) == 10.0);
+        REQUIRE(a(1, 0) == 15.0);
+        REQUIRE(a(39, 29) == 20.0);
+        REQUIRE_THROWS_AS(cnda::clip(a, 1.0, 0.0), std::invalid_argument);
+    }
+
+    SECTION("axpy") {
+        cnda::ContiguousND<double> x = cnda::ContiguousND<double>::full({40, 30}, 1.0);
+        cnda::axpy(a, 3.0, x);
+        REQUIRE(a(0, 0) == 3.0);
+        REQUIRE(a(2, 5) == 68.0);
+        cnda::ContiguousND<double> wrong({30, 40});
+        REQUIRE_THROWS_AS(cnda::axpy(a, 1.0, wrong), std::invalid_argument);
+    }
+
+    SECTION("casting copy") {
+        cnda::ContiguousND<std::int32_t> i32({40, 30});
+        cnda::copy_from(i32, a);
+        REQUIRE(i32(39, 29) == 1199);
+        cnda::ContiguousND<float> f32({40, 30});
+        cnda::copy_from(f32, i32);
+        REQUIRE(f32(1, 1) == 31.0f);
+    }
+
+    SECTION("strided views") {
+        auto v = a.slice({cnda::Range{0, 40, 2}, cnda::Range{1, 30, 3}});
+        REQUIRE_FALSE(v.is_contiguous());
+        cnda::fill(v, -1.0);
+        REQUIRE(a(0, 1) == -1.0);
+        REQUIRE(a(0, 0) == 0.0);
+        REQUIRE(a(1, 1) == 31.0);
+        REQUIRE(a(38, 28) == -1.0);
+
+        cnda::ContiguousND<std::int64_t> packed(v.shape());
+        cnda::copy_from(packed, v);
+        for (std::size_t i = 0; i < packed.size(); ++i) REQUIRE(packed.data()[i] == -1);
+    }
+
+    SECTION("evenly spaced views") {
+        // Every other element of the buffer, as a 20x15 view
+        cnda::ContiguousND<double> v({20, 15}, {30, 2}, a.data(), a.shared_owner());
+        std::size_t step = 0;
+        REQUIRE(cnda::detail::even_step(v, step));
+        REQUIRE(step == 2);
+        REQUIRE_FALSE(cnda::detail::even_step(a.slice({cnda::Range{0, 40, 1}, cnda::Range{0, 20, 2}}), step));
+
+        cnda::scale(v, 2.0);
+        REQUIRE(a(0, 2) == 4.0);
+        REQUIRE(a(0, 3) == 3.0);
+        REQUIRE(a(19, 28) == 2.0 * 598);
+        REQUIRE(a(20, 0) == 600.0);
+        cnda::ContiguousND<double> x = cnda::ContiguousND<double>::full({20, 15}, 1.0);
+        cnda::axpy(v, 1.0, x);
+        REQUIRE(a(1, 0) == 61.0);
+        REQUIRE(a(1, 1) == 31.0);
+    }
+}
+
+TEST_CASE("may_overlap compares memory extents", "[kernels]") {
+    cnda::ContiguousND<double> a({10, 8});
+    cnda::ContiguousND<double> b({10, 8});
+    REQUIRE_FALSE(cnda::may_overlap(a, b));
+    REQUIRE(cnda::may_overlap(a, a));
+
+    auto top = a.slice({cnda::Range{0, 5, 1}, cnda::Range{0, 8, 1}});
+    auto bottom = a.slice({cnda::Range{5, 10, 1}, cnda::Range{0, 8, 1}});
+    auto middle = a.slice({cnda::Range{4, 6, 1}, cnda::Range{0, 8, 1}});
+    REQUIRE_FALSE(cnda::may_overlap(top, bottom));
+    REQUIRE(cnda::may_overlap(top, middle));
+    REQUIRE(cnda::may_overlap(middle, bottom));
+    REQUIRE(cnda::may_overlap(a.transpose(), bottom));
+
+    // Element types may differ; extents are compared in bytes
+    cnda::ContiguousND<float> f({10}, {1}, reinterpret_cast<float*>(a.data() + 75), a.shared_owner());
+    REQUIRE(cnda::may_overlap(f, bottom));
+    REQUIRE_FALSE(cnda::may_overlap(f, top));
+
+    cnda::ContiguousND<double> none({0, 8});
+    REQUIRE_FALSE(cnda::may_overlap(none, a));
+}
+
+TEST_CASE("kernels on AoS elements", "[kernels]") {
+    ParallelScope scope(2);
+    cnda::ContiguousND<cnda::aos::Vec2f> a({64});
+    cnda::aos::Vec2f v = {1.0f, 2.0f};
+    cnda::fill(a, v);
+    cnda::ContiguousND<cnda::aos::Vec2f> b({64});
+    cnda::copy_from(b, a);
+    REQUIRE(b(63).y == 2.0f);
+}
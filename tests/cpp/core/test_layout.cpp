@@ -0,0 +1,108 @@
+#include <catch2/catch_test_macros.hpp>
+#include <cnda/contiguous_nd.hpp>
+#include <cnda/kernels.hpp>
+#include <cnda/layout.hpp>
+#include <cnda/parallel.hpp>
+#include <cstddef>
+#include <stdexcept>
+#include <vector>
+
+using namespace cnda;
+
+// Every element = its row-major position
+static void iota(ContiguousND<int>& a) {
+    int v = 0;
+    for (int& x : a) x = v++;
+}
+
+TEST_CASE("F-ordered arrays and transpose views", "[layout]") {
+    ContiguousND<float> f = ContiguousND<float>::zeros({3, 4, 5}, Order::F);
+    REQUIRE(f.strides() == std::vector<std::size_t>{1, 3, 12});
+    REQUIRE(f.is_f_contiguous());
+    REQUIRE_FALSE(f.is_contiguous());
+    f(2, 1, 3) = 7.0f;
+    REQUIRE(f.data()[2 + 1 * 3 + 3 * 12] == 7.0f);
+
+    ContiguousND<float> t = f.transpose();
+    REQUIRE(t.shape() == std::vector<std::size_t>{5, 4, 3});
+    REQUIRE(t.is_contiguous());
+    REQUIRE(t(3, 1, 2) == 7.0f);
+    REQUIRE(t.data() == f.data());
+    REQUIRE(t.owner() != nullptr);
+
+    ContiguousND<float> p = f.transpose({1, 2, 0});
+    REQUIRE(p.shape() == std::vector<std::size_t>{4, 5, 3});
+    REQUIRE(p.strides() == std::vector<std::size_t>{3, 12, 1});
+    REQUIRE(p(1, 3, 2) == 7.0f);
+    REQUIRE_THROWS_AS(f.transpose({0, 0, 1}), std::invalid_argument);
+    REQUIRE_THROWS_AS(f.transpose({0, 1}), std::invalid_argument);
+    REQUIRE_THROWS_AS(f.transpose({0, 1, 3}), std::invalid_argument);
+
+    // Axes of extent 1 do not affect either contiguity
+    ContiguousND<float> col = ContiguousND<float>::empty({4, 1}, Order::F);
+    REQUIRE(col.is_contiguous());
+    REQUIRE(col.is_f_contiguous());
+}
+
+TEST_CASE("copy_to_layout converts between any two layouts", "[layout]") {
+    // Large enough for several tiles along every axis, with ragged edges
+    const std::size_t n0 = 37, n1 = 70, n2 = 45;
+    ContiguousND<int> c({n0, n1, n2});
+    iota(c);
+
+    SECTION("C to F and back") {
+        ContiguousND<int> f = copy_in_order(c, Order::F);
+        REQUIRE(f.is_f_contiguous());
+        ContiguousND<int> back = copy_in_order(f, Order::C);
+        REQUIRE(back.is_contiguous());
+        for (std::size_t i = 0; i < n0; ++i)
+            for (std::size_t j = 0; j < n1; ++j)
+                for (std::size_t k = 0; k < n2; ++k) {
+                    REQUIRE(f(i, j, k) == c(i, j, k));
+                    REQUIRE(back(i, j, k) == c(i, j, k));
+                }
+    }
+
+    SECTION("Permutations and strided views") {
+        const std::vector<std::vector<std::size_t>> perms = {
+            {0, 1, 2}, {0, 2, 1}, {1, 0, 2}, {1, 2, 0}, {2, 0, 1}, {2, 1, 0}};
+        for (const std::vector<std::size_t>& axes : perms) {
+            ContiguousND<int> view = c.transpose(axes);
+            ContiguousND<int> out(view.shape());
+            copy_to_layout(view, out);
+            ContiguousND<int> f = ContiguousND<int>::empty(view.shape(), Order::F);
+            copy_from(f, view);  // same element type: goes through copy_to_layout
+            std::vector<int> expected(view.begin(), view.end());
+            REQUIRE(std::vector<int>(out.begin(), out.end()) == expected);
+            REQUIRE(std::vector<int>(f.begin(), f.end()) == expected);
+        }
+        ContiguousND<int> sub = c.slice({{1, 36, 2}, {0, 70, 3}, {4, 44, 1}});
+        ContiguousND<int> f = copy_in_order(sub, Order::F);
+        for (std::size_t i = 0; i < sub.shape()[0]; ++i)
+            for (std::size_t j = 0; j < sub.shape()[1]; ++j)
+                for (std::size_t k = 0; k < sub.shape()[2]; ++k)
+                    REQUIRE(f(i, j, k) == c(1 + 2 * i, 3 * j, 4 + k));
+    }
+
+    SECTION("Parallel tiles cover every element once") {
+        struct Scope {
+            std::size_t threads = get_num_threads(), threshold = get_parallel_threshold();
+            Scope() { set_num_threads(3); set_parallel_threshold(1); }
+            ~Scope() { set_num_threads(threads); set_parallel_threshold(threshold); }
+        } scope;
+        ContiguousND<int> f = ContiguousND<int>::full({n0, n1, n2}, -1, Order::F);
+        copy_to_layout(c, f);
+        ContiguousND<int> t(c.transpose().shape());
+        copy_to_layout(c.transpose(), t);
+        for (std::size_t i = 0; i < n0; ++i)
+            for (std::size_t j = 0; j < n1; ++j)
+                for (std::size_t k = 0; k < n2; ++k) {
+                    REQUIRE(f(i, j, k) == c(i, j, k));
+                    REQUIRE(t(k, j, i) == c(i, j, k));
+                }
+    }
+
+    ContiguousND<int> wrong({n0, n2, n1});
+    REQUIRE_THROWS_AS(copy_to_layout(c, wrong), std::invalid_argument);
+    REQUIRE_THROWS_AS(copy_from(wrong, c), std::invalid_argument);
+}
@@ -0,0 +1,165 @@
+#include <catch2/catch_test_macros.hpp>
+#include <cnda/aos_types.hpp>
+#include <cnda/mmap.hpp>
+#include <cstdio>
+#include <cstdint>
+#include <fstream>
+#include <sstream>
+#include <string>
+#include <vector>
+
+template <class T>
+static void write_raw(const std::string& path, const std::vector<T>& values) {
+    std::ofstream out(path.c_str(), std::ios::binary);
+    out.write(reinterpret_cast<const char*>(values.data()),
+              static_cast<std::streamsize>(values.size() * sizeof(T)));
+}
+
+template <class T>
+static std::vector<T> read_raw(const std::string& path, std::size_t n) {
+    std::vector<T> values(n);
+    std::ifstream in(path.c_str(), std::ios::binary);
+    in.read(reinterpret_cast<char*>(values.data()), static_cast<std::streamsize>(n * sizeof(T)));
+    return values;
+}
+
+// Version 1.0 .npy header for `dict`, padded to a multiple of 64 bytes
+static std::string npy_header(std::string dict) {
+    while ((10 + dict.size() + 1) % 64 != 0) dict += ' ';
+    dict += '\n';
+    std::string h("\x93NUMPY\x01\x00", 8);
+    h += static_cast<char>(dict.size() & 0xff);
+    h += static_cast<char>(dict.size() >> 8);
+    return h + dict;
+}
+
+TEST_CASE("open_mmap maps raw files", "[mmap]") {
+    const std::string path = "cnda_test_mmap.bin";
+    write_raw<float>(path, {0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11});
+
+    SECTION("read-only mapping sees the file contents") {
+        auto a = cnda::open_mmap<float>(path, {3, 4});
+        REQUIRE(a.is_view());
+        REQUIRE(a.shape() == std::vector<std::size_t>{3, 4});
+        REQUIRE(a(2, 3) == 11.0f);
+        REQUIRE(cnda::mapped_file_of(a.owner()) != nullptr);
+        REQUIRE(cnda::mapped_file_of(a.owner())->mode() == cnda::MapMode::read_only);
+    }
+
+    SECTION("offset skips leading bytes") {
+        auto a = cnda::open_mmap<float>(path, {2, 2}, cnda::MapMode::read_only, 4 * sizeof(float));
+        REQUIRE(a(0, 0) == 4.0f);
+        REQUIRE(a(1, 1) == 7.0f);
+    }
+
+    SECTION("read-write mapping writes through to the file") {
+        {
+            auto a = cnda::open_mmap<float>(path, {12}, cnda::MapMode::read_write);
+            a(5) = 50.0f;
+            cnda::mapped_file_of(a.owner())->flush();
+        }
+        REQUIRE(read_raw<float>(path, 12)[5] == 50.0f);
+    }
+
+    SECTION("copy-on-write mapping leaves the file alone") {
+        {
+            auto a = cnda::open_mmap<float>(path, {12}, cnda::MapMode::copy_on_write);
+            a(5) = 50.0f;
+            REQUIRE(a(5) == 50.0f);
+        }
+        REQUIRE(read_raw<float>(path, 12)[5] == 5.0f);
+    }
+
+    SECTION("slices keep the mapping alive") {
+        cnda::ContiguousND<float> tail({1});
+        {
+            auto a = cnda::open_mmap<float>(path, {3, 4});
+            cnda::mapped_file_of(a.owner())->advise(cnda::MapAdvice::sequential);
+            tail = a.slice({cnda::Range{2, 3, 1}, cnda::Range{0, 4, 2}});
+        }
+        REQUIRE(tail(0, 1) == 10.0f);
+        REQUIRE(cnda::mapped_file_of(tail.owner()) != nullptr);
+    }
+
+    SECTION("errors") {
+        REQUIRE_THROWS_AS(cnda::open_mmap<float>(path, {13}), std::invalid_argument);
+        REQUIRE_THROWS_AS(cnda::open_mmap<float>(path, {2}, cnda::MapMode::read_only, 2), std::invalid_argument);
+        REQUIRE_THROWS_AS(cnda::open_mmap<float>("cnda_no_such_file.bin", {1}), std::runtime_error);
+    }
+
+    SECTION("empty arrays map nothing") {
+        auto a = cnda::open_mmap<float>(path, {0, 4});
+        REQUIRE(a.size() == 0);
+    }
+
+    std::remove(path.c_str());
+}
+
+TEST_CASE("owners that are not mappings", "[mmap]") {
+    cnda::ContiguousND<int> a({4});
+    REQUIRE(cnda::mapped_file_of(a.owner()) == nullptr);
+    auto buf = std::make_shared<std::vector<int>>(4);
+    cnda::ContiguousND<int> v({4}, buf->data(), buf);
+    REQUIRE(cnda::mapped_file_of(v.owner()) == nullptr);
+}
+
+TEST_CASE("npy header parsing", "[mmap][npy]") {
+    SECTION("scalar descr and shape") {
+        std::istringstream in(npy_header("{'descr': '<f8', 'fortran_order': False, 'shape': (2, 3), }"));
+        cnda::npy::Header h = cnda::npy::read_header(in);
+        REQUIRE(h.descr == "<f8");
+        REQUIRE_FALSE(h.fortran_order);
+        REQUIRE(h.shape == std::vector<std::size_t>{2, 3});
+        REQUIRE(h.data_offset == 128);
+    }
+
+    SECTION("1-D and 0-D shapes") {
+        std::istringstream one(npy_header("{'descr': '<i4', 'fortran_order': True, 'shape': (7,), }"));
+        cnda::npy::Header h = cnda::npy::read_header(one);
+        REQUIRE(h.fortran_order);
+        REQUIRE(h.shape == std::vector<std::size_t>{7});
+
+        std::istringstream zero(npy_header("{'descr': '<i4', 'fortran_order': False, 'shape': (), }"));
+        REQUIRE(cnda::npy::read_header(zero).shape.empty());
+    }
+
+    SECTION("structured descr") {
+        std::istringstream in(npy_header(
+            "{'descr': [('u', '<f4'), ('v', '<f4'), ('flag', '<i4')], 'fortran_order': False, 'shape': (4,), }"));
+        cnda::npy::Header h = cnda::npy::read_header(in);
+        REQUIRE(cnda::npy::descr_matches<cnda::aos::Cell2D>(h.descr));
+        REQUIRE_FALSE(cnda::npy::descr_matches<cnda::aos::Vec3f>(h.descr));
+        REQUIRE(h.shape == std::vector<std::size_t>{4});
+    }
+
+    SECTION("not a .npy file") {
+        std::istringstream in("plain text, not an array");
+        REQUIRE_THROWS_AS(cnda::npy::read_header(in), std::runtime_error);
+    }
+}
+
+TEST_CASE("descr strings", "[npy]") {
+    if (!cnda::npy::detail::host_is_little_endian()) return;
+    REQUIRE(cnda::npy::descr<float>() == "<f4");
+    REQUIRE(cnda::npy::descr<double>() == "<f8");
+    REQUIRE(cnda::npy::descr<std::int32_t>() == "<i4");
+    REQUIRE(cnda::npy::descr<std::int64_t>() == "<i8");
+    REQUIRE(cnda::npy::descr<cnda::aos::Vec2f>() == "[('x', '<f4'), ('y', '<f4')]");
+}
+
+TEST_CASE("open_npy_mmap", "[mmap][npy]") {
+    const std::string path = "cnda_test_mmap.npy";
+    {
+        std::ofstream out(path.c_str(), std::ios::binary);
+        out << npy_header("{'descr': '<i8', 'fortran_order': False, 'shape': (2, 2), }");
+        const std::int64_t values[4] = {1, 2, 3, 4};
+        out.write(reinterpret_cast<const char*>(values), sizeof(values));
+    }
+
+    auto a = cnda::open_npy_mmap<std::int64_t>(path);
+    REQUIRE(a.shape() == std::vector<std::size_t>{2, 2});
+    REQUIRE(a(1, 0) == 3);
+    REQUIRE_THROWS_AS(cnda::open_npy_mmap<double>(path), std::invalid_argument);
+
+    std::remove(path.c_str());
+}
@@ -0,0 +1,104 @@
+#include <catch2/catch_test_macros.hpp>
+#include <cnda/contiguous_nd.hpp>
+#include <cnda/morton.hpp>
+#include <cnda/parallel.hpp>
+#include <algorithm>
+#include <cstddef>
+#include <cstdint>
+#include <set>
+#include <stdexcept>
+#include <vector>
+
+using namespace cnda;
+
+TEST_CASE("Morton codes interleave index bits", "[morton]") {
+    REQUIRE(morton::encode(0u, 0u) == 0);
+    REQUIRE(morton::encode(0u, 1u) == 1);
+    REQUIRE(morton::encode(1u, 0u) == 2);
+    REQUIRE(morton::encode(3u, 5u) == 0x1bu);       // i=011, j=101 -> 01 10 11
+    REQUIRE(morton::encode(1u, 0u, 0u) == 4);
+    REQUIRE(morton::encode(0u, 1u, 1u) == 3);
+    REQUIRE(morton::encode(7u, 0u, 0u) == 0x124u);
+
+    const std::uint32_t samples[] = {0u, 1u, 2u, 1000u, 65535u, 1u << 20, (1u << 21) - 1};
+    for (std::uint32_t i : samples)
+        for (std::uint32_t j : samples)
+            for (std::uint32_t k : samples) {
+                std::uint32_t a, b, c;
+                morton::decode(morton::encode(i, j, k), a, b, c);
+                REQUIRE((a == i && b == j && c == k));
+                morton::decode(morton::encode(i, j), a, b);
+                REQUIRE((a == i && b == j));
+            }
+    std::uint32_t a, b;
+    morton::decode(morton::encode(0xffffffffu, 0x12345678u), a, b);
+    REQUIRE((a == 0xffffffffu && b == 0x12345678u));
+}
+
+TEST_CASE("MortonArray maps every cell to its own slot", "[morton]") {
+    // Shapes that are not multiples of the brick side
+    MortonArray<int, 3> m({9, 10, 17});
+    REQUIRE(m.size() == 9 * 10 * 17);
+    REQUIRE(m.storage_size() == 16 * 16 * 24);
+    std::set<std::size_t> seen;
+    for (std::size_t i = 0; i < 9; ++i)
+        for (std::size_t j = 0; j < 10; ++j)
+            for (std::size_t k = 0; k < 17; ++k) {
+                const std::size_t off = m.offset(i, j, k);
+                REQUIRE(off < m.storage_size());
+                REQUIRE(seen.insert(off).second);
+            }
+    // Inside a brick, the offset is the Morton code of the local index
+    REQUIRE(m.offset(3, 5, 6) == morton::encode(3u, 5u, 6u));
+    REQUIRE(m.offset(0, 0, 8) == MortonArray<int, 3>::brick_size);
+    m(8, 9, 16) = 42;
+    REQUIRE(m(8, 9, 16) == 42);
+
+    MortonArray<float, 2> p({20, 33});
+    REQUIRE(p.offset(15, 15) == 255);
+    REQUIRE(p.offset(16, 0) == 3 * 256);            // 3 bricks per brick row
+}
+
+TEST_CASE("MortonArray converts to and from row-major arrays", "[morton]") {
+    ContiguousND<double> src({13, 7, 20});
+    double v = 0;
+    for (double& x : src) x = v++;
+
+    MortonArray<double, 3> m = MortonArray<double, 3>::from(src);
+    for (std::size_t i = 0; i < 13; ++i)
+        for (std::size_t j = 0; j < 7; ++j)
+            for (std::size_t k = 0; k < 20; ++k) REQUIRE(m(i, j, k) == src(i, j, k));
+
+    ContiguousND<double> back = m.to_contiguous();
+    REQUIRE(back.shape() == src.shape());
+    REQUIRE(std::equal(back.begin(), back.end(), src.begin()));
+
+    SECTION("Strided views and several threads") {
+        struct Scope {
+            std::size_t threads = get_num_threads(), threshold = get_parallel_threshold();
+            Scope() { set_num_threads(3); set_parallel_threshold(1); }
+            ~Scope() { set_num_threads(threads); set_parallel_threshold(threshold); }
+        } scope;
+        ContiguousND<double> t = src.transpose();   // 20 x 7 x 13
+        MortonArray<double, 3> mt = MortonArray<double, 3>::from(t);
+        REQUIRE(mt(19, 6, 12) == src(12, 6, 19));
+        ContiguousND<double> dst = ContiguousND<double>::zeros({20, 7, 13}, Order::F);
+        mt.copy_to(dst);
+        for (std::size_t i = 0; i < 20; ++i)
+            for (std::size_t j = 0; j < 7; ++j)
+                for (std::size_t k = 0; k < 13; ++k) REQUIRE(dst(i, j, k) == src(k, j, i));
+    }
+
+    ContiguousND<float> img({5, 40});
+    float f = 0;
+    for (float& x : img) x = f++;
+    MortonArray<float, 2> m2 = MortonArray<float, 2>::from(img);
+    REQUIRE(m2(4, 39) == 199.0f);
+    ContiguousND<float> img_back = m2.to_contiguous();
+    REQUIRE(std::equal(img_back.begin(), img_back.end(), img.begin()));
+
+    ContiguousND<double> wrong({13, 7, 21});
+    REQUIRE_THROWS_AS(m.copy_from(wrong), std::invalid_argument);
+    REQUIRE_THROWS_AS(m.copy_to(wrong), std::invalid_argument);
+    REQUIRE_THROWS_AS((MortonArray<float, 3>::from(img)), std::invalid_argument);
+}
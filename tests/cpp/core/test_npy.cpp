@@ -0,0 +1,133 @@
+#include <catch2/catch_test_macros.hpp>
+#include <cnda/aos_types.hpp>
+#include <cnda/npy.hpp>
+#include <cstdio>
+#include <cstdint>
+#include <sstream>
+#include <string>
+#include <vector>
+
+TEST_CASE("header_bytes round-trips through read_header", "[npy]") {
+    SECTION("scalar dtype") {
+        const std::string h = cnda::npy::header_bytes("<f4", {3, 4});
+        REQUIRE(h.size() % 64 == 0);
+        std::istringstream in(h);
+        cnda::npy::Header parsed = cnda::npy::read_header(in);
+        REQUIRE(parsed.descr == "<f4");
+        REQUIRE(parsed.shape == std::vector<std::size_t>{3, 4});
+        REQUIRE(parsed.data_offset == h.size());
+    }
+
+    SECTION("1-D, 0-D and structured") {
+        std::istringstream one(cnda::npy::header_bytes("<i8", {7}));
+        REQUIRE(cnda::npy::read_header(one).shape == std::vector<std::size_t>{7});
+
+        std::istringstream zero(cnda::npy::header_bytes("<i8", {}));
+        REQUIRE(cnda::npy::read_header(zero).shape.empty());
+
+        const std::string d = cnda::npy::descr<cnda::aos::Cell3D>();
+        std::istringstream rec(cnda::npy::header_bytes(d, {2, 2}));
+        REQUIRE(cnda::npy::descr_matches<cnda::aos::Cell3D>(cnda::npy::read_header(rec).descr));
+    }
+}
+
+TEST_CASE("save and load", "[npy]") {
+    const std::string path = "cnda_test_npy.npy";
+
+    SECTION("contiguous array, one write or in chunks") {
+        cnda::ContiguousND<double> a({5, 7});
+        for (std::size_t i = 0; i < a.size(); ++i) a.data()[i] = 0.5 * static_cast<double>(i);
+
+        for (std::size_t chunk : {std::size_t(0), std::size_t(24), std::size_t(1)}) {
+            cnda::npy::save(path, a, chunk);
+            auto b = cnda::npy::load<double>(path, chunk);
+            REQUIRE(b.shape() == a.shape());
+            REQUIRE_FALSE(b.is_view());
+            for (std::size_t i = 0; i < a.size(); ++i) REQUIRE(b.data()[i] == a.data()[i]);
+        }
+    }
+
+    SECTION("strided views are written in row-major order") {
+        cnda::ContiguousND<std::int32_t> a({4, 6});
+        for (std::size_t i = 0; i < a.size(); ++i) a.data()[i] = static_cast<std::int32_t>(i);
+        auto v = a.slice({cnda::Range{1, 4, 2}, cnda::Range{0, 6, 3}});
+        REQUIRE_FALSE(v.is_contiguous());
+
+        cnda::npy::save(path, v, sizeof(std::int32_t));
+        auto b = cnda::npy::load<std::int32_t>(path);
+        REQUIRE(b.shape() == std::vector<std::size_t>{2, 2});
+        REQUIRE(b(0, 0) == 6);
+        REQUIRE(b(0, 1) == 9);
+        REQUIRE(b(1, 0) == 18);
+        REQUIRE(b(1, 1) == 21);
+    }
+
+    SECTION("AoS structs") {
+        cnda::ContiguousND<cnda::aos::Particle> a({3});
+        a(1).mass = 2.5;
+        a(2).vz = -1.0;
+        cnda::npy::save(path, a);
+        REQUIRE(cnda::npy::read_header(path).descr == cnda::npy::descr<cnda::aos::Particle>());
+        auto b = cnda::npy::load<cnda::aos::Particle>(path);
+        REQUIRE(b(1).mass == 2.5);
+        REQUIRE(b(2).vz == -1.0);
+    }
+
+    SECTION("empty arrays") {
+        cnda::ContiguousND<float> a({0, 3});
+        cnda::npy::save(path, a);
+        auto b = cnda::npy::load<float>(path);
+        REQUIRE(b.shape() == std::vector<std::size_t>{0, 3});
+    }
+
+    SECTION("dtype mismatch") {
+        cnda::npy::save(path, cnda::ContiguousND<float>({2}));
+        REQUIRE_THROWS_AS(cnda::npy::load<double>(path), std::invalid_argument);
+    }
+
+    std::remove(path.c_str());
+}
+
+TEST_CASE("Writer streams pieces", "[npy]") {
+    const std::string path = "cnda_test_writer.npy";
+
+    SECTION("pieces add up to the shape") {
+        cnda::npy::Writer<float> w(path, {2, 3});
+        const float first[2] = {1, 2};
+        const float rest[4] = {3, 4, 5, 6};
+        w.write(first, 2);
+        REQUIRE(w.remaining() == 4);
+        w.write(rest, 4);
+        w.close();
+
+        auto b = cnda::npy::load<float>(path);
+        REQUIRE(b(1, 2) == 6.0f);
+    }
+
+    SECTION("too many or too few elements") {
+        cnda::npy::Writer<float> w(path, {2});
+        const float v[3] = {1, 2, 3};
+        REQUIRE_THROWS_AS(w.write(v, 3), std::invalid_argument);
+        w.write(v, 1);
+        REQUIRE_THROWS_AS(w.close(), std::invalid_argument);
+    }
+
+    SECTION("unwritable path") {
+        REQUIRE_THROWS_AS(cnda::npy::Writer<float>("no_such_dir/x.npy", {1}), std::runtime_error);
+    }
+
+    std::remove(path.c_str());
+}
+
+TEST_CASE("load errors", "[npy]") {
+    REQUIRE_THROWS_AS(cnda::npy::load<float>("cnda_no_such_file.npy"), std::runtime_error);
+
+    const std::string path = "cnda_test_truncated.npy";
+    {
+        std::ofstream out(path.c_str(), std::ios::binary);
+        out << cnda::npy::header_bytes("<f4", {100});
+        out << "short";
+    }
+    REQUIRE_THROWS_AS(cnda::npy::load<float>(path), std::runtime_error);
+    std::remove(path.c_str());
+}
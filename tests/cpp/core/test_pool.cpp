@@ -0,0 +1,152 @@
+#include <catch2/catch_test_macros.hpp>
+#include <cnda/contiguous_nd.hpp>
+#include <cnda/fixed_rank.hpp>
+#include <cnda/pool.hpp>
+#include <cstdint>
+#include <memory>
+#include <thread>
+#include <vector>
+
+// Upstream allocator that counts live blocks
+struct CountingAllocator : cnda::Allocator {
+    std::size_t live = 0, total = 0;
+    void* allocate(std::size_t bytes, std::size_t alignment) override {
+        ++live;
+        ++total;
+        return cnda::aligned_allocate(bytes, alignment);
+    }
+    void deallocate(void* p, std::size_t, std::size_t) noexcept override {
+        --live;
+        cnda::aligned_free(p);
+    }
+};
+
+TEST_CASE("size classes", "[pool]") {
+    REQUIRE(cnda::BufferPool::size_class(1) == 64);
+    REQUIRE(cnda::BufferPool::size_class(64) == 64);
+    REQUIRE(cnda::BufferPool::size_class(65) == 80);
+    REQUIRE(cnda::BufferPool::size_class(4096) == 4096);
+    REQUIRE(cnda::BufferPool::size_class(5000) == 5120);
+    for (std::size_t b = 1; b < 100000; b = b * 3 + 1) {
+        const std::size_t c = cnda::BufferPool::size_class(b);
+        REQUIRE(c >= b);
+        REQUIRE(c <= b + b / 4 + 64);
+    }
+}
+
+TEST_CASE("arrays reuse pooled buffers", "[pool]") {
+    auto upstream = std::make_shared<CountingAllocator>();
+    auto pool = std::make_shared<cnda::BufferPool>(1 << 20, upstream);
+
+    const double* first;
+    {
+        cnda::ContiguousND<double> a({32, 32}, cnda::default_alignment, pool);
+        first = a.data();
+        a(1, 1) = 5.0;
+    }
+    REQUIRE(pool->stats().bytes_held == 8192);
+    REQUIRE(upstream->live == 1);
+
+    SECTION("same size class and alignment hits") {
+        auto b = cnda::ContiguousND<double>::empty({30, 33}, cnda::default_alignment, pool);
+        REQUIRE(b.data() == first);
+        auto z = cnda::ContiguousND<double>::zeros({32, 32}, cnda::default_alignment, pool);
+        REQUIRE(z(1, 1) == 0.0);
+        const cnda::PoolStats s = pool->stats();
+        REQUIRE(s.hits == 1);
+        REQUIRE(s.misses == 2);
+        REQUIRE(s.bytes_in_use == 2 * 8192);
+        REQUIRE(s.bytes_held == 0);
+    }
+
+    SECTION("a different alignment misses") {
+        auto b = cnda::ContiguousND<double>::empty({32, 32}, 4096, pool);
+        REQUIRE(reinterpret_cast<std::uintptr_t>(b.data()) % 4096 == 0);
+        REQUIRE(pool->stats().hits == 0);
+    }
+
+    SECTION("fixed-rank arrays and views") {
+        std::unique_ptr<cnda::ContiguousND<double>> view;
+        {
+            cnda::ContiguousND<double, 2> f({32, 32}, cnda::default_alignment, pool);
+            REQUIRE(f.data() == first);
+            view.reset(new cnda::ContiguousND<double>(cnda::as_dynamic(f)));
+        }
+        // The view still holds the buffer
+        REQUIRE(pool->stats().bytes_in_use == 8192);
+        view.reset();
+        REQUIRE(pool->stats().bytes_held == 8192);
+    }
+
+    SECTION("trim and destruction return everything upstream") {
+        pool->trim();
+        REQUIRE(upstream->live == 0);
+        {
+            cnda::ContiguousND<float> c({100}, cnda::default_alignment, pool);
+            pool.reset();  // the array keeps the pool alive
+            c(99) = 1.0f;
+        }
+        REQUIRE(upstream->live == 0);
+    }
+}
+
+TEST_CASE("idle blocks are evicted least recently used first", "[pool]") {
+    auto upstream = std::make_shared<CountingAllocator>();
+    auto pool = std::make_shared<cnda::BufferPool>(3 * 4096, upstream);
+
+    std::vector<cnda::ContiguousND<char>> arrays;
+    for (std::size_t i = 0; i < 4; ++i) arrays.push_back(cnda::ContiguousND<char>({4096}, 64, pool));
+    const char* oldest = arrays[0].data();
+    const char* newest = arrays[3].data();
+    arrays.clear();  // released in order 0..3; the fourth exceeds the cap
+
+    cnda::PoolStats s = pool->stats();
+    REQUIRE(s.bytes_held == 3 * 4096);
+    REQUIRE(s.evictions == 1);
+    REQUIRE(upstream->live == 3);
+
+    cnda::ContiguousND<char> again({4096}, 64, pool);
+    REQUIRE(again.data() == newest);
+    REQUIRE(again.data() != oldest);
+
+    pool->set_capacity(4096);
+    REQUIRE(pool->stats().bytes_held == 4096);
+    REQUIRE(upstream->live == 2);
+
+    // Blocks larger than the cap are never kept
+    { cnda::ContiguousND<char> big({8192}, 64, pool); }
+    REQUIRE(pool->stats().bytes_held == 4096);
+    REQUIRE(upstream->live == 2);
+}
+
+TEST_CASE("default allocator", "[pool]") {
+    auto pool = std::make_shared<cnda::BufferPool>();
+    cnda::set_default_allocator(pool);
+    {
+        cnda::ContiguousND<int> a({256});
+        REQUIRE(pool->stats().bytes_in_use == 1024);
+    }
+    cnda::set_default_allocator(nullptr);
+    cnda::ContiguousND<int> b({256});
+    REQUIRE(pool->stats().hits == 0);
+    REQUIRE(pool->stats().bytes_in_use == 0);
+    REQUIRE(pool->stats().bytes_held == 1024);
+}
+
+TEST_CASE("the pool is thread-safe", "[pool]") {
+    auto pool = std::make_shared<cnda::BufferPool>(64 * 1024);
+    std::vector<std::thread> threads;
+    for (int t = 0; t < 4; ++t) {
+        threads.push_back(std::thread([pool, t] {
+            for (std::size_t i = 0; i < 500; ++i) {
+                cnda::ContiguousND<float> a({16 + (i + t) % 7 * 16}, cnda::default_alignment, pool);
+                a(0) = 1.0f;
+            }
+        }));
+    }
+    for (std::thread& th : threads) th.join();
+    const cnda::PoolStats s = pool->stats();
+    REQUIRE(s.hits + s.misses == 2000);
+    REQUIRE(s.bytes_in_use == 0);
+    REQUIRE(s.bytes_held <= s.capacity);
+}
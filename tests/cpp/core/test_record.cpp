@@ -0,0 +1,103 @@
+#include <catch2/catch_test_macros.hpp>
+#include <cnda/record.hpp>
+#include <cstdint>
+#include <cstring>
+#include <memory>
+#include <vector>
+
+// A 9-field production-style record: mixed f4/f8/i2 with a packed layout
+static std::shared_ptr<const cnda::RecordLayout> mixed_layout() {
+    std::vector<cnda::RecordField> f = {
+        {"rho", 0, 8, 'f'}, {"u", 8, 4, 'f'}, {"v", 12, 4, 'f'}, {"w", 16, 4, 'f'},
+        {"p", 20, 4, 'f'}, {"e", 24, 8, 'f'}, {"phase", 32, 2, 'i'}, {"mat", 34, 2, 'i'},
+        {"tag", 36, 4, 'V'}};
+    return std::make_shared<cnda::RecordLayout>(std::move(f), 40);
+}
+
+TEST_CASE("RecordLayout validates its fields", "[record]") {
+    auto layout = mixed_layout();
+    REQUIRE(layout->itemsize() == 40);
+    REQUIRE(layout->num_fields() == 9);
+    REQUIRE(layout->find("phase")->offset == 32);
+    REQUIRE(layout->find("nope") == nullptr);
+
+    auto cell = cnda::RecordLayout::of<cnda::aos::Cell2D>();
+    REQUIRE(cell.itemsize() == sizeof(cnda::aos::Cell2D));
+    REQUIRE(cell.find("flag")->kind == 'i');
+
+    REQUIRE_THROWS_AS(cnda::RecordLayout({{"a", 4, 8, 'f'}}, 8), std::invalid_argument);
+    REQUIRE_THROWS_AS(cnda::RecordLayout({{"a", 0, 4, 'f'}, {"a", 4, 4, 'f'}}, 8), std::invalid_argument);
+    REQUIRE_THROWS_AS(cnda::RecordLayout({}, 0), std::invalid_argument);
+}
+
+TEST_CASE("RecordArray stores zeroed records with byte strides", "[record]") {
+    cnda::RecordArray a({3, 4}, mixed_layout());
+    REQUIRE(a.size() == 12);
+    REQUIRE(a.itemsize() == 40);
+    REQUIRE(a.strides() == std::vector<std::size_t>({160, 40}));
+    REQUIRE(a.is_contiguous());
+    REQUIRE_FALSE(a.is_view());
+    for (std::size_t i = 0; i < a.size() * a.itemsize(); ++i) REQUIRE(a.data()[i] == 0);
+
+    std::int16_t phase = 7;
+    std::memcpy(a.record({2, 2}) + 32, &phase, 2);
+    REQUIRE_THROWS_AS(a.record({3, 0}), std::out_of_range);
+    REQUIRE_THROWS_AS(a.record({0}), std::invalid_argument);
+
+    SECTION("field views") {
+        cnda::ContiguousND<double> rho = a.field<double>("rho");
+        REQUIRE(rho.strides() == std::vector<std::size_t>({20, 5}));
+        rho(1, 2) = 2.5;
+        double got = 0;
+        std::memcpy(&got, a.record({1, 2}), 8);
+        REQUIRE(got == 2.5);
+
+        cnda::ContiguousND<std::int16_t> ph = a.field<std::int16_t>("phase");
+        REQUIRE(ph(2, 2) == 7);
+        REQUIRE(ph.shared_owner() == a.rows().shared_owner());
+
+        REQUIRE_THROWS_AS(a.field<float>("rho"), std::invalid_argument);
+        REQUIRE_THROWS_AS(a.field<float>("tag"), std::invalid_argument);
+        REQUIRE_THROWS_AS(a.field<float>("nope"), std::invalid_argument);
+        // 6-byte records are not a whole number of floats apart
+        cnda::RecordArray odd({2}, std::make_shared<cnda::RecordLayout>(
+            std::vector<cnda::RecordField>{{"x", 0, 4, 'f'}}, 6));
+        REQUIRE_THROWS_AS(odd.field<float>("x"), std::invalid_argument);
+    }
+
+    SECTION("slices share the records") {
+        cnda::RecordArray s = a.slice({{1, 3, 1}, {0, 4, 2}});
+        REQUIRE(s.is_view());
+        REQUIRE_FALSE(s.is_contiguous());
+        REQUIRE(s.shape() == std::vector<std::size_t>({2, 2}));
+        REQUIRE(s.strides() == std::vector<std::size_t>({160, 80}));
+        REQUIRE(s.field<std::int16_t>("phase")(1, 1) == 7);
+    }
+
+    SECTION("bulk take and put of whole records") {
+        std::vector<unsigned char> rec(40, 0xAB);
+        const std::int64_t where[] = {0, 2, 2, 3};
+        a.put(where, 2, false, rec.data(), 1);
+        std::vector<unsigned char> out(3 * 40);
+        const std::int64_t flat[] = {2, 15, 0};
+        REQUIRE_THROWS_AS(a.take(flat, 3, true, out.data()), std::out_of_range);
+        const std::int64_t ok[] = {2, 11, 0};
+        a.take(ok, 3, true, out.data());
+        REQUIRE(out[0] == 0xAB);
+        REQUIRE(out[40 + 39] == 0xAB);
+        REQUIRE(out[80] == 0);
+        REQUIRE_THROWS_AS(a.put(ok, 3, true, rec.data(), 2), std::invalid_argument);
+    }
+}
+
+TEST_CASE("RecordArray views external records", "[record]") {
+    auto buf = std::make_shared<std::vector<cnda::aos::Cell2D>>(6);
+    for (std::size_t i = 0; i < 6; ++i) (*buf)[i].flag = static_cast<std::int32_t>(i);
+    auto layout = std::make_shared<cnda::RecordLayout>(cnda::RecordLayout::of<cnda::aos::Cell2D>());
+    cnda::RecordArray a({3}, {24}, buf->data(), buf, layout);
+    REQUIRE(a.is_view());
+    REQUIRE_FALSE(a.is_contiguous());
+    cnda::ContiguousND<std::int32_t> flag = a.field<std::int32_t>("flag");
+    REQUIRE(flag(2) == 4);
+    REQUIRE(flag.owner() == buf);
+}
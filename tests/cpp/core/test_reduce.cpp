@@ -0,0 +1,184 @@
+#include <catch2/catch_test_macros.hpp>
+#include <catch2/catch_approx.hpp>
+#include <cnda/aos_types.hpp>
+#include <cnda/field_view.hpp>
+#include <cnda/reduce.hpp>
+#include <cmath>
+#include <cstdint>
+#include <limits>
+#include <vector>
+
+using Catch::Approx;
+
+// Force the parallel path even for the small arrays used here
+struct ParallelScope {
+    std::size_t threads, threshold;
+    ParallelScope(std::size_t n) : threads(cnda::get_num_threads()), threshold(cnda::get_parallel_threshold()) {
+        cnda::set_num_threads(n);
+        cnda::set_parallel_threshold(1);
+    }
+    ~ParallelScope() {
+        cnda::set_num_threads(threads);
+        cnda::set_parallel_threshold(threshold);
+    }
+};
+
+// a(i, j, k) = 100 i + 10 j + k
+static cnda::ContiguousND<double> ramp(std::size_t n0, std::size_t n1, std::size_t n2) {
+    cnda::ContiguousND<double> a({n0, n1, n2});
+    for (std::size_t i = 0; i < n0; ++i)
+        for (std::size_t j = 0; j < n1; ++j)
+            for (std::size_t k = 0; k < n2; ++k)
+                a(i, j, k) = 100.0 * i + 10.0 * j + k;
+    return a;
+}
+
+TEST_CASE("full reductions", "[reduce]") {
+    ParallelScope scope(4);
+    auto a = ramp(3, 4, 5);
+
+    REQUIRE(cnda::sum(a) == Approx(3 * 20 * 100.0 + 3 * 5 * 60.0 + 12 * 10.0));
+    REQUIRE(cnda::mean(a) == Approx(cnda::sum(a) / 60.0));
+    REQUIRE(cnda::amin(a) == 0.0);
+    REQUIRE(cnda::amax(a) == 234.0);
+    REQUIRE(cnda::argmax(a) == 59);
+
+    SECTION("every summation mode") {
+        for (cnda::Summation m : {cnda::Summation::naive, cnda::Summation::pairwise, cnda::Summation::kahan}) {
+            REQUIRE(cnda::sum(a, m) == Approx(cnda::sum(a)));
+        }
+    }
+
+    SECTION("strided views") {
+        auto v = a.slice({cnda::Range{0, 3, 2}, cnda::Range{1, 4, 2}, cnda::Range{0, 5, 4}});
+        REQUIRE_FALSE(v.is_contiguous());
+        // elements: i in {0, 2}, j in {1, 3}, k in {0, 4}
+        REQUIRE(cnda::sum(v) == Approx(4 * 200.0 + 4 * 40.0 + 4 * 4.0));
+        REQUIRE(cnda::amax(v) == 234.0);
+        REQUIRE(cnda::amin(v) == 10.0);
+        REQUIRE(cnda::argmax(v) == 7);
+    }
+
+    SECTION("integers sum into int64") {
+        cnda::ContiguousND<std::int32_t> big = cnda::ContiguousND<std::int32_t>::full({1000}, 3000000);
+        const std::int64_t s = cnda::sum(big);
+        REQUIRE(s == 3000000000LL);
+    }
+}
+
+TEST_CASE("axis reductions", "[reduce]") {
+    ParallelScope scope(3);
+    auto a = ramp(3, 4, 5);
+
+    SECTION("sum along each axis") {
+        for (cnda::Summation m : {cnda::Summation::naive, cnda::Summation::pairwise, cnda::Summation::kahan}) {
+            auto s0 = cnda::sum(a, 0, m);
+            REQUIRE(s0.shape() == std::vector<std::size_t>{4, 5});
+            REQUIRE(s0(2, 3) == Approx(300.0 + 3 * 23.0));
+
+            auto s1 = cnda::sum(a, 1, m);
+            REQUIRE(s1.shape() == std::vector<std::size_t>{3, 5});
+            REQUIRE(s1(1, 4) == Approx(4 * 104.0 + 60.0));
+
+            auto s2 = cnda::sum(a, 2, m);
+            REQUIRE(s2.shape() == std::vector<std::size_t>{3, 4});
+            REQUIRE(s2(2, 1) == Approx(5 * 210.0 + 10.0));
+        }
+    }
+
+    SECTION("extrema, argmax and mean") {
+        auto mn = cnda::amin(a, 1);
+        REQUIRE(mn(2, 3) == 203.0);
+        auto mx = cnda::amax(a, 0);
+        REQUIRE(mx(1, 1) == 211.0);
+        auto am = cnda::argmax(a, 2);
+        REQUIRE(am(0, 0) == 4);
+        auto am0 = cnda::argmax(a, 0);
+        REQUIRE(am0(3, 3) == 2);
+        auto me = cnda::mean(a, 2);
+        REQUIRE(me(1, 2) == Approx(122.0));
+    }
+
+    SECTION("strided views") {
+        auto v = a.slice({cnda::Range{0, 3, 1}, cnda::Range{0, 4, 3}});
+        auto s = cnda::sum(v, 0);
+        REQUIRE(s.shape() == std::vector<std::size_t>{2, 5});
+        REQUIRE(s(1, 2) == Approx(300.0 + 90.0 + 6.0));
+        auto m = cnda::amax(v, 1);
+        REQUIRE(m(2, 4) == 234.0);
+    }
+
+    SECTION("wide rows span several column blocks") {
+        cnda::ContiguousND<float> w({7, 600});
+        for (std::size_t i = 0; i < 7; ++i)
+            for (std::size_t j = 0; j < 600; ++j) w(i, j) = static_cast<float>(i == 3 ? j : 0);
+        auto s = cnda::sum(w, 0);
+        auto am = cnda::argmax(w, 0);
+        for (std::size_t j = 1; j < 600; ++j) {
+            REQUIRE(s(j) == static_cast<float>(j));
+            REQUIRE(am(j) == 3);
+        }
+    }
+
+    SECTION("errors") {
+        REQUIRE_THROWS_AS(cnda::sum(a, 3), std::out_of_range);
+        cnda::ContiguousND<double> e({2, 0});
+        REQUIRE(cnda::sum(e, 1)(1) == 0.0);
+        REQUIRE_THROWS_AS(cnda::amax(e, 1), std::invalid_argument);
+        REQUIRE_THROWS_AS(cnda::amin(e), std::invalid_argument);
+        REQUIRE(cnda::sum(e) == 0.0);
+    }
+}
+
+TEST_CASE("NaN handling follows NumPy", "[reduce]") {
+    const double nan = std::numeric_limits<double>::quiet_NaN();
+    cnda::ContiguousND<double> a({2, 3});
+    a(0, 0) = 1.0; a(0, 1) = nan; a(0, 2) = 5.0;
+    a(1, 0) = 9.0; a(1, 1) = 2.0; a(1, 2) = 3.0;
+
+    REQUIRE(std::isnan(cnda::amax(a)));
+    REQUIRE(std::isnan(cnda::amin(a)));
+    REQUIRE(cnda::argmax(a) == 1);
+    auto mx = cnda::amax(a, 1);
+    REQUIRE(std::isnan(mx(0)));
+    REQUIRE(mx(1) == 9.0);
+    auto am = cnda::argmax(a, 0);
+    REQUIRE(am(0) == 1);
+    REQUIRE(am(1) == 0);
+}
+
+TEST_CASE("pairwise and Kahan beat naive float summation", "[reduce]") {
+    cnda::ContiguousND<float> a = cnda::ContiguousND<float>::full({1 << 22}, 0.1f);
+    const double exact = 0.1f * static_cast<double>(1 << 22);
+    const double naive = cnda::sum(a, cnda::Summation::naive);
+    const double pairwise = cnda::sum(a, cnda::Summation::pairwise);
+    const double kahan = cnda::sum(a, cnda::Summation::kahan);
+    REQUIRE(std::fabs(pairwise - exact) < std::fabs(naive - exact));
+    REQUIRE(std::fabs(kahan - exact) < std::fabs(naive - exact));
+    REQUIRE(std::fabs(kahan - exact) / exact < 1e-6);
+}
+
+TEST_CASE("per-field reductions through field_view", "[reduce][aos]") {
+    cnda::ContiguousND<cnda::aos::Particle> p({4, 3});
+    for (std::size_t i = 0; i < 4; ++i)
+        for (std::size_t j = 0; j < 3; ++j) {
+            p(i, j).mass = static_cast<double>(i * 3 + j);
+            p(i, j).x = -1.0;
+        }
+
+    auto mass = cnda::field_view(p, &cnda::aos::Particle::mass);
+    REQUIRE(mass.shape() == p.shape());
+    REQUIRE(mass.owner() != nullptr);
+    REQUIRE(cnda::sum(mass) == 66.0);
+    REQUIRE(cnda::argmax(mass) == 11);
+    auto col = cnda::sum(mass, 0);
+    REQUIRE(col(1) == 22.0);
+    REQUIRE(cnda::amax(cnda::field_view(p, &cnda::aos::Particle::x)) == -1.0);
+
+    mass(0, 0) = 42.0;
+    REQUIRE(p(0, 0).mass == 42.0);
+
+    cnda::ContiguousND<cnda::aos::Cell2D> cells({5});
+    cells(3).flag = 7;
+    REQUIRE(cnda::amax(cnda::field_view(cells, &cnda::aos::Cell2D::flag)) == 7);
+}
@@ -0,0 +1,98 @@
+#include <catch2/catch_test_macros.hpp>
+#include <cnda/contiguous_nd.hpp>
+#include <cnda/layout.hpp>
+#include <cstddef>
+#include <stdexcept>
+#include <vector>
+
+using namespace cnda;
+
+// Every element = its row-major position
+static ContiguousND<int> iota(const Extents& shape) {
+    ContiguousND<int> a(shape);
+    int v = 0;
+    for (int& x : a) x = v++;
+    return a;
+}
+
+TEST_CASE("reshape of contiguous arrays is a view", "[reshape]") {
+    ContiguousND<int> a = iota({2, 3, 4});
+    ContiguousND<int> r = a.reshape({4, 6});
+    REQUIRE(r.shape() == std::vector<std::size_t>{4, 6});
+    REQUIRE(r.is_contiguous());
+    REQUIRE(r.data() == a.data());
+    REQUIRE(r.owner() != nullptr);  // shares the owning buffer
+    REQUIRE(r(3, 5) == 23);
+    r(1, 0) = -6;
+    REQUIRE(a(0, 1, 2) == -6);
+
+    REQUIRE(a.reshape({24}).strides() == std::vector<std::size_t>{1});
+    REQUIRE(a.reshape({1, 24, 1}).is_contiguous());
+    REQUIRE_THROWS_AS(a.reshape({5, 5}), std::invalid_argument);
+
+    ContiguousND<int> empty({0, 3});
+    REQUIRE(empty.reshape({3, 0, 7}).size() == 0);
+}
+
+TEST_CASE("reshape of strided views", "[reshape]") {
+    ContiguousND<int> a = iota({6, 4, 5});
+    // Every other row: axes 1 and 2 stay contiguous with each other
+    ContiguousND<int> v = a.slice({{0, 6, 2}});
+    ContiguousND<int> r = v.reshape({3, 20});
+    REQUIRE(r.strides() == std::vector<std::size_t>{40, 1});
+    REQUIRE(r(2, 13) == a(4, 2, 3));
+    ContiguousND<int> s = v.reshape({3, 2, 2, 5});
+    REQUIRE(s(1, 1, 0, 4) == a(2, 2, 4));
+    // Merging the sliced axis with the next one needs a copy
+    REQUIRE_THROWS_AS(v.reshape({12, 5}), std::invalid_argument);
+
+    // F-ordered: splitting and merging axes is fine only where it keeps order
+    ContiguousND<int> f = ContiguousND<int>::zeros({4, 6}, Order::F);
+    REQUIRE(f.reshape({4, 2, 3}).strides() == std::vector<std::size_t>{1, 12, 4});
+    REQUIRE_THROWS_AS(f.reshape({24}), std::invalid_argument);
+}
+
+TEST_CASE("squeeze and expand_dims", "[reshape]") {
+    ContiguousND<int> a = iota({1, 3, 1, 4});
+    ContiguousND<int> s = a.squeeze();
+    REQUIRE(s.shape() == std::vector<std::size_t>{3, 4});
+    REQUIRE(s.is_contiguous());
+    REQUIRE(s(2, 3) == 11);
+    REQUIRE(a.squeeze(2).shape() == std::vector<std::size_t>{1, 3, 4});
+    REQUIRE_THROWS_AS(a.squeeze(1), std::invalid_argument);
+    REQUIRE_THROWS_AS(a.squeeze(4), std::out_of_range);
+
+    ContiguousND<int> b = iota({3, 4});
+    for (std::size_t axis = 0; axis <= 2; ++axis) {
+        ContiguousND<int> e = b.expand_dims(axis);
+        REQUIRE(e.ndim() == 3);
+        REQUIRE(e.shape()[axis] == 1);
+        REQUIRE(e.is_contiguous());
+        REQUIRE(e.squeeze(axis).shape() == b.shape());
+    }
+    REQUIRE(b.expand_dims(1)(2, 0, 3) == 11);
+    REQUIRE_THROWS_AS(b.expand_dims(3), std::out_of_range);
+}
+
+TEST_CASE("ravel views when it can and flatten always copies", "[reshape]") {
+    ContiguousND<int> a = iota({4, 6});
+    ContiguousND<int> r = ravel(a);
+    REQUIRE(r.data() == a.data());
+    REQUIRE(r.shape() == std::vector<std::size_t>{24});
+
+    ContiguousND<int> cols = a.slice({{0, 4, 1}, {0, 6, 2}});
+    ContiguousND<int> even = ravel(cols);  // every other element: still a view
+    REQUIRE(even.data() == a.data());
+    REQUIRE(even.strides() == std::vector<std::size_t>{2});
+    REQUIRE(even(5) == 10);
+
+    ContiguousND<int> t = a.transpose();
+    ContiguousND<int> copied = ravel(t);
+    REQUIRE(copied.data() != a.data());
+    REQUIRE_FALSE(copied.is_view());
+    for (std::size_t i = 0; i < 24; ++i) REQUIRE(copied(i) == t(i / 4, i % 4));
+
+    ContiguousND<int> flat = flatten(a);
+    REQUIRE(flat.data() != a.data());
+    REQUIRE(std::vector<int>(flat.begin(), flat.end()) == std::vector<int>(a.begin(), a.end()));
+}
@@ -0,0 +1,137 @@
+#include <catch2/catch_test_macros.hpp>
+#include <cnda/contiguous_nd.hpp>
+#include <memory>
+#include <vector>
+
+static std::shared_ptr<std::vector<int>> iota_buffer(std::size_t n) {
+    auto owner = std::make_shared<std::vector<int>>(n);
+    for (std::size_t i = 0; i < n; ++i) (*owner)[i] = static_cast<int>(i);
+    return owner;
+}
+
+TEST_CASE("strided view constructor uses the given strides", "[slice]") {
+    auto owner = iota_buffer(24);
+
+    SECTION("2D every other column") {
+        // 3x4 logical grid inside a 3x8 buffer
+        cnda::ContiguousND<int> v({3, 4}, {8, 2}, owner->data(), owner);
+        REQUIRE(v.is_view());
+        REQUIRE_FALSE(v.is_contiguous());
+        REQUIRE(v.size() == 12);
+        REQUIRE(v(0, 1) == 2);
+        REQUIRE(v(2, 3) == 22);
+        REQUIRE(v.at(1, 2) == 12);
+        REQUIRE(v.index({2, 1}) == 18);
+    }
+
+    SECTION("3D and 4D accessors") {
+        cnda::ContiguousND<int> v3({2, 2, 2}, {12, 4, 1}, owner->data() + 1, owner);
+        REQUIRE(v3(1, 1, 1) == 1 + 12 + 4 + 1);
+        cnda::ContiguousND<int> v4({2, 1, 2, 2}, {12, 100, 4, 2}, owner->data(), owner);
+        REQUIRE(v4(1, 0, 1, 1) == 12 + 4 + 2);
+        REQUIRE(v4.at(1, 0, 1, 1) == 18);
+    }
+
+    SECTION("row-major strides are detected as contiguous") {
+        cnda::ContiguousND<int> v({2, 3, 4}, {12, 4, 1}, owner->data(), owner);
+        REQUIRE(v.is_contiguous());
+        // extent-1 axes may carry any stride
+        cnda::ContiguousND<int> w({1, 6}, {999, 1}, owner->data(), owner);
+        REQUIRE(w.is_contiguous());
+    }
+
+    SECTION("rank mismatch between shape and strides throws") {
+        REQUIRE_THROWS_AS(cnda::ContiguousND<int>({2, 3}, {1}, owner->data(), owner),
+                          std::invalid_argument);
+    }
+}
+
+TEST_CASE("slice() builds zero-copy sub-array views", "[slice]") {
+    auto owner = iota_buffer(60);
+    cnda::ContiguousND<int> a({3, 4, 5}, owner->data(), owner);
+
+    SECTION("ranges with steps") {
+        auto v = a.slice({{1, 3, 1}, {0, 4, 2}, {1, 5, 3}});
+        REQUIRE(v.shape() == std::vector<std::size_t>({2, 2, 2}));
+        REQUIRE(v.strides() == std::vector<std::size_t>({20, 10, 3}));
+        REQUIRE(v(0, 0, 0) == 21);
+        REQUIRE(v(1, 1, 1) == 20 + 20 + 10 + 4);
+        v(0, 1, 0) = -7;
+        REQUIRE((*owner)[31] == -7);
+    }
+
+    SECTION("trailing axes are kept whole and stops are clamped") {
+        auto v = a.slice({{2, 100, 1}});
+        REQUIRE(v.shape() == std::vector<std::size_t>({1, 4, 5}));
+        REQUIRE(v.is_contiguous());
+        REQUIRE(v(0, 0, 0) == 40);
+    }
+
+    SECTION("views share the parent's owner") {
+        long before = owner.use_count();
+        auto v = a.slice({{0, 1, 1}});
+        REQUIRE(v.owner() == owner);
+        REQUIRE(owner.use_count() == before + 1);
+    }
+
+    SECTION("slices of slices compose") {
+        auto v = a.slice({{0, 3, 2}}).slice({{1, 2, 1}, {1, 4, 2}});
+        REQUIRE(v.shape() == std::vector<std::size_t>({1, 2, 5}));
+        REQUIRE(v(0, 1, 4) == 40 + 15 + 4);
+    }
+
+    SECTION("invalid arguments") {
+        REQUIRE_THROWS_AS(a.slice({{0, 1, 0}}), std::invalid_argument);
+        REQUIRE_THROWS_AS(a.slice({{0, 1, 1}, {0, 1, 1}, {0, 1, 1}, {0, 1, 1}}), std::out_of_range);
+    }
+}
+
+TEST_CASE("slice() of an owning array shares its buffer", "[slice]") {
+    cnda::ContiguousND<double> v({1});
+    {
+        cnda::ContiguousND<double> a({4, 4});
+        for (std::size_t i = 0; i < a.size(); ++i) a.data()[i] = static_cast<double>(i);
+
+        v = a.slice({{1, 3, 1}, {1, 3, 1}});
+        REQUIRE(v.is_view());
+        REQUIRE(v(0, 0) == 5.0);
+        v(1, 0) = -1.0;
+        REQUIRE(a(2, 1) == -1.0);
+    }
+    // The parent is gone; the view keeps the buffer alive
+    REQUIRE(v(1, 1) == 10.0);
+    REQUIRE(v(1, 0) == -1.0);
+}
+
+TEST_CASE("borrow() builds views without an owner reference", "[slice]") {
+    cnda::ContiguousND<double> a({4, 4});
+    for (std::size_t i = 0; i < a.size(); ++i) a.data()[i] = static_cast<double>(i);
+    auto shared = a.slice({});
+    const long refs = shared.owner().use_count();
+
+    auto b = a.borrow({{1, 3, 1}, {0, 4, 2}});
+    REQUIRE(b.is_borrowed());
+    REQUIRE_FALSE(b.is_view());
+    REQUIRE(b.owner() == nullptr);
+    REQUIRE(shared.owner().use_count() == refs);
+    REQUIRE(b.shape() == std::vector<std::size_t>{2, 2});
+    REQUIRE(b(1, 1) == 10.0);
+    b(0, 1) = -1.0;
+    REQUIRE(a(1, 2) == -1.0);
+
+    // Views of a borrowed view stay borrowed
+    auto bb = b.slice({{1, 2, 1}});
+    REQUIRE(bb.is_borrowed());
+    REQUIRE(bb(0, 0) == 8.0);
+    REQUIRE_FALSE(a.is_borrowed());
+    REQUIRE_FALSE(shared.is_borrowed());
+}
+
+#ifdef CNDA_BOUNDS_CHECK
+TEST_CASE("strided view bounds checking", "[slice][bounds]") {
+    auto owner = iota_buffer(24);
+    cnda::ContiguousND<int> v({3, 4}, {8, 2}, owner->data(), owner);
+    REQUIRE_THROWS_AS(v(3, 0), std::out_of_range);
+    REQUIRE_THROWS_AS(v(0, 4), std::out_of_range);
+}
+#endif
@@ -281,3 +281,12 @@ TEST_CASE("non-owning view lifetime management", "[view][lifetime]") {
     // owner use_count should be 2 (owner variable + view's m_external_owner)
     REQUIRE(owner.use_count() == 2);
 }
+
+TEST_CASE("owner() exposes the external owner of a view", "[view][lifetime]") {
+    auto owner = std::make_shared<std::vector<int>>(6, 0);
+    cnda::ContiguousND<int> view({2, 3}, owner->data(), owner);
+    REQUIRE(view.owner() == owner);
+
+    cnda::ContiguousND<int> owned({2, 3});
+    REQUIRE(owned.owner() == nullptr);
+}
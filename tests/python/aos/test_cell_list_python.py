@@ -0,0 +1,116 @@
+"""
+Cell list tests for CNDA Python bindings.
+
+CellList bins the particles of a ContiguousND_Particle into a uniform grid;
+query_radius() and query_knn() must agree with a brute-force search, and
+update() / reorder() must keep the bins consistent with the particles.
+"""
+
+import numpy as np
+import pytest
+import cnda
+
+
+def make_particles(n, seed):
+    rng = np.random.default_rng(seed)
+    p = cnda.ContiguousND_Particle([n])
+    arr = p.to_numpy()
+    arr["x"] = rng.uniform(-2, 3, n)
+    arr["y"] = rng.uniform(-2, 3, n)
+    arr["z"] = rng.uniform(0, 1, n)
+    arr["mass"] = np.arange(n)
+    return p, arr
+
+
+def positions(arr):
+    return np.stack([arr["x"], arr["y"], arr["z"]], axis=1)
+
+
+def brute_radius(arr, q, r):
+    d2 = ((positions(arr) - q) ** 2).sum(axis=1)
+    return np.flatnonzero(d2 <= r * r)
+
+
+def brute_knn(arr, q, k):
+    d2 = ((positions(arr) - q) ** 2).sum(axis=1)
+    return np.lexsort((np.arange(len(d2)), d2))[:k]
+
+
+QUERIES = np.array([[0.0, 0.0, 0.5], [2.9, -1.9, 0.1], [-6.0, 1.0, 0.5], [0.5, 0.5, 4.0]])
+
+
+def check_queries(cl, arr):
+    for r in (0.0, 0.3, 1.2):
+        found = cl.query_radius(QUERIES, r)
+        assert len(found) == len(QUERIES)
+        for q, idx in zip(QUERIES, found):
+            assert idx.dtype == np.int64
+            np.testing.assert_array_equal(idx, brute_radius(arr, q, r))
+    knn = cl.query_knn(QUERIES, 6)
+    assert knn.shape == (len(QUERIES), 6)
+    for q, idx in zip(QUERIES, knn):
+        np.testing.assert_array_equal(idx, brute_knn(arr, q, 6))
+
+
+def test_queries_match_brute_force():
+    p, arr = make_particles(400, 0)
+    cl = cnda.CellList(0.5)
+    cl.build(p)
+    assert len(cl) == 400
+    assert cl.cell_size == 0.5
+    assert np.prod(cl.shape()) == cl.num_cells()
+    check_queries(cl, arr)
+
+    # One point gives one array
+    np.testing.assert_array_equal(cl.query_radius(QUERIES[0], 1.0), brute_radius(arr, QUERIES[0], 1.0))
+    np.testing.assert_array_equal(cl.query_knn(QUERIES[1], 3), brute_knn(arr, QUERIES[1], 3))
+
+    threads, threshold = cnda.get_num_threads(), cnda.get_parallel_threshold()
+    try:
+        cnda.set_num_threads(3)
+        cnda.set_parallel_threshold(1)
+        cl.build(p)
+        check_queries(cl, arr)
+    finally:
+        cnda.set_num_threads(threads)
+        cnda.set_parallel_threshold(threshold)
+
+
+def test_update_and_reorder():
+    p, arr = make_particles(600, 1)
+    cl = cnda.CellList(0.5)
+    assert cl.update(p) is False            # first call builds
+    rng = np.random.default_rng(2)
+    moving = np.arange(0, 600, 20)
+    arr["x"][moving] = np.clip(arr["x"][moving] + rng.uniform(-0.2, 0.2, len(moving)), -1.5, 2.5)
+    assert cl.update(p) is True
+    check_queries(cl, arr)
+
+    before = arr.copy()
+    order = cl.reorder(p)
+    assert order.dtype == np.int64
+    np.testing.assert_array_equal(arr, before[order])
+    check_queries(cl, arr)
+
+    arr["x"][0] = 50.0                      # leaves the grid
+    assert cl.update(p) is False
+    check_queries(cl, arr)
+
+
+def test_errors():
+    p, arr = make_particles(10, 3)
+    cl = cnda.CellList(1.0)
+    cl.build(p)
+    with pytest.raises(ValueError):
+        cnda.CellList(0.0)
+    with pytest.raises(ValueError):
+        cl.query_knn(QUERIES, 11)
+    with pytest.raises(ValueError):
+        cl.query_radius([[0.0, 0.0]], 1.0)
+    with pytest.raises(ValueError):
+        cl.query_radius(QUERIES, -1.0)
+    with pytest.raises(ValueError):
+        cl.reorder(make_particles(5, 4)[0])
+    arr["y"][2] = np.nan
+    with pytest.raises(ValueError):
+        cl.build(p)
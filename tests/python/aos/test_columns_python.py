@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+import cnda
+
+# Python-side tests for from_columns()/to_columns(): bulk packing of AoS
+# arrays from and to one NumPy array per field.
+
+
+def test_from_columns_interleaves_fields():
+    n = 1000
+    x = np.arange(n, dtype=np.float32)
+    p = cnda.ContiguousND_Particle.from_columns(
+        [10, 100], x=x, y=x + 1, z=x + 2, vx=-x, vy=2 * x, vz=0.5 * x, mass=np.ones(n))
+    assert p.shape() == [10, 100]
+    arr = p.to_numpy()
+    np.testing.assert_array_equal(arr['x'].ravel(), x)
+    np.testing.assert_array_equal(arr['y'].ravel(), x + 1)
+    np.testing.assert_array_equal(arr['vy'].ravel(), 2 * x)
+    assert arr['mass'].dtype == np.float64
+    np.testing.assert_array_equal(arr['mass'], 1.0)
+
+
+def test_from_columns_casts_and_accepts_any_layout():
+    u = np.arange(12, dtype=np.float64).reshape(4, 3).T  # F-ordered, float64
+    c = cnda.ContiguousND_Cell2D.from_columns([3, 4], u=u, v=[0] * 12, flag=np.arange(12))
+    arr = c.to_numpy()
+    np.testing.assert_array_equal(arr['u'], u.astype(np.float32))
+    np.testing.assert_array_equal(arr['flag'].ravel(), np.arange(12))
+
+
+def test_from_columns_errors():
+    with pytest.raises(TypeError, match="missing field 'flag'"):
+        cnda.ContiguousND_Cell2D.from_columns([2], u=[1, 2], v=[3, 4])
+    with pytest.raises(TypeError, match="no field named 'w'"):
+        cnda.ContiguousND_Cell2D.from_columns([2], u=[1, 2], v=[3, 4], flag=[0, 0], w=[0, 0])
+    with pytest.raises(ValueError, match="one value per element"):
+        cnda.ContiguousND_Cell2D.from_columns([2], u=[1, 2, 3], v=[3, 4], flag=[0, 0])
+
+
+def test_to_columns_round_trip():
+    c = cnda.ContiguousND_MaterialPoint([6, 7])
+    arr = c.to_numpy()
+    rng = np.random.default_rng(0)
+    for name in arr.dtype.names:
+        arr[name] = rng.integers(0, 100, size=arr.shape)
+    cols = c.to_columns()
+    assert set(cols) == set(arr.dtype.names)
+    for name in arr.dtype.names:
+        assert cols[name].shape == (6, 7)
+        assert cols[name].dtype == arr.dtype[name]
+        np.testing.assert_array_equal(cols[name], arr[name])
+    # Columns are copies
+    cols['density'][0, 0] = -1
+    assert arr['density'][0, 0] != -1
+    back = cnda.ContiguousND_MaterialPoint.from_columns([6, 7], **cols)
+    assert back.to_numpy()['density'][0, 0] == -1
+    np.testing.assert_array_equal(back.to_numpy()['temperature'], arr['temperature'])
+
+
+def test_to_columns_of_strided_view():
+    c = cnda.ContiguousND_Vec3f([8, 5])
+    arr = c.to_numpy()
+    arr['x'] = np.arange(40).reshape(8, 5)
+    view = c[1:7:2, ::2]
+    cols = view.to_columns()
+    assert cols['x'].shape == (3, 3)
+    np.testing.assert_array_equal(cols['x'], arr['x'][1:7:2, ::2])
+
+
+def test_to_columns_matches_soa():
+    c = cnda.ContiguousND_Cell3D([4, 5, 6])
+    arr = c.to_numpy()
+    arr['w'] = np.arange(120).reshape(4, 5, 6)
+    soa = cnda.SoA_Cell3D.from_aos(c).to_numpy()
+    cols = c.to_columns()
+    for name in soa:
+        np.testing.assert_array_equal(cols[name], soa[name])
@@ -0,0 +1,75 @@
+"""
+Active-cell list tests for CNDA Python bindings.
+
+where_flag(k) returns the sorted flat positions of the Cell2D/Cell3D cells
+with flag == k; take()/put() move those cells to and from a dense buffer,
+and update_where_flag() refreshes a list after a few flags change.
+"""
+
+import numpy as np
+import pytest
+import cnda
+
+
+CLASSES = [cnda.ContiguousND_Cell2D, cnda.ContiguousND_Cell3D]
+
+
+def make_cells(cls, shape):
+    c = cls(list(shape))
+    arr = c.to_numpy()
+    n = int(np.prod(shape))
+    arr["u"] = np.arange(n).reshape(shape)
+    arr["flag"] = (np.arange(n).reshape(shape) % 5 == 0) + 2 * (np.arange(n).reshape(shape) % 7 == 0)
+    return c, arr
+
+
+@pytest.mark.parametrize("cls", CLASSES)
+def test_where_flag_matches_numpy(cls):
+    shape = (37, 41) if cls is cnda.ContiguousND_Cell2D else (9, 10, 11)
+    c, arr = make_cells(cls, shape)
+    for k in (0, 1, 2, 3, 9):
+        idx = c.where_flag(k)
+        assert idx.dtype == np.int64
+        np.testing.assert_array_equal(idx, np.flatnonzero(arr["flag"] == k))
+
+    threads, threshold = cnda.get_num_threads(), cnda.get_parallel_threshold()
+    try:
+        cnda.set_num_threads(3)
+        cnda.set_parallel_threshold(1)
+        np.testing.assert_array_equal(c.where_flag(1), np.flatnonzero(arr["flag"] == 1))
+    finally:
+        cnda.set_num_threads(threads)
+        cnda.set_parallel_threshold(threshold)
+
+
+def test_gather_and_scatter_active_cells():
+    c, arr = make_cells(cnda.ContiguousND_Cell2D, (20, 30))
+    fluid = c.where_flag(1)
+    work = c.take(fluid)
+    assert (work["flag"] == 1).all()
+    np.testing.assert_array_equal(work["u"], fluid)
+
+    u = c.field("u")
+    u.put(fluid, u.take(fluid) + 1000)
+    expected = np.arange(600, dtype=np.float32)
+    expected[fluid] += 1000
+    np.testing.assert_array_equal(arr["u"].ravel(), expected)
+
+
+def test_update_where_flag():
+    c, arr = make_cells(cnda.ContiguousND_Cell3D, (6, 7, 8))
+    fluid = c.where_flag(1)
+    flat = arr["flag"].reshape(-1)
+    changed = np.array([fluid[0], fluid[-1], 1, 2, 2])
+    flat[changed] = [0, 0, 1, 1, 1]
+    new = c.update_where_flag(fluid, changed, 1)
+    np.testing.assert_array_equal(new, np.flatnonzero(flat == 1))
+    np.testing.assert_array_equal(c.update_where_flag(new, [], 1), new)
+
+    with pytest.raises(IndexError):
+        c.update_where_flag(fluid, [336], 1)
+    with pytest.raises(IndexError):
+        c.update_where_flag([-1], [], 1)
+    with pytest.raises(ValueError):
+        c.update_where_flag(fluid, [[0, 0, 0]], 1)
+    assert not hasattr(cnda.ContiguousND_Vec2f, "where_flag")
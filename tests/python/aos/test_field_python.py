@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+import cnda
+
+# Python-side tests for field(name): zero-copy scalar views of one AoS field.
+
+
+def make_cells(shape):
+    c = cnda.ContiguousND_Cell2D(list(shape))
+    arr = c.to_numpy()
+    n = int(np.prod(shape))
+    arr['u'] = np.arange(n).reshape(shape)
+    arr['v'] = -np.arange(n).reshape(shape)
+    arr['flag'] = np.arange(n).reshape(shape) % 3
+    return c, arr
+
+
+def test_field_is_a_strided_view():
+    c, arr = make_cells((3, 4))
+    u = c.field("u")
+    assert type(u).__name__ == "ContiguousND_float"
+    assert u.shape() == [3, 4]
+    assert u.strides() == [12, 3]
+    assert u.is_view() is True
+    assert u.data_ptr() == c.data_ptr()
+    assert c.field("v").data_ptr() == c.data_ptr() + 4
+    assert type(c.field("flag")).__name__ == "ContiguousND_int32"
+    assert c.field("flag")[2, 3] == 11 % 3
+
+
+@pytest.mark.parametrize("name, fields", [
+    ("Vec3f", ["x", "y", "z"]),
+    ("Particle", ["x", "y", "z", "vx", "vy", "vz", "mass"]),
+    ("MaterialPoint", ["density", "temperature", "pressure", "id"]),
+])
+def test_field_to_numpy_is_zero_copy(name, fields):
+    a = getattr(cnda, "ContiguousND_" + name)([5])
+    arr = a.to_numpy()
+    for f in fields:
+        view = a.field(f).to_numpy()
+        assert np.shares_memory(view, arr)
+        assert view.strides == arr[f].strides
+        view[:] = 7
+        assert (arr[f] == 7).all()
+
+
+def test_in_place_update_of_one_field():
+    c, arr = make_cells((4, 5))
+    c.field("u")[:] *= 0.5
+    c.field("v")[1:3, ::2] += 100
+    assert arr['u'].tolist() == (np.arange(20).reshape(4, 5) * 0.5).tolist()
+    assert arr['v'][1, 2] == -7 + 100
+    assert arr['v'][0, 0] == 0
+    assert arr['flag'].tolist() == (np.arange(20).reshape(4, 5) % 3).tolist()
+
+
+def test_field_of_a_slice_and_lifetime():
+    c, arr = make_cells((4, 4))
+    u = c[1:4:2, ::3].field("u")
+    del c
+    assert u.shape() == [2, 2]
+    assert u.data() == [4.0, 7.0, 12.0, 15.0]
+    u.fill(-1.0)
+    assert arr['u'][3, 3] == -1.0
+
+
+def test_field_errors():
+    c = cnda.ContiguousND_Cell2D([2])
+    with pytest.raises(KeyError):
+        c.field("w")
+    assert not hasattr(cnda.ContiguousND_double([2]), "field")
@@ -0,0 +1,188 @@
+import gc
+
+import numpy as np
+import pytest
+import cnda
+
+# Python-side tests for zero-copy NumPy interop of the AoS containers.
+
+CELL2D_DTYPE = np.dtype([('u', '<f4'), ('v', '<f4'), ('flag', '<i4')], align=True)
+PARTICLE_DTYPE = np.dtype([('x', '<f8'), ('y', '<f8'), ('z', '<f8'),
+                           ('vx', '<f8'), ('vy', '<f8'), ('vz', '<f8'),
+                           ('mass', '<f8')])
+
+
+@pytest.mark.parametrize("name, dtype", [
+    ("Vec2f", [('x', '<f4'), ('y', '<f4')]),
+    ("Vec3f", [('x', '<f4'), ('y', '<f4'), ('z', '<f4')]),
+    ("Cell2D", [('u', '<f4'), ('v', '<f4'), ('flag', '<i4')]),
+    ("Cell3D", [('u', '<f4'), ('v', '<f4'), ('w', '<f4'), ('flag', '<i4')]),
+    ("Particle", PARTICLE_DTYPE),
+    ("MaterialPoint", [('density', '<f4'), ('temperature', '<f4'),
+                       ('pressure', '<f4'), ('id', '<i4')]),
+])
+def test_from_numpy_structured_dtypes(name, dtype):
+    arr = np.zeros((2, 3), dtype=dtype)
+    a = cnda.from_numpy(arr, copy=False)
+    assert type(a).__name__ == "ContiguousND_" + name
+    assert a.data_ptr() == arr.ctypes.data
+    assert arr.dtype.itemsize == cnda.sizeof_aos(name)
+
+    out = a.to_numpy(copy=False)
+    assert out.dtype == arr.dtype
+    assert out.ctypes.data == arr.ctypes.data
+
+
+def test_cell2d_writes_are_shared():
+    arr = np.zeros((2, 3), dtype=CELL2D_DTYPE)
+    a = cnda.from_numpy(arr)
+    a[1, 2] = cnda.Cell2D(1.5, -2.5, 7)
+    assert arr[1, 2]['u'] == pytest.approx(1.5)
+    assert arr[1, 2]['v'] == pytest.approx(-2.5)
+    assert arr[1, 2]['flag'] == 7
+
+    arr['flag'][0, 0] = 3
+    assert a[0, 0].flag == 3
+
+
+def test_particle_to_numpy_from_owning_array():
+    p = cnda.ContiguousND_Particle([4])
+    p[2] = cnda.Particle(1.0, 2.0, 3.0, 0.0, 0.0, 0.0, 5.0)
+    out = p.to_numpy()
+    assert out.dtype.names == ('x', 'y', 'z', 'vx', 'vy', 'vz', 'mass')
+    assert out['mass'][2] == 5.0
+    del p
+    gc.collect()
+    assert out['z'][2] == 3.0
+
+
+def test_mismatched_field_layout_is_rejected():
+    swapped = np.zeros(4, dtype=[('v', '<f4'), ('u', '<f4'), ('flag', '<i4')])
+    with pytest.raises(TypeError):
+        cnda.from_numpy(swapped)
+
+
+def test_structured_copy_from_strided_input():
+    arr = np.zeros(8, dtype=CELL2D_DTYPE)
+    arr['u'] = np.arange(8)
+    a = cnda.from_numpy(arr[::2], copy=True)
+    assert a.is_view() is False
+    assert [a[i].u for i in range(4)] == [0.0, 2.0, 4.0, 6.0]
+
+
+@pytest.mark.parametrize("dtype", [
+    np.dtype([('u', '<f4'), ('v', '<f4'), ('flag', '<i4')], align=True),
+    np.dtype({'names': ['u', 'v', 'flag'], 'formats': ['<f4', '<f4', '<i4'],
+              'offsets': [0, 4, 8], 'itemsize': 12}),
+    # Same offsets, fields listed in another order
+    np.dtype({'names': ['flag', 'u', 'v'], 'formats': ['<i4', '<f4', '<f4'],
+              'offsets': [8, 0, 4]}),
+])
+def test_equivalent_layouts_are_zero_copy(dtype):
+    arr = np.zeros(5, dtype=dtype)
+    arr['flag'] = np.arange(5)
+    a = cnda.from_numpy(arr)
+    assert type(a).__name__ == "ContiguousND_Cell2D"
+    assert a.data_ptr() == arr.ctypes.data
+    assert a[3].flag == 3
+
+
+@pytest.mark.parametrize("dtype", [
+    # Padded records
+    np.dtype({'names': ['u', 'v', 'flag'], 'formats': ['<f4', '<f4', '<i4'],
+              'offsets': [0, 4, 8], 'itemsize': 16}),
+    # Fields in another place
+    np.dtype([('flag', '<i4'), ('u', '<f4'), ('v', '<f4')]),
+    # Other widths and byte order
+    np.dtype([('u', '<f8'), ('v', '<f8'), ('flag', '<i4')]),
+    np.dtype([('u', '>f4'), ('v', '>f4'), ('flag', '>i4')]),
+])
+def test_other_layouts_are_converted_by_name_on_copy(dtype):
+    arr = np.zeros(4, dtype=dtype)
+    arr['u'] = [1, 2, 3, 4]
+    arr['flag'] = [5, 6, 7, 8]
+    with pytest.raises(TypeError, match="layout of Cell2D"):
+        cnda.from_numpy(arr)
+    a = cnda.from_numpy(arr, copy=True)
+    assert type(a).__name__ == "ContiguousND_Cell2D"
+    assert [a[i].u for i in range(4)] == [1.0, 2.0, 3.0, 4.0]
+    assert [a[i].flag for i in range(4)] == [5, 6, 7, 8]
+
+
+def test_unknown_fields_are_rejected_even_on_copy():
+    for dtype in ([('u', '<f4'), ('v', '<f4')],
+                  [('u', '<f4'), ('v', '<f4'), ('flag', '<f4')],
+                  [('u', '<f4'), ('v', '<f4'), ('flag', '<i4'), ('extra', '<i4')],
+                  [('u', '<f4', (2,)), ('v', '<f4'), ('flag', '<i4')]):
+        with pytest.raises(TypeError, match="unsupported dtype"):
+            cnda.from_numpy(np.zeros(2, dtype=dtype), copy=True)
+
+
+def test_dtype_decision_is_stable_across_calls():
+    # The answer is cached per dtype object; repeated and fresh dtypes agree
+    packed = np.dtype([('u', '<f4'), ('v', '<f4'), ('flag', '<i4')])
+    padded = np.dtype({'names': ['u', 'v', 'flag'], 'formats': ['<f4', '<f4', '<i4'],
+                       'offsets': [0, 4, 8], 'itemsize': 16})
+    for _ in range(3):
+        arr = np.zeros(2, dtype=packed)
+        assert cnda.from_numpy(arr).data_ptr() == arr.ctypes.data
+        with pytest.raises(TypeError):
+            cnda.from_numpy(np.zeros(2, dtype=padded))
+    for _ in range(300):
+        dtype = np.dtype([('u', '<f4'), ('v', '<f4'), ('flag', '<i4')])
+        assert cnda.from_numpy(np.zeros(1, dtype=dtype)).is_view() is True
+
+
+def test_open_mmap_requires_the_exact_layout(tmp_path):
+    path = tmp_path / "cells.bin"
+    np.zeros(4, dtype=CELL2D_DTYPE).tofile(path)
+    a = cnda.open_mmap(str(path), dtype=np.dtype([('u', '<f4'), ('v', '<f4'), ('flag', '<i4')]))
+    assert type(a).__name__ == "ContiguousND_Cell2D"
+    assert a.shape() == [4]
+    with pytest.raises(TypeError):
+        cnda.open_mmap(str(path), dtype=[('flag', '<i4'), ('u', '<f4'), ('v', '<f4')])
+
+
+@pytest.mark.parametrize("name", ["Vec2f", "Vec3f", "Cell2D", "Cell3D",
+                                  "Particle", "MaterialPoint"])
+def test_aos_buffer_protocol_exports_structured_format(name):
+    a = getattr(cnda, "ContiguousND_" + name)([2, 3])
+    m = memoryview(a)
+    size = cnda.sizeof_aos(name)
+    assert m.format.startswith("^T{") or m.format.startswith("T{")
+    assert m.itemsize == size
+    assert m.shape == (2, 3)
+    assert m.strides == (3 * size, size)
+
+    x = np.asarray(a)
+    assert x.dtype == a.to_numpy().dtype
+    assert x.ctypes.data == a.data_ptr()
+
+
+def test_aos_array_interface_descr():
+    p = cnda.ContiguousND_Particle([4])
+    ai = p.__array_interface__
+    assert ai["typestr"] == "|V56"
+    assert [f[0] for f in ai["descr"]] == ['x', 'y', 'z', 'vx', 'vy', 'vz', 'mass']
+
+    class OnlyInterface:
+        __array_interface__ = ai
+
+    x = np.asarray(OnlyInterface())
+    x['mass'][3] = 2.5
+    assert p[3].mass == 2.5
+
+
+def test_aos_take_put_structured_values():
+    arr = np.zeros((3, 3), dtype=CELL2D_DTYPE)
+    a = cnda.from_numpy(arr)
+    vals = np.zeros(2, dtype=CELL2D_DTYPE)
+    vals['u'] = [1.0, 2.0]
+    vals['flag'] = [4, 5]
+    a.put(np.array([[0, 0], [2, 1]]), vals)
+    assert arr[2, 1]['flag'] == 5
+
+    out = a.take(np.array([7, 0]))
+    assert out.dtype.names == ('u', 'v', 'flag')
+    assert out['u'].tolist() == [2.0, 1.0]
+    assert out['flag'].tolist() == [5, 4]
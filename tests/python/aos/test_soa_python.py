@@ -0,0 +1,83 @@
+import gc
+
+import numpy as np
+import pytest
+import cnda
+
+# Python-side tests for the Structure-of-Arrays containers (SoA_*).
+
+PARTICLE_FIELDS = ['x', 'y', 'z', 'vx', 'vy', 'vz', 'mass']
+
+
+def make_particles(n):
+    dtype = cnda.ContiguousND_Particle([1]).to_numpy().dtype
+    arr = np.zeros(n, dtype=dtype)
+    for k, name in enumerate(PARTICLE_FIELDS):
+        arr[name] = np.arange(n) + 1000 * k
+    return arr
+
+
+def test_soa_construction_and_fields():
+    s = cnda.SoA_Particle([4, 5])
+    assert s.shape() == [4, 5]
+    assert s.ndim() == 2
+    assert s.size() == 20
+    assert s.fields() == PARTICLE_FIELDS
+
+
+def test_soa_field_views_are_typed_and_shared():
+    s = cnda.SoA_Cell2D([3, 4])
+    u = s.field("u")
+    flag = s.field("flag")
+    assert type(u).__name__ == "ContiguousND_float"
+    assert type(flag).__name__ == "ContiguousND_int32"
+    assert u.is_view() is True
+    u[2, 3] = 1.5
+    assert s.field("u")[2, 3] == 1.5
+    with pytest.raises(KeyError):
+        s.field("w")
+
+
+def test_soa_to_numpy_views():
+    s = cnda.SoA_Vec3f([8])
+    cols = s.to_numpy()
+    assert list(cols) == ['x', 'y', 'z']
+    cols['y'][:] = np.arange(8)
+    assert s.field("y").data() == list(range(8))
+    del s
+    gc.collect()
+    assert cols['y'][7] == 7.0
+
+
+def test_aos_soa_round_trip():
+    src = make_particles(5000)
+    aos = cnda.from_numpy(src)
+    s = cnda.SoA_Particle.from_aos(aos)
+    cols = s.to_numpy()
+    for name in PARTICLE_FIELDS:
+        np.testing.assert_array_equal(cols[name], src[name])
+
+    cols['mass'] *= 2
+    back = s.to_aos()
+    assert type(back).__name__ == "ContiguousND_Particle"
+    out = back.to_numpy()
+    np.testing.assert_array_equal(out['mass'], src['mass'] * 2)
+    np.testing.assert_array_equal(out['vz'], src['vz'])
+
+
+def test_in_place_conversions():
+    cells = cnda.ContiguousND_Cell3D([16, 16])
+    s = cnda.SoA_Cell3D([16, 16])
+    np.asarray(cells)['w'] = 3.0
+    s.copy_from_aos(cells)
+    assert (s.to_numpy()['w'] == 3.0).all()
+
+    s.field("flag")[0, 0] = 9
+    s.copy_to_aos(cells)
+    assert cells[0, 0].flag == 9
+
+
+def test_shape_mismatch_raises():
+    s = cnda.SoA_Vec2f([3, 4])
+    with pytest.raises(ValueError, match="shape mismatch"):
+        s.copy_from_aos(cnda.ContiguousND_Vec2f([4, 3]))
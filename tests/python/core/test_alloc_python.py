@@ -0,0 +1,58 @@
+"""
+Allocation mode tests for CNDA Python bindings.
+
+Owning arrays come from aligned memory; empty() skips initialization, zeros()
+and full() fill it.
+"""
+
+import numpy as np
+import pytest
+import cnda
+
+
+CLASSES = ["ContiguousND_int32", "ContiguousND_int64",
+           "ContiguousND_float", "ContiguousND_double"]
+
+
+@pytest.mark.parametrize("cls", CLASSES)
+def test_default_constructor_is_aligned_and_zeroed(cls):
+    a = getattr(cnda, cls)([5, 7])
+    assert a.data_ptr() % cnda.DEFAULT_ALIGNMENT == 0
+    assert not np.asarray(a).any()
+
+
+@pytest.mark.parametrize("cls", CLASSES)
+def test_factories(cls):
+    C = getattr(cnda, cls)
+    e = C.empty([3, 4])
+    assert e.shape() == [3, 4]
+    assert e.is_view() is False
+    assert e.data_ptr() % 64 == 0
+
+    z = C.zeros([3, 4])
+    assert not np.asarray(z).any()
+
+    f = C.full([3, 4], 7)
+    assert (np.asarray(f) == 7).all()
+
+
+def test_custom_alignment():
+    a = cnda.ContiguousND_double.empty([16], alignment=4096)
+    assert a.data_ptr() % 4096 == 0
+    b = cnda.ContiguousND_float([8], alignment=256)
+    assert b.data_ptr() % 256 == 0
+    h = cnda.ContiguousND_float.zeros([1024], alignment=cnda.HUGE_PAGE_ALIGNMENT)
+    assert h.data_ptr() % (2 << 20) == 0
+
+
+def test_bad_alignment():
+    with pytest.raises(ValueError):
+        cnda.ContiguousND_float.empty([4], alignment=48)
+
+
+def test_aos_factories():
+    p = cnda.ContiguousND_Particle.full([3], cnda.Particle(1.0, 2.0, 3.0, mass=4.0))
+    assert np.asarray(p)['mass'].tolist() == [4.0, 4.0, 4.0]
+    c = cnda.ContiguousND_Cell2D.zeros([2, 2])
+    assert (np.asarray(c)['flag'] == 0).all()
+    assert cnda.ContiguousND_Vec3f.empty([10]).size() == 10
@@ -0,0 +1,89 @@
+"""
+Buffer protocol tests for CNDA Python bindings.
+
+Every ContiguousND_* class exports its memory through PEP 3118 and through
+NumPy's __array_interface__, so consumers can read it without copying.
+"""
+
+import array
+import io
+
+import numpy as np
+import pytest
+import cnda
+
+
+SCALAR_CASES = [
+    ("ContiguousND_int32", np.int32),
+    ("ContiguousND_int64", np.int64),
+    ("ContiguousND_float", np.float32),
+    ("ContiguousND_double", np.float64),
+]
+
+
+@pytest.mark.parametrize("cls, dtype", SCALAR_CASES)
+def test_memoryview_shape_strides_itemsize(cls, dtype):
+    a = getattr(cnda, cls)([2, 3, 4])
+    m = memoryview(a)
+    itemsize = np.dtype(dtype).itemsize
+    assert m.ndim == 3
+    assert m.shape == (2, 3, 4)
+    assert m.itemsize == itemsize
+    assert m.strides == (12 * itemsize, 4 * itemsize, itemsize)
+    assert m.readonly is False
+    assert np.dtype(m.format) == np.dtype(dtype)
+
+
+@pytest.mark.parametrize("cls, dtype", SCALAR_CASES)
+def test_asarray_is_zero_copy(cls, dtype):
+    a = getattr(cnda, cls)([3, 4])
+    x = np.asarray(a)
+    assert x.dtype == np.dtype(dtype)
+    assert x.ctypes.data == a.data_ptr()
+    x[2, 3] = 9
+    assert a[2, 3] == 9
+
+
+def test_memoryview_writes_reach_array():
+    a = cnda.ContiguousND_int32([4])
+    m = memoryview(a)
+    m[2] = 17
+    assert a[2] == 17
+
+
+def test_buffer_consumers_without_numpy():
+    a = cnda.ContiguousND_double([3])
+    for i in range(3):
+        a[i] = i + 0.5
+    assert array.array("d", bytes(memoryview(a))).tolist() == [0.5, 1.5, 2.5]
+
+    sink = io.BytesIO()
+    assert sink.write(a) == 3 * 8
+
+
+def test_array_interface_scalar():
+    a = cnda.ContiguousND_float([2, 5])
+    ai = a.__array_interface__
+    assert ai["version"] == 3
+    assert ai["shape"] == (2, 5)
+    assert ai["strides"] == (20, 4)
+    assert np.dtype(ai["typestr"]) == np.float32
+    assert ai["data"] == (a.data_ptr(), False)
+
+
+def test_array_interface_is_used_by_numpy():
+    a = cnda.ContiguousND_int64([2, 2])
+    a[1, 0] = 5
+
+    class OnlyInterface:
+        __array_interface__ = a.__array_interface__
+
+    x = np.asarray(OnlyInterface())
+    assert x.ctypes.data == a.data_ptr()
+    assert x[1, 0] == 5
+
+
+def test_view_buffer_shares_source_memory():
+    src = np.arange(6, dtype=np.float64)
+    v = cnda.from_numpy(src)
+    assert np.asarray(v).ctypes.data == src.ctypes.data
@@ -0,0 +1,104 @@
+"""
+Expression tests for CNDA Python bindings.
+
+cnda.Expression compiles an arithmetic string once; calling it evaluates
+every element in one pass over float or double arrays, broadcasting like
+NumPy, into out= or a new array.
+"""
+
+import numpy as np
+import pytest
+import cnda
+
+
+CLASSES = [
+    (cnda.ContiguousND_float, np.float32),
+    (cnda.ContiguousND_double, np.float64),
+]
+
+
+@pytest.mark.parametrize("cls,dtype", CLASSES)
+def test_expression_matches_numpy(cls, dtype):
+    rng = np.random.default_rng(0)
+    u, a, b, c = (rng.random((5, 7)).astype(dtype) for _ in range(4))
+    e = cnda.Expression("u + dt*(a*b - c)")
+    assert e.source == "u + dt*(a*b - c)"
+    assert e.names() == ["u", "dt", "a", "b", "c"]
+    r = e(u=cnda.from_numpy(u), dt=0.5, a=cnda.from_numpy(a), b=cnda.from_numpy(b), c=cnda.from_numpy(c))
+    assert isinstance(r, cls)
+    np.testing.assert_allclose(r.to_numpy(), u + dtype(0.5) * (a * b - c), rtol=1e-6)
+
+
+@pytest.mark.parametrize("cls,dtype", CLASSES)
+def test_expression_into_out(cls, dtype):
+    x = np.arange(12, dtype=dtype).reshape(3, 4)
+    u = cnda.from_numpy(x.copy())
+    e = cnda.Expression("-u / 2 + 1")
+    assert e(out=u, u=u) is u                      # in place
+    np.testing.assert_allclose(u.to_numpy(), -x / 2 + 1)
+
+    # A strided view as the destination only touches its elements
+    base = cnda.from_numpy(np.zeros((4, 6), dtype=dtype))
+    view = base[::2, 1::2]
+    cnda.evaluate("k * 3", out=view, k=2)
+    expected = np.zeros((4, 6), dtype=dtype)
+    expected[::2, 1::2] = 6
+    np.testing.assert_array_equal(base.to_numpy(), expected)
+
+
+def test_expression_broadcasts():
+    a = cnda.from_numpy(np.arange(12.0).reshape(3, 4))
+    row = cnda.from_numpy(np.arange(4.0))
+    col = cnda.from_numpy(np.arange(3.0).reshape(3, 1))
+    r = cnda.evaluate("a - row * col", a=a, row=row, col=col)
+    assert r.shape() == [3, 4]
+    np.testing.assert_allclose(r.to_numpy(), a.to_numpy() - row.to_numpy() * col.to_numpy())
+
+    # Transposed operands are read in place
+    t = cnda.evaluate("a * 2", a=a.transpose())
+    np.testing.assert_allclose(t.to_numpy(), a.to_numpy().T * 2)
+
+    with pytest.raises(ValueError):
+        cnda.evaluate("a + b", a=a, b=cnda.from_numpy(np.arange(3.0)))
+    with pytest.raises(ValueError):
+        cnda.evaluate("a", out=cnda.ContiguousND_double([4]), a=a)
+
+
+def test_expression_of_constants_is_rank_zero():
+    r = cnda.evaluate("1.5e1 - 2*(3 + -1)")
+    assert isinstance(r, cnda.ContiguousND_double)
+    assert r.ndim() == 0
+    assert r.to_numpy() == 11.0
+
+
+def test_expression_parallel_matches_serial():
+    threads, threshold = cnda.get_num_threads(), cnda.get_parallel_threshold()
+    x = np.random.default_rng(1).random((67, 301))
+    a = cnda.from_numpy(x)
+    try:
+        cnda.set_num_threads(3)
+        cnda.set_parallel_threshold(1)
+        r = cnda.evaluate("a * a - 1 / (a + 1)", a=a)
+    finally:
+        cnda.set_num_threads(threads)
+        cnda.set_parallel_threshold(threshold)
+    np.testing.assert_allclose(r.to_numpy(), x * x - 1 / (x + 1))
+
+
+def test_expression_errors():
+    with pytest.raises(ValueError, match="position 2"):
+        cnda.Expression("a+*b")
+    with pytest.raises(ValueError):
+        cnda.Expression("(a + b")
+    e = cnda.Expression("a + b")
+    a = cnda.from_numpy(np.ones(3))
+    with pytest.raises(TypeError, match="missing operand 'b'"):
+        e(a=a)
+    with pytest.raises(TypeError, match="unexpected operand 'c'"):
+        e(a=a, b=1, c=2)
+    with pytest.raises(TypeError):
+        e(a=a, b=cnda.from_numpy(np.ones(3, dtype=np.float32)))  # mixed dtypes
+    with pytest.raises(TypeError):
+        e(a=cnda.from_numpy(np.ones(3, dtype=np.int32)), b=1)
+    with pytest.raises(TypeError):
+        e(a=a, b="x")
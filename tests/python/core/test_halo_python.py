@@ -0,0 +1,125 @@
+"""
+Halo grid tests for CNDA Python bindings.
+
+HaloGrid_* classes pad an interior with ghost layers; fill_halo() matches
+numpy.pad (periodic = 'wrap', reflect = 'symmetric', constant), and
+stencil() applies a weighted sum of neighbours to every interior cell.
+"""
+
+import numpy as np
+import pytest
+import cnda
+
+
+CLASSES = [
+    (cnda.HaloGrid_float, np.float32),
+    (cnda.HaloGrid_double, np.float64),
+]
+
+NUMPY_MODES = {"periodic": "wrap", "reflect": "symmetric"}
+
+
+def make_grid(cls, dtype, shape, halo):
+    g = cls(shape, halo)
+    values = np.arange(np.prod(shape), dtype=dtype).reshape(shape)
+    g.interior().to_numpy()[...] = values
+    return g, values
+
+
+@pytest.mark.parametrize("cls,dtype", CLASSES)
+def test_interior_and_padded_views(cls, dtype):
+    g = cls([3, 4], 2)
+    assert g.shape() == [3, 4]
+    assert g.ndim() == 2
+    assert g.halo() == 2
+    padded = g.padded()
+    assert padded.shape() == [7, 8]
+    interior = g.interior()
+    assert interior.is_view() is True
+    interior[1, 2] = 5
+    assert padded.to_numpy()[3, 4] == 5
+    del g                                       # views keep the buffer alive
+    assert interior.to_numpy()[1, 2] == 5
+
+
+@pytest.mark.parametrize("cls,dtype", CLASSES)
+@pytest.mark.parametrize("mode", ["periodic", "reflect"])
+def test_fill_halo_matches_numpy_pad(cls, dtype, mode):
+    g, values = make_grid(cls, dtype, [4, 5, 6], 2)
+    g.fill_halo(mode)
+    np.testing.assert_array_equal(g.padded().to_numpy(), np.pad(values, 2, mode=NUMPY_MODES[mode]))
+
+
+def test_fill_halo_constant_and_per_axis():
+    g, values = make_grid(cnda.HaloGrid_double, np.float64, [3, 4], 1)
+    g.fill_halo("constant", 7.5)
+    np.testing.assert_array_equal(g.padded().to_numpy(), np.pad(values, 1, constant_values=7.5))
+    g.fill_halo(["constant", "periodic"], -1)
+    expected = np.pad(np.pad(values, [(1, 1), (0, 0)], constant_values=-1), [(0, 0), (1, 1)], mode="wrap")
+    np.testing.assert_array_equal(g.padded().to_numpy(), expected)
+
+    with pytest.raises(ValueError):
+        g.fill_halo("wrap")
+    with pytest.raises(ValueError):
+        g.fill_halo(["periodic"])
+    with pytest.raises(ValueError):
+        cnda.HaloGrid_double([1, 4], 2).fill_halo("reflect")
+
+
+def test_exchange_halo():
+    a, va = make_grid(cnda.HaloGrid_float, np.float32, [3, 4], 1)
+    b, vb = make_grid(cnda.HaloGrid_float, np.float32, [2, 4], 1)
+    a.exchange_halo(b, 0)
+    np.testing.assert_array_equal(a.padded().to_numpy()[4, 1:5], vb[0])
+    np.testing.assert_array_equal(b.padded().to_numpy()[0, 1:5], va[-1])
+    with pytest.raises(ValueError):
+        a.exchange_halo(b, 1)
+    with pytest.raises(ValueError):
+        a.exchange_halo(a, 0)
+
+
+@pytest.mark.parametrize("cls,dtype", CLASSES)
+def test_stencil_laplacian(cls, dtype):
+    g, values = make_grid(cls, dtype, [20, 33], 1)
+    g.fill_halo("periodic")
+    offsets = [(-1, 0), (1, 0), (0, -1), (0, 1), (0, 0)]
+    lap = g.stencil(offsets, [1, 1, 1, 1, -4])
+    expected = sum(np.roll(values, s, axis=a) for s in (1, -1) for a in (0, 1)) - 4 * values
+    np.testing.assert_allclose(lap.to_numpy(), expected)
+
+    # Into another grid's interior, on several threads
+    threads, threshold = cnda.get_num_threads(), cnda.get_parallel_threshold()
+    nxt = cls([20, 33], 1)
+    try:
+        cnda.set_num_threads(3)
+        cnda.set_parallel_threshold(1)
+        out = nxt.interior()
+        assert g.stencil(offsets, [1, 1, 1, 1, -4], out=out) is out
+    finally:
+        cnda.set_num_threads(threads)
+        cnda.set_parallel_threshold(threshold)
+    np.testing.assert_allclose(nxt.interior().to_numpy(), expected)
+
+    with pytest.raises(ValueError):
+        g.stencil([(2, 0)], [1])            # beyond the halo
+    with pytest.raises(ValueError):
+        g.stencil([(1,)], [1])              # wrong rank
+    with pytest.raises(ValueError):
+        g.stencil(offsets, [1])
+
+
+def test_cell_grids():
+    g = cnda.HaloGrid_Cell2D([2, 3], 1)
+    g.interior()[0, 0] = cnda.Cell2D(1.0, 2.0, 5)
+    g.fill_halo("constant", cnda.Cell2D(0.0, 0.0, -1))
+    p = g.padded().to_numpy()
+    assert (p["flag"][0] == -1).all()
+    g.fill_halo("periodic")
+    p = g.padded().to_numpy()
+    assert p["flag"][3, 4] == 5
+    assert p["v"][3, 4] == 2.0
+    assert not hasattr(g, "stencil")
+
+    c = cnda.HaloGrid_Cell3D([2, 2, 2], 1)
+    c.fill_halo("reflect")
+    assert c.padded().shape() == [4, 4, 4]
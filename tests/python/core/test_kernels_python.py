@@ -0,0 +1,211 @@
+"""
+Element-wise kernel tests for CNDA Python bindings.
+
+fill/copy_from/scale/axpy/clip run in C++ on the cnda thread pool with the
+GIL released; the threshold is lowered here so small arrays take the
+parallel path too.
+"""
+
+import threading
+
+import numpy as np
+import pytest
+import cnda
+
+
+CLASSES = [("ContiguousND_int32", np.int32), ("ContiguousND_int64", np.int64),
+           ("ContiguousND_float", np.float32), ("ContiguousND_double", np.float64)]
+
+
+@pytest.fixture(autouse=True)
+def parallel():
+    threads, threshold = cnda.get_num_threads(), cnda.get_parallel_threshold()
+    cnda.set_num_threads(4)
+    cnda.set_parallel_threshold(1)
+    yield
+    cnda.set_num_threads(threads)
+    cnda.set_parallel_threshold(threshold)
+
+
+def test_thread_settings():
+    assert cnda.get_num_threads() == 4
+    cnda.set_num_threads(0)
+    assert cnda.get_num_threads() >= 1
+    assert cnda.get_parallel_threshold() == 1
+
+
+@pytest.mark.parametrize("cls,dtype", CLASSES)
+def test_fill_scale_clip(cls, dtype):
+    a = getattr(cnda, cls)([30, 40])
+    a.fill(3)
+    assert (np.asarray(a) == 3).all()
+
+    src = np.arange(1200, dtype=dtype).reshape(30, 40)
+    a = cnda.from_numpy(src.copy())
+    a.scale(2)
+    np.testing.assert_array_equal(np.asarray(a), src * 2)
+    a.clip(10, 100)
+    np.testing.assert_array_equal(np.asarray(a), np.clip(src * 2, 10, 100))
+
+
+@pytest.mark.parametrize("cls,dtype", CLASSES)
+def test_axpy(cls, dtype):
+    y = cnda.from_numpy(np.arange(100, dtype=dtype))
+    x = getattr(cnda, cls).full([100], 1)
+    y.axpy(3, x)
+    np.testing.assert_array_equal(np.asarray(y), np.arange(100) + 3)
+    with pytest.raises(ValueError):
+        y.axpy(1, getattr(cnda, cls)([99]))
+
+
+@pytest.mark.parametrize("src_cls,src_dtype", CLASSES)
+@pytest.mark.parametrize("dst_cls,dst_dtype", CLASSES)
+def test_casting_copy(src_cls, src_dtype, dst_cls, dst_dtype):
+    src = cnda.from_numpy(np.arange(64, dtype=src_dtype).reshape(8, 8))
+    dst = getattr(cnda, dst_cls)([8, 8])
+    dst.copy_from(src)
+    np.testing.assert_array_equal(np.asarray(dst), np.arange(64, dtype=dst_dtype).reshape(8, 8))
+
+
+def test_casting_truncates():
+    dst = cnda.ContiguousND_int32([3])
+    dst.copy_from(cnda.from_numpy(np.array([1.9, -1.9, 2.0])))
+    assert dst.data() == [1, -1, 2]
+
+
+def test_strided_views():
+    base = np.arange(600, dtype=np.float64).reshape(20, 30)
+    a = cnda.from_numpy(base)
+    v = a[::2, 1::3]
+    v.fill(-1.0)
+    assert (base[::2, 1::3] == -1).all()
+    assert base[1, 1] == 31
+
+    packed = cnda.ContiguousND_float([10, 10])
+    packed.copy_from(v)
+    assert (np.asarray(packed) == -1).all()
+
+
+def test_overlapping_operands():
+    # The source is read as it was before the call, like NumPy
+    x = np.arange(10.0)
+    b = cnda.from_numpy(x)
+    b[1:].copy_from(b[:-1])
+    np.testing.assert_array_equal(x, [0, 0, 1, 2, 3, 4, 5, 6, 7, 8])
+
+    x = np.arange(10.0)
+    b = cnda.from_numpy(x)
+    b[:-1].axpy(2.0, b[1:])
+    np.testing.assert_array_equal(x[:-1], np.arange(9.0) + 2 * np.arange(1.0, 10.0))
+
+    # Casting copy from an overlapping view of another dtype
+    x = np.arange(16, dtype=np.int64)
+    a = cnda.from_numpy(x)
+    d = cnda.from_numpy(x.view(np.float64))
+    d[1:].copy_from(a[:-1])
+    np.testing.assert_array_equal(x.view(np.float64), np.arange(-1.0, 15.0).clip(0))
+
+    # The same view is its own source
+    t = np.arange(12.0).reshape(3, 4)
+    v = cnda.from_numpy(t)[:, 1:]
+    v.axpy(1.0, v)
+    np.testing.assert_array_equal(t[:, 1:], 2 * np.arange(12.0).reshape(3, 4)[:, 1:])
+
+
+def test_aos_fill_and_copy():
+    a = cnda.ContiguousND_Cell2D([50])
+    a.fill(cnda.Cell2D(1.0, 2.0, 7))
+    b = cnda.ContiguousND_Cell2D([50])
+    b.copy_from(a)
+    assert (b.to_numpy()["flag"] == 7).all()
+    assert not hasattr(a, "scale")
+    with pytest.raises(TypeError):
+        b.copy_from(cnda.ContiguousND_Vec2f([50]))
+
+
+def test_errors(tmp_path):
+    a = cnda.ContiguousND_double([4])
+    with pytest.raises(ValueError):
+        a.clip(1.0, 0.0)
+    with pytest.raises(ValueError):
+        a.copy_from(cnda.ContiguousND_double([5]))
+    with pytest.raises(TypeError):
+        a.copy_from(np.zeros(4))
+
+    path = str(tmp_path / "r.npy")
+    np.save(path, np.zeros(4))
+    ro = cnda.open_mmap(path)
+    with pytest.raises(ValueError):
+        ro.fill(1.0)
+
+
+def test_kernels_release_the_gil():
+    arrays = [cnda.ContiguousND_double([200000]) for _ in range(4)]
+
+    def work(a):
+        for _ in range(5):
+            a.fill(1.0)
+            a.scale(2.0)
+
+    threads = [threading.Thread(target=work, args=(a,)) for a in arrays]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for a in arrays:
+        assert (np.asarray(a) == 2.0).all()
+
+
+@pytest.mark.parametrize("name, dtype", CLASSES)
+def test_in_place_operators(name, dtype):
+    a = cnda.from_numpy(np.arange(12, dtype=dtype).reshape(3, 4))
+    b = cnda.from_numpy(np.ones((3, 4), dtype=dtype))
+    before = a
+    a += 2
+    a -= b
+    a *= 3
+    assert a is before
+    assert np.asarray(a).tolist() == (3 * (np.arange(12) + 1)).reshape(3, 4).tolist()
+    with pytest.raises(ValueError):
+        a += cnda.from_numpy(np.ones(12, dtype=dtype))
+
+
+def test_in_place_operators_write_through_slices():
+    x = np.arange(20, dtype=np.float64).reshape(4, 5)
+    a = cnda.from_numpy(x)
+    a[1:3, ::2] *= 0.5
+    a[0:1] /= 4
+    assert x[1].tolist() == [2.5, 6.0, 3.5, 8.0, 4.5]
+    assert x[0].tolist() == [0.0, 0.25, 0.5, 0.75, 1.0]
+    assert x[3, 0] == 15.0
+
+
+def test_in_place_operators_with_overlapping_operands():
+    # The operand keeps its values from before the update, as in NumPy
+    ref = np.arange(10.0)
+    ref[1:] += ref[:-1]
+    b = cnda.from_numpy(np.arange(10.0))
+    x = b[1:]
+    x += b[:-1]
+    np.testing.assert_array_equal(np.asarray(b), ref)
+    assert np.asarray(b)[1:4].tolist() == [1.0, 3.0, 5.0]
+
+    ref = np.arange(16.0).reshape(4, 4)
+    ref -= ref.T.copy()
+    m = cnda.from_numpy(np.arange(16.0).reshape(4, 4))
+    m -= m.transpose()
+    np.testing.assert_array_equal(np.asarray(m), ref)
+
+    m *= m
+    np.testing.assert_array_equal(np.asarray(m), ref * ref)
+
+
+def test_in_place_operators_reject_other_operands():
+    i = cnda.ContiguousND_int32([4])
+    with pytest.raises(TypeError):
+        i *= 0.5
+    with pytest.raises(TypeError):
+        i /= 2
+    d = cnda.ContiguousND_double([4])
+    with pytest.raises(TypeError):
+        d += "1"
@@ -0,0 +1,127 @@
+"""
+Memory-layout tests for CNDA Python bindings.
+
+Column-major (order="F") arrays, zero-copy import of Fortran-ordered
+ndarrays, transpose() views, and copy(order) through the tiled layout copy.
+"""
+
+import gc
+
+import numpy as np
+import pytest
+import cnda
+
+
+CLASSES = [
+    (cnda.ContiguousND_float, np.float32),
+    (cnda.ContiguousND_double, np.float64),
+    (cnda.ContiguousND_int32, np.int32),
+    (cnda.ContiguousND_int64, np.int64),
+]
+
+
+@pytest.mark.parametrize("cls,dtype", CLASSES)
+def test_f_ordered_construction(cls, dtype):
+    for a in (cls([3, 4, 5], order="F"), cls.zeros([3, 4, 5], order="F"),
+              cls.empty([3, 4, 5], order="F"), cls.full([3, 4, 5], 2, order="F")):
+        assert a.strides() == [1, 3, 12]
+        assert a.is_f_contiguous() is True
+        assert a.is_contiguous() is False
+        x = a.to_numpy()
+        assert x.flags.f_contiguous
+        assert x.dtype == dtype
+    assert cls.full([2, 2], 7, order="F").to_numpy().tolist() == [[7, 7], [7, 7]]
+    with pytest.raises(ValueError, match="order must be 'C' or 'F'"):
+        cls([2], order="K")
+
+
+def test_f_ordered_indexing_matches_numpy():
+    a = cnda.ContiguousND_double([3, 4], order="F")
+    x = a.to_numpy()
+    x[...] = np.arange(12).reshape(3, 4)
+    assert a[1, 2] == 6.0
+    assert a.at((2, 3)) == 11.0
+    assert a.data() == list(range(12))  # row-major element order
+    a[0, 1] = -1.0
+    assert x[0, 1] == -1.0
+
+
+def test_from_numpy_wraps_fortran_arrays():
+    x = np.asfortranarray(np.arange(24, dtype=np.float32).reshape(2, 3, 4))
+    with pytest.raises(ValueError, match="C-contiguous"):
+        cnda.from_numpy(x)
+    a = cnda.from_numpy(x, order="F")
+    assert a.is_view() is True
+    assert a.data_ptr() == x.ctypes.data
+    assert a.strides() == [1, 2, 6]
+    assert a[1, 2, 3] == x[1, 2, 3]
+    a[0, 0, 1] = 100
+    assert x[0, 0, 1] == 100
+    del x
+    gc.collect()
+    assert a[0, 0, 1] == 100
+
+    c = np.arange(6, dtype=np.int64).reshape(2, 3)
+    with pytest.raises(ValueError, match="F-contiguous"):
+        cnda.from_numpy(c, order="F")
+    b = cnda.from_numpy(c, copy=True, order="F")
+    assert b.is_f_contiguous() and not b.is_view()
+    np.testing.assert_array_equal(b.to_numpy(), c)
+    with pytest.raises(ValueError):
+        cnda.from_numpy(c, order="X")
+
+
+@pytest.mark.parametrize("cls,dtype", CLASSES)
+def test_transpose_views(cls, dtype):
+    x = np.arange(60).astype(dtype).reshape(3, 4, 5)
+    a = cnda.from_numpy(x.copy())
+    t = a.transpose()
+    assert t.shape() == [5, 4, 3]
+    assert t.is_f_contiguous() and t.is_view()
+    assert t.data_ptr() == a.data_ptr()
+    np.testing.assert_array_equal(t.to_numpy(), x.T)
+    p = a.transpose([1, 2, 0])
+    np.testing.assert_array_equal(p.to_numpy(), x.transpose(1, 2, 0))
+    p[3, 4, 2] = 0
+    assert a[2, 3, 4] == 0
+    with pytest.raises(ValueError):
+        a.transpose([0, 0, 1])
+    with pytest.raises(ValueError):
+        a.transpose([0, 1])
+
+
+@pytest.mark.parametrize("cls,dtype", CLASSES)
+def test_copy_in_order(cls, dtype):
+    x = np.arange(37 * 70 * 45).astype(dtype).reshape(37, 70, 45)
+    a = cnda.from_numpy(x)
+    f = a.copy(order="F")
+    assert f.is_f_contiguous() and not f.is_view()
+    np.testing.assert_array_equal(f.to_numpy(), x)
+    c = f.copy()
+    assert c.is_contiguous()
+    np.testing.assert_array_equal(c.to_numpy(), x)
+    for axes in ([0, 2, 1], [1, 0, 2], [2, 0, 1], [2, 1, 0]):
+        v = a.transpose(axes).copy()
+        np.testing.assert_array_equal(v.to_numpy(), x.transpose(axes))
+    s = a[1:30:3, ::2].copy(order="F")
+    np.testing.assert_array_equal(s.to_numpy(), x[1:30:3, ::2])
+    with pytest.raises(ValueError):
+        a.copy(order="A")
+
+
+def test_copy_from_between_layouts():
+    x = np.random.default_rng(1).random((64, 48))
+    src = cnda.from_numpy(x)
+    dst = cnda.ContiguousND_double([48, 64], order="F")
+    dst.copy_from(src.transpose())
+    np.testing.assert_array_equal(dst.to_numpy(), x.T)
+
+
+def test_aos_transpose_and_copy():
+    c = cnda.ContiguousND_Vec2f([3, 4])
+    arr = c.to_numpy()
+    arr['x'] = np.arange(12).reshape(3, 4)
+    f = c.copy(order="F")
+    assert f.is_f_contiguous()
+    np.testing.assert_array_equal(f.to_numpy()['x'], arr['x'])
+    np.testing.assert_array_equal(c.transpose().to_numpy()['x'], arr['x'].T)
@@ -0,0 +1,135 @@
+"""
+Memory-mapped file tests for CNDA Python bindings.
+
+open_mmap() wraps a raw file or a .npy file in a ContiguousND_* view whose
+data pointer is the mapping itself; nothing is read until it is touched.
+"""
+
+import numpy as np
+import pytest
+import cnda
+
+
+@pytest.fixture
+def npy_file(tmp_path):
+    path = tmp_path / "a.npy"
+    np.save(path, np.arange(12, dtype=np.float32).reshape(3, 4))
+    return str(path)
+
+
+def test_read_npy_header(npy_file):
+    h = cnda.read_npy_header(npy_file)
+    assert h["descr"] == "<f4"
+    assert h["fortran_order"] is False
+    assert h["shape"] == (3, 4)
+    assert h["offset"] % 64 == 0
+
+
+def test_open_npy_read_only(npy_file):
+    a = cnda.open_mmap(npy_file)
+    assert isinstance(a, cnda.ContiguousND_float)
+    assert a.shape() == [3, 4]
+    assert a.is_view() and a.is_mapped()
+    assert a[2, 3] == 11.0
+    n = np.asarray(a)
+    np.testing.assert_array_equal(n, np.load(npy_file))
+    assert not n.flags.writeable
+    assert memoryview(a).readonly
+    assert not a.to_numpy().flags.writeable
+
+
+def test_read_only_rejects_writes(npy_file):
+    a = cnda.open_mmap(npy_file, mode="r")
+    with pytest.raises(ValueError):
+        a[0, 0] = 1.0
+    with pytest.raises(ValueError):
+        a[0:2, :] = 1.0
+    with pytest.raises(ValueError):
+        a.put(np.array([0]), np.array([1.0], dtype=np.float32))
+
+
+def test_read_only_rejects_soa_copy_to_aos(tmp_path):
+    path = str(tmp_path / "cells.npy")
+    np.save(path, cnda.ContiguousND_Cell2D([2, 3]).to_numpy())
+    a = cnda.open_mmap(path, mode="r")
+    assert isinstance(a, cnda.ContiguousND_Cell2D)
+    with pytest.raises(ValueError):
+        cnda.SoA_Cell2D([2, 3]).copy_to_aos(a)
+
+
+def test_read_write_mode_writes_to_file(npy_file):
+    a = cnda.open_mmap(npy_file, mode="r+")
+    a[1, 1] = 99.0
+    a[2, :] = -1.0
+    a.flush()
+    on_disk = np.load(npy_file)
+    assert on_disk[1, 1] == 99.0
+    np.testing.assert_array_equal(on_disk[2], -1.0)
+
+
+def test_copy_on_write_mode_keeps_file(npy_file):
+    a = cnda.open_mmap(npy_file, mode="c")
+    a[0, 0] = -5.0
+    assert a[0, 0] == -5.0
+    assert np.load(npy_file)[0, 0] == 0.0
+
+
+def test_raw_file_with_dtype_and_shape(tmp_path):
+    path = str(tmp_path / "raw.bin")
+    np.arange(10, dtype=np.int64).tofile(path)
+
+    whole = cnda.open_mmap(path, "int64")
+    assert isinstance(whole, cnda.ContiguousND_int64)
+    assert whole.shape() == [10]
+
+    a = cnda.open_mmap(path, np.int64, (2, 2), offset=16)
+    assert a.data() == [2, 3, 4, 5]
+
+
+def test_views_keep_the_mapping_alive(npy_file):
+    a = cnda.open_mmap(npy_file)
+    row = a[1:, ::2]
+    n = a.to_numpy()
+    del a
+    assert row.is_mapped()
+    assert row.data() == [4.0, 6.0, 8.0, 10.0]
+    assert n[2, 3] == 11.0
+
+
+def test_madvise(npy_file):
+    a = cnda.open_mmap(npy_file)
+    for advice in ("sequential", "random", "willneed", "normal"):
+        a.madvise(advice)
+    with pytest.raises(ValueError):
+        a.madvise("soon")
+
+
+def test_structured_npy(tmp_path):
+    path = str(tmp_path / "cells.npy")
+    dt = np.dtype([("u", "<f4"), ("v", "<f4"), ("flag", "<i4")])
+    cells = np.zeros(5, dtype=dt)
+    cells["flag"] = np.arange(5)
+    np.save(path, cells)
+
+    a = cnda.open_mmap(path)
+    assert isinstance(a, cnda.ContiguousND_Cell2D)
+    assert a[3].flag == 3
+    np.testing.assert_array_equal(a.to_numpy()["flag"], np.arange(5))
+
+
+def test_errors(tmp_path, npy_file):
+    raw = str(tmp_path / "raw.bin")
+    np.zeros(4, dtype=np.float32).tofile(raw)
+    with pytest.raises(ValueError):
+        cnda.open_mmap(raw, "float", [5])
+    with pytest.raises(ValueError):
+        cnda.open_mmap(npy_file, mode="w")
+    with pytest.raises(OSError):
+        cnda.open_mmap(str(tmp_path / "missing.npy"))
+    with pytest.raises(TypeError):
+        cnda.open_mmap(raw, np.complex64)
+    with pytest.raises(ValueError):
+        cnda.ContiguousND_float([2]).flush()
+    np.save(str(tmp_path / "f.npy"), np.asfortranarray(np.ones((2, 3))))
+    with pytest.raises(ValueError):
+        cnda.open_mmap(str(tmp_path / "f.npy"))
@@ -0,0 +1,93 @@
+"""
+.npy save/load tests for CNDA Python bindings.
+
+save() writes straight from the buffer (optionally in chunk_bytes pieces);
+load() picks the ContiguousND_* class from the file's dtype. Files are
+interchangeable with np.save / np.load.
+"""
+
+import numpy as np
+import pytest
+import cnda
+
+
+CLASSES = [("ContiguousND_int32", np.int32), ("ContiguousND_int64", np.int64),
+           ("ContiguousND_float", np.float32), ("ContiguousND_double", np.float64)]
+
+
+@pytest.mark.parametrize("cls,dtype", CLASSES)
+@pytest.mark.parametrize("chunk_bytes", [0, 16, 1 << 20])
+def test_round_trip(tmp_path, cls, dtype, chunk_bytes):
+    path = str(tmp_path / "a.npy")
+    src = np.arange(60, dtype=dtype).reshape(3, 4, 5)
+    a = cnda.from_numpy(src)
+    a.save(path, chunk_bytes=chunk_bytes)
+
+    np.testing.assert_array_equal(np.load(path), src)
+    b = cnda.load(path, chunk_bytes=chunk_bytes)
+    assert type(b).__name__ == cls
+    assert b.is_view() is False
+    np.testing.assert_array_equal(np.asarray(b), src)
+
+
+def test_load_file_written_by_numpy(tmp_path):
+    path = str(tmp_path / "n.npy")
+    src = np.linspace(0, 1, 11)
+    np.save(path, src)
+    np.testing.assert_array_equal(np.asarray(cnda.load(path)), src)
+
+
+def test_save_strided_view(tmp_path):
+    path = str(tmp_path / "v.npy")
+    src = np.arange(48, dtype=np.float64).reshape(6, 8)
+    view = cnda.from_numpy(src)[1::2, ::3]
+    view.save(path, chunk_bytes=8)
+    np.testing.assert_array_equal(np.load(path), src[1::2, ::3])
+
+
+def test_aos_round_trip(tmp_path):
+    path = str(tmp_path / "p.npy")
+    a = cnda.ContiguousND_Particle([4])
+    n = a.to_numpy()
+    n["x"] = np.arange(4)
+    n["mass"] = 2.0
+    a.save(path)
+
+    on_disk = np.load(path)
+    assert on_disk.dtype.names == ("x", "y", "z", "vx", "vy", "vz", "mass")
+    np.testing.assert_array_equal(on_disk["x"], np.arange(4))
+
+    b = cnda.load(path)
+    assert isinstance(b, cnda.ContiguousND_Particle)
+    assert b[3].x == 3.0 and b[3].mass == 2.0
+
+
+def test_mapped_array_can_be_saved(tmp_path):
+    src_path, dst_path = str(tmp_path / "src.npy"), str(tmp_path / "dst.npy")
+    np.save(src_path, np.arange(10, dtype=np.int32))
+    cnda.open_mmap(src_path).save(dst_path, chunk_bytes=12)
+    np.testing.assert_array_equal(np.load(dst_path), np.arange(10))
+
+
+def test_errors(tmp_path):
+    with pytest.raises(OSError):
+        cnda.load(str(tmp_path / "missing.npy"))
+    with pytest.raises(OSError):
+        cnda.ContiguousND_float([2]).save(str(tmp_path / "no_dir" / "a.npy"))
+
+    path = str(tmp_path / "c.npy")
+    np.save(path, np.zeros(3, dtype=np.complex128))
+    with pytest.raises(TypeError):
+        cnda.load(path)
+
+    path = str(tmp_path / "f.npy")
+    np.save(path, np.asfortranarray(np.ones((2, 3))))
+    with pytest.raises(ValueError):
+        cnda.load(path)
+
+    path = str(tmp_path / "t.npy")
+    np.save(path, np.ones(100))
+    with open(path, "r+b") as f:
+        f.truncate(200)
+    with pytest.raises(OSError):
+        cnda.load(path)
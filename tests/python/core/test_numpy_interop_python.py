@@ -0,0 +1,113 @@
+"""
+NumPy interop tests for CNDA Python bindings.
+
+Covers cnda.from_numpy() and ContiguousND_*.to_numpy() for the scalar types:
+zero-copy round trips, lifetime of exported views, and the copy=True path.
+"""
+
+import gc
+
+import numpy as np
+import pytest
+import cnda
+
+
+@pytest.mark.parametrize("dtype, cls", [
+    (np.int32, "ContiguousND_int32"),
+    (np.int64, "ContiguousND_int64"),
+    (np.float32, "ContiguousND_float"),
+    (np.float64, "ContiguousND_double"),
+])
+def test_from_numpy_picks_class_from_dtype(dtype, cls):
+    x = np.arange(12, dtype=dtype).reshape(3, 4)
+    a = cnda.from_numpy(x)
+    assert type(a).__name__ == cls
+    assert a.shape() == [3, 4]
+    assert a.strides() == [4, 1]
+    assert a.is_view() is True
+    assert a.data_ptr() == x.ctypes.data
+
+
+def test_round_trip_is_zero_copy():
+    x = np.arange(12, dtype=np.float32).reshape(3, 4)
+    a = cnda.from_numpy(x, copy=False)
+    y = a.to_numpy(copy=False)
+    y[1, 2] = 42
+    assert x[1, 2] == 42
+    assert a[1, 2] == 42
+    assert y.ctypes.data == x.ctypes.data
+
+
+def test_from_numpy_view_keeps_source_alive():
+    a = cnda.from_numpy(np.arange(6, dtype=np.int64))
+    gc.collect()
+    assert a[5] == 5
+
+
+def test_to_numpy_view_outlives_wrapper():
+    x = np.arange(6, dtype=np.float64)
+    y = cnda.from_numpy(x).to_numpy()
+    del x
+    gc.collect()
+    assert y.tolist() == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+
+
+def test_to_numpy_on_owning_array():
+    b = cnda.ContiguousND_float([2, 3])
+    B = b.to_numpy(copy=False)
+    B.fill(7.0)
+    assert b[1, 2] == 7.0
+    assert B.ctypes.data == b.data_ptr()
+    del b
+    gc.collect()
+    assert (B == 7.0).all()
+
+
+def test_to_numpy_copy_isolates_buffer():
+    b = cnda.ContiguousND_int32([4])
+    b[0] = 1
+    B = b.to_numpy(copy=True)
+    B[0] = 99
+    assert b[0] == 1
+    assert B.ctypes.data != b.data_ptr()
+
+
+def test_non_contiguous_requires_copy():
+    x = np.arange(12, dtype=np.float64).reshape(3, 4).T
+    with pytest.raises(ValueError, match="C-contiguous"):
+        cnda.from_numpy(x)
+
+    a = cnda.from_numpy(x, copy=True)
+    assert a.is_view() is False
+    assert a.shape() == [4, 3]
+    np.testing.assert_array_equal(a.to_numpy(), x)
+
+
+def test_read_only_requires_copy():
+    x = np.arange(4, dtype=np.int32)
+    x.flags.writeable = False
+    with pytest.raises(ValueError, match="read-only"):
+        cnda.from_numpy(x)
+    a = cnda.from_numpy(x, copy=True)
+    assert a.data_ptr() != x.ctypes.data
+    assert a.data() == [0, 1, 2, 3]
+
+
+def test_unsupported_dtype_raises_type_error():
+    with pytest.raises(TypeError):
+        cnda.from_numpy(np.zeros(3, dtype=np.float16))
+    with pytest.raises(TypeError):
+        cnda.from_numpy(np.zeros(3, dtype=">i4"))
+
+
+def test_byte_swapped_input_is_converted_on_copy():
+    x = np.arange(4, dtype=">i4")
+    a = cnda.from_numpy(x, copy=True)
+    assert type(a).__name__ == "ContiguousND_int32"
+    assert a.data() == [0, 1, 2, 3]
+
+
+def test_zero_sized_round_trip():
+    a = cnda.from_numpy(np.zeros((0, 5), dtype=np.float32))
+    assert a.size() == 0
+    assert a.to_numpy().shape == (0, 5)
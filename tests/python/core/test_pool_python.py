@@ -0,0 +1,108 @@
+"""
+Buffer pool tests for CNDA Python bindings.
+
+enable_pool() makes new ContiguousND_* buffers come from a size-class pool
+that keeps released blocks (up to a byte cap) for reuse; pool_stats()
+reports its counters.
+"""
+
+import numpy as np
+import pytest
+import cnda
+
+
+CLASSES = [("ContiguousND_int32", np.int32), ("ContiguousND_int64", np.int64),
+           ("ContiguousND_float", np.float32), ("ContiguousND_double", np.float64),
+           ("ContiguousND_Particle", None)]
+
+
+@pytest.fixture(autouse=True)
+def no_pool():
+    cnda.disable_pool()
+    yield
+    cnda.disable_pool()
+
+
+def test_disabled_by_default():
+    assert cnda.pool_stats() is None
+    cnda.ContiguousND_double([4])
+    assert cnda.pool_stats() is None
+
+
+@pytest.mark.parametrize("cls,dtype", CLASSES)
+def test_repeated_shapes_hit(cls, dtype):
+    cnda.enable_pool(1 << 20)
+    for _ in range(10):
+        a = getattr(cnda, cls).zeros([32, 16])
+        assert a.size() == 512
+        del a
+    s = cnda.pool_stats()
+    assert s["misses"] == 1
+    assert s["hits"] == 9
+    assert s["bytes_in_use"] == 0
+    assert s["bytes_held"] > 0
+    assert s["capacity"] == 1 << 20
+
+
+def test_reused_buffers_are_reinitialized():
+    cnda.enable_pool()
+    a = cnda.ContiguousND_double.full([100], 7.0)
+    del a
+    b = cnda.ContiguousND_double([100])
+    assert (b.to_numpy() == 0).all()
+    del b
+    c = cnda.ContiguousND_double.full([100], 3.0)
+    assert (c.to_numpy() == 3.0).all()
+    assert cnda.pool_stats()["hits"] == 2
+
+
+def test_views_keep_pooled_buffers_in_use():
+    cnda.enable_pool()
+    a = cnda.ContiguousND_float.full([64, 64], 1.0)
+    arr = np.asarray(a)
+    view = a[::2, ::2]
+    del a
+    assert cnda.pool_stats()["bytes_in_use"] == 64 * 64 * 4
+    del view
+    assert arr.sum() == 64 * 64
+    del arr
+    s = cnda.pool_stats()
+    assert s["bytes_in_use"] == 0
+    assert s["bytes_held"] == 64 * 64 * 4
+
+
+def test_capacity_evicts_oldest_blocks():
+    cnda.enable_pool(3 * 4096)
+    arrays = [cnda.ContiguousND_int32([1024]) for _ in range(5)]
+    del arrays
+    s = cnda.pool_stats()
+    assert s["bytes_held"] == 3 * 4096
+    assert s["evictions"] == 2
+
+    # Lowering the cap trims right away; enable_pool() on an active pool
+    # only changes the cap
+    cnda.enable_pool(4096)
+    s = cnda.pool_stats()
+    assert s["bytes_held"] == 4096
+    assert s["capacity"] == 4096
+    assert s["misses"] == 5
+
+
+def test_load_uses_the_pool(tmp_path):
+    path = str(tmp_path / "a.npy")
+    np.save(path, np.arange(256, dtype=np.float64))
+    cnda.enable_pool()
+    for _ in range(3):
+        a = cnda.load(path)
+        assert a.to_numpy()[255] == 255
+        del a
+    assert cnda.pool_stats()["hits"] == 2
+
+
+def test_disable_keeps_live_arrays_valid():
+    cnda.enable_pool()
+    a = cnda.ContiguousND_int64.full([10], 5)
+    cnda.disable_pool()
+    assert cnda.pool_stats() is None
+    assert a.to_numpy().sum() == 50
+    del a
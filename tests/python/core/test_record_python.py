@@ -0,0 +1,168 @@
+"""
+Run-time record tests for CNDA Python bindings.
+
+ContiguousND_record holds records whose layout comes from any structured
+NumPy dtype: zero-copy import/export, typed field views, slices, and bulk
+take()/put() of whole records.
+"""
+
+import gc
+
+import numpy as np
+import pytest
+import cnda
+
+
+# A 9-field production record with mixed f4/f8/i2 and a string tag
+CELL = np.dtype([('rho', '<f8'), ('u', '<f4'), ('v', '<f4'), ('w', '<f4'),
+                 ('p', '<f4'), ('e', '<f8'), ('phase', '<i2'), ('mat', '<i2'),
+                 ('tag', 'S4')])
+
+
+def make_cells(shape):
+    x = np.zeros(shape, dtype=CELL)
+    n = x.size
+    x['rho'] = np.arange(n).reshape(shape)
+    x['p'] = -np.arange(n).reshape(shape)
+    x['phase'] = np.arange(n).reshape(shape) % 3
+    return x
+
+
+def test_construction_and_metadata():
+    a = cnda.ContiguousND_record([3, 4], CELL)
+    assert a.dtype == CELL
+    assert a.shape() == [3, 4]
+    assert a.itemsize() == CELL.itemsize == 40
+    assert a.strides() == [160, 40]
+    assert a.is_view() is False
+    assert a.is_contiguous() is True
+    assert (a.to_numpy() == np.zeros((3, 4), dtype=CELL)).all()
+
+
+def test_from_numpy_is_zero_copy_both_ways():
+    x = make_cells((2, 5))
+    a = cnda.ContiguousND_record.from_numpy(x)
+    assert a.is_view() is True
+    assert a.data_ptr() == x.ctypes.data
+    out = a.to_numpy()
+    assert np.shares_memory(out, x)
+    assert out.dtype == CELL
+    assert np.shares_memory(np.asarray(a), x)
+    del a
+    gc.collect()
+    out['mat'][1, 4] = 9
+    assert x['mat'][1, 4] == 9
+
+
+def test_from_numpy_copy_rules():
+    x = make_cells(8)
+    with pytest.raises(ValueError, match="C-contiguous"):
+        cnda.ContiguousND_record.from_numpy(x[::2])
+    a = cnda.ContiguousND_record.from_numpy(x[::2], copy=True)
+    assert a.is_view() is False
+    assert a.to_numpy()['rho'].tolist() == [0.0, 2.0, 4.0, 6.0]
+    x.flags.writeable = False
+    with pytest.raises(ValueError, match="read-only"):
+        cnda.ContiguousND_record.from_numpy(x)
+
+
+def test_field_views():
+    x = make_cells((3, 4))
+    a = cnda.ContiguousND_record.from_numpy(x)
+    rho = a.field("rho")
+    assert type(rho).__name__ == "ContiguousND_double"
+    assert rho.strides() == [20, 5]
+    rho *= 2
+    assert x['rho'][2, 3] == 22.0
+    p = a.field("p")
+    assert type(p).__name__ == "ContiguousND_float"
+    assert np.shares_memory(p.to_numpy(), x)
+    assert p.to_numpy()[1, 1] == -5.0
+    with pytest.raises(TypeError, match="to_numpy"):
+        a.field("phase")
+    with pytest.raises(KeyError):
+        a.field("missing")
+
+
+def test_misaligned_field_is_rejected():
+    packed = np.dtype([('flag', '<i1'), ('x', '<f8')])
+    a = cnda.ContiguousND_record([4], packed)
+    with pytest.raises(ValueError):
+        a.field("x")
+    assert a.to_numpy()['x'].shape == (4,)
+
+
+def test_slices_are_record_views():
+    x = make_cells((4, 6))
+    a = cnda.ContiguousND_record.from_numpy(x)
+    s = a[1:4:2, ::3]
+    assert s.shape() == [2, 2]
+    assert s.strides() == [480, 120]
+    assert s.is_view() is True
+    assert s.is_contiguous() is False
+    assert s.to_numpy()['rho'].tolist() == [[6.0, 9.0], [18.0, 21.0]]
+    s.field("rho").fill(0.0)
+    assert x['rho'][3, 3] == 0.0
+    # A bare integer goes through NumPy: a structured view of the row
+    row = a[2]
+    assert np.shares_memory(row, x)
+    assert row['phase'].tolist() == x['phase'][2].tolist()
+
+
+def test_element_access_goes_through_numpy():
+    a = cnda.ContiguousND_record([2, 2], CELL)
+    a[1, 0] = (1.5, 0, 0, 0, 0, 0, 2, 3, b'ab')
+    rec = a[1, 0]
+    assert rec['rho'] == 1.5
+    assert rec['tag'] == b'ab'
+    rec['mat'] = 7
+    assert a.to_numpy()['mat'][1, 0] == 7
+
+
+def test_take_and_put_whole_records():
+    a = cnda.ContiguousND_record.from_numpy(make_cells((3, 4)))
+    rows = a.take(np.array([0, 5, 11]))
+    assert rows.dtype == CELL
+    assert rows['rho'].tolist() == [0.0, 5.0, 11.0]
+    assert a.take(np.array([[1, 1], [2, 3]]))['p'].tolist() == [-5.0, -11.0]
+
+    new = np.zeros(2, dtype=CELL)
+    new['tag'] = [b'left', b'rite']
+    a.put(np.array([1, 2]), new)
+    assert a.to_numpy()['tag'][0].tolist() == [b'', b'left', b'rite', b'']
+    a.put(np.array([[2, 0], [2, 1]]), new[:1])
+    assert a.to_numpy()['tag'][2, :2].tolist() == [b'left', b'left']
+
+    with pytest.raises(IndexError):
+        a.take(np.array([12]))
+    with pytest.raises(IndexError):
+        a.put(np.array([0, 12]), new)
+    assert a.to_numpy()['tag'][0, 0] == b''
+    with pytest.raises(ValueError):
+        a.put(np.array([0, 1, 2]), new)
+    with pytest.raises(TypeError):
+        a.take(np.array([0.5, 1.5]))
+    with pytest.raises(TypeError):
+        a.put(np.ones(12, dtype=bool), new[:1])
+
+
+def test_nested_and_byte_swapped_fields_round_trip():
+    dt = np.dtype([('pos', '<f4', (3,)), ('id', '>i4'), ('inner', [('a', '<i2'), ('b', '<i2')])])
+    x = np.zeros(3, dtype=dt)
+    x['pos'][1] = [1, 2, 3]
+    x['id'] = [7, 8, 9]
+    a = cnda.ContiguousND_record.from_numpy(x)
+    out = a.to_numpy(copy=True)
+    assert not np.shares_memory(out, x)
+    assert out['pos'][1].tolist() == [1.0, 2.0, 3.0]
+    assert out['id'].tolist() == [7, 8, 9]
+    for name in ("pos", "id", "inner"):
+        with pytest.raises(TypeError):
+            a.field(name)
+
+
+def test_unsupported_dtypes():
+    with pytest.raises(TypeError):
+        cnda.ContiguousND_record([2], np.float64)
+    with pytest.raises(TypeError):
+        cnda.ContiguousND_record([2], [('obj', 'O'), ('x', '<f8')])
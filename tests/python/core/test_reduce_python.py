@@ -0,0 +1,137 @@
+"""
+Reduction tests for CNDA Python bindings.
+
+sum/mean/min/max/argmax are checked against NumPy for full and axis-wise
+reductions, on contiguous arrays and strided views, and per field on AoS
+classes. The threshold is lowered so small arrays take the parallel path.
+"""
+
+import numpy as np
+import pytest
+import cnda
+
+
+CLASSES = [("ContiguousND_int32", np.int32), ("ContiguousND_int64", np.int64),
+           ("ContiguousND_float", np.float32), ("ContiguousND_double", np.float64)]
+
+
+@pytest.fixture(autouse=True)
+def parallel():
+    threads, threshold = cnda.get_num_threads(), cnda.get_parallel_threshold()
+    cnda.set_num_threads(4)
+    cnda.set_parallel_threshold(1)
+    yield
+    cnda.set_num_threads(threads)
+    cnda.set_parallel_threshold(threshold)
+
+
+def sample(dtype, shape=(6, 7, 8)):
+    rng = np.random.default_rng(7)
+    return rng.integers(-50, 50, size=shape).astype(dtype)
+
+
+@pytest.mark.parametrize("cls,dtype", CLASSES)
+def test_full_reductions(cls, dtype):
+    ref = sample(dtype)
+    a = cnda.from_numpy(ref)
+    assert a.sum() == pytest.approx(ref.sum(dtype=np.float64))
+    assert a.mean() == pytest.approx(ref.mean(dtype=np.float64))
+    assert a.min() == ref.min()
+    assert a.max() == ref.max()
+    assert a.argmax() == ref.argmax()
+
+
+@pytest.mark.parametrize("cls,dtype", CLASSES)
+@pytest.mark.parametrize("axis", [0, 1, 2, -1])
+def test_axis_reductions(cls, dtype, axis):
+    ref = sample(dtype)
+    a = cnda.from_numpy(ref)
+    np.testing.assert_allclose(a.sum(axis=axis).to_numpy(), ref.sum(axis=axis), rtol=1e-6)
+    np.testing.assert_allclose(a.mean(axis=axis).to_numpy(), ref.mean(axis=axis, dtype=np.float64))
+    np.testing.assert_array_equal(a.min(axis).to_numpy(), ref.min(axis=axis))
+    np.testing.assert_array_equal(a.max(axis).to_numpy(), ref.max(axis=axis))
+    np.testing.assert_array_equal(a.argmax(axis).to_numpy(), ref.argmax(axis=axis))
+
+
+def test_result_dtypes():
+    a = cnda.ContiguousND_int32([3, 4])
+    assert a.sum(axis=0).to_numpy().dtype == np.int64
+    assert a.mean(axis=0).to_numpy().dtype == np.float64
+    assert a.min(axis=0).to_numpy().dtype == np.int32
+    assert a.argmax(axis=0).to_numpy().dtype == np.int64
+    assert isinstance(a.sum(), int)
+
+
+def test_int32_sum_does_not_overflow():
+    a = cnda.ContiguousND_int32.full([1000], 3_000_000)
+    assert a.sum() == 3_000_000_000
+
+
+def test_strided_views():
+    ref = sample(np.float64)
+    a = cnda.from_numpy(ref)
+    v = a[1:6:2, 0:7:3, 1:8:2]
+    r = ref[1:6:2, 0:7:3, 1:8:2]
+    assert v.sum() == pytest.approx(r.sum())
+    assert v.argmax() == r.argmax()
+    for axis in range(3):
+        np.testing.assert_allclose(v.sum(axis=axis).to_numpy(), r.sum(axis=axis))
+        np.testing.assert_array_equal(v.max(axis).to_numpy(), r.max(axis=axis))
+
+
+@pytest.mark.parametrize("method", ["naive", "pairwise", "kahan"])
+def test_summation_methods(method):
+    ref = np.full(1 << 20, 0.1, dtype=np.float32)
+    a = cnda.from_numpy(ref)
+    exact = float(np.float32(0.1)) * ref.size
+    s = a.sum(method=method)
+    if method == "naive":
+        assert s == pytest.approx(exact, rel=1e-1)
+    else:
+        assert s == pytest.approx(exact, rel=1e-6)
+    np.testing.assert_allclose(cnda.from_numpy(ref.reshape(1024, 1024)).sum(axis=0, method=method).to_numpy(),
+                               np.full(1024, exact / 1024), rtol=1e-5)
+
+
+def test_nan_propagates_like_numpy():
+    ref = np.array([[1.0, np.nan, 5.0], [9.0, 2.0, 3.0]])
+    a = cnda.from_numpy(ref)
+    assert np.isnan(a.max())
+    assert np.isnan(a.min())
+    assert a.argmax() == ref.argmax()
+    np.testing.assert_array_equal(a.max(1).to_numpy(), ref.max(axis=1))
+    np.testing.assert_array_equal(a.argmax(0).to_numpy(), ref.argmax(axis=0))
+
+
+def test_field_reductions():
+    p = cnda.ContiguousND_Particle([4, 3])
+    arr = p.to_numpy()
+    arr["mass"] = np.arange(12.0).reshape(4, 3)
+    arr["vx"] = -1.0
+    assert p.sum("mass") == 66.0
+    assert p.argmax("mass") == 11
+    np.testing.assert_array_equal(p.sum("mass", axis=0).to_numpy(), arr["mass"].sum(axis=0))
+    np.testing.assert_array_equal(p.max("mass", 1).to_numpy(), arr["mass"].max(axis=1))
+    assert p.max("vx") == -1.0
+    assert p.mean("mass", method="kahan") == pytest.approx(5.5)
+
+    cells = cnda.ContiguousND_Cell2D([5])
+    cells.to_numpy()["flag"][3] = 7
+    assert cells.max("flag") == 7
+    assert cells.argmax("flag") == 3
+
+
+def test_errors():
+    a = cnda.ContiguousND_double([2, 3])
+    with pytest.raises(IndexError):
+        a.sum(axis=2)
+    with pytest.raises(IndexError):
+        a.max(-3)
+    with pytest.raises(ValueError):
+        a.sum(method="fast")
+    with pytest.raises(ValueError):
+        cnda.ContiguousND_double([0]).max()
+    assert cnda.ContiguousND_double([0]).sum() == 0.0
+    assert np.isnan(cnda.ContiguousND_double([0]).mean())
+    with pytest.raises(KeyError):
+        cnda.ContiguousND_Particle([2]).sum("nope")
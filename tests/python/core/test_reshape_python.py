@@ -0,0 +1,112 @@
+"""
+Shape-change tests for CNDA Python bindings.
+
+reshape(), squeeze() and expand_dims() return views of the same buffer;
+ravel() views when it can and copies otherwise; flatten() always copies.
+"""
+
+import gc
+
+import numpy as np
+import pytest
+import cnda
+
+
+CLASSES = [
+    (cnda.ContiguousND_float, np.float32),
+    (cnda.ContiguousND_double, np.float64),
+    (cnda.ContiguousND_int32, np.int32),
+    (cnda.ContiguousND_int64, np.int64),
+]
+
+
+@pytest.mark.parametrize("cls,dtype", CLASSES)
+def test_reshape_is_a_view(cls, dtype):
+    x = np.arange(24).astype(dtype)
+    a = cnda.from_numpy(x.reshape(2, 3, 4).copy())
+    r = a.reshape([4, 6])
+    assert r.shape() == [4, 6]
+    assert r.is_view() is True
+    assert r.data_ptr() == a.data_ptr()
+    np.testing.assert_array_equal(r.to_numpy(), x.reshape(4, 6))
+    r[1, 0] = -6
+    assert a[0, 1, 2] == -6
+    assert a.reshape([-1]).shape() == [24]
+    assert a.reshape([2, -1, 3]).shape() == [2, 4, 3]
+    with pytest.raises(ValueError):
+        a.reshape([5, 5])
+    with pytest.raises(ValueError):
+        a.reshape([-1, -1])
+    with pytest.raises(ValueError):
+        a.reshape([7, -1])
+
+
+def test_reshape_keeps_buffer_alive():
+    a = cnda.ContiguousND_double([3, 4])
+    a[2, 3] = 5.0
+    r = a.reshape([12])
+    del a
+    gc.collect()
+    assert r[11] == 5.0
+
+
+def test_reshape_of_views():
+    x = np.arange(120, dtype=np.int64).reshape(6, 4, 5)
+    a = cnda.from_numpy(x)
+    v = a[::2]
+    np.testing.assert_array_equal(v.reshape([3, 20]).to_numpy(), x[::2].reshape(3, 20))
+    with pytest.raises(ValueError, match="without copying"):
+        v.reshape([12, 5])
+    f = cnda.from_numpy(np.asfortranarray(x[0]), order="F")
+    with pytest.raises(ValueError, match="without copying"):
+        f.reshape([20])
+
+
+def test_squeeze_and_expand_dims():
+    x = np.arange(12, dtype=np.float32).reshape(1, 3, 1, 4)
+    a = cnda.from_numpy(x)
+    s = a.squeeze()
+    assert s.shape() == [3, 4]
+    assert s.data_ptr() == a.data_ptr()
+    np.testing.assert_array_equal(s.to_numpy(), x.squeeze())
+    assert a.squeeze(axis=-2).shape() == [1, 3, 4]
+    with pytest.raises(ValueError):
+        a.squeeze(1)
+    with pytest.raises(IndexError):
+        a.squeeze(4)
+
+    b = s.expand_dims(1)
+    assert b.shape() == [3, 1, 4]
+    assert b.is_contiguous()
+    np.testing.assert_array_equal(b.to_numpy(), np.expand_dims(x.squeeze(), 1))
+    assert s.expand_dims(-1).shape() == [3, 4, 1]
+    assert s.expand_dims(0).shape() == [1, 3, 4]
+    with pytest.raises(IndexError):
+        s.expand_dims(3)
+
+
+def test_ravel_and_flatten():
+    x = np.arange(24, dtype=np.int32).reshape(4, 6)
+    a = cnda.from_numpy(x)
+    r = a.ravel()
+    assert r.shape() == [24]
+    assert r.data_ptr() == a.data_ptr()
+    every_other = a[:, ::2].ravel()
+    assert every_other.data_ptr() == a.data_ptr()
+    np.testing.assert_array_equal(every_other.to_numpy(), x[:, ::2].ravel())
+    t = a.transpose().ravel()
+    assert t.data_ptr() != a.data_ptr()
+    np.testing.assert_array_equal(t.to_numpy(), x.T.ravel())
+    f = a.flatten()
+    assert f.data_ptr() != a.data_ptr()
+    np.testing.assert_array_equal(f.to_numpy(), x.ravel())
+
+
+def test_aos_reshape():
+    c = cnda.ContiguousND_Cell2D([2, 6])
+    arr = c.to_numpy()
+    arr['u'] = np.arange(12).reshape(2, 6)
+    r = c.reshape([3, 4])
+    np.testing.assert_array_equal(r.to_numpy()['u'], np.arange(12).reshape(3, 4))
+    assert c.expand_dims(0).shape() == [1, 2, 6]
+    np.testing.assert_array_equal(c[:, ::3].ravel().to_numpy()['u'], arr['u'][:, ::3].ravel())
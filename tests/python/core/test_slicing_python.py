@@ -0,0 +1,109 @@
+"""
+Slicing tests for CNDA Python bindings.
+
+Slices in __getitem__ return strided views that share memory with the parent;
+NumPy slicing of the same data is used as the oracle.
+"""
+
+import gc
+
+import numpy as np
+import pytest
+import cnda
+
+
+@pytest.fixture
+def grid():
+    x = np.arange(60, dtype=np.float64).reshape(3, 4, 5)
+    return x, cnda.from_numpy(x)
+
+
+@pytest.mark.parametrize("key", [
+    (slice(1, 3),),
+    (slice(None), slice(None, None, 2)),
+    (slice(1, 3), slice(None, None, 2), 1),
+    (0, slice(1, None), slice(None, None, 3)),
+    (slice(-2, None), -1),
+    (slice(5, 9),),
+])
+def test_slices_match_numpy(grid, key):
+    x, a = grid
+    v = a[key]
+    expected = x[key]
+    assert v.shape() == list(expected.shape)
+    assert v.is_view() is True
+    np.testing.assert_array_equal(np.asarray(v), expected)
+    assert v.data() == expected.ravel().tolist()
+
+
+def test_view_strides_and_contiguity(grid):
+    _, a = grid
+    rows = a[1:3]
+    assert rows.is_contiguous() is True
+    assert rows.strides() == [20, 5, 1]
+
+    cols = a[:, ::2, 1]
+    assert cols.is_contiguous() is False
+    assert cols.strides() == [20, 10]
+
+
+def test_view_writes_reach_parent(grid):
+    x, a = grid
+    v = a[1:, ::2]
+    v[0, 1, 4] = -1.0
+    assert x[1, 2, 4] == -1.0
+
+
+def test_slice_assignment_broadcasts(grid):
+    x, a = grid
+    a[:, 0, :] = 0.0
+    assert (x[:, 0, :] == 0).all()
+    a[0, 1:3] = np.array([[1, 2, 3, 4, 5], [6, 7, 8, 9, 10]])
+    assert x[0, 2].tolist() == [6, 7, 8, 9, 10]
+
+
+def test_view_of_owning_array_keeps_parent_alive():
+    b = cnda.ContiguousND_int32([4, 4])
+    inner = b[1:3, 1:3]
+    inner[:, :] = np.array([[1, 2], [3, 4]])
+    del b
+    gc.collect()
+    assert inner.data() == [1, 2, 3, 4]
+
+
+def test_views_compose_and_export(grid):
+    x, a = grid
+    v = a[::2][:, 1:3, ::2]
+    np.testing.assert_array_equal(v.to_numpy(), x[::2][:, 1:3, ::2])
+    assert v.to_numpy().ctypes.data == x[::2][:, 1:3, ::2].ctypes.data
+    assert memoryview(v).strides == (2 * 20 * 8, 5 * 8, 2 * 8)
+
+
+def test_take_put_on_strided_view(grid):
+    x, a = grid
+    v = a[:, 1::2, ::2]
+    np.testing.assert_array_equal(v.take(np.arange(v.size())), x[:, 1::2, ::2].ravel())
+    v.put(np.array([[2, 1, 2]]), -5.0)
+    assert x[2, 3, 4] == -5.0
+
+
+def test_slicing_errors(grid):
+    _, a = grid
+    with pytest.raises(ValueError, match="negative slice steps"):
+        a[::-1]
+    with pytest.raises(IndexError):
+        a[0, 0, 0, slice(None)]
+    with pytest.raises(IndexError):
+        a[3, :]
+    with pytest.raises(ValueError):
+        a[::0]
+
+
+def test_aos_slice_assignment_with_struct():
+    c = cnda.ContiguousND_Cell2D([6])
+    c[::2] = cnda.Cell2D(1.0, 2.0, 3)
+    assert [c[i].flag for i in range(6)] == [3, 0, 3, 0, 3, 0]
+    evens = c[::2]
+    assert evens[1].u == pytest.approx(1.0)
+    evens[1].u = 9.0
+    assert c[2].u == pytest.approx(9.0)
@@ -0,0 +1,109 @@
+"""
+Batched gather/scatter tests for CNDA Python bindings.
+
+take(indices) / put(indices, values) accept a (k, ndim) int64 index array or
+k flat row-major positions and run in a single C++ loop.
+"""
+
+import numpy as np
+import pytest
+import cnda
+
+
+def make_filled(shape, dtype):
+    x = np.arange(int(np.prod(shape)), dtype=dtype).reshape(shape)
+    return x, cnda.from_numpy(x)
+
+
+class TestTake:
+    def test_take_multi_index(self):
+        x, a = make_filled((3, 4, 5), np.float64)
+        idx = np.array([[0, 0, 0], [1, 2, 3], [2, 3, 4]], dtype=np.int64)
+        out = a.take(idx)
+        assert out.dtype == np.float64
+        np.testing.assert_array_equal(out, x[tuple(idx.T)])
+
+    def test_take_flat(self):
+        x, a = make_filled((3, 4), np.int32)
+        out = a.take(np.array([11, 0, 5, 5]))
+        assert out.tolist() == [11, 0, 5, 5]
+
+    def test_take_accepts_lists_and_other_int_dtypes(self):
+        x, a = make_filled((2, 2), np.int64)
+        assert a.take([[1, 1], [0, 1]]).tolist() == [3, 1]
+        assert a.take(np.array([3], dtype=np.int32)).tolist() == [3]
+
+    def test_take_empty(self):
+        _, a = make_filled((2, 2), np.float32)
+        assert a.take(np.zeros((0, 2), dtype=np.int64)).shape == (0,)
+
+    def test_take_out_of_bounds(self):
+        _, a = make_filled((3, 4), np.float32)
+        with pytest.raises(IndexError, match=r"take\(\): index out of bounds"):
+            a.take(np.array([[0, 0], [3, 0]]))
+        with pytest.raises(IndexError):
+            a.take(np.array([-1]))
+        with pytest.raises(IndexError):
+            a.take(np.array([12]))
+
+    def test_take_rejects_float_indices(self):
+        _, a = make_filled((5,), np.float64)
+        with pytest.raises(TypeError, match=r"take\(\): indices must be an integer array"):
+            a.take(np.array([1.7, 2.2]))
+        with pytest.raises(TypeError):
+            a.take([[0.0, 1.0]])
+
+    def test_take_rejects_bool_mask(self):
+        _, a = make_filled((3,), np.int32)
+        with pytest.raises(TypeError, match="bool"):
+            a.take(np.array([True, False, True]))
+
+    def test_take_bad_index_shape(self):
+        _, a = make_filled((3, 4), np.float32)
+        with pytest.raises(ValueError, match="shape"):
+            a.take(np.zeros((2, 3), dtype=np.int64))
+
+
+class TestPut:
+    def test_put_multi_index(self):
+        x, a = make_filled((3, 4), np.float64)
+        a.put(np.array([[0, 1], [2, 3]]), np.array([-1.0, -2.0]))
+        assert x[0, 1] == -1.0
+        assert x[2, 3] == -2.0
+
+    def test_put_flat_broadcast_scalar(self):
+        x, a = make_filled((2, 3), np.int32)
+        a.put(np.array([0, 2, 4]), 9)
+        assert x.ravel().tolist() == [9, 1, 9, 3, 9, 5]
+
+    def test_put_is_all_or_nothing(self):
+        x, a = make_filled((2, 3), np.int64)
+        before = x.copy()
+        with pytest.raises(IndexError, match=r"put\(\)"):
+            a.put(np.array([0, 1, 6]), np.array([7, 7, 7]))
+        np.testing.assert_array_equal(x, before)
+
+    def test_put_rejects_float_and_bool_indices(self):
+        x, a = make_filled((4,), np.float32)
+        before = x.copy()
+        with pytest.raises(TypeError, match=r"put\(\)"):
+            a.put(np.array([0.9, 2.5]), 7.0)
+        with pytest.raises(TypeError, match=r"put\(\)"):
+            a.put(np.array([True, False, True, False]), 7.0)
+        np.testing.assert_array_equal(x, before)
+
+    def test_put_value_count_mismatch(self):
+        _, a = make_filled((4,), np.float32)
+        with pytest.raises(ValueError):
+            a.put(np.array([0, 1, 2]), np.array([1.0, 2.0]))
+
+    def test_put_round_trip_with_take(self):
+        a = cnda.ContiguousND_float([16, 16])
+        rng = np.random.default_rng(0)
+        idx = rng.integers(0, 16, size=(100, 2))
+        vals = rng.random(100).astype(np.float32)
+        # keep only the last write to each cell so the oracle is exact
+        _, last = np.unique(idx[::-1], axis=0, return_index=True)
+        keep = len(idx) - 1 - last
+        a.put(idx[keep], vals[keep])
+        np.testing.assert_array_equal(a.take(idx[keep]), vals[keep])